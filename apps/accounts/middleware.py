@@ -4,7 +4,7 @@ from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.utils.deprecation import MiddlewareMixin
 
-from userprofiles.models import UserProfile
+from userprofiles.preferences import get_user_preferences
 
 
 class UserProfileCompleteMiddleware(MiddlewareMixin):
@@ -31,13 +31,14 @@ class UserProfileCompleteMiddleware(MiddlewareMixin):
         if request.user.is_anonymous or self._is_whitelisted_url(request):
             return None
 
-        user_profile = UserProfile.objects.filter(user=request.user)
-        if user_profile.exists():
-            request.session['is_registration_complete'] = True
+        is_registration_complete = get_user_preferences(request.user).is_registration_complete
+        # Only write to the session when the value changes, otherwise the session is saved on every request
+        if request.session.get('is_registration_complete') != is_registration_complete:
+            request.session['is_registration_complete'] = is_registration_complete
+        if is_registration_complete:
             return None
 
         redirect_url = reverse_lazy('account_complete_registration')
-        request.session['is_registration_complete'] = False
         # Prevent redirect loop
         if redirect_url != request.path:
             site = get_current_site(request)
@@ -1,6 +1,10 @@
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import RequestFactory
 from django.urls import reverse
 
+from accounts.middleware import UserProfileCompleteMiddleware
 from ayrabo.utils.testing import BaseTestCase
+from users.models import User
 from users.tests import UserFactory
 
 
@@ -56,3 +60,21 @@ class UserProfileCompleteMiddlewareTests(BaseTestCase):
         response = self.client.get(reverse('account_complete_registration'))
         self.assert_200(response)
         self.assertTemplateUsed(response, 'userprofiles/userprofile_create.html')
+
+    def test_session_only_written_on_change(self):
+        middleware = UserProfileCompleteMiddleware()
+        request = RequestFactory().get(reverse('home'))
+        request.user = User.objects.get(pk=self.user_with_profile.pk)
+        request.session = SessionStore()
+        request.session['is_registration_complete'] = True
+        request.session.modified = False
+        with self.assertNumQueries(1):
+            self.assertIsNone(middleware.process_request(request))
+        self.assertFalse(request.session.modified)
+
+        request.session['is_registration_complete'] = False
+        request.session.modified = False
+        with self.assertNumQueries(0):
+            middleware.process_request(request)
+        self.assertTrue(request.session.modified)
+        self.assertTrue(request.session['is_registration_complete'])
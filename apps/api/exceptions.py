@@ -8,3 +8,9 @@ class SportNotConfiguredAPIException(exceptions.APIException):
 
     status_code = status.HTTP_400_BAD_REQUEST
     default_code = 'sport_not_configured'
+
+
+class GameRosterConflictAPIException(exceptions.APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'The game roster has been changed by someone else, reload it and try again.'
+    default_code = 'game_roster_conflict'
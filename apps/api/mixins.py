@@ -1,9 +1,13 @@
+from django.conf import settings
 from django.db import transaction
 from rest_framework import serializers, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 
+from api.projections import ProjectionNotSupportedException, ValuesProjection
+from api.serializers import EXPAND_QUERY_PARAM, FIELDS_QUERY_PARAM, get_query_param_list
+
 
 class DynamicSerializerMixin:
     """
@@ -116,3 +120,46 @@ class BulkDeleteMixin:
 
     def perform_bulk_delete(self, serializer):
         serializer.bulk_delete()
+
+
+class SparseFieldsetMixin:
+    """
+    View counterpart of `SparseFieldsetSerializerMixin`, lets `get_queryset` skip fetching related objects that won't
+    be serialized.
+    """
+
+    def is_field_included(self, field_name):
+        field_names = get_query_param_list(self.request, FIELDS_QUERY_PARAM)
+        return field_names is None or field_name in field_names
+
+    def is_field_expanded(self, field_name):
+        """
+        :param field_name: Name of one of the serializer's `Meta.expandable_fields`
+        :return: Whether the field is serialized as nested objects
+        """
+        expand = get_query_param_list(self.request, EXPAND_QUERY_PARAM)
+        return self.is_field_included(field_name) and (expand is None or field_name in expand)
+
+
+class ValuesListMixin:
+    """
+    Opt-in (`settings.API_VALUES_SERIALIZATION_ENABLED`) fast read path for list views. Unpaginated JSON responses are
+    read with a `values()` query and streamed, see `ValuesProjection`. Paginated responses, other formats (i.e. the
+    browsable api) and serializers the projection doesn't support go through the serializer.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not settings.API_VALUES_SERIALIZATION_ENABLED or request.accepted_renderer.format != 'json':
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        try:
+            projection = ValuesProjection(self.get_serializer())
+        except ProjectionNotSupportedException:
+            serializer = self.get_serializer(queryset, many=True)
+            return Response(serializer.data)
+        return projection.streaming_response(queryset)
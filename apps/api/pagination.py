@@ -0,0 +1,21 @@
+from rest_framework.pagination import CursorPagination
+
+
+class OptionalCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination on the objects' ids. Pagination is opt-in: requests without a `cursor` or `page_size`
+    query param get the unpaginated list, so existing clients keep working. Integrations pulling large lists should
+    paginate, responses are then bounded by `max_page_size`.
+
+    Paginated responses look like: {"next": "<url>", "previous": "<url>", "results": [...]}
+    """
+    ordering = 'id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view=view)
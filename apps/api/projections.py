@@ -0,0 +1,193 @@
+import json
+from itertools import chain, islice
+
+from django.core.exceptions import FieldDoesNotExist
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+
+VALUE = 'value'
+NESTED = 'nested'
+MANY = 'many'
+
+# Field types whose `to_representation` returns the value the db returns as is
+PASSTHROUGH_FIELD_CLASSES = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.NullBooleanField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+class ProjectionNotSupportedException(Exception):
+    """
+    Raised when a serializer has fields that can't be read from a `values()` query, i.e. method fields.
+    """
+    pass
+
+
+class ValuesProjection(object):
+    """
+    Read only version of a model serializer that reads rows with a `values_list` query instead of loading model
+    objects. The serializer's fields are compiled to the columns to select and the position of each field's value, so
+    serializing a row doesn't go through the serializer's fields. Produces the same data as the serializer.
+
+    Supports fields backed by a model field (including foreign key pks), nested (non many) serializers of foreign keys
+    and top level lists of related pks, which are fetched with one more query per chunk of rows.
+
+    projection = ValuesProjection(HockeyPlayerSerializer(context={'request': request}))
+    data = projection.to_representation(HockeyPlayer.objects.filter(team=team))
+    """
+    chunk_size = 2000
+
+    def __init__(self, serializer):
+        """
+        :param serializer: Model serializer instance, its `fields` (i.e. after sparse fieldsets) are compiled
+        :raises ProjectionNotSupportedException: If a field can't be read from a `values()` query
+        """
+        if not isinstance(serializer, serializers.ModelSerializer):
+            raise ProjectionNotSupportedException(f'{serializer.__class__.__name__} is not a model serializer.')
+        self.model = serializer.Meta.model
+        self.columns = ['pk']
+        # Field name -> lookup of the related pks, for lists of related pks
+        self.many_lookups = {}
+        self.spec = self._compile(serializer, self.model, prefix='')
+
+    def _add_column(self, lookup):
+        self.columns.append(lookup)
+        return len(self.columns) - 1
+
+    def _get_model_field(self, model, field):
+        source_attrs = field.source_attrs
+        if len(source_attrs) != 1:
+            raise ProjectionNotSupportedException(f'{field.field_name} has an unsupported source.')
+        try:
+            return model._meta.get_field(source_attrs[0])
+        except FieldDoesNotExist:
+            raise ProjectionNotSupportedException(f'{field.field_name} is not a model field.')
+
+    def _compile(self, serializer, model, prefix):
+        spec = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.ListSerializer):
+                raise ProjectionNotSupportedException(f'{name} is a nested list of objects.')
+
+            model_field = self._get_model_field(model, field)
+            lookup = f'{prefix}{model_field.name}'
+            if isinstance(field, serializers.ManyRelatedField):
+                if prefix or not isinstance(field.child_relation, serializers.PrimaryKeyRelatedField):
+                    raise ProjectionNotSupportedException(f'{name} is an unsupported list of related objects.')
+                self.many_lookups[name] = (lookup, model_field.related_model)
+                spec.append((MANY, name, None, None))
+            elif isinstance(field, serializers.BaseSerializer):
+                if not model_field.many_to_one and not model_field.one_to_one:
+                    raise ProjectionNotSupportedException(f'{name} is not a foreign key.')
+                pk_index = self._add_column(lookup)
+                spec.append((
+                    NESTED, name, pk_index, self._compile(field, model_field.related_model, prefix=f'{lookup}__')
+                ))
+            elif isinstance(field, serializers.RelatedField) and not isinstance(
+                field, serializers.PrimaryKeyRelatedField
+            ):
+                raise ProjectionNotSupportedException(f'{name} is an unsupported related field.')
+            elif model_field.many_to_many or model_field.one_to_many:
+                raise ProjectionNotSupportedException(f'{name} is a list of related objects.')
+            else:
+                converter = None if isinstance(field, PASSTHROUGH_FIELD_CLASSES) else field.to_representation
+                spec.append((VALUE, name, self._add_column(lookup), converter))
+        return spec
+
+    def _build(self, spec, row, many_values):
+        data = {}
+        for kind, name, index, arg in spec:
+            if kind is VALUE:
+                value = row[index]
+                data[name] = value if value is None or arg is None else arg(value)
+            elif kind is NESTED:
+                data[name] = None if row[index] is None else self._build(arg, row, many_values)
+            else:
+                data[name] = many_values[name].get(row[0], [])
+        return data
+
+    def _get_many_values(self, pks):
+        """
+        :return: Dict of field name -> dict of pk -> list of related pks, in the related model's default ordering
+        """
+        many_values = {}
+        for name, (lookup, related_model) in self.many_lookups.items():
+            ordering = [
+                f'-{lookup}__{field[1:]}' if field.startswith('-') else f'{lookup}__{field}'
+                for field in related_model._meta.ordering
+            ]
+            qs = self.model._default_manager.filter(pk__in=pks).order_by(*ordering, f'{lookup}__pk')
+            values = many_values[name] = {}
+            for pk, related_pk in qs.values_list('pk', lookup):
+                # Rows without related objects have a `None` related pk
+                if related_pk is not None:
+                    values.setdefault(pk, []).append(related_pk)
+        return many_values
+
+    def iter_chunks(self, queryset):
+        """
+        :param queryset: Queryset of the serializer's model, its filters and ordering are used
+        :return: Generator of lists of serialized rows, the rows are read with a db cursor `chunk_size` rows at a time
+        """
+        rows = queryset.select_related(None).prefetch_related(None).values_list(*self.columns).iterator(
+            chunk_size=self.chunk_size
+        )
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            many_values = self._get_many_values([row[0] for row in chunk]) if self.many_lookups else {}
+            yield [self._build(self.spec, row, many_values) for row in chunk]
+            if len(chunk) < self.chunk_size:
+                # The rows have been exhausted, don't go back to the db to find out
+                return
+
+    def to_representation(self, queryset):
+        """
+        :return: List of serialized rows, same as `serializer_cls(queryset, many=True).data`
+        """
+        return [data for chunk in self.iter_chunks(queryset) for data in chunk]
+
+    def iter_json(self, queryset):
+        """
+        :return: Generator of the utf-8 encoded chunks of the JSON array of the serialized rows. Encoded the same way
+            DRF's `JSONRenderer` does, without its `default` hook since the values have already been converted.
+        """
+        encoder = json.JSONEncoder(
+            ensure_ascii=not api_settings.UNICODE_JSON,
+            allow_nan=not api_settings.STRICT_JSON,
+            separators=(',', ':') if api_settings.COMPACT_JSON else (', ', ': '),
+        )
+        separator = b','
+        yield b'['
+        first = True
+        for chunk in self.iter_chunks(queryset):
+            content = separator.join(encoder.encode(data).encode('utf-8') for data in chunk)
+            yield content if first else separator + content
+            first = False
+        yield b']'
+
+    def streaming_response(self, queryset):
+        """
+        The query is executed and the first chunk is read before the response is returned, so errors (i.e. the db
+        being unavailable) are raised in the view and handled like any other error. Responses that fit in one chunk
+        are read entirely. Errors reading later chunks can only end the stream, the status has already been sent.
+
+        The queries of later chunks are executed while the response is streamed, after the view and the middleware
+        have returned. `QueryInstrumentationMiddleware` adds them to the query report once the stream ends, they're
+        missing from its headers.
+
+        :return: `StreamingHttpResponse` of the JSON array of the serialized rows
+        """
+        content = self.iter_json(queryset)
+        # The opening bracket and the first chunk, or the closing bracket when there aren't any rows
+        head = list(islice(content, 2))
+        return StreamingHttpResponse(chain(head, content), content_type='application/json')
@@ -1,22 +1,189 @@
+import operator
 from collections import OrderedDict
+from collections.abc import Mapping
+from functools import reduce
 
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections, router
+from django.db.models import Q, QuerySet
 from rest_framework import serializers
+from rest_framework.validators import UniqueTogetherValidator
+
+
+def _to_pk(model_cls, value):
+    """
+    :return: The pk value converted to the model's pk type, `None` if it can't be converted
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return model_cls._meta.pk.to_python(value)
+    except (DjangoValidationError, TypeError, ValueError):
+        return None
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key related field that uses the objects `BulkCreateUpdateDeleteListSerializer` fetches (one query for all
+    of the items) before validating a bulk payload, instead of querying for each item's object. Pks that weren't
+    prefetched, i.e. invalid ones, fall back to the default behavior.
+    """
+
+    def __init__(self, **kwargs):
+        # pk -> object, set by the list serializer for the duration of the validation
+        self.prefetched_objects = None
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if self.prefetched_objects is not None:
+            obj = self.prefetched_objects.get(_to_pk(self.get_queryset().model, data))
+            if obj is not None:
+                return obj
+        return super().to_internal_value(data)
+
+
+class BulkUniqueTogetherValidator(UniqueTogetherValidator):
+    """
+    Unique together validator that checks against the existing values `BulkCreateUpdateDeleteListSerializer` fetches
+    (one query for all of the items) before validating a bulk create payload, instead of querying for each item.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # Set of tuples of existing values for the fields, set by the list serializer for the duration of the validation
+        self.existing_values = None
+        super().__init__(*args, **kwargs)
+
+    def __call__(self, attrs, serializer):
+        if self.existing_values is None:
+            return super().__call__(attrs, serializer)
+        self.enforce_required_fields(attrs, serializer)
+        values = tuple(
+            getattr(value, 'pk', value) for value in
+            (attrs.get(serializer.fields[field_name].source) for field_name in self.fields)
+        )
+        # Ignore validation if any field is None
+        if None not in values and values in self.existing_values:
+            field_names = ', '.join(self.fields)
+            raise serializers.ValidationError(self.message.format(field_names=field_names), code='unique')
 
 
 class BulkCreateUpdateDeleteListSerializer(serializers.ListSerializer):
+    """
+    List serializer for the bulk actions (see `api.mixins`). Related objects and unique together constraints are
+    fetched/checked for all of the items at once, so validating a payload takes a fixed # of queries. Creates use
+    `bulk_create` (when the db returns the pks of bulk inserted rows) and updates use `bulk_update`.
+
+    NOTE: Bulk creates and updates don't call the child serializer's `create`/`update` or the model's `save` and don't
+    send `pre_save`/`post_save` signals.
+    """
     pk_field = 'id'
 
+    def _get_bulk_related_fields(self):
+        return [
+            field for field in self.child.fields.values()
+            if isinstance(field, BulkPrimaryKeyRelatedField) and not field.read_only
+        ]
+
+    def _get_bulk_unique_together_validators(self):
+        if self.instance is not None:
+            return []
+        return [validator for validator in self.child.validators if isinstance(validator, BulkUniqueTogetherValidator)]
+
+    def _prefetch_related_objects(self, items):
+        for field in self._get_bulk_related_fields():
+            queryset = field.get_queryset()
+            if not isinstance(queryset, QuerySet):
+                continue
+            pks = {_to_pk(queryset.model, item.get(field.field_name)) for item in items}
+            pks.discard(None)
+            field.prefetched_objects = queryset.in_bulk(pks) if pks else {}
+
+    def _get_unique_values(self, validator, item):
+        """
+        :return: Tuple of the item's values (pks for related objects) for the validator's fields, `None` if any of them
+            is missing or invalid (the item's validation reports those)
+        """
+        values = []
+        for field_name in validator.fields:
+            field = self.child.fields.get(field_name)
+            if field is None or item.get(field_name) is None:
+                return None
+            try:
+                value = field.run_validation(item.get(field_name))
+            except serializers.ValidationError:
+                return None
+            values.append(getattr(value, 'pk', value))
+        return tuple(values)
+
+    def _prefetch_unique_together_values(self, items):
+        for validator in self._get_bulk_unique_together_validators():
+            sources = [self.child.fields[field_name].source for field_name in validator.fields]
+            values = {self._get_unique_values(validator, item) for item in items}
+            values.discard(None)
+            validator.existing_values = set()
+            if values:
+                condition = reduce(operator.or_, (Q(**dict(zip(sources, item_values))) for item_values in values))
+                validator.existing_values = set(validator.queryset.filter(condition).values_list(*sources))
+
+    def _clear_prefetched(self):
+        for field in self._get_bulk_related_fields():
+            field.prefetched_objects = None
+        for validator in self._get_bulk_unique_together_validators():
+            validator.existing_values = None
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            return super().to_internal_value(data)
+        items = [item for item in data if isinstance(item, Mapping)]
+        try:
+            self._prefetch_related_objects(items)
+            self._prefetch_unique_together_values(items)
+            return super().to_internal_value(data)
+        finally:
+            self._clear_prefetched()
+
+    def _get_many_to_many_field_names(self):
+        model_cls = self.child.Meta.model
+        return {field.name for field in model_cls._meta.get_fields() if field.many_to_many or field.one_to_many}
+
     def create(self, validated_data):
-        return super().create(validated_data)
+        model_cls = self.child.Meta.model
+        connection = connections[router.db_for_write(model_cls)]
+        many_to_many_field_names = self._get_many_to_many_field_names()
+        has_many_to_many = any(many_to_many_field_names.intersection(attrs) for attrs in validated_data)
+        if not connection.features.can_return_ids_from_bulk_insert or has_many_to_many:
+            # The created objects need pks for the response and many to many relations can't be bulk created
+            return super().create(validated_data)
+        return model_cls.objects.bulk_create([model_cls(**attrs) for attrs in validated_data])
 
     def bulk_update(self):
+        model_cls = self.child.Meta.model
+        many_to_many_field_names = self._get_many_to_many_field_names()
         instances = []
+        field_names = set()
+        many_to_many_values = []
         for data in self.validated_data:
             instance = data.pop(self.pk_field)
-            self.child.update(instance, data)
+            for attr, value in data.items():
+                if attr in many_to_many_field_names:
+                    many_to_many_values.append((instance, attr, value))
+                else:
+                    setattr(instance, attr, value)
+                    field_names.add(attr)
             # We could `.copy` `self.validated_data` so we don't need to add this back but I think this is fine as is
             data.update({self.pk_field: instance})
             instances.append(instance)
+
+        if field_names:
+            # `bulk_update` doesn't set `auto_now` fields
+            for field in model_cls._meta.concrete_fields:
+                if getattr(field, 'auto_now', False):
+                    field_names.add(field.name)
+                    for instance in instances:
+                        field.pre_save(instance, add=False)
+            model_cls.objects.bulk_update(instances, sorted(field_names))
+        for instance, attr, value in many_to_many_values:
+            getattr(instance, attr).set(value)
         return instances
 
     def bulk_delete(self):
@@ -41,6 +208,14 @@ class BulkCreateUpdateDeleteListSerializer(serializers.ListSerializer):
 
 class AbstractBulkCreateModelSerializer(serializers.ModelSerializer):
     """Abstract serializer for bulk create"""
+    serializer_related_field = BulkPrimaryKeyRelatedField
+
+    def get_unique_together_validators(self):
+        return [
+            BulkUniqueTogetherValidator(queryset=validator.queryset, fields=validator.fields)
+            for validator in super().get_unique_together_validators()
+        ]
+
     class Meta:
         model = None
         list_serializer_class = BulkCreateUpdateDeleteListSerializer
@@ -48,11 +223,13 @@ class AbstractBulkCreateModelSerializer(serializers.ModelSerializer):
 
 class AbstractBulkUpdateModelSerializer(serializers.ModelSerializer):
     """Abstract serializer for bulk update. Make sure you call `super` in any subclasses if overriding `validate`"""
+    serializer_related_field = BulkPrimaryKeyRelatedField
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         view = self.context.get('view')
         # Can use `self.Meta.model.objects.all()` or something similar
-        self.fields['id'] = serializers.PrimaryKeyRelatedField(queryset=view.get_queryset())
+        self.fields['id'] = BulkPrimaryKeyRelatedField(queryset=view.get_queryset())
 
     def validate(self, data):
         # There's some weirdness with partial=True that doesn't actually validate a payload like [{}] includes id
@@ -72,9 +249,69 @@ class AbstractBulkDeleteModelSerializer(serializers.ModelSerializer):
         super().__init__(*args, **kwargs)
         view = self.context.get('view')
         # Can use `self.Meta.model.objects.all()` or something similar
-        self.fields['id'] = serializers.PrimaryKeyRelatedField(queryset=view.get_queryset())
+        self.fields['id'] = BulkPrimaryKeyRelatedField(queryset=view.get_queryset())
 
     class Meta:
         model = None  # Remember to update me
         fields = ('id',)
         list_serializer_class = BulkCreateUpdateDeleteListSerializer
+
+
+FIELDS_QUERY_PARAM = 'fields'
+EXPAND_QUERY_PARAM = 'expand'
+
+
+def get_query_param_list(request, name):
+    """
+    :param request: DRF request, can be `None`
+    :param name: Name of the query param, i.e. `fields`
+    :return: Set of the query param's comma separated values, `None` if the request doesn't have the query param
+    """
+    if request is None or name not in request.query_params:
+        return None
+    return {value.strip() for value in request.query_params.get(name).split(',') if value.strip()}
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Lets clients choose the fields they need, so responses only include (and views only fetch) what is used.
+
+    `?fields=id,name` only includes the `id` and `name` fields. All fields are included by default.
+
+    `?expand=players` only serializes the `players` of the fields listed in `Meta.expandable_fields` as nested
+    objects, the other expandable fields are serialized as ids (or lists of ids), i.e. `?expand=` collapses all of
+    them. All expandable fields are expanded by default.
+
+    Only applies to the top level serializer (or the child of a top level list serializer) of an api response.
+    """
+
+    def _is_root(self):
+        parent = getattr(self, 'parent', None)
+        if isinstance(parent, serializers.ListSerializer):
+            parent = getattr(parent, 'parent', None)
+        return parent is None
+
+    def _get_collapsed_field(self, field):
+        kwargs = {'read_only': True}
+        if field.source:
+            kwargs['source'] = field.source
+        if isinstance(field, serializers.ListSerializer):
+            return serializers.PrimaryKeyRelatedField(many=True, **kwargs)
+        return serializers.PrimaryKeyRelatedField(**kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or not self._is_root():
+            return fields
+
+        field_names = get_query_param_list(request, FIELDS_QUERY_PARAM)
+        if field_names is not None:
+            fields = OrderedDict((name, field) for name, field in fields.items() if name in field_names)
+
+        expand = get_query_param_list(request, EXPAND_QUERY_PARAM)
+        if expand is not None:
+            for name in getattr(self.Meta, 'expandable_fields', ()):
+                if name in fields and name not in expand:
+                    fields[name] = self._get_collapsed_field(fields[name])
+        return fields
@@ -0,0 +1,121 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.projections import ProjectionNotSupportedException, ValuesProjection
+from api.v1.games.serializers import HockeyGamePlayerSerializer
+from api.v1.players.serializers import HockeyPlayerSerializer
+from api.v1.seasons.serializers import HockeySeasonRosterSerializer, SeasonRosterPlayerIdsSerializer
+from ayrabo.utils.testing import BaseTestCase
+from common.models import GenericChoice
+from common.tests import GenericChoiceFactory
+from games.models import HockeyGamePlayer
+from games.tests import HockeyGamePlayerFactory, HockeyGameFactory
+from players.models import HockeyPlayer
+from players.tests import HockeyPlayerFactory
+from seasons.models import HockeySeasonRoster
+from seasons.tests import HockeySeasonRosterFactory
+from teams.tests import TeamFactory
+
+
+class HockeyPlayerTimestampsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = HockeyPlayer
+        fields = ['id', 'created', 'updated']
+
+
+class HockeyPlayerMethodFieldSerializer(serializers.ModelSerializer):
+    name = serializers.SerializerMethodField()
+
+    def get_name(self, obj):
+        return obj.user.get_full_name()
+
+    class Meta:
+        model = HockeyPlayer
+        fields = ['id', 'name']
+
+
+class ValuesProjectionTests(BaseTestCase):
+    def setUp(self):
+        self.team = TeamFactory()
+        self.players = HockeyPlayerFactory.create_batch(3, team=self.team)
+        self.players[0].user.first_name = 'Zoë'
+        self.players[0].user.save()
+
+    def _get_context(self, data=None):
+        return {'request': Request(APIRequestFactory().get('/', data=data))}
+
+    def assertSameData(self, serializer, queryset):
+        data = serializer.__class__(queryset, many=True, context=serializer.context).data
+        projection = ValuesProjection(serializer)
+        self.assertListEqual(projection.to_representation(queryset), data)
+        self.assertEqual(b''.join(projection.iter_json(queryset)), JSONRenderer().render(data))
+
+    def test_nested_serializer(self):
+        self.assertSameData(HockeyPlayerSerializer(), HockeyPlayer.objects.order_by('id'))
+
+    def test_to_representation(self):
+        self.assertSameData(HockeyPlayerTimestampsSerializer(), HockeyPlayer.objects.order_by('id'))
+
+    def test_sparse_fieldsets(self):
+        context = self._get_context({'fields': 'id,user,position', 'expand': ''})
+        projection = ValuesProjection(HockeyPlayerSerializer(context=context))
+        self.assertListEqual(projection.columns, ['pk', 'id', 'user', 'position'])
+        self.assertSameData(HockeyPlayerSerializer(context=context), HockeyPlayer.objects.order_by('id'))
+
+    def test_related_pks(self):
+        game = HockeyGameFactory(
+            home_team=self.team,
+            type=GenericChoiceFactory(type=GenericChoice.GAME_TYPE, content_object=self.team.sport),
+            point_value=GenericChoiceFactory(type=GenericChoice.GAME_POINT_VALUE, content_object=self.team.sport)
+        )
+        for player in self.players:
+            HockeyGamePlayerFactory(game=game, team=self.team, player=player)
+        self.assertSameData(HockeyGamePlayerSerializer(), HockeyGamePlayer.objects.order_by('id'))
+
+    def test_lists_of_related_pks(self):
+        HockeySeasonRosterFactory(team=self.team, players=self.players)
+        HockeySeasonRosterFactory(team=self.team, players=self.players[1:])
+        HockeySeasonRosterFactory(team=self.team)
+        context = self._get_context({'expand': ''})
+        queryset = HockeySeasonRoster.objects.order_by('id')
+        with self.assertNumQueries(2):
+            ValuesProjection(HockeySeasonRosterSerializer(context=context)).to_representation(queryset)
+        self.assertSameData(HockeySeasonRosterSerializer(context=context), queryset)
+
+    def test_chunks(self):
+        projection = ValuesProjection(HockeyPlayerSerializer())
+        projection.chunk_size = 2
+        chunks = list(projection.iter_chunks(HockeyPlayer.objects.order_by('id')))
+        self.assertListEqual([len(chunk) for chunk in chunks], [2, 1])
+        self.assertEqual(b''.join(projection.iter_json(HockeyPlayer.objects.none())), b'[]')
+
+    def test_streaming_response(self):
+        projection = ValuesProjection(HockeyPlayerSerializer())
+        queryset = HockeyPlayer.objects.order_by('id')
+        # The rows fit in one chunk, they're read before the response is returned
+        with self.assertNumQueries(1):
+            response = projection.streaming_response(queryset)
+        with self.assertNumQueries(0):
+            content = b''.join(response.streaming_content)
+        self.assertEqual(content, JSONRenderer().render(HockeyPlayerSerializer(queryset, many=True).data))
+
+    def test_streaming_response_error(self):
+        projection = ValuesProjection(HockeyPlayerSerializer())
+        with mock.patch.object(projection, 'iter_chunks', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                projection.streaming_response(HockeyPlayer.objects.all())
+
+    def test_not_supported(self):
+        serializers_not_supported = [
+            HockeySeasonRosterSerializer(),
+            HockeyPlayerMethodFieldSerializer(),
+            SeasonRosterPlayerIdsSerializer(),
+        ]
+        for serializer in serializers_not_supported:
+            with self.assertRaises(ProjectionNotSupportedException, msg=serializer.__class__.__name__):
+                ValuesProjection(serializer)
@@ -8,6 +8,7 @@ from api.serializers import (
     AbstractBulkDeleteModelSerializer,
     AbstractBulkUpdateModelSerializer,
     BulkCreateUpdateDeleteListSerializer,
+    BulkPrimaryKeyRelatedField,
 )
 from ayrabo.utils.testing import BaseAPITestCase
 from ayrabo.utils.testing.models import DummyModel
@@ -56,6 +57,36 @@ class BulkCreateUpdateDeleteListSerializerTests(BaseAPITestCase):
 
         self.assertIsNotNone(serializer.validated_data[0].get('id'))
 
+    def test_bulk_update_num_queries(self):
+        instances = [DummyModel.objects.create(name=f'Team {i}', count=i) for i in range(10)]
+        self.mock_view.get_queryset.return_value = DummyModel.objects.all()
+        data = [{'id': instance.id, 'count': 100} for instance in instances]
+        serializer = BulkCreateUpdateDeleteListSerializer(
+            child=BulkUpdateDummyModelSerializer(context=self.context),
+            data=data,
+            partial=True
+        )
+        # Fetch the objects being updated, update them
+        with self.assertNumQueries(2):
+            serializer.is_valid(raise_exception=True)
+            serializer.bulk_update()
+        self.assertListEqual(list(DummyModel.objects.filter(count=100).order_by('id')), instances)
+
+    def test_invalid_pk(self):
+        data = [{'id': self.instance1.id, 'count': 100}, {'id': 1000, 'count': 100}, {'id': 'a'}]
+        serializer = BulkCreateUpdateDeleteListSerializer(
+            child=BulkUpdateDummyModelSerializer(context=self.context),
+            data=data,
+            partial=True
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertListEqual(serializer.errors, [
+            {},
+            {'id': ['Invalid pk "1000" - object does not exist.']},
+            {'id': ['Incorrect type. Expected pk value, received str.']},
+        ])
+        self.assertIsNone(serializer.child.fields['id'].prefetched_objects)
+
     def test_bulk_delete(self):
         data = [{'id': self.instance1.id}, {'id': self.instance2.id}]
         serializer = BulkCreateUpdateDeleteListSerializer(
@@ -99,7 +130,7 @@ class AbstractBulkUpdateModelSerializerTests(BaseAPITestCase):
     def test_init(self):
         # DRF removes the default id field so we need to explicitly set it so the serializer actually validates the ids
         # are valid, etc
-        self.assertIs(type(self.serializer.fields.get('id')), serializers.PrimaryKeyRelatedField)
+        self.assertIs(type(self.serializer.fields.get('id')), BulkPrimaryKeyRelatedField)
 
     def test_validate(self):
         with self.assertRaisesMessage(serializers.ValidationError, 'This field is required.'):
@@ -115,7 +146,7 @@ class AbstractBulkDeleteModelSerializerTests(BaseAPITestCase):
         self.serializer = BulkDeleteDummyModelSerializer(context={'view': mock_view})
 
     def test_init(self):
-        self.assertIs(type(self.serializer.fields.get('id')), serializers.PrimaryKeyRelatedField)
+        self.assertIs(type(self.serializer.fields.get('id')), BulkPrimaryKeyRelatedField)
 
     def test_meta(self):
         self.assertTupleEqual(self.serializer.Meta.fields, ('id',))
@@ -2,12 +2,15 @@ from django.db.models import Q
 from rest_framework import serializers
 
 from api.exceptions import SportNotConfiguredAPIException
+from api.mixins import BulkViewActionMixin
 from api.serializers import (
     AbstractBulkCreateModelSerializer,
     AbstractBulkDeleteModelSerializer,
     AbstractBulkUpdateModelSerializer,
+    SparseFieldsetSerializerMixin,
 )
 from games.models import HockeyGamePlayer
+from players.models import HockeyPlayer
 from teams.models import Team
 
 
@@ -72,7 +75,7 @@ class AbstractGamePlayerCreateSerializer(serializers.ModelSerializer):
         pass
 
 
-class HockeyGamePlayerSerializer(serializers.ModelSerializer):
+class HockeyGamePlayerSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Basic serializer that should only be used for listing. To support single create, etc please look at the validation
     logic the abstract game player bulk create serializer is doing.
@@ -120,3 +123,59 @@ class HockeyGamePlayerBulkDeleteSerializer(AbstractBulkDeleteModelSerializer):
 
     class Meta(AbstractBulkDeleteModelSerializer.Meta):
         model = HockeyGamePlayer
+
+
+class GameRosterSyncPlayerSerializer(serializers.Serializer):
+    # Players are validated all at once by the roster serializer, a related field would query for each player
+    player = serializers.IntegerField()
+    is_starting = serializers.BooleanField(default=False)
+
+
+class AbstractGameRosterSyncSerializer(serializers.Serializer):
+    """
+    Desired end state of a team's game roster, see `games.rosters.sync_game_roster`. The `version` is the roster's
+    version token returned by the roster workspace api (or a previous sync).
+    """
+    player_model_cls = None
+
+    team = serializers.PrimaryKeyRelatedField(queryset=Team.objects.none())
+    version = serializers.CharField()
+    players = GameRosterSyncPlayerSerializer(many=True, allow_empty=True)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        game = self.context.get('game')
+        self.fields['team'].queryset = Team.objects.filter(Q(id=game.home_team_id) | Q(id=game.away_team_id))
+
+    def validate_players(self, value):
+        if len(value) > BulkViewActionMixin.BULK_ACTION_MAX_ITEMS:
+            raise serializers.ValidationError(
+                f'Game rosters can only have {BulkViewActionMixin.BULK_ACTION_MAX_ITEMS} players.'
+            )
+        player_ids = [item.get('player') for item in value]
+        if len(set(player_ids)) != len(player_ids):
+            raise serializers.ValidationError('Players can only be included once.')
+        return value
+
+    def validate(self, attrs):
+        team = attrs.get('team')
+        game = self.context.get('game')
+
+        validate_user_authorized_to_manage_team(team, game, self.context)
+
+        player_ids = [item.get('player') for item in attrs.get('players')]
+        valid_ids = set(
+            self.player_model_cls.objects.active().filter(team=team, id__in=player_ids).values_list('id', flat=True)
+        )
+        invalid_ids = [player_id for player_id in player_ids if player_id not in valid_ids]
+        if invalid_ids:
+            raise serializers.ValidationError({
+                'players': 'Players {} are inactive or do not belong to the specified team.'.format(
+                    ', '.join(str(player_id) for player_id in invalid_ids)
+                )
+            })
+        return attrs
+
+
+class HockeyGameRosterSyncSerializer(AbstractGameRosterSyncSerializer):
+    player_model_cls = HockeyPlayer
@@ -1,26 +1,28 @@
 import datetime
 
 import pytz
+from django.db import connection
 from rest_framework.reverse import reverse
 
-from ayrabo.utils.testing import BaseAPITestCase
+from ayrabo.utils.testing import BaseAPITestCase, QueryBudgetMixin
 from common.models import GenericChoice
 from common.tests import GenericChoiceFactory
 from divisions.tests import DivisionFactory
 from games.models import HockeyGame, HockeyGamePlayer
+from games.rosters import get_game_roster_version
 from games.tests import HockeyGameFactory, HockeyGamePlayerFactory
 from leagues.tests import LeagueFactory
 from managers.tests import ManagerFactory
 from players.tests import HockeyPlayerFactory
 from scorekeepers.tests import ScorekeeperFactory
-from seasons.tests import SeasonFactory
+from seasons.tests import HockeySeasonRosterFactory, SeasonFactory
 from sports.models import SportRegistration
 from sports.tests import SportFactory, SportRegistrationFactory
 from teams.tests import TeamFactory
 from users.tests import UserFactory
 
 
-class GamePlayerViewSetTests(BaseAPITestCase):
+class GamePlayerViewSetTests(QueryBudgetMixin, BaseAPITestCase):
     def _get_list_url(self, sport_pk, game_pk):
         return reverse('v1:sports:games:players-list', kwargs={'pk': sport_pk, 'game_pk': game_pk})
 
@@ -33,6 +35,13 @@ class GamePlayerViewSetTests(BaseAPITestCase):
     def _get_bulk_delete_url(self, sport_pk, game_pk):
         return reverse('v1:sports:games:players-bulk-delete', kwargs={'pk': sport_pk, 'game_pk': game_pk})
 
+    def _get_sync_url(self, sport_pk, game_pk):
+        return reverse('v1:sports:games:players-sync', kwargs={'pk': sport_pk, 'game_pk': game_pk})
+
+    def _get_version(self, team):
+        return get_game_roster_version(HockeyGamePlayer.objects.filter(game=self.game, team=team,
+                                                                       player__is_active=True))
+
     def _create_game_players(self):
         self.home_game_player1 = HockeyGamePlayerFactory(
             game=self.game,
@@ -140,6 +149,17 @@ class GamePlayerViewSetTests(BaseAPITestCase):
         response = self.client.get(self._get_list_url(self.ice_hockey.pk, self.game.pk))
         self.assertAPIError(response, 'unauthenticated')
 
+    def test_query_budget(self):
+        self.login(user=self.user)
+        url = self._get_list_url(self.ice_hockey.pk, self.game.pk)
+
+        def seed(count):
+            for _ in range(count):
+                player = HockeyPlayerFactory(team=self.home_team, sport=self.ice_hockey)
+                HockeyGamePlayerFactory(game=self.game, team=self.home_team, player=player)
+
+        self.assertQueriesDoNotScale(lambda: self.client.get(url), seed, sizes=(1, 20), max_queries=9)
+
     def test_home_team_manager_allowed(self):
         self.login(user=self.user)
 
@@ -256,6 +276,25 @@ class GamePlayerViewSetTests(BaseAPITestCase):
             ]
         )
 
+    def test_list_paginated(self):
+        self._create_game_players()
+        self.login(user=self.user)
+        url = self._get_list_url(self.ice_hockey.pk, self.game.pk)
+        response = self.client.get(url, data={'page_size': 2, 'fields': 'id,player'})
+        self.assert_200(response)
+        self.assertListEqual(response.data.get('results'), [
+            {'id': self.home_game_player1.pk, 'player': self.home_player1.pk},
+            {'id': self.home_game_player2.pk, 'player': self.home_player2.pk},
+        ])
+        self.assertIsNone(response.data.get('previous'))
+
+        response = self.client.get(response.data.get('next'))
+        self.assert_200(response)
+        self.assertListEqual(response.data.get('results'), [
+            {'id': self.away_game_player1.pk, 'player': self.away_player1.pk},
+        ])
+        self.assertIsNone(response.data.get('next'))
+
     def test_bulk_create_valid(self):
         ScorekeeperFactory(user=self.user, sport=self.ice_hockey)
         self.login(user=self.user)
@@ -388,3 +427,283 @@ class GamePlayerViewSetTests(BaseAPITestCase):
             {'id': [f'Invalid pk "{self.away_game_player2.id}" - object does not exist.']}
         ])
         self.assertEqual(HockeyGamePlayer.objects.filter(game=self.game).count(), 4)
+
+    def test_bulk_actions_num_queries_do_not_depend_on_payload_size(self):
+        ScorekeeperFactory(user=self.user, sport=self.ice_hockey)
+        self.login(user=self.user)
+        players = HockeyPlayerFactory.create_batch(10, team=self.home_team, sport=self.ice_hockey)
+        create_url = self._get_bulk_create_url(self.ice_hockey.pk, self.game.pk)
+        update_url = self._get_bulk_update_url(self.ice_hockey.pk, self.game.pk)
+        delete_url = self._get_bulk_delete_url(self.ice_hockey.pk, self.game.pk)
+        # Warm up per process caches
+        self.client.post(delete_url, data=[{'id': 1000}], format='json')
+
+        counts = []
+        for size in (1, 10):
+            data = [
+                {'team': self.home_team.pk, 'is_starting': False, 'game': self.game.pk, 'player': player.pk}
+                for player in players[:size]
+            ]
+            response, create_stats = self.record_queries(lambda: self.client.post(create_url, data=data, format='json'))
+            self.assert_201(response)
+            game_players = HockeyGamePlayer.objects.filter(game=self.game)
+            response, update_stats = self.record_queries(lambda: self.client.post(update_url, data=[
+                {'id': game_player.pk, 'is_starting': True} for game_player in game_players
+            ], format='json'))
+            self.assert_200(response)
+            self.assertEqual(HockeyGamePlayer.objects.filter(game=self.game, is_starting=True).count(), size)
+            response, delete_stats = self.record_queries(lambda: self.client.post(delete_url, data=[
+                {'id': game_player.pk} for game_player in game_players
+            ], format='json'))
+            self.assert_204(response)
+            # Rows are inserted one at a time when the db can't return the pks of bulk inserted rows
+            num_inserts = 0 if connection.features.can_return_ids_from_bulk_insert else size
+            counts.append((create_stats.count - num_inserts, update_stats.count, delete_stats.count))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_sync(self):
+        self._create_game_players()
+        self.login(user=self.user)
+        home_player3 = HockeyPlayerFactory(team=self.home_team, sport=self.ice_hockey)
+
+        response = self.client.post(self._get_sync_url(self.ice_hockey.pk, self.game.pk), data={
+            'team': self.home_team.pk,
+            'version': self._get_version(self.home_team),
+            'players': [
+                {'player': self.home_player2.pk, 'is_starting': True},
+                {'player': home_player3.pk},
+            ],
+        })
+
+        self.assert_200(response)
+        game_players = HockeyGamePlayer.objects.filter(game=self.game, team=self.home_team).order_by('pk')
+        self.assertListEqual(
+            [(game_player.player_id, game_player.is_starting) for game_player in game_players],
+            [(self.home_player2.pk, True), (home_player3.pk, False)]
+        )
+        self.assertEqual(response.data['team'], self.home_team.pk)
+        self.assertEqual(response.data['version'], self._get_version(self.home_team))
+        self.assertListEqual([game_player['id'] for game_player in response.data['game_players']], [
+            game_player.pk for game_player in game_players
+        ])
+        # Away team's game roster is left alone
+        self.assertEqual(HockeyGamePlayer.objects.filter(game=self.game, team=self.away_team).count(), 2)
+
+    def test_sync_empty_roster(self):
+        self._create_game_players()
+        self.login(user=self.user)
+        response = self.client.post(self._get_sync_url(self.ice_hockey.pk, self.game.pk), data={
+            'team': self.home_team.pk,
+            'version': self._get_version(self.home_team),
+            'players': [],
+        }, format='json')
+        self.assert_200(response)
+        self.assertFalse(HockeyGamePlayer.objects.filter(game=self.game, team=self.home_team).exists())
+
+    def test_sync_stale_version(self):
+        self._create_game_players()
+        self.login(user=self.user)
+        version = self._get_version(self.home_team)
+        # i.e. someone else updated the roster after it was fetched
+        self.home_game_player2.is_starting = True
+        self.home_game_player2.save()
+
+        response = self.client.post(self._get_sync_url(self.ice_hockey.pk, self.game.pk), data={
+            'team': self.home_team.pk,
+            'version': version,
+            'players': [{'player': self.home_player1.pk}],
+        })
+        self.assertAPIError(response, 'game_roster_conflict')
+        self.assertEqual(HockeyGamePlayer.objects.filter(game=self.game, team=self.home_team).count(), 2)
+
+    def test_sync_invalid_players(self):
+        self.login(user=self.user)
+        inactive_player = HockeyPlayerFactory(team=self.home_team, sport=self.ice_hockey, is_active=False)
+        url = self._get_sync_url(self.ice_hockey.pk, self.game.pk)
+        version = self._get_version(self.home_team)
+
+        response = self.client.post(url, data={
+            'team': self.home_team.pk,
+            'version': version,
+            'players': [
+                {'player': self.home_player1.pk},
+                {'player': self.away_player1.pk},
+                {'player': inactive_player.pk},
+            ],
+        })
+        self.assertAPIError(response, 'validation_error', {
+            'players': [f'Players {self.away_player1.pk}, {inactive_player.pk} are inactive or do not belong to the '
+                        f'specified team.']
+        })
+
+        response = self.client.post(url, data={
+            'team': self.home_team.pk,
+            'version': version,
+            'players': [{'player': self.home_player1.pk}, {'player': self.home_player1.pk}],
+        })
+        self.assertAPIError(response, 'validation_error', {'players': ['Players can only be included once.']})
+        self.assertFalse(HockeyGamePlayer.objects.filter(game=self.game).exists())
+
+    def test_sync_team_not_authorized(self):
+        self.login(user=self.user)
+        response = self.client.post(self._get_sync_url(self.ice_hockey.pk, self.game.pk), data={
+            'team': self.away_team.pk,
+            'version': self._get_version(self.away_team),
+            'players': [{'player': self.away_player1.pk}],
+        })
+        self.assertAPIError(response, 'validation_error', {
+            'team': ['You do not have permission to manage game players for this team.']
+        })
+
+        response = self.client.post(self._get_sync_url(self.ice_hockey.pk, self.game.pk), data={
+            'team': self.additional_team.pk,
+            'version': self._get_version(self.additional_team),
+            'players': [],
+        }, format='json')
+        self.assertAPIError(response, 'validation_error', {
+            'team': [f'Invalid pk "{self.additional_team.pk}" - object does not exist.']
+        })
+
+    def test_sync_num_queries_does_not_depend_on_roster_size(self):
+        self.login(user=self.user)
+        url = self._get_sync_url(self.ice_hockey.pk, self.game.pk)
+        # Warm up per process caches
+        self.client.post(url, data={'team': self.home_team.pk, 'version': self._get_version(self.home_team),
+                                    'players': []}, format='json')
+
+        counts = []
+        for size in (1, 10):
+            removed = HockeyPlayerFactory.create_batch(size, team=self.home_team, sport=self.ice_hockey)
+            kept = HockeyPlayerFactory.create_batch(size, team=self.home_team, sport=self.ice_hockey)
+            added = HockeyPlayerFactory.create_batch(size, team=self.home_team, sport=self.ice_hockey)
+            for player in removed + kept:
+                HockeyGamePlayerFactory(game=self.game, team=self.home_team, player=player)
+            data = {
+                'team': self.home_team.pk,
+                'version': self._get_version(self.home_team),
+                'players': [{'player': player.pk, 'is_starting': True} for player in kept + added],
+            }
+            response, stats = self.record_queries(lambda: self.client.post(url, data=data, format='json'))
+            self.assert_200(response)
+            self.assertEqual(len(response.data['game_players']), size * 2)
+            counts.append(stats.count)
+            HockeyGamePlayer.objects.filter(game=self.game).delete()
+        self.assertEqual(counts[0], counts[1], self._format_queries(stats))
+
+
+class GameRosterWorkspaceAPIViewTests(QueryBudgetMixin, BaseAPITestCase):
+    def _get_url(self, sport_pk, game_pk):
+        return reverse('v1:sports:games:roster-workspace', kwargs={'pk': sport_pk, 'game_pk': game_pk})
+
+    def setUp(self):
+        self.ice_hockey = SportFactory(name='Ice Hockey')
+        self.liahl = LeagueFactory(name='Long Island Amateur Hockey League', sport=self.ice_hockey)
+        self.mm_aa = DivisionFactory(name='Midget Minor AA', league=self.liahl)
+        self.home_team = TeamFactory(name='Green Machine IceCats', division=self.mm_aa)
+        self.away_team = TeamFactory(name='Aviator Gulls', division=self.mm_aa)
+        self.home_player1 = HockeyPlayerFactory(team=self.home_team, sport=self.ice_hockey)
+        self.home_player2 = HockeyPlayerFactory(team=self.home_team, sport=self.ice_hockey)
+        self.inactive_home_player = HockeyPlayerFactory(team=self.home_team, sport=self.ice_hockey, is_active=False)
+        self.away_player = HockeyPlayerFactory(team=self.away_team, sport=self.ice_hockey)
+
+        self.season = SeasonFactory(league=self.liahl, start_date=datetime.date.today())
+        start = pytz.utc.localize(datetime.datetime.utcnow() + datetime.timedelta(days=7))
+        self.game = HockeyGameFactory(
+            home_team=self.home_team,
+            team=self.home_team,
+            away_team=self.away_team,
+            type=GenericChoiceFactory(
+                short_value='exhibition', long_value='Exhibition', type=GenericChoice.GAME_TYPE,
+                content_object=self.ice_hockey
+            ),
+            point_value=GenericChoiceFactory(
+                short_value='2', long_value='2', type=GenericChoice.GAME_POINT_VALUE, content_object=self.ice_hockey
+            ),
+            start=start,
+            end=start + datetime.timedelta(hours=3),
+            timezone='US/Eastern',
+            season=self.season,
+            status=HockeyGame.SCHEDULED
+        )
+        self.home_game_player = HockeyGamePlayerFactory(
+            game=self.game, team=self.home_team, player=self.home_player1, is_starting=True
+        )
+        self.away_game_player = HockeyGamePlayerFactory(game=self.game, team=self.away_team, player=self.away_player)
+
+        self.season_roster = HockeySeasonRosterFactory(season=self.season, team=self.home_team, default=True)
+        self.season_roster.players.add(self.home_player1, self.home_player2, self.inactive_home_player)
+        # Other season, should be excluded
+        past_season = SeasonFactory(league=self.liahl, start_date=datetime.date.today() - datetime.timedelta(days=365))
+        HockeySeasonRosterFactory(season=past_season, team=self.home_team)
+        HockeySeasonRosterFactory(season=self.season, team=self.away_team)
+
+        self.user = UserFactory()
+        SportRegistrationFactory(user=self.user, sport=self.ice_hockey, role=SportRegistration.MANAGER)
+        ManagerFactory(user=self.user, team=self.home_team)
+
+    def test_login_required(self):
+        response = self.client.get(self._get_url(self.ice_hockey.pk, self.game.pk))
+        self.assertAPIError(response, 'unauthenticated')
+
+    def test_permission_denied(self):
+        self.login(user=UserFactory())
+        response = self.client.get(self._get_url(self.ice_hockey.pk, self.game.pk))
+        self.assertAPIError(response, 'permission_denied')
+
+    def test_game_dne(self):
+        self.login(user=self.user)
+        response = self.client.get(self._get_url(self.ice_hockey.pk, 1000))
+        self.assertAPIError(response, 'not_found')
+
+    def test_get(self):
+        self.login(user=self.user)
+        response = self.client.get(self._get_url(self.ice_hockey.pk, self.game.pk))
+
+        self.assert_200(response)
+        data = response.data
+        self.assertTrue(data['can_update_home_roster'])
+        self.assertFalse(data['can_update_away_roster'])
+
+        home_team = data['home_team']
+        self.assertEqual(home_team['id'], self.home_team.pk)
+        self.assertCountEqual([player['id'] for player in home_team['players']], [
+            self.home_player1.pk, self.home_player2.pk
+        ])
+        self.assertEqual(home_team['game_roster_version'], get_game_roster_version([self.home_game_player]))
+        self.assertListEqual(home_team['game_players'], [{
+            'id': self.home_game_player.pk,
+            'team': self.home_team.pk,
+            'is_starting': True,
+            'game': self.game.pk,
+            'player': self.home_player1.pk,
+        }])
+        self.assertEqual(len(home_team['season_rosters']), 1)
+        season_roster = home_team['season_rosters'][0]
+        self.assertEqual(season_roster['id'], self.season_roster.pk)
+        self.assertEqual(season_roster['season'], self.season.pk)
+        self.assertTrue(season_roster['default'])
+        # Inactive players aren't in the players list, so they aren't included
+        self.assertCountEqual(season_roster['players'], [self.home_player1.pk, self.home_player2.pk])
+
+        away_team = data['away_team']
+        self.assertEqual(away_team['id'], self.away_team.pk)
+        self.assertListEqual([player['id'] for player in away_team['players']], [self.away_player.pk])
+        self.assertListEqual([game_player['id'] for game_player in away_team['game_players']], [
+            self.away_game_player.pk
+        ])
+        # The user can't update the away team's roster
+        self.assertIsNone(away_team['season_rosters'])
+
+    def test_query_budget(self):
+        self.login(user=self.user)
+        url = self._get_url(self.ice_hockey.pk, self.game.pk)
+
+        def seed(count):
+            for _ in range(count):
+                for team in [self.home_team, self.away_team]:
+                    player = HockeyPlayerFactory(team=team, sport=self.ice_hockey)
+                    HockeyGamePlayerFactory(game=self.game, team=team, player=player)
+                    self.season_roster.players.add(player)
+                HockeySeasonRosterFactory(season=self.season, team=self.home_team)
+
+        self.assertQueriesDoNotScale(lambda: self.client.get(url), seed, sizes=(1, 20), max_queries=12)
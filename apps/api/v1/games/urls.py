@@ -10,5 +10,6 @@ router.register('players', views.GamePlayerViewSet, basename='players')
 
 app_name = 'games'
 urlpatterns = [
+    url(r'^(?P<game_pk>\d+)/roster-workspace/$', views.GameRosterWorkspaceAPIView.as_view(), name='roster-workspace'),
     url(r'^(?P<game_pk>\d+)/', include(router.urls)),
 ]
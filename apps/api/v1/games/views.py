@@ -1,23 +1,32 @@
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
-from rest_framework import mixins, viewsets
+from rest_framework import generics, mixins, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-from api.exceptions import SportNotConfiguredAPIException
-from api.mixins import BulkCreateMixin, BulkDeleteMixin, BulkUpdateMixin, BulkViewActionMixin
+from api.exceptions import GameRosterConflictAPIException, SportNotConfiguredAPIException
+from api.mixins import (
+    BulkCreateMixin,
+    BulkDeleteMixin,
+    BulkUpdateMixin,
+    BulkViewActionMixin,
+    ValuesListMixin,
+)
+from api.pagination import OptionalCursorPagination
+from api.v1.seasons.serializers import SeasonRosterPlayerIdsSerializer
 from games.mappings import get_game_model_cls, get_game_player_model_cls, get_game_player_serializer_cls
+from games.rosters import StaleGameRosterException, get_game_roster_version, sync_game_roster
+from players.mappings import get_player_model_cls, get_player_serializer_cls
+from seasons.mappings import get_season_roster_model_cls
 from sports.models import Sport
 from users.authorizers import GameAuthorizer
 from .permissions import GamePlayerViewSetPermission
 
 
-class GamePlayerViewSet(BulkViewActionMixin,
-                        BulkCreateMixin,
-                        BulkUpdateMixin,
-                        BulkDeleteMixin,
-                        mixins.ListModelMixin,
-                        viewsets.GenericViewSet):
+class GameAPIViewMixin(object):
     """
-    API for game players (aka game rosters)
+    Resolves the sport and game from the url and authorizes the user to update the game's rosters.
     """
     permission_classes = (IsAuthenticated, GamePlayerViewSetPermission)
 
@@ -51,19 +60,42 @@ class GamePlayerViewSet(BulkViewActionMixin,
         self.game_authorizer = GameAuthorizer(user=self.request.user)
         super().initial(request, *args, **kwargs)
 
-    def get_serializer_class(self):
-        return get_game_player_serializer_cls(self.sport, self.action)
-
-    def get_serializer_context(self):
-        context = super().get_serializer_context()
+    def get_roster_permissions(self):
+        """
+        :return: Dict with whether the user can update the home (`can_update_home_roster`) and away
+            (`can_update_away_roster`) team's game roster
+        """
         can_update_game = self.game.can_update()
-        context.update({
+        return {
             'can_update_home_roster': can_update_game and self.game_authorizer.can_user_update_game_roster(
                 team=self.game.home_team, sport=self.sport
             ),
             'can_update_away_roster': can_update_game and self.game_authorizer.can_user_update_game_roster(
                 team=self.game.away_team, sport=self.sport
             ),
+        }
+
+
+class GamePlayerViewSet(GameAPIViewMixin,
+                        BulkViewActionMixin,
+                        BulkCreateMixin,
+                        BulkUpdateMixin,
+                        BulkDeleteMixin,
+                        ValuesListMixin,
+                        mixins.ListModelMixin,
+                        viewsets.GenericViewSet):
+    """
+    API for game players (aka game rosters)
+    """
+    pagination_class = OptionalCursorPagination
+
+    def get_serializer_class(self):
+        return get_game_player_serializer_cls(self.sport, self.action)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context.update(self.get_roster_permissions())
+        context.update({
             'game': self.game,
             'sport': self.sport,
         })
@@ -73,3 +105,92 @@ class GamePlayerViewSet(BulkViewActionMixin,
         model_cls = get_game_player_model_cls(self.sport)
         # Return objs for one of the AbstractGamePlayer model subclasses
         return model_cls.objects.select_related('team', 'game', 'player').filter(game=self.game, player__is_active=True)
+
+    @action(detail=False, methods=['post'], url_path='sync')
+    def sync(self, request, *args, **kwargs):
+        """
+        Replace a team's game roster with the players in the request, in a single transaction. Responds with a 409 if
+        the roster has changed since the version in the request was fetched.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        team = serializer.validated_data.get('team')
+        players = {item.get('player'): item.get('is_starting') for item in serializer.validated_data.get('players')}
+        try:
+            game_players = sync_game_roster(
+                get_game_player_model_cls(self.sport),
+                self.game,
+                team,
+                players,
+                serializer.validated_data.get('version')
+            )
+        except StaleGameRosterException:
+            raise GameRosterConflictAPIException()
+        game_player_serializer_cls = get_game_player_serializer_cls(self.sport, 'list')
+        return Response({
+            'team': team.pk,
+            'version': get_game_roster_version(game_players),
+            'game_players': game_player_serializer_cls(game_players, many=True).data,
+        })
+
+
+class GameRosterWorkspaceAPIView(GameAPIViewMixin, generics.GenericAPIView):
+    """
+    Everything the game rosters update page needs, in one response: the active players, game players (aka game roster),
+    game roster version and the game season's season rosters for both teams. Season rosters reference players by id and
+    are only included for the teams the user can update the game roster for (`None` otherwise).
+
+    The # of queries doesn't depend on the # of players, game players or season rosters.
+    """
+
+    def _get_season_rosters_by_team(self, team_ids):
+        if not team_ids:
+            return {}
+        season_roster_model_cls = get_season_roster_model_cls(self.sport, exception_cls=SportNotConfiguredAPIException)
+        player_model_cls = get_player_model_cls(self.sport, exception_cls=SportNotConfiguredAPIException)
+        season_rosters = season_roster_model_cls.objects.filter(
+            season_id=self.game.season_id,
+            team_id__in=team_ids
+        ).prefetch_related(
+            Prefetch('players', queryset=player_model_cls.objects.only('id', 'team_id', 'is_active'))
+        )
+        result = {team_id: [] for team_id in team_ids}
+        for season_roster in season_rosters:
+            result[season_roster.team_id].append(season_roster)
+        return result
+
+    def get(self, request, *args, **kwargs):
+        game = self.game
+        player_model_cls = get_player_model_cls(self.sport, exception_cls=SportNotConfiguredAPIException)
+        player_serializer_cls = get_player_serializer_cls(self.sport, exception_cls=SportNotConfiguredAPIException)
+        game_player_model_cls = get_game_player_model_cls(self.sport, exception_cls=SportNotConfiguredAPIException)
+        game_player_serializer_cls = get_game_player_serializer_cls(self.sport, 'list')
+
+        team_ids = {'home_team': game.home_team_id, 'away_team': game.away_team_id}
+        players = player_model_cls.objects.active().filter(team_id__in=team_ids.values()).select_related('user')
+        game_players = game_player_model_cls.objects.filter(game=game, player__is_active=True)
+
+        data = self.get_roster_permissions()
+        can_update_roster = {
+            'home_team': data['can_update_home_roster'],
+            'away_team': data['can_update_away_roster'],
+        }
+        season_rosters_by_team = self._get_season_rosters_by_team(
+            [team_id for key, team_id in team_ids.items() if can_update_roster[key]]
+        )
+        for key, team_id in team_ids.items():
+            season_rosters = season_rosters_by_team.get(team_id)
+            team_game_players = [game_player for game_player in game_players if game_player.team_id == team_id]
+            data[key] = {
+                'id': team_id,
+                'players': player_serializer_cls(
+                    [player for player in players if player.team_id == team_id], many=True
+                ).data,
+                'game_players': game_player_serializer_cls(team_game_players, many=True).data,
+                # Sent back when syncing the game roster, see `GamePlayerViewSet.sync`
+                'game_roster_version': get_game_roster_version(team_game_players),
+                'season_rosters': None if season_rosters is None else SeasonRosterPlayerIdsSerializer(
+                    season_rosters, many=True
+                ).data,
+            }
+        return Response(data)
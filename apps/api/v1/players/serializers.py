@@ -1,18 +1,21 @@
 from rest_framework import serializers
 
+from api.serializers import SparseFieldsetSerializerMixin
 from api.v1.users.serializers import UserSerializer
 from players.models import HockeyPlayer
 
 
-class AbstractPlayerSerializer(serializers.ModelSerializer):
+class AbstractPlayerSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
 
     class Meta:
         model = None
         fields = ['id', 'user', 'sport', 'team', 'jersey_number', 'is_active']
+        expandable_fields = ['user']
 
 
 class HockeyPlayerSerializer(AbstractPlayerSerializer):
     class Meta:
         model = HockeyPlayer
         fields = AbstractPlayerSerializer.Meta.fields + ['position', 'handedness']
+        expandable_fields = AbstractPlayerSerializer.Meta.expandable_fields
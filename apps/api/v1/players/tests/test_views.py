@@ -1,4 +1,8 @@
-from ayrabo.utils.testing import BaseAPITestCase
+import json
+
+from django.test import override_settings
+
+from ayrabo.utils.testing import BaseAPITestCase, QueryBudgetMixin
 from managers.tests import ManagerFactory
 from players.tests import HockeyPlayerFactory
 from sports.models import SportRegistration
@@ -7,7 +11,7 @@ from teams.tests import TeamFactory
 from users.tests import UserFactory
 
 
-class PlayersListAPIViewTests(BaseAPITestCase):
+class PlayersListAPIViewTests(QueryBudgetMixin, BaseAPITestCase):
     url = 'v1:teams:players:list'
 
     def setUp(self):
@@ -55,3 +59,59 @@ class PlayersListAPIViewTests(BaseAPITestCase):
         response = self.client.get(self.format_url(pk=self.team.pk))
         data = [p.get('id') for p in response.data]
         self.assertListEqual(data, [self.p6.pk, self.p5.pk, self.p4.pk, self.p3.pk, self.p2.pk, self.p1.pk])
+
+    def test_paginated(self):
+        url = self.format_url(pk=self.team.pk)
+        response = self.client.get(url, data={'page_size': 4, 'is_active': True})
+        self.assert_200(response)
+        self.assertListEqual(
+            [p.get('id') for p in response.data.get('results')],
+            [self.p1.pk, self.p2.pk, self.p3.pk, self.p4.pk]
+        )
+        self.assertIsNone(response.data.get('previous'))
+        response = self.client.get(response.data.get('next'))
+        self.assertListEqual([p.get('id') for p in response.data.get('results')], [self.p5.pk])
+        self.assertIsNone(response.data.get('next'))
+
+    def test_max_page_size(self):
+        HockeyPlayerFactory.create_batch(100, team=self.team)
+        response = self.client.get(self.format_url(pk=self.team.pk), data={'page_size': 1000})
+        self.assertEqual(len(response.data.get('results')), 100)
+
+    def test_fields(self):
+        url = self.format_url(pk=self.team.pk)
+        response = self.client.get(url, data={'fields': 'id,jersey_number,foo', 'page_size': 1})
+        self.assertListEqual(response.data.get('results'), [{'id': self.p1.pk, 'jersey_number': self.p1.jersey_number}])
+
+    def test_expand(self):
+        url = self.format_url(pk=self.team.pk)
+        response = self.client.get(url, data={'fields': 'id,user', 'expand': 'user', 'page_size': 1})
+        self.assertEqual(response.data.get('results')[0].get('user').get('id'), self.p1.user_id)
+        # Session, user, user profile, team, players. The players' users aren't fetched when they're collapsed
+        with self.assertNumQueries(5):
+            response = self.client.get(url, data={'fields': 'id,user', 'expand': '', 'page_size': 1})
+        self.assertListEqual(response.data.get('results'), [{'id': self.p1.pk, 'user': self.p1.user_id}])
+
+    def test_values_serialization(self):
+        url = self.format_url(pk=self.team.pk)
+        for data in [{}, {'fields': 'id,user', 'expand': ''}]:
+            expected = self.client.get(url, data=data).data
+            with override_settings(API_VALUES_SERIALIZATION_ENABLED=True):
+                response = self.client.get(url, data=data)
+                self.assertTrue(response.streaming)
+                self.assertEqual(response['Content-Type'], 'application/json')
+                content = json.loads(b''.join(response.streaming_content))
+                self.assertCountEqual(content, json.loads(json.dumps(expected)))
+                # Paginated responses go through the serializer
+                response = self.client.get(url, data={'page_size': 2, **data})
+                self.assertFalse(response.streaming)
+                self.assertEqual(len(response.data.get('results')), 2)
+
+    def test_query_budget(self):
+        url = self.format_url(pk=self.team.pk)
+        self.assertQueriesDoNotScale(
+            lambda: self.client.get(url),
+            lambda count: HockeyPlayerFactory.create_batch(count, team=self.team),
+            sizes=(1, 20),
+            max_queries=5
+        )
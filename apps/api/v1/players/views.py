@@ -3,21 +3,24 @@ from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 
 from api.exceptions import SportNotConfiguredAPIException
+from api.mixins import SparseFieldsetMixin, ValuesListMixin
+from api.pagination import OptionalCursorPagination
 from players.mappings import get_player_model_cls, get_player_serializer_cls
 from teams.models import Team
 
 
-class PlayersListAPIView(generics.ListAPIView):
+class PlayersListAPIView(SparseFieldsetMixin, ValuesListMixin, generics.ListAPIView):
     permission_classes = (IsAuthenticated,)
+    pagination_class = OptionalCursorPagination
     filterset_fields = ('is_active',)
 
     def _get_team(self):
         if hasattr(self, 'team'):  # pragma: no cover
             return self.team
         self.team = get_object_or_404(
-            Team.objects.select_related('division', 'division__league', 'division__league__sport'),
+            Team.objects.select_related('sport'),
             pk=self.kwargs.get('pk'))
-        self.sport = self.team.division.league.sport
+        self.sport = self.team.sport
         return self.team
 
     def get_serializer_class(self):
@@ -26,4 +29,7 @@ class PlayersListAPIView(generics.ListAPIView):
     def get_queryset(self):
         team = self._get_team()
         model_cls = get_player_model_cls(self.sport, exception_cls=SportNotConfiguredAPIException)
-        return model_cls.objects.filter(team=team).select_related('user')
+        qs = model_cls.objects.filter(team=team)
+        if self.is_field_expanded('user'):
+            qs = qs.select_related('user')
+        return qs
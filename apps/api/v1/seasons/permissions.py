@@ -7,5 +7,5 @@ class SeasonRostersListPermission(permissions.BasePermission):
     def has_permission(self, request, view):
         season_roster_authorizer = SeasonRosterAuthorizer(user=request.user)
         team = view._get_team()
-        sport = team.division.league.sport
+        sport = team.sport
         return season_roster_authorizer.can_user_list(team=team, sport=sport, api=True)
@@ -1,13 +1,15 @@
 from rest_framework import serializers
 
+from api.serializers import SparseFieldsetSerializerMixin
 from api.v1.players.serializers import HockeyPlayerSerializer
 from seasons.models import HockeySeasonRoster
 
 
-class AbstractSeasonRosterSerializer(serializers.ModelSerializer):
+class AbstractSeasonRosterSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = None
         fields = ['id', 'name', 'default', 'season', 'players']
+        expandable_fields = ['players']
 
 
 class HockeySeasonRosterSerializer(AbstractSeasonRosterSerializer):
@@ -15,3 +17,19 @@ class HockeySeasonRosterSerializer(AbstractSeasonRosterSerializer):
 
     class Meta(AbstractSeasonRosterSerializer.Meta):
         model = HockeySeasonRoster
+
+
+class SeasonRosterPlayerIdsSerializer(serializers.Serializer):
+    """
+    Season roster with the ids of its players instead of the players, used when the players are already part of the
+    response (see the game roster workspace api). Only includes players that are active and still on the team, the
+    season roster's players need to be prefetched.
+    """
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(read_only=True)
+    default = serializers.BooleanField(read_only=True)
+    season = serializers.IntegerField(source='season_id', read_only=True)
+    players = serializers.SerializerMethodField()
+
+    def get_players(self, obj):
+        return [player.id for player in obj.players.all() if player.is_active and player.team_id == obj.team_id]
@@ -1,6 +1,10 @@
 import datetime
+import json
+
+from django.test import override_settings
 
 from ayrabo.utils.testing import BaseAPITestCase
+from players.tests import HockeyPlayerFactory
 from divisions.tests import DivisionFactory
 from leagues.tests import LeagueFactory
 from managers.tests import ManagerFactory
@@ -93,3 +97,52 @@ class SeasonRostersListAPIViewTests(BaseAPITestCase):
         response = self.client.get(self.formatted_url, data={'season': 1})
         data = [roster.get('id') for roster in response.data]
         self.assertListEqual(data, [1, 2])
+
+    def test_paginated(self):
+        SportRegistrationFactory(user=self.user, sport=self.sport, role=SportRegistration.MANAGER)
+        ManagerFactory(user=self.user, team=self.team)
+        self.login(user=self.user)
+        HockeySeasonRosterFactory(id=1, name='Main Squad', season=self.season, team=self.team)
+        HockeySeasonRosterFactory(id=2, name='Backup Squad', season=self.season, team=self.team)
+        HockeySeasonRosterFactory(id=3, name='Third Squad', season=self.season, team=self.team)
+        response = self.client.get(self.formatted_url, data={'page_size': 2, 'fields': 'id'})
+        self.assertListEqual(response.data.get('results'), [{'id': 1}, {'id': 2}])
+        response = self.client.get(response.data.get('next'))
+        self.assertListEqual(response.data.get('results'), [{'id': 3}])
+
+    def test_players_as_ids(self):
+        SportRegistrationFactory(user=self.user, sport=self.sport, role=SportRegistration.MANAGER)
+        ManagerFactory(user=self.user, team=self.team)
+        self.login(user=self.user)
+        players = HockeyPlayerFactory.create_batch(3, team=self.team, sport=self.sport)
+        HockeySeasonRosterFactory(id=1, name='Main Squad', season=self.season, team=self.team, players=players)
+        HockeySeasonRosterFactory(id=2, name='Backup Squad', season=self.season, team=self.team, players=players[:1])
+
+        response = self.client.get(self.formatted_url, data={'fields': 'id,players'})
+        self.assertEqual(response.data[0].get('players')[0].get('user').get('id'), players[0].user_id)
+
+        response = self.client.get(self.formatted_url, data={'fields': 'id,players', 'expand': ''})
+        self.assertListEqual(response.data, [
+            {'id': 1, 'players': [player.pk for player in players]},
+            {'id': 2, 'players': [players[0].pk]},
+        ])
+
+    @override_settings(API_VALUES_SERIALIZATION_ENABLED=True)
+    def test_values_serialization(self):
+        SportRegistrationFactory(user=self.user, sport=self.sport, role=SportRegistration.MANAGER)
+        ManagerFactory(user=self.user, team=self.team)
+        self.login(user=self.user)
+        players = HockeyPlayerFactory.create_batch(2, team=self.team, sport=self.sport)
+        HockeySeasonRosterFactory(id=1, name='Main Squad', season=self.season, team=self.team, players=players)
+        HockeySeasonRosterFactory(id=2, name='Backup Squad', season=self.season, team=self.team)
+
+        response = self.client.get(self.formatted_url, data={'fields': 'id,players', 'expand': ''})
+        self.assertTrue(response.streaming)
+        self.assertListEqual(json.loads(b''.join(response.streaming_content)), [
+            {'id': 1, 'players': [player.pk for player in players]},
+            {'id': 2, 'players': []},
+        ])
+        # Nested lists of players go through the serializer
+        response = self.client.get(self.formatted_url)
+        self.assertFalse(response.streaming)
+        self.assertEqual(len(response.data[0].get('players')), 2)
@@ -1,8 +1,12 @@
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 
 from api.exceptions import SportNotConfiguredAPIException
+from api.mixins import SparseFieldsetMixin, ValuesListMixin
+from api.pagination import OptionalCursorPagination
+from players.mappings import get_player_model_cls
 from seasons.models import HockeySeasonRoster
 from teams.models import Team
 from .permissions import SeasonRostersListPermission
@@ -17,18 +21,19 @@ SPORT_SEASON_ROSTER_MODEL_MAPPINGS = {
 }
 
 
-class SeasonRostersListAPIView(generics.ListAPIView):
+class SeasonRostersListAPIView(SparseFieldsetMixin, ValuesListMixin, generics.ListAPIView):
     permission_classes = (IsAuthenticated, SeasonRostersListPermission)
+    pagination_class = OptionalCursorPagination
     filterset_fields = ('season',)
 
     def _get_team(self):
         if hasattr(self, 'team'):
             return self.team
         self.team = get_object_or_404(
-            Team.objects.select_related('division', 'division__league', 'division__league__sport', 'organization'),
+            Team.objects.select_related('sport', 'organization'),
             pk=self.kwargs.get('pk')
         )
-        self.sport = self.team.division.league.sport
+        self.sport = self.team.sport
         return self.team
 
     def get_serializer_class(self):
@@ -42,4 +47,11 @@ class SeasonRostersListAPIView(generics.ListAPIView):
         model_cls = SPORT_SEASON_ROSTER_MODEL_MAPPINGS.get(self.sport.name)
         if model_cls is None:
             raise SportNotConfiguredAPIException(self.sport)
-        return model_cls.objects.filter(team=team).prefetch_related('players__user')
+        qs = model_cls.objects.filter(team=team)
+        if self.is_field_expanded('players'):
+            return qs.prefetch_related('players__user')
+        if self.is_field_included('players'):
+            # Players are serialized as ids
+            player_model_cls = get_player_model_cls(self.sport, exception_cls=SportNotConfiguredAPIException)
+            return qs.prefetch_related(Prefetch('players', queryset=player_model_cls.objects.only('id')))
+        return qs
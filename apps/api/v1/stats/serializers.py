@@ -0,0 +1,18 @@
+from rest_framework import serializers
+
+from api.v1.users.serializers import UserSerializer
+from stats.models import HockeyPlayerSeasonStats
+
+
+class AbstractPlayerSeasonStatsSerializer(serializers.ModelSerializer):
+    user = UserSerializer(source='player.user', read_only=True)
+
+    class Meta:
+        model = None
+        fields = ['id', 'player', 'user', 'team', 'season']
+
+
+class HockeyPlayerSeasonStatsSerializer(AbstractPlayerSeasonStatsSerializer):
+    class Meta:
+        model = HockeyPlayerSeasonStats
+        fields = AbstractPlayerSeasonStatsSerializer.Meta.fields + ['goals', 'assists', 'points', 'penalty_minutes']
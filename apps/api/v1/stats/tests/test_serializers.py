@@ -0,0 +1,38 @@
+from ayrabo.utils.testing import BaseAPITestCase
+from players.tests import HockeyPlayerFactory
+from seasons.tests import SeasonFactory
+from sports.tests import SportFactory
+from stats.models import HockeyPlayerSeasonStats
+from teams.tests import TeamFactory
+from users.tests import UserFactory
+from ..serializers import HockeyPlayerSeasonStatsSerializer
+
+
+class HockeyPlayerSeasonStatsSerializerTests(BaseAPITestCase):
+    serializer_cls = HockeyPlayerSeasonStatsSerializer
+
+    def test_data(self):
+        user = UserFactory(id=1, first_name='Michael', last_name='Scott')
+        sport = SportFactory(id=1)
+        team = TeamFactory(id=1, division__league__sport=sport)
+        season = SeasonFactory(id=1, league=team.division.league)
+        player = HockeyPlayerFactory(id=1, user=user, sport=sport, team=team)
+        player_stats = HockeyPlayerSeasonStats.objects.create(id=1, player=player, team=team, season=season, goals=3,
+                                                              assists=2, points=5, penalty_minutes=4)
+
+        data = self.serializer_cls(instance=player_stats).data
+        self.assertDictEqual(data, {
+            'id': 1,
+            'player': 1,
+            'user': {
+                'id': 1,
+                'first_name': 'Michael',
+                'last_name': 'Scott'
+            },
+            'team': 1,
+            'season': 1,
+            'goals': 3,
+            'assists': 2,
+            'points': 5,
+            'penalty_minutes': 4
+        })
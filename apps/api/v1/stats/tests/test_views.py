@@ -0,0 +1,81 @@
+from ayrabo.utils.testing import BaseAPITestCase
+from players.tests import HockeyPlayerFactory
+from seasons.tests import SeasonFactory
+from sports.tests import SportFactory
+from stats.models import HockeyPlayerSeasonStats
+from teams.tests import TeamFactory
+from users.tests import UserFactory
+
+
+class PlayerSeasonStatsLeadersAPIViewTests(BaseAPITestCase):
+    url = 'v1:stats:leaders'
+
+    def _create_stats(self, team, **kwargs):
+        player = HockeyPlayerFactory(team=team, sport=self.sport)
+        return HockeyPlayerSeasonStats.objects.create(player=player, team=team, season=self.season, **kwargs)
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.sport = SportFactory(name='Ice Hockey')
+        self.team = TeamFactory(name='Green Machine IceCats', division__league__sport=self.sport)
+        self.other_team = TeamFactory(name='Long Island Edge', division=self.team.division)
+        self.season = SeasonFactory(league=self.team.division.league, teams=[self.team, self.other_team])
+
+        self.s1 = self._create_stats(self.team, goals=3, assists=1, points=4)
+        self.s2 = self._create_stats(self.team, goals=1, assists=1, points=2, penalty_minutes=10)
+        self.s3 = self._create_stats(self.other_team, goals=2, assists=2, points=4, penalty_minutes=2)
+        self.s4 = self._create_stats(self.other_team, penalty_minutes=4)
+        self.formatted_url = self.format_url(pk=self.season.pk)
+        self.login(user=self.user)
+
+    def _get_ids(self, response):
+        return [player_stats.get('id') for player_stats in response.data]
+
+    # General
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(self.formatted_url)
+        self.assertAPIError(response, 'unauthenticated')
+
+    def test_season_dne(self):
+        response = self.client.get(self.format_url(pk=1000))
+        self.assertAPIError(response, 'not_found')
+
+    def test_sport_not_configured(self):
+        season = SeasonFactory(league__sport__name='Sport 1')
+        response = self.client.get(self.format_url(pk=season.pk))
+        self.assertAPIError(response, 'sport_not_configured',
+                            error_message_overrides={'detail': 'Sport 1 is not currently configured.'})
+
+    # List
+    def test_list(self):
+        response = self.client.get(self.formatted_url)
+        self.assert_200(response)
+        self.assertListEqual(self._get_ids(response), [self.s1.pk, self.s3.pk, self.s2.pk])
+
+    def test_list_penalty_minutes(self):
+        response = self.client.get(self.formatted_url, data={'category': 'penalty_minutes'})
+        self.assertListEqual(self._get_ids(response), [self.s2.pk, self.s4.pk, self.s3.pk])
+
+    def test_list_team(self):
+        response = self.client.get(self.formatted_url, data={'team': self.other_team.pk})
+        self.assertListEqual(self._get_ids(response), [self.s3.pk])
+
+    def test_list_limit(self):
+        response = self.client.get(self.formatted_url, data={'limit': 1})
+        self.assertListEqual(self._get_ids(response), [self.s1.pk])
+
+    def test_list_invalid_params(self):
+        response = self.client.get(self.formatted_url, data={'category': 'goals'})
+        self.assertAPIError(response, 'validation_error', error_message_overrides={
+            'category': ['Select a valid choice. Choices are points, penalty_minutes.']
+        })
+        response = self.client.get(self.formatted_url, data={'limit': 'abc'})
+        self.assertAPIError(response, 'validation_error', error_message_overrides={
+            'limit': ['A valid integer is required.']
+        })
+        for limit in [0, -1]:
+            response = self.client.get(self.formatted_url, data={'limit': limit})
+            self.assertAPIError(response, 'validation_error', error_message_overrides={
+                'limit': ['Ensure this value is greater than or equal to 1.']
+            })
@@ -0,0 +1,9 @@
+from django.conf.urls import url
+
+from . import views
+
+
+app_name = 'stats'
+urlpatterns = [
+    url(r'^$', views.PlayerSeasonStatsLeadersAPIView.as_view(), name='leaders'),
+]
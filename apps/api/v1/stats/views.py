@@ -0,0 +1,53 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+
+from api.exceptions import SportNotConfiguredAPIException
+from seasons.models import Season
+from stats.mappings import get_player_season_stats_model_cls, get_player_season_stats_serializer_cls
+
+
+class PlayerSeasonStatsLeadersAPIView(generics.ListAPIView):
+    """
+    Leaderboard for a season. Supports the following query params:
+
+    * `category`: Stat to rank players by, defaults to `points`
+    * `team`: Only include players for this team
+    * `limit`: Max number of players to return, defaults to 10. Must be at least 1, values over 100 are treated as 100.
+    """
+    permission_classes = (IsAuthenticated,)
+    default_limit = 10
+    max_limit = 100
+
+    def _get_season(self):
+        if hasattr(self, 'season'):  # pragma: no cover
+            return self.season
+        self.season = get_object_or_404(Season.objects.select_related('league__sport'), pk=self.kwargs.get('pk'))
+        self.sport = self.season.league.sport
+        return self.season
+
+    def _get_int_query_param(self, name, default=None):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise ValidationError({name: ['A valid integer is required.']})
+
+    def get_serializer_class(self):
+        return get_player_season_stats_serializer_cls(self.sport, exception_cls=SportNotConfiguredAPIException)
+
+    def get_queryset(self):
+        season = self._get_season()
+        model_cls = get_player_season_stats_model_cls(self.sport, exception_cls=SportNotConfiguredAPIException)
+        categories = list(model_cls.LEADERBOARD_ORDERINGS.keys())
+        category = self.request.query_params.get('category', categories[0])
+        if category not in categories:
+            raise ValidationError({'category': [f'Select a valid choice. Choices are {", ".join(categories)}.']})
+        limit = self._get_int_query_param('limit', self.default_limit)
+        if limit < 1:
+            raise ValidationError({'limit': ['Ensure this value is greater than or equal to 1.']})
+        team_id = self._get_int_query_param('team')
+        return model_cls.objects.get_leaders(season, category, team=team_id, limit=min(limit, self.max_limit))
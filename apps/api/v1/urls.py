@@ -4,6 +4,7 @@ from django.urls import include
 
 app_name = 'v1'
 urlpatterns = [
+    url(r'^seasons/(?P<pk>\d+)/leaders/', include('api.v1.stats.urls')),
     url(r'^sports/', include('api.v1.sports.urls')),
     url(r'^teams/', include('api.v1.teams.urls')),
 ]
@@ -0,0 +1,65 @@
+from django.contrib import admin
+
+from .models import BulkUploadJob, BulkUploadJobError
+
+
+class BulkUploadJobErrorInline(admin.TabularInline):
+    model = BulkUploadJobError
+    fields = ['line_number', 'errors']
+    readonly_fields = ['line_number', 'errors']
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(BulkUploadJob)
+class BulkUploadJobAdmin(admin.ModelAdmin):
+    list_display = [
+        'id',
+        'content_type',
+        'status',
+        'progress_display',
+        'created_count',
+        'error_count',
+        'created_by',
+        'created',
+        'finished',
+    ]
+    list_filter = ['status', 'content_type']
+    list_select_related = ['content_type', 'created_by']
+    fields = [
+        'content_type',
+        'file',
+        'created_by',
+        'status',
+        'progress_display',
+        'total_rows',
+        'processed_rows',
+        'created_count',
+        'error_count',
+        'error',
+        'created',
+        'started',
+        'finished',
+    ]
+    readonly_fields = fields
+    inlines = [BulkUploadJobErrorInline]
+
+    def progress_display(self, obj):
+        return f'{obj.progress}%'
+
+    progress_display.short_description = 'Progress'
+
+    def has_add_permission(self, request):
+        """
+        Jobs are queued from the bulk upload page of each model.
+        """
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
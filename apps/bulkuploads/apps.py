@@ -0,0 +1,6 @@
+from django.apps import AppConfig
+
+
+class BulkuploadsConfig(AppConfig):
+    name = 'bulkuploads'
+    verbose_name = 'Bulk Uploads'
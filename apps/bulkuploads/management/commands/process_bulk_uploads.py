@@ -0,0 +1,57 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from bulkuploads.utils import claim_bulk_upload_jobs, run_bulk_upload_job
+
+
+class Command(BaseCommand):
+    help = (
+        'Worker that processes queued bulk uploads in a local process pool. Runs until it is stopped, unless --once is '
+        'passed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2,
+                            help='# of jobs processed at the same time. 0 processes jobs in this process.')
+        parser.add_argument('--poll-interval', type=float, default=5, help='Seconds to wait when there are no jobs.')
+        parser.add_argument('--once', action='store_true', help='Exit once there are no pending jobs.')
+
+    def run_jobs(self, job_ids, pool):
+        if pool is None:
+            statuses = map(run_bulk_upload_job, job_ids)
+        else:
+            statuses = pool.map(run_bulk_upload_job, job_ids)
+        for job_id, status in zip(job_ids, statuses):
+            self.stdout.write(f'Bulk upload {job_id}: {status}')
+
+    def handle(self, *args, **options):
+        num_processes = options.get('processes')
+        poll_interval = options.get('poll_interval')
+        once = options.get('once')
+
+        pool = None
+        if num_processes > 0:
+            # Forked processes inherit the configured django setup, but can't share the parent's db connections. They
+            # open their own.
+            connections.close_all()
+            pool = ProcessPoolExecutor(
+                max_workers=num_processes,
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=connections.close_all
+            )
+        try:
+            while True:
+                job_ids = claim_bulk_upload_jobs(limit=max(num_processes, 1))
+                if job_ids:
+                    self.run_jobs(job_ids, pool)
+                elif once:
+                    break
+                else:
+                    time.sleep(poll_interval)
+        finally:
+            if pool is not None:
+                pool.shutdown()
@@ -0,0 +1,58 @@
+# Generated by Django 2.2.28 on 2026-10-18 13:49
+
+import ayrabo.utils.utils
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BulkUploadJob',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Updated')),
+                ('file', models.FileField(upload_to=ayrabo.utils.utils.UploadTo('bulk_uploads/'), verbose_name='File')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=32, verbose_name='Status')),
+                ('total_rows', models.PositiveIntegerField(default=0, verbose_name='Total Rows')),
+                ('processed_rows', models.PositiveIntegerField(default=0, verbose_name='Processed Rows')),
+                ('created_count', models.PositiveIntegerField(default=0, verbose_name='Created')),
+                ('error_count', models.PositiveIntegerField(default=0, verbose_name='Rows With Errors')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('started', models.DateTimeField(blank=True, null=True, verbose_name='Started')),
+                ('finished', models.DateTimeField(blank=True, null=True, verbose_name='Finished')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.ContentType', verbose_name='Model')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bulk_upload_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+            ],
+            options={
+                'ordering': ['-created'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BulkUploadJobError',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('line_number', models.PositiveIntegerField(verbose_name='Line Number')),
+                ('errors', models.TextField(verbose_name='Errors')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='row_errors', to='bulkuploads.BulkUploadJob', verbose_name='Job')),
+            ],
+            options={
+                'ordering': ['line_number'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='bulkuploadjob',
+            index=models.Index(fields=['status', 'created'], name='bulkuploadjob_status_created'),
+        ),
+    ]
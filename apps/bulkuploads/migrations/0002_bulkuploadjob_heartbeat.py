@@ -0,0 +1,18 @@
+# Generated by Django 2.2.28 on 2026-10-18 16:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bulkuploads', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkuploadjob',
+            name='heartbeat',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Heartbeat'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+from ayrabo.utils import UploadTo
+from common.models import TimestampedModel
+
+
+class BulkUploadJob(TimestampedModel):
+    """
+    A csv uploaded through `AdminBulkUploadMixin` that is processed off-request by the `process_bulk_uploads` worker.
+    Progress counters are updated as the worker goes, so the status page can be refreshed to follow along. The worker
+    updates `heartbeat` along with them, running jobs without a recent heartbeat were abandoned by a worker that died.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (COMPLETED, 'Completed'),
+        (FAILED, 'Failed'),
+    )
+
+    content_type = models.ForeignKey(ContentType, verbose_name='Model', on_delete=models.CASCADE, related_name='+')
+    file = models.FileField(verbose_name='File', upload_to=UploadTo('bulk_uploads/'))
+    created_by = models.ForeignKey('users.User', verbose_name='Created By', on_delete=models.SET_NULL, null=True,
+                                   blank=True, related_name='bulk_upload_jobs')
+    status = models.CharField(verbose_name='Status', max_length=32, choices=STATUSES, default=PENDING)
+    total_rows = models.PositiveIntegerField(verbose_name='Total Rows', default=0)
+    processed_rows = models.PositiveIntegerField(verbose_name='Processed Rows', default=0)
+    created_count = models.PositiveIntegerField(verbose_name='Created', default=0)
+    error_count = models.PositiveIntegerField(verbose_name='Rows With Errors', default=0)
+    error = models.TextField(verbose_name='Error', blank=True)
+    started = models.DateTimeField(verbose_name='Started', null=True, blank=True)
+    finished = models.DateTimeField(verbose_name='Finished', null=True, blank=True)
+    heartbeat = models.DateTimeField(verbose_name='Heartbeat', null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created']
+        indexes = [
+            models.Index(fields=['status', 'created'], name='bulkuploadjob_status_created'),
+        ]
+
+    @property
+    def progress(self):
+        """
+        :return: Percentage of rows processed
+        """
+        if not self.total_rows:
+            return 100 if self.status in [self.COMPLETED, self.FAILED] else 0
+        return int(self.processed_rows * 100 / self.total_rows)
+
+    def __str__(self):
+        return f'{self.content_type.name} bulk upload {self.pk}'
+
+
+class BulkUploadJobError(models.Model):
+    job = models.ForeignKey(BulkUploadJob, verbose_name='Job', on_delete=models.CASCADE, related_name='row_errors')
+    line_number = models.PositiveIntegerField(verbose_name='Line Number')
+    errors = models.TextField(verbose_name='Errors')
+
+    class Meta:
+        ordering = ['line_number']
+
+    def __str__(self):
+        return f'Line {self.line_number}: {self.errors}'
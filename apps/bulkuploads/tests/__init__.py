@@ -0,0 +1,30 @@
+import shutil
+import tempfile
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.base import ContentFile
+from django.test import override_settings
+
+from ayrabo.utils.testing import BaseTestCase
+from bulkuploads.models import BulkUploadJob
+
+
+class BulkUploadJobTestCase(BaseTestCase):
+    """
+    Uploaded csvs are written to a temporary media root that is removed after the tests.
+    """
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_root_override = override_settings(MEDIA_ROOT=media_root)
+        media_root_override.enable()
+        self.addCleanup(media_root_override.disable)
+
+    def create_job(self, model_cls, lines, **kwargs):
+        return BulkUploadJob.objects.create(
+            content_type=ContentType.objects.get_for_model(model_cls),
+            file=ContentFile('\n'.join(lines).encode(), name='upload.csv'),
+            **kwargs
+        )
@@ -0,0 +1,24 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from bulkuploads.models import BulkUploadJob
+from bulkuploads.tests import BulkUploadJobTestCase
+from locations.models import Location
+
+
+class ProcessBulkUploadsCommandTests(BulkUploadJobTestCase):
+    def test_process_bulk_uploads(self):
+        header = 'name,street_number,street,city,state,zip_code,phone_number,website'
+        jobs = [
+            self.create_job(Location, [header, f'Rink {i},1,Main St,Brooklyn,NY,11217,(917) 618-6100,'])
+            for i in range(3)
+        ]
+        out = StringIO()
+        call_command('process_bulk_uploads', '--processes=0', '--once', stdout=out)
+        self.assertListEqual(
+            out.getvalue().splitlines(),
+            [f'Bulk upload {job.pk}: completed' for job in jobs]
+        )
+        self.assertEqual(BulkUploadJob.objects.filter(status=BulkUploadJob.COMPLETED).count(), 3)
+        self.assertEqual(Location.objects.count(), 3)
@@ -0,0 +1,110 @@
+import datetime
+
+from django.test import override_settings
+from django.utils import timezone
+
+from bulkuploads.models import BulkUploadJob
+from bulkuploads.tests import BulkUploadJobTestCase
+from bulkuploads.utils import claim_bulk_upload_jobs, format_form_errors, run_bulk_upload_job
+from locations.models import Location
+from players.models import HockeyPlayer
+from sports.tests import SportFactory
+from teams.tests import TeamFactory
+from users.tests import UserFactory
+
+
+LOCATIONS_HEADER = 'name,street_number,street,city,state,zip_code,phone_number,website'
+BARCLAYS_CENTER = 'Barclays Center,620,Atlantic Ave,Brooklyn,NY,11217,(917) 618-6100,http://barclayscenter.com'
+
+
+class BulkUploadJobUtilsTests(BulkUploadJobTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sport = SportFactory(name='Ice Hockey')
+        self.team = TeamFactory(division__league__sport=self.sport)
+        self.users = UserFactory.create_batch(3)
+
+    def test_claim_bulk_upload_jobs(self):
+        job1 = self.create_job(Location, [LOCATIONS_HEADER])
+        job2 = self.create_job(Location, [LOCATIONS_HEADER])
+        self.create_job(Location, [LOCATIONS_HEADER], status=BulkUploadJob.COMPLETED)
+        self.assertListEqual(claim_bulk_upload_jobs(limit=1), [job1.pk])
+        self.assertListEqual(claim_bulk_upload_jobs(limit=5), [job2.pk])
+        self.assertListEqual(claim_bulk_upload_jobs(limit=5), [])
+        job1.refresh_from_db()
+        self.assertEqual(job1.status, BulkUploadJob.RUNNING)
+        self.assertIsNotNone(job1.started)
+        self.assertEqual(job1.heartbeat, job1.started)
+
+    @override_settings(BULK_UPLOAD_STALE_TIMEOUT=60)
+    def test_claim_bulk_upload_jobs_fails_stale_jobs(self):
+        stale = timezone.now() - datetime.timedelta(seconds=61)
+        stale_job = self.create_job(Location, [LOCATIONS_HEADER], status=BulkUploadJob.RUNNING, started=stale,
+                                    heartbeat=stale)
+        # i.e. claimed before heartbeats were recorded
+        old_job = self.create_job(Location, [LOCATIONS_HEADER], status=BulkUploadJob.RUNNING, started=stale)
+        running_job = self.create_job(Location, [LOCATIONS_HEADER], status=BulkUploadJob.RUNNING, started=stale,
+                                      heartbeat=timezone.now())
+        self.assertListEqual(claim_bulk_upload_jobs(limit=5), [])
+        for job, status in [(stale_job, BulkUploadJob.FAILED), (old_job, BulkUploadJob.FAILED),
+                            (running_job, BulkUploadJob.RUNNING)]:
+            job.refresh_from_db()
+            self.assertEqual(job.status, status)
+        self.assertEqual(stale_job.error, 'The worker processing the upload stopped responding.')
+        self.assertIsNotNone(stale_job.finished)
+
+    def test_run_chunked(self):
+        job = self.create_job(HockeyPlayer, [
+            'user,team,jersey_number,position,handedness',
+            f'{self.users[0].pk},{self.team.pk},1,C,Left',
+            f'{self.users[1].pk},{self.team.pk},2,INVALID,Left',
+            f'{self.users[2].pk},{self.team.pk},3,G,Right',
+        ])
+        self.assertEqual(run_bulk_upload_job(job.pk), BulkUploadJob.COMPLETED)
+
+        job.refresh_from_db()
+        self.assertDictEqual(
+            {field: getattr(job, field) for field in ['total_rows', 'processed_rows', 'created_count', 'error_count']},
+            {'total_rows': 3, 'processed_rows': 3, 'created_count': 2, 'error_count': 1}
+        )
+        self.assertEqual(job.progress, 100)
+        self.assertIsNotNone(job.finished)
+        row_error = job.row_errors.get()
+        self.assertEqual(row_error.line_number, 3)
+        self.assertEqual(
+            row_error.errors,
+            'position: Select a valid choice. INVALID is not one of the available choices.'
+        )
+        self.assertEqual(HockeyPlayer.objects.count(), 2)
+
+    def test_run_formset(self):
+        job = self.create_job(Location, [LOCATIONS_HEADER, BARCLAYS_CENTER])
+        self.assertEqual(run_bulk_upload_job(job.pk), BulkUploadJob.COMPLETED)
+        job.refresh_from_db()
+        self.assertEqual(job.created_count, 1)
+        self.assertEqual(job.processed_rows, 1)
+        self.assertTrue(Location.objects.filter(name='Barclays Center').exists())
+
+    def test_run_formset_with_errors(self):
+        job = self.create_job(Location, [LOCATIONS_HEADER, BARCLAYS_CENTER, 'Rink,,,,,,,'])
+        self.assertEqual(run_bulk_upload_job(job.pk), BulkUploadJob.COMPLETED)
+        job.refresh_from_db()
+        # Nothing is saved when any of the rows are invalid
+        self.assertEqual(job.created_count, 0)
+        self.assertEqual(job.error_count, 1)
+        self.assertEqual(job.row_errors.get().line_number, 3)
+        self.assertFalse(Location.objects.exists())
+
+    def test_run_failed(self):
+        job = self.create_job(Location, [LOCATIONS_HEADER, BARCLAYS_CENTER])
+        job.file.delete(save=False)
+        self.assertEqual(run_bulk_upload_job(job.pk), BulkUploadJob.FAILED)
+        job.refresh_from_db()
+        self.assertIn('Traceback', job.error)
+        self.assertIsNotNone(job.finished)
+
+    def test_format_form_errors(self):
+        self.assertEqual(
+            format_form_errors({'name': ['This field is required.'], 'team': ['Invalid.', 'Inactive.']}),
+            'name: This field is required.; team: Invalid., Inactive.'
+        )
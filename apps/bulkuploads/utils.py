@@ -0,0 +1,141 @@
+import codecs
+import csv
+import datetime
+import traceback
+
+from django.conf import settings
+from django.contrib import admin
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import BulkUploadJob, BulkUploadJobError
+
+
+def get_bulk_upload_view(model_cls, admin_site=admin.site):
+    """
+    Build the bulk upload view the model's admin uses, so jobs are processed exactly like uploads in the request.
+
+    :param model_cls: Model the csv is being uploaded for
+    :param admin_site: Admin site the model is registered with
+    :return: `AdminBulkUploadView` instance
+    """
+    model_admin = admin_site._registry[model_cls]
+    return model_admin.bulk_upload_view_class(**model_admin.get_bulk_upload_view_kwargs())
+
+
+def get_line_numbers(csv_file):
+    """
+    :param csv_file: csv file opened in binary mode
+    :return: The line each row of the csv ends on
+    """
+    reader = csv.DictReader(codecs.iterdecode(csv_file, 'utf-8'))
+    return [reader.line_num for _ in reader]
+
+
+def format_form_errors(form_errors):
+    """
+    :param form_errors: Dict of field name -> list of error messages
+    :return: Errors as a single line of text, i.e. `team: Select a valid choice.`
+    """
+    return '; '.join(f'{field}: {", ".join(errors)}' for field, errors in form_errors.items())
+
+
+def fail_stale_bulk_upload_jobs():
+    """
+    Mark running jobs that haven't had a heartbeat in `BULK_UPLOAD_STALE_TIMEOUT` seconds as failed, their worker died
+    (or was killed) while processing them. They aren't returned to pending because chunks saved before the worker died
+    would be saved again.
+
+    :return: # of jobs marked as failed
+    """
+    now = timezone.now()
+    cutoff = now - datetime.timedelta(seconds=settings.BULK_UPLOAD_STALE_TIMEOUT)
+    return BulkUploadJob.objects.filter(
+        # Jobs claimed before heartbeats were recorded only have a start
+        Q(heartbeat__lt=cutoff) | Q(heartbeat__isnull=True, started__lt=cutoff),
+        status=BulkUploadJob.RUNNING
+    ).update(status=BulkUploadJob.FAILED, error='The worker processing the upload stopped responding.', finished=now)
+
+
+def claim_bulk_upload_jobs(limit):
+    """
+    Mark up to `limit` pending jobs as running, oldest first. Jobs are claimed with a conditional update, so multiple
+    workers never process the same job. Stale running jobs are failed first (see `fail_stale_bulk_upload_jobs`).
+
+    :param limit: Max # of jobs to claim
+    :return: List of the claimed job ids
+    """
+    fail_stale_bulk_upload_jobs()
+    pending = BulkUploadJob.objects.filter(status=BulkUploadJob.PENDING)
+    job_ids = list(pending.order_by('created').values_list('id', flat=True)[:limit])
+    now = timezone.now()
+    return [
+        job_id for job_id in job_ids
+        if pending.filter(pk=job_id).update(status=BulkUploadJob.RUNNING, started=now, heartbeat=now)
+    ]
+
+
+def _record_progress(job, num_rows, num_instances, row_errors):
+    BulkUploadJob.objects.filter(pk=job.pk).update(
+        heartbeat=timezone.now(),
+        processed_rows=F('processed_rows') + num_rows,
+        created_count=F('created_count') + num_instances,
+        error_count=F('error_count') + len(row_errors),
+    )
+    BulkUploadJobError.objects.bulk_create([
+        BulkUploadJobError(job=job, line_number=line_number, errors=format_form_errors(form_errors))
+        for line_number, form_errors in row_errors
+    ])
+
+
+def process_bulk_upload_job(job):
+    """
+    Process a claimed job with the bulk upload view of the model's admin. Admins with a chunk size save the valid rows
+    chunk by chunk and progress is recorded after each chunk. Otherwise the csv is saved all at once, only if every
+    row is valid. Rows with errors are recorded with the line they're on.
+
+    :param job: `BulkUploadJob` to process
+    """
+    view = get_bulk_upload_view(job.content_type.model_class())
+    with job.file.open('rb') as csv_file:
+        line_numbers = get_line_numbers(csv_file)
+        job.total_rows = len(line_numbers)
+        BulkUploadJob.objects.filter(pk=job.pk).update(total_rows=job.total_rows)
+        csv_file.seek(0)
+
+        if view.chunk_size:
+            def on_chunk_saved(num_rows, num_instances, row_errors):
+                _record_progress(job, num_rows, num_instances, row_errors)
+
+            view.save_chunks(csv_file, on_chunk_saved=on_chunk_saved)
+        else:
+            instances, formset = view.save_formset(csv_file)
+            if instances is None and formset.non_form_errors():
+                # i.e. too many rows, these aren't tied to a line
+                raise ValidationError(formset.non_form_errors())
+            row_errors = [
+                (line_number, form_errors)
+                for line_number, form_errors in zip(line_numbers, formset.errors) if form_errors
+            ]
+            _record_progress(job, job.total_rows, len(instances or []), row_errors)
+
+
+def run_bulk_upload_job(job_id):
+    """
+    Process the job and mark it as completed, or failed if an unexpected error occurred. Rows saved before the error
+    are kept. This is what the `process_bulk_uploads` worker runs in its process pool.
+
+    :param job_id: Id of a claimed job
+    :return: The job's final status
+    """
+    job = BulkUploadJob.objects.select_related('content_type').get(pk=job_id)
+    status, error = BulkUploadJob.COMPLETED, ''
+    try:
+        process_bulk_upload_job(job)
+    except ValidationError as e:
+        status, error = BulkUploadJob.FAILED, ' '.join(e.messages)
+    except Exception:
+        status, error = BulkUploadJob.FAILED, traceback.format_exc()
+    BulkUploadJob.objects.filter(pk=job_id).update(status=status, error=error, finished=timezone.now())
+    return status
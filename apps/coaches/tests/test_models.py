@@ -1,6 +1,7 @@
 from django.db.utils import IntegrityError
 
 from ayrabo.utils.testing import BaseTestCase
+from coaches.models import Coach
 from coaches.tests import CoachFactory
 from teams.tests import TeamFactory
 from users.tests import UserFactory
@@ -20,3 +21,11 @@ class CoachModelTests(BaseTestCase):
         CoachFactory(user=user, team=team)
         with self.assertRaises(IntegrityError):
             CoachFactory(user=user, team=team)
+
+    def test_clean_sets_sport(self):
+        # i.e. admin bulk uploads, the cleaned coaches are bulk created
+        team = TeamFactory()
+        coach = CoachFactory.build(user=UserFactory(), team=team)
+        coach.full_clean()
+        Coach.objects.bulk_create([coach])
+        self.assertEqual(Coach.objects.get().sport_id, team.sport_id)
@@ -0,0 +1,91 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+FRAGMENT_VERSION_CACHE_KEY = 'fragments:version:{scope}:{pk}'
+FRAGMENT_CACHE_KEY = 'fragments:{name}:{digest}'
+
+LEAGUE = 'league'
+SEASON = 'season'
+TEAM = 'team'
+
+
+def is_fragment_cache_enabled():
+    return bool(getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 0))
+
+
+def get_fragment_version_cache_key(scope, pk):
+    return FRAGMENT_VERSION_CACHE_KEY.format(scope=scope, pk=pk)
+
+
+def get_fragment_versions(scopes):
+    """
+    Fetch the current version of each scope, i.e. `[('league', 1), ('season', 4)]`. Scopes that don't have a version
+    yet (or were evicted) are given a new one, so fragments cached before an eviction are never reused.
+
+    :param scopes: List of (scope, pk) tuples
+    :return: List of versions, in the same order as `scopes`
+    """
+    keys = [get_fragment_version_cache_key(scope, pk) for scope, pk in scopes]
+    versions = cache.get_many(keys)
+    missing = {key: uuid.uuid4().hex for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_fragment_versions(*scopes):
+    """
+    Give each scope a new version, all fragments cached for the scopes are stale afterwards. A no-op if the fragment
+    cache has been disabled.
+
+    NOTE: `QuerySet.update` and `bulk_create` don't send signals, code bulk changing games, teams, seasons, etc. needs
+    to call this function manually.
+
+    :param scopes: (scope, pk) tuples, i.e. `('team', 1)`. Tuples with a pk of None are ignored.
+    """
+    if not is_fragment_cache_enabled():
+        return
+    cache.set_many({
+        get_fragment_version_cache_key(scope, pk): uuid.uuid4().hex for scope, pk in scopes if pk is not None
+    }, None)
+
+
+def get_fragment_cache_key(name, scopes, vary_on=()):
+    """
+    :param name: Name of the fragment, i.e. `league_divisions`
+    :param scopes: List of (scope, pk) tuples the fragment depends on
+    :param vary_on: Additional values the fragment depends on, i.e. query params
+    :return: Cache key for the current version of the fragment
+    """
+    parts = [f'{scope}:{pk}:{version}' for (scope, pk), version in zip(scopes, get_fragment_versions(scopes))]
+    parts.extend(str(value) for value in vary_on)
+    digest = hashlib.md5(':'.join(parts).encode()).hexdigest()
+    return FRAGMENT_CACHE_KEY.format(name=name, digest=digest)
+
+
+def get_or_render_fragment(name, scopes, render, vary_on=()):
+    """
+    Fetch a fragment from the cache, rendering (and caching) it on a miss. A fragment is usually rendered html, but can
+    be anything that can be pickled. Fragments are shared by all users, they can't contain anything that depends on the
+    user's permissions.
+
+    :param name: Name of the fragment, i.e. `league_divisions`
+    :param scopes: List of (scope, pk) tuples the fragment depends on. Changes to games, teams, seasons, etc. bump the
+        scopes' versions (see `bump_fragment_versions`).
+    :param render: Function that renders the fragment, it is called with no args
+    :param vary_on: Additional values the fragment depends on, i.e. query params
+    :return: The fragment
+    """
+    if not is_fragment_cache_enabled():
+        return render()
+    cache_key = get_fragment_cache_key(name, scopes, vary_on)
+    fragment = cache.get(cache_key)
+    if fragment is None:
+        fragment = render()
+        cache.set(cache_key, fragment, settings.FRAGMENT_CACHE_TIMEOUT)
+    return fragment
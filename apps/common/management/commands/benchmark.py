@@ -0,0 +1,313 @@
+import datetime
+import json
+import math
+import statistics
+import time
+import tracemalloc
+import uuid
+from itertools import cycle, permutations
+
+import pytz
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ayrabo.db.queries import QueryRecorder
+from common.models import GenericChoice
+from divisions.models import Division
+from games.models import AbstractGame, HockeyAssist, HockeyGame, HockeyGamePlayer, HockeyGoal
+from leagues.models import League
+from locations.models import Location
+from managers.models import Manager
+from organizations.models import Organization
+from periods.models import HockeyPeriod
+from players.models import HockeyPlayer
+from scorekeepers.models import Scorekeeper
+from seasons.models import HockeySeasonRoster, Season
+from sports.models import Sport, SportRegistration
+from standings.utils import rebuild_hockey_standings
+from stats.utils import rebuild_hockey_player_stats
+from teams.models import Team
+from userprofiles.models import UserProfile
+from users.models import User
+
+
+def percentile(values, percent):
+    """
+    Nearest rank percentile, i.e. `percentile([...], 95)`.
+    """
+    values = sorted(values)
+    return values[max(math.ceil(percent / 100 * len(values)) - 1, 0)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed synthetic leagues at the given scale and time the hot views and v1 api endpoints through the test '
+        'client. Latency percentiles, query counts and peak memory are written to a JSON file that can be diffed '
+        'between commits. Everything is rolled back afterwards, the shared cache is swapped for a local memory cache '
+        'so nothing cached for the seeded data outlives the rollback.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--leagues', type=int, default=1, help='# of leagues to seed')
+        parser.add_argument('--divisions', type=int, default=2, help='# of divisions per league')
+        parser.add_argument('--teams', type=int, default=6, help='# of teams per division')
+        parser.add_argument('--players', type=int, default=15, help='# of players per team')
+        parser.add_argument('--games', type=int, default=100, help='# of games per season, per league')
+        parser.add_argument('--iterations', type=int, default=20, help='# of timed requests per view')
+        parser.add_argument('--output', default='benchmark.json', help='Path of the JSON report')
+        parser.add_argument('--only', nargs='*', default=None, help='Only benchmark these views, i.e. leagues:schedule')
+
+    def create_data(self, options):
+        """
+        Bulk create the leagues, the first league's team, season and game are the ones that get benchmarked.
+        """
+        token = uuid.uuid4().hex[:8]
+        sport, _ = Sport.objects.get_or_create(name='Ice Hockey', defaults={'slug': 'ice-hockey'})
+        choices = GenericChoice.objects.get_choices(instance=sport)
+        game_type = choices.filter(type=GenericChoice.GAME_TYPE).first() or GenericChoice.objects.create(
+            content_object=sport, short_value='exhibition', long_value='Exhibition', type=GenericChoice.GAME_TYPE
+        )
+        point_value = choices.filter(type=GenericChoice.GAME_POINT_VALUE).first() or GenericChoice.objects.create(
+            content_object=sport, short_value='2', long_value='2', type=GenericChoice.GAME_POINT_VALUE
+        )
+        location = Location.objects.create(name=f'Benchmark Rink {token}', slug=f'benchmark-rink-{token}',
+                                           street='Main St', street_number='1', city='Long Island', state='NY',
+                                           zip_code='11701', phone_number='(516) 123-4567')
+
+        user = User.objects.create_user(username=f'benchmark-{token}', email=f'benchmark-{token}@ayrabo.com',
+                                        password='myweakpassword', first_name='Benchmark', last_name='User')
+        UserProfile.objects.create(user=user, gender=UserProfile.MALE, birthday=datetime.date(1990, 1, 1),
+                                   height='5\' 7"', weight=150, timezone='US/Eastern')
+        SportRegistration.objects.create_for_user_and_sport(
+            user, sport, [SportRegistration.MANAGER, SportRegistration.SCOREKEEPER]
+        )
+        Scorekeeper.objects.create(user=user, sport=sport)
+
+        today = timezone.now().date()
+        data = None
+        for league_index in range(options['leagues']):
+            league = League.objects.create(name=f'Benchmark League {league_index} {token}',
+                                           abbreviated_name=f'BL{league_index}',
+                                           slug=f'benchmark-league-{league_index}-{token}', sport=sport)
+            Division.objects.bulk_create([
+                Division(name=f'Division {i}', slug=f'division-{i}', league=league) for i in range(options['divisions'])
+            ])
+            divisions = list(Division.objects.filter(league=league).order_by('id'))
+            prefix = f'{league_index}-{token}'
+            Organization.objects.bulk_create([
+                Organization(name=f'Organization {i} {prefix}', slug=f'organization-{i}-{prefix}', sport=sport)
+                for i in range(options['teams'])
+            ])
+            organizations = list(Organization.objects.filter(slug__endswith=prefix).order_by('id'))
+            Team.objects.bulk_create([
+                Team(name=f'Team {i}', slug=f'team-{i}', division=division, organization=organization, league=league,
+                     sport=sport)
+                for division in divisions for i, organization in enumerate(organizations)
+            ])
+            teams = list(Team.objects.filter(league=league).order_by('id'))
+
+            past_season = Season.objects.create(league=league, start_date=today - datetime.timedelta(days=545),
+                                                end_date=today - datetime.timedelta(days=181))
+            current_season = Season.objects.create(league=league, start_date=today - datetime.timedelta(days=180),
+                                                   end_date=today + datetime.timedelta(days=185))
+            for season in [past_season, current_season]:
+                season.teams.add(*teams)
+
+            players = self.create_players(teams, sport, options['players'], prefix)
+            seasons = [past_season, current_season]
+            games = self.create_games(teams, seasons, options['games'], game_type, point_value, location, user)
+            self.create_results(seasons, players)
+            if data is None:
+                team = teams[0]
+                Manager.objects.create(user=user, team=team)
+                game = HockeyGame.objects.filter(season=current_season, home_team=team).order_by('id').first()
+                if game is None:
+                    raise CommandError('The first team needs a home game, use a larger # of games.')
+                self.create_rosters(game, current_season, players, user)
+                data = {'sport': sport, 'league': league, 'team': team, 'season': current_season, 'game': game,
+                        'user': user}
+            self.stdout.write(f'Seeded {league.name}: {len(teams)} teams, {len(players)} players, {games} games')
+        return data
+
+    def create_players(self, teams, sport, players_per_team, prefix):
+        num_players = len(teams) * players_per_team
+        User.objects.bulk_create([
+            User(username=f'benchmark-player-{i}-{prefix}', email=f'benchmark-player-{i}-{prefix}@ayrabo.com')
+            for i in range(num_players)
+        ])
+        user_ids = User.objects.filter(username__endswith=prefix, username__startswith='benchmark-player-').order_by(
+            'id'
+        ).values_list('id', flat=True)
+        jersey_numbers = HockeyPlayer.MAX_JERSEY_NUMBER + 1
+        HockeyPlayer.objects.bulk_create([
+            HockeyPlayer(user_id=user_id, team=teams[i // players_per_team], sport=sport,
+                         jersey_number=i % players_per_team % jersey_numbers, position=HockeyPlayer.CENTER,
+                         handedness=HockeyPlayer.LEFT, is_active=True)
+            for i, user_id in enumerate(user_ids)
+        ])
+        # Only some dbs set the pks of bulk created objects
+        return list(HockeyPlayer.objects.filter(team__in=teams).order_by('id'))
+
+    def create_games(self, teams, seasons, games_per_season, game_type, point_value, location, user):
+        tz = pytz.timezone('US/Eastern')
+        matchups = cycle([
+            (home_team, away_team)
+            for home_team, away_team in permutations(teams, 2) if home_team.division_id == away_team.division_id
+        ])
+        now = timezone.now()
+        games = []
+        for season in seasons:
+            days = (season.end_date - season.start_date).days
+            for i in range(games_per_season):
+                home_team, away_team = next(matchups)
+                day = season.start_date + datetime.timedelta(days=i * days // games_per_season)
+                start = tz.localize(datetime.datetime.combine(day, datetime.time(hour=19)))
+                status = AbstractGame.COMPLETED if start < now else AbstractGame.SCHEDULED
+                games.append(HockeyGame(
+                    home_team=home_team, away_team=away_team, team=home_team, type=game_type, point_value=point_value,
+                    status=status, location=location, start=start,
+                    end=start + datetime.timedelta(hours=2), timezone='US/Eastern', season=season, created_by=user
+                ))
+        HockeyGame.objects.bulk_create(games)
+        return len(games)
+
+    def create_results(self, seasons, players):
+        """
+        Score the completed games, then rebuild the standings and player stats from them. Bulk inserts don't send the
+        signals that keep the standings and stats up to date.
+        """
+        players_by_team = {}
+        for player in players:
+            players_by_team.setdefault(player.team_id, []).append(player)
+        games = list(HockeyGame.objects.filter(season__in=seasons, status=AbstractGame.COMPLETED).order_by('id'))
+        HockeyPeriod.objects.bulk_create([
+            HockeyPeriod(game=game, name=HockeyPeriod.ONE, duration=20, complete=True) for game in games
+        ])
+        periods = dict(HockeyPeriod.objects.filter(game__in=games).values_list('game_id', 'id'))
+
+        goals = []
+        assist_players = []
+        for i, game in enumerate(games):
+            # The home team wins 2-1 or loses 1-2, every other game
+            for team_id, num_goals in [(game.home_team_id, 1 + i % 2), (game.away_team_id, 2 - i % 2)]:
+                team_players = players_by_team[team_id]
+                for j in range(num_goals):
+                    goals.append(HockeyGoal(
+                        game=game, period_id=periods[game.pk], time=datetime.timedelta(minutes=5 + j),
+                        player=team_players[(i + j) % len(team_players)], type=HockeyGoal.EVEN_STRENGTH
+                    ))
+                    assist_players.append(team_players[(i + j + 1) % len(team_players)])
+        HockeyGoal.objects.bulk_create(goals)
+        # Only some dbs set the pks of bulk created objects
+        goal_ids = HockeyGoal.objects.filter(game__in=games).order_by('id').values_list('id', flat=True)
+        HockeyAssist.objects.bulk_create([
+            HockeyAssist(goal_id=goal_id, player=player) for goal_id, player in zip(goal_ids, assist_players)
+        ])
+
+        season_qs = Season.objects.filter(pk__in=[season.pk for season in seasons])
+        rebuild_hockey_standings(season_qs)
+        rebuild_hockey_player_stats(season_qs)
+
+    def create_rosters(self, game, season, players, user):
+        game_players = []
+        for team in [game.home_team, game.away_team]:
+            team_players = [player for player in players if player.team_id == team.pk]
+            roster = HockeySeasonRoster.objects.create(name='Benchmark Roster', season=season, team=team, default=True,
+                                                       created_by=user)
+            HockeySeasonRoster.players.through.objects.bulk_create([
+                HockeySeasonRoster.players.through(hockeyseasonroster=roster, hockeyplayer=player)
+                for player in team_players
+            ])
+            game_players.extend(HockeyGamePlayer(game=game, team=team, player=player) for player in team_players)
+        HockeyGamePlayer.objects.bulk_create(game_players)
+
+    def get_targets(self, data):
+        sport, league, team, season, game = data['sport'], data['league'], data['team'], data['season'], data['game']
+        game_kwargs = {'slug': sport.slug, 'game_pk': game.pk}
+        return [
+            ('teams:schedule', reverse('teams:schedule', kwargs={'team_pk': team.pk})),
+            ('leagues:schedule', reverse('leagues:schedule', kwargs={'slug': league.slug})),
+            ('leagues:divisions', reverse('leagues:divisions', kwargs={'slug': league.slug})),
+            ('sports:games:scoresheet', reverse('sports:games:scoresheet', kwargs=game_kwargs)),
+            ('sports:games:rosters:update', reverse('sports:games:rosters:update', kwargs=game_kwargs)),
+            ('sports:dashboard', reverse('sports:dashboard', kwargs={'slug': sport.slug})),
+            ('users:detail', reverse('users:detail', kwargs={'pk': data['user'].pk})),
+            ('v1:teams:players:list', reverse('v1:teams:players:list', kwargs={'pk': team.pk})),
+            ('v1:teams:season_rosters:list', reverse('v1:teams:season_rosters:list', kwargs={'pk': team.pk})),
+            ('v1:sports:games:players-list', reverse('v1:sports:games:players-list',
+                                                     kwargs={'pk': sport.pk, 'game_pk': game.pk})),
+            ('v1:stats:leaders', reverse('v1:stats:leaders', kwargs={'pk': season.pk})),
+        ]
+
+    def benchmark(self, client, url, iterations):
+        """
+        Time the requests without tracing memory (tracemalloc slows everything down), then make one more request to
+        measure the queries and peak memory.
+        """
+        # Warms up per process caches (sites, content types, templates, etc.)
+        status_code = client.get(url).status_code
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            client.get(url)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        tracemalloc.start()
+        with QueryRecorder() as recorder:
+            client.get(url)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stats = recorder.stats
+        return {
+            'status_code': status_code,
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'mean_ms': round(statistics.mean(timings), 2),
+            'queries': stats.count,
+            'duplicate_queries': stats.duplicates,
+            'similar_queries': stats.similar,
+            'db_time_ms': round(stats.time * 1000, 2),
+            'peak_memory_kib': round(peak / 1024, 1),
+        }
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        if iterations < 1:
+            raise CommandError('--iterations must be at least 1.')
+        scale = {name: options[name] for name in ['leagues', 'divisions', 'teams', 'players', 'games']}
+        results = {}
+
+        # The test client's host needs to be allowed, DEBUG would log every query and enable the debug toolbar. The
+        # rollback doesn't undo cache writes (current seasons, fragment versions, fragments, etc.), they go to a local
+        # memory cache that's discarded when the command exits.
+        caches = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmark'}}
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=['testserver'], DEBUG=False, CACHES=caches):
+            data = self.create_data(options)
+            client = Client()
+            client.force_login(data['user'])
+
+            self.stdout.write(f'{"View":<32} {"Status":>6} {"p50 ms":>8} {"p95 ms":>8} {"Queries":>8} {"Peak KiB":>10}')
+            for name, url in self.get_targets(data):
+                if options['only'] and name not in options['only']:
+                    continue
+                result = results[name] = self.benchmark(client, url, iterations)
+                self.stdout.write(
+                    f'{name:<32} {result["status_code"]:>6} {result["p50_ms"]:>8.2f} {result["p95_ms"]:>8.2f} '
+                    f'{result["queries"]:>8} {result["peak_memory_kib"]:>10.1f}'
+                )
+            transaction.set_rollback(True)
+
+        report = {
+            'scale': scale,
+            'iterations': iterations,
+            'database': settings.DATABASES['default']['ENGINE'],
+            'results': results,
+        }
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        self.stdout.write(f'Wrote {options["output"]}')
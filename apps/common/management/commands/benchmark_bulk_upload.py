@@ -0,0 +1,108 @@
+import time
+import tracemalloc
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from ayrabo.utils.admin.views import AdminBulkUploadView
+from divisions.models import Division
+from leagues.models import League
+from organizations.models import Organization
+from players.admin import HockeyPlayerAdminForm, PlayerAdminModelFormSet
+from players.models import HockeyPlayer
+from sports.models import Sport
+from teams.models import Team
+from users.models import User
+
+
+PLAYERS_PER_TEAM = HockeyPlayer.MAX_JERSEY_NUMBER + 1
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the formset and the streaming (chunked) bulk upload paths by uploading a generated hockey players '
+        'csv. Everything is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help='# of rows in the generated csv')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Chunk size used for the streaming upload')
+
+    def create_data(self, num_rows):
+        sport, _ = Sport.objects.get_or_create(name='Ice Hockey', defaults={'slug': 'ice-hockey'})
+        league = League.objects.create(name='Benchmark League', abbreviated_name='BL', slug='benchmark-league',
+                                       sport=sport)
+        division = Division.objects.create(name='Benchmark Division', slug='benchmark-division', league=league)
+        organization = Organization.objects.create(name='Benchmark Organization', slug='benchmark-organization',
+                                                   sport=sport)
+        teams = [
+            Team.objects.create(name=f'Benchmark Team {i}', slug=f'benchmark-team-{i}', division=division,
+                                organization=organization)
+            for i in range(num_rows // PLAYERS_PER_TEAM + 1)
+        ]
+        User.objects.bulk_create([
+            User(username=f'benchmark{i}', email=f'benchmark{i}@ayrabo.com') for i in range(num_rows)
+        ])
+        user_ids = User.objects.filter(username__startswith='benchmark').order_by('id').values_list('id', flat=True)
+
+        lines = ['user,team,jersey_number,position,handedness']
+        for i, user_id in enumerate(user_ids):
+            team = teams[i // PLAYERS_PER_TEAM]
+            lines.append(f'{user_id},{team.id},{i % PLAYERS_PER_TEAM},{HockeyPlayer.CENTER},{HockeyPlayer.LEFT}')
+        return '\n'.join(lines).encode()
+
+    def benchmark(self, name, func):
+        """
+        Run `func` in a transaction that is rolled back, so each path starts from the same data. Queries are counted
+        instead of captured so the sql doesn't count towards the peak memory.
+        """
+        num_queries = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal num_queries
+            num_queries += 1
+            return execute(sql, params, many, context)
+
+        tracemalloc.start()
+        with transaction.atomic(), connection.execute_wrapper(count_queries):
+            start = time.perf_counter()
+            num_created = func()
+            elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.stdout.write(f'{name:<10} {num_created:>8} {elapsed:>10.2f} {num_queries:>8} {peak / 1024 / 1024:>10.1f}')
+
+    def handle(self, *args, **options):
+        num_rows = options.get('rows')
+        chunk_size = options.get('chunk_size')
+        view_kwargs = {
+            'model': HockeyPlayer,
+            'fields': HockeyPlayerAdminForm.Meta.fields,
+            'model_form_class': HockeyPlayerAdminForm,
+            'model_formset_class': PlayerAdminModelFormSet,
+        }
+
+        with transaction.atomic():
+            content = self.create_data(num_rows)
+
+            def save_formset():
+                view = AdminBulkUploadView(**view_kwargs)
+                instances, formset = view.save_formset(SimpleUploadedFile('players.csv', content))
+                if instances is None:
+                    # i.e. formsets are limited to 1000 forms
+                    self.stderr.write(f'The formset path rejected the csv: {formset.non_form_errors()}')
+                    return 0
+                return len(instances)
+
+            def save_chunks():
+                view = AdminBulkUploadView(chunk_size=chunk_size, **view_kwargs)
+                num_created, _ = view.save_chunks(SimpleUploadedFile('players.csv', content))
+                return num_created
+
+            self.stdout.write(f'Uploading {num_rows} hockey players\n')
+            self.stdout.write(f'{"Path":<10} {"Created":>8} {"Seconds":>10} {"Queries":>8} {"Peak MiB":>10}')
+            self.benchmark('formset', save_formset)
+            self.benchmark('streaming', save_chunks)
+            transaction.set_rollback(True)
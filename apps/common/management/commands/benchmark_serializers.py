@@ -0,0 +1,106 @@
+import json
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Prefetch
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.projections import ValuesProjection
+from api.v1.games.serializers import HockeyGamePlayerSerializer
+from api.v1.players.serializers import HockeyPlayerSerializer
+from api.v1.seasons.serializers import HockeySeasonRosterSerializer
+from games.models import HockeyGamePlayer
+from players.models import HockeyPlayer
+from seasons.models import HockeySeasonRoster
+from .benchmark import Command as BenchmarkCommand
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the standard serializers of the v1 list apis to the values() based projections (see '
+        '`api.projections.ValuesProjection`) by serializing a team with the given # of players to JSON. Everything is '
+        'rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='# of players, season roster players and game '
+                                                                    'players to serialize')
+        parser.add_argument('--iterations', type=int, default=5, help='# of timed runs per path')
+
+    def get_targets(self, data):
+        team, game = data['team'], data['game']
+        # Season rosters are listed with their players as ids, nested players aren't supported by the projections
+        context = {'request': Request(APIRequestFactory().get('/', data={'expand': ''}))}
+        # Same queries as the list apis, the projections ignore the select_related and prefetch_related
+        return [
+            ('players', HockeyPlayerSerializer, {},
+             HockeyPlayer.objects.filter(team=team).select_related('user').order_by('id')),
+            ('season_rosters', HockeySeasonRosterSerializer, context,
+             HockeySeasonRoster.objects.filter(team=team).prefetch_related(
+                 Prefetch('players', queryset=HockeyPlayer.objects.only('id'))
+             ).order_by('id')),
+            ('game_players', HockeyGamePlayerSerializer, {},
+             HockeyGamePlayer.objects.filter(game=game, team=team).order_by('id')),
+        ]
+
+    def benchmark(self, func, iterations):
+        """
+        Time the runs without tracing memory (tracemalloc slows everything down), then run once more to count the
+        queries and measure the peak memory.
+        """
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            content = func()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        num_queries = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal num_queries
+            num_queries += 1
+            return execute(sql, params, many, context)
+
+        tracemalloc.start()
+        with connection.execute_wrapper(count_queries):
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return content, statistics.median(timings), num_queries, peak
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        iterations = options['iterations']
+        if rows < 1 or iterations < 1:
+            raise CommandError('--rows and --iterations must be at least 1.')
+
+        with transaction.atomic():
+            data = BenchmarkCommand(stdout=self.stdout, stderr=self.stderr).create_data({
+                'leagues': 1, 'divisions': 1, 'teams': 2, 'players': rows, 'games': 2
+            })
+            self.stdout.write(
+                f'{"Payload":<16} {"Path":<10} {"Rows":>6} {"Median ms":>10} {"Queries":>8} {"Peak KiB":>10} '
+                f'{"Bytes":>10} {"Match":>6}'
+            )
+            for name, serializer_cls, context, queryset in self.get_targets(data):
+                def serialize():
+                    return JSONRenderer().render(serializer_cls(queryset.all(), many=True, context=context).data)
+
+                def project():
+                    return b''.join(ValuesProjection(serializer_cls(context=context)).iter_json(queryset.all()))
+
+                expected = None
+                for path, func in [('standard', serialize), ('values', project)]:
+                    content, median, num_queries, peak = self.benchmark(func, iterations)
+                    parsed = json.loads(content)
+                    expected = parsed if expected is None else expected
+                    self.stdout.write(
+                        f'{name:<16} {path:<10} {len(parsed):>6} {median:>10.2f} {num_queries:>8} '
+                        f'{peak / 1024:>10.1f} {len(content):>10} {"yes" if parsed == expected else "NO":>6}'
+                    )
+            transaction.set_rollback(True)
@@ -1,14 +1,18 @@
 import datetime
+import multiprocessing
 import random
 from itertools import cycle, permutations
 
 import pytz
 from allauth.account.models import EmailAddress
 from django.conf import settings
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
 from django.utils import timezone
 from faker import Faker
 
+from common.fragments import LEAGUE, SEASON, TEAM, bump_fragment_versions
 from common.management.commands._utils import get_or_create
 from common.management.seed_data.testing_data import liahl_divisions
 from common.models import GenericChoice
@@ -28,6 +32,10 @@ from users.models import User
 
 faker = Faker()
 PLAYERS_PER_TEAM = 22
+PASSWORD = 'myweakpassword'
+BATCH_SIZE = 1000
+# Set before the process pool forks, so workers don't need to pickle the command (see `seed_division_in_bulk`)
+_bulk_seeder = None
 
 
 def generate_birthday(year):
@@ -60,6 +68,145 @@ def get_friday(date):
     return date + datetime.timedelta((4 - date.weekday()) % 7)
 
 
+def get_team_names(config, scale):
+    """
+    :param config: Division config from `liahl_divisions`
+    :param scale: # of teams to create per team in the config, copies are numbered i.e. `Long Island Edge 2`
+    :return: List of team names for the division
+    """
+    names = config.get('teams')
+    return [name if copy == 1 else f'{name} {copy}' for copy in range(1, scale + 1) for name in names]
+
+
+def seed_division_in_bulk(args):
+    """
+    Process pool entry point, seeds a division with the `BulkSeeder` inherited from the parent process.
+    """
+    division_name, config, seed = args
+    try:
+        return _bulk_seeder.seed_division(division_name, config, seed)
+    finally:
+        # The connection was opened by this process, the parent's connections were closed before forking
+        connections.close_all()
+
+
+class BulkSeeder(object):
+    """
+    Seeds divisions with `bulk_create`. Users share a single pre-hashed password, and matchups and schedules are
+    generated in memory. Divisions are independent of each other, so they can be seeded by separate processes.
+    """
+
+    def __init__(self, command, league, seasons, players_per_team, scale, batch_size):
+        self.command = command
+        self.stdout = command.stdout
+        self.league = league
+        self.sport = league.sport
+        self.seasons = seasons
+        self.players_per_team = players_per_team
+        self.scale = scale
+        self.batch_size = batch_size
+        self.password = make_password(PASSWORD)
+        choices = GenericChoice.objects.get_choices(instance=self.sport)
+        self.point_value = choices.filter(short_value=2, type=GenericChoice.GAME_POINT_VALUE).first()
+        self.game_type = choices.filter(type=GenericChoice.GAME_TYPE).get(short_value='league')
+        self.location_ids = list(Location.objects.values_list('id', flat=True))
+        superuser = User.objects.filter(is_superuser=True).first()
+        self.superuser_id = superuser.pk if superuser else None
+
+    def seed_division(self, division_name, config, seed):
+        """
+        :param division_name: Name of the division
+        :param config: Division config from `liahl_divisions`
+        :param seed: Seed for the random data, so a division is seeded the same way regardless of the process it's
+            seeded by
+        :return: Dict of # of players and games created
+        """
+        random.seed(seed)
+        faker.seed_instance(seed)
+        division, _ = self.command.create_division(division_name, self.league)
+        teams = []
+        for team_name in get_team_names(config, self.scale):
+            organization, _ = self.command.create_organization(team_name, division)
+            team, _ = self.command.create_team(team_name, division, organization)
+            teams.append(team)
+
+        teams_with_players = set(HockeyPlayer.objects.filter(team__in=teams).values_list('team_id', flat=True))
+        num_players = self.create_players([team for team in teams if team.pk not in teams_with_players], config)
+        num_games = self.create_games(teams)
+        self.stdout.write(f'{division_name}: {len(teams)} teams, {num_players} players, {num_games} games')
+        return {'players': num_players, 'games': num_games}
+
+    def get_username_prefix(self, team):
+        return f'user-{team.pk}-'
+
+    def create_players(self, teams, config):
+        users = []
+        for team in teams:
+            for i in range(self.players_per_team):
+                email = f'{self.get_username_prefix(team)}{i}@ayrabo.com'
+                users.append(User(username=email, email=email, password=self.password,
+                                  first_name=faker.first_name_male(), last_name=faker.last_name_male()))
+        User.objects.bulk_create(users, batch_size=self.batch_size)
+
+        email_addresses, user_profiles, sport_registrations, players = [], [], [], []
+        handedness_choices = [handedness[0] for handedness in HockeyPlayer.HANDEDNESS]
+        for team in teams:
+            birth_year = random.choice(config.get('bday_year'))
+            # Only some dbs set the pks of bulk created objects
+            users = User.objects.filter(username__startswith=self.get_username_prefix(team)).order_by('id')
+            for i, (user_id, email) in enumerate(users.values_list('id', 'email')):
+                email_addresses.append(EmailAddress(user_id=user_id, email=email, verified=True, primary=True))
+                user_profiles.append(UserProfile(
+                    user_id=user_id,
+                    gender=UserProfile.MALE,
+                    birthday=generate_birthday(birth_year),
+                    height=f'{random.randint(1, 8)}\' {random.randint(0, 11)}\"',
+                    weight=faker.random_int(min=UserProfile.MIN_WEIGHT, max=UserProfile.MAX_WEIGHT),
+                    timezone='US/Eastern'
+                ))
+                sport_registrations.append(SportRegistration(user_id=user_id, sport=self.sport,
+                                                             role=SportRegistration.PLAYER, is_complete=True))
+                players.append(HockeyPlayer(
+                    user_id=user_id,
+                    team=team,
+                    sport=self.sport,
+                    jersey_number=(i % self.players_per_team) + 1,
+                    position=get_position(i),
+                    handedness=faker.random_element(handedness_choices),
+                    is_active=True
+                ))
+
+        for model_cls, objs in [(EmailAddress, email_addresses), (UserProfile, user_profiles),
+                                (SportRegistration, sport_registrations), (HockeyPlayer, players)]:
+            model_cls.objects.bulk_create(objs, batch_size=self.batch_size)
+        return len(players)
+
+    def create_games(self, teams):
+        managers = dict(Manager.objects.active().filter(team__in=teams).values_list('team_id', 'user_id'))
+        matchups = list(permutations(teams, 2))
+        games = []
+        for season in self.seasons:
+            season.teams.add(*teams)
+            tz = faker.random_element(settings.TIMEZONES)
+            for home_team, away_team, start, end in self.command.get_schedule(matchups, season, tz):
+                games.append(HockeyGame(
+                    home_team=home_team,
+                    away_team=away_team,
+                    point_value=self.point_value,
+                    status=AbstractGame.SCHEDULED,
+                    type=self.game_type,
+                    timezone=tz,
+                    season=season,
+                    start=start,
+                    end=end,
+                    location_id=random.choice(self.location_ids),
+                    team=home_team,
+                    created_by_id=managers.get(home_team.pk, self.superuser_id)
+                ))
+        HockeyGame.objects.bulk_create(games, batch_size=self.batch_size)
+        return len(games)
+
+
 class Command(BaseCommand):
     help = 'Creates useful testing data'
 
@@ -74,6 +221,14 @@ class Command(BaseCommand):
         ))
         parser.add_argument('league', choices=leagues)
         parser.add_argument('--players-per-team', type=int, default=PLAYERS_PER_TEAM)
+        parser.add_argument('--scale', type=int, default=1,
+                            help='# of teams to create for each team in the seed data, copies are numbered')
+        parser.add_argument('--bulk', action='store_true',
+                            help='Create everything with bulk_create, recommended for large datasets')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Batch size used in bulk mode')
+        parser.add_argument('--processes', type=int, default=1,
+                            help='# of processes divisions are seeded by in bulk mode')
+        parser.add_argument('--seed', type=int, default=None, help='Seed for the random data, for reproducible seeds')
 
     def create_seasons(self, league):
         season_start_date = datetime.date(year=2015, month=8, day=15)
@@ -169,9 +324,15 @@ class Command(BaseCommand):
             i += 1
         return players
 
-    def create_games(self, matchups, point_value, game_type, tz, season, locations):
-        games = []
-        i = 0
+    def get_schedule(self, matchups, season, tz):
+        """
+        Schedule the matchups on Fridays and Saturdays throughout the season.
+
+        :param matchups: List of (home team, away team) tuples
+        :param season: Season the games are for
+        :param tz: Name of the timezone the games are played in
+        :return: Generator of (home team, away team, start, end) tuples
+        """
         tz = pytz.timezone(tz)
         timezone.activate(tz)
         iterator = cycle(range(2))
@@ -189,10 +350,14 @@ class Command(BaseCommand):
                 weeks += 1
             weeks = weeks % 52
 
+            start = tz.localize(start)
+            yield home_team, away_team, start, start + datetime.timedelta(hours=3)
+
+    def create_games(self, matchups, point_value, game_type, tz, season, locations):
+        games = []
+        for home_team, away_team, start, end in self.get_schedule(matchups, season, tz):
             manager = Manager.objects.active().filter(team=home_team).first()
             created_by = manager.user if manager else User.objects.filter(is_superuser=True).first()
-            start = tz.localize(start)
-            end = start + datetime.timedelta(hours=3)
             game = self.create_game(
                 home_team=home_team,
                 away_team=away_team,
@@ -217,7 +382,6 @@ class Command(BaseCommand):
                 self.stdout.write(self.style.WARNING(warning_msg.format(game.id, game.end, season)))
 
             games.append(game)
-            i += 1
         return games
 
     def create_game(self, **kwargs):
@@ -229,22 +393,12 @@ class Command(BaseCommand):
         )
         return game
 
-    def handle(self, *args, **options):
-        locations = Location.objects.all()
-        if not locations.exists():
-            raise CommandError('Please create some locations before running this command.')
-        start = timezone.now()
-
-        league = League.objects.select_related('sport').get(abbreviated_name__iexact=options.get('league'))
+    def seed_one_at_a_time(self, league, seasons, players_per_team, scale, locations):
         sport = league.sport
-        players_per_team = options.get('players_per_team')
-
-        seasons = self.create_seasons(league=league)
-
         for division_name, config in liahl_divisions.items():
             self.stdout.write(f'Creating division {division_name}')
             division, _ = self.create_division(division_name, league)
-            for team_name in config.get('teams'):
+            for team_name in get_team_names(config, scale):
                 self.stdout.write(f'  Creating organization {team_name}')
                 organization, _ = self.create_organization(team_name, division)
                 self.stdout.write(f'    Creating team {team_name}')
@@ -277,6 +431,56 @@ class Command(BaseCommand):
                 games = self.create_games(matchups, point_value, game_type, tz, season, locations)
                 self.stdout.write(f'      Created {len(games)} games')
 
+    def seed_in_bulk(self, league, seasons, players_per_team, scale, batch_size, processes, seed):
+        global _bulk_seeder
+        _bulk_seeder = BulkSeeder(self, league, seasons, players_per_team, scale, batch_size)
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        work = [(name, config, seed + i) for i, (name, config) in enumerate(liahl_divisions.items())]
+        try:
+            if processes > 1:
+                # Forked processes can't share the parent's db connections, they open their own
+                connections.close_all()
+                with multiprocessing.get_context('fork').Pool(processes) as pool:
+                    results = pool.map(seed_division_in_bulk, work)
+            else:
+                results = [_bulk_seeder.seed_division(*item) for item in work]
+        finally:
+            _bulk_seeder = None
+
+        # bulk_create doesn't send signals
+        team_ids = Team.objects.filter(league=league).values_list('id', flat=True)
+        bump_fragment_versions(
+            (LEAGUE, league.pk),
+            *[(SEASON, season.pk) for season in seasons],
+            *[(TEAM, team_id) for team_id in team_ids]
+        )
+        num_players = sum(result['players'] for result in results)
+        num_games = sum(result['games'] for result in results)
+        self.stdout.write(f'Created {num_players} players and {num_games} games')
+
+    def handle(self, *args, **options):
+        locations = Location.objects.all()
+        if not locations.exists():
+            raise CommandError('Please create some locations before running this command.')
+        start = timezone.now()
+
+        league = League.objects.select_related('sport').get(abbreviated_name__iexact=options.get('league'))
+        players_per_team = options.get('players_per_team')
+        scale = options.get('scale')
+        seed = options.get('seed')
+        if seed is not None:
+            random.seed(seed)
+            faker.seed_instance(seed)
+
+        seasons = self.create_seasons(league=league)
+
+        if options.get('bulk'):
+            self.seed_in_bulk(league, [season for season, _ in seasons], players_per_team, scale,
+                              options.get('batch_size'), options.get('processes'), seed)
+        else:
+            self.seed_one_at_a_time(league, seasons, players_per_team, scale, locations)
+
         end = timezone.now()
         self.stdout.write(f'Duration: {end - start}')
         self.stdout.write('Done')
@@ -1,11 +1,14 @@
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 from easy_thumbnails.signal_handlers import generate_aliases_global
 from easy_thumbnails.signals import saved_file
 
 from .managers import GenericChoiceManager
+from .reference_data import GENERIC_CHOICES, bump_reference_data_versions
 
 
 saved_file.connect(generate_aliases_global)
@@ -53,3 +56,9 @@ class GenericChoice(TimestampedModel):
 
     def __str__(self):
         return self.long_value
+
+
+@receiver(post_save, sender=GenericChoice)
+@receiver(post_delete, sender=GenericChoice)
+def bump_reference_data_versions_on_generic_choice_change(sender, instance, **kwargs):
+    bump_reference_data_versions(GENERIC_CHOICES)
@@ -0,0 +1,182 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+
+
+REFERENCE_DATA_VERSION_CACHE_KEY = 'reference_data:version:{name}'
+REFERENCE_DATA_CACHE_KEY = 'reference_data:{name}:{version}'
+
+SPORTS = 'sports'
+LEAGUES = 'leagues'
+DIVISIONS = 'divisions'
+LOCATIONS = 'locations'
+GENERIC_CHOICES = 'generic_choices'
+GENERIC_PENALTY_CHOICES = 'generic_penalty_choices'
+
+
+def _get_sports():
+    from sports.models import Sport
+
+    return Sport.objects.all()
+
+
+def _get_leagues():
+    from leagues.models import League
+
+    return League.objects.select_related('sport')
+
+
+def _get_divisions():
+    from divisions.models import Division
+
+    return Division.objects.select_related('league__sport')
+
+
+def _get_locations():
+    from locations.models import Location
+
+    return Location.objects.all()
+
+
+def _get_generic_choices():
+    from common.models import GenericChoice
+
+    return GenericChoice.objects.all()
+
+
+def _get_generic_penalty_choices():
+    from penalties.models import GenericPenaltyChoice
+
+    return GenericPenaltyChoice.objects.all()
+
+
+# Reference data name -> function returning the queryset for the reference data. Changes to the models a queryset
+# depends on (including select_related models) need to bump the reference data's version, see the `post_save` and
+# `post_delete` receivers in each model's app.
+REFERENCE_DATA_QUERYSETS = {
+    SPORTS: _get_sports,
+    LEAGUES: _get_leagues,
+    DIVISIONS: _get_divisions,
+    LOCATIONS: _get_locations,
+    GENERIC_CHOICES: _get_generic_choices,
+    GENERIC_PENALTY_CHOICES: _get_generic_penalty_choices,
+}
+
+# Reference data name -> (version, list of objects) loaded by this process
+_reference_data = {}
+
+
+def is_reference_data_cache_enabled():
+    return bool(getattr(settings, 'REFERENCE_DATA_CACHE_TIMEOUT', 0))
+
+
+def get_reference_data_version_cache_key(name):
+    return REFERENCE_DATA_VERSION_CACHE_KEY.format(name=name)
+
+
+def _get_version(name):
+    version_cache_key = get_reference_data_version_cache_key(name)
+    version = cache.get(version_cache_key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(version_cache_key, version, None)
+    return version
+
+
+def _load_all(name):
+    """
+    :return: All objects for the reference data, from this process if it has loaded the current version, falling back
+        to the shared cache and then the db.
+    """
+    version = _get_version(name)
+    entry = _reference_data.get(name)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    cache_key = REFERENCE_DATA_CACHE_KEY.format(name=name, version=version)
+    objects = cache.get(cache_key)
+    if objects is None:
+        objects = list(REFERENCE_DATA_QUERYSETS[name]())
+        cache.set(cache_key, objects, settings.REFERENCE_DATA_CACHE_TIMEOUT)
+    _reference_data[name] = (version, objects)
+    return objects
+
+
+def get_reference_objects(reference_data, **filters):
+    """
+    Fetch rarely changing objects (sports, leagues, locations, etc.) from the registry. The registry is populated
+    lazily, each process keeps the objects it has loaded until another process (or this one) changes them. Objects are
+    shared, callers must not modify them. When the registry has been disabled the objects are queried for.
+
+    :param reference_data: Name of the reference data, i.e. `SPORTS`
+    :param filters: Field values (no lookups) the objects need to have, i.e. `sport_id=1`
+    :return: List of objects, in the reference data queryset's order
+    """
+    if not is_reference_data_cache_enabled():
+        return list(REFERENCE_DATA_QUERYSETS[reference_data]().filter(**filters))
+    return [
+        obj for obj in _load_all(reference_data)
+        if all(getattr(obj, field) == value for field, value in filters.items())
+    ]
+
+
+def get_reference_object(reference_data, **filters):
+    """
+    :param reference_data: Name of the reference data, i.e. `SPORTS`
+    :param filters: Field values (no lookups) the object needs to have, i.e. `name='Ice Hockey'`
+    :raises DoesNotExist: If there isn't an object with the field values
+    :return: The first object with the field values
+    """
+    if not is_reference_data_cache_enabled():
+        return REFERENCE_DATA_QUERYSETS[reference_data]().get(**filters)
+    objects = get_reference_objects(reference_data, **filters)
+    if not objects:
+        model_cls = REFERENCE_DATA_QUERYSETS[reference_data]().model
+        raise model_cls.DoesNotExist(f'{model_cls.__name__} matching {filters} does not exist.')
+    return objects[0]
+
+
+def get_generic_choices(instance):
+    """
+    :param instance: Object the generic choices are for, i.e. a sport
+    :return: List of `GenericChoice` objects for the instance, of all types
+    """
+    content_type = ContentType.objects.get_for_model(instance)
+    return get_reference_objects(GENERIC_CHOICES, content_type_id=content_type.id, object_id=instance.pk)
+
+
+def lazy_model_choices(field, get_objects):
+    """
+    Build the choices of a model choice field from reference objects, so rendering the field doesn't query for them.
+    The choices are built when the field is rendered, the field's queryset is still used to validate the submitted
+    value.
+
+    field.choices = lazy_model_choices(field, lambda: get_reference_objects(LOCATIONS))
+
+    :param field: ModelChoiceField to build the choices for
+    :param get_objects: Function returning the objects the user can choose from, it is called with no args
+    :return: Function returning a list of (value, label) tuples, including the field's empty label
+    """
+    def get_choices():
+        choices = [('', field.empty_label)] if field.empty_label is not None else []
+        choices.extend((field.prepare_value(obj), field.label_from_instance(obj)) for obj in get_objects())
+        return choices
+
+    return get_choices
+
+
+def bump_reference_data_versions(*names):
+    """
+    Give each reference data a new version, all processes reload it the next time it's used. The process calling this
+    function reloads it even when the shared cache has been disabled.
+
+    NOTE: `QuerySet.update` and `bulk_create` don't send signals, code bulk changing reference data needs to call this
+    function manually.
+
+    :param names: Names of the reference data, i.e. `SPORTS`
+    """
+    for name in names:
+        _reference_data.pop(name, None)
+    if is_reference_data_cache_enabled():
+        cache.set_many({get_reference_data_version_cache_key(name): uuid.uuid4().hex for name in names}, None)
@@ -68,3 +68,26 @@ def get_seasons_nav_tab_url(context, profile_type):
 @register.simple_tag()
 def dict_get(dictionary, key):
     return dictionary.get(key) if dictionary else None
+
+
+@register.simple_tag(takes_context=True)
+def query_string(context, **kwargs):
+    """
+    Builds a query string from the current request's query params, replacing the given params. Params with a value of
+    None are removed, i.e. `{% query_string page=2 %}`.
+    """
+    params = context['request'].GET.copy()
+    for key, value in kwargs.items():
+        if value is None:
+            params.pop(key, None)
+        else:
+            params[key] = value
+    return f'?{params.urlencode()}'
+
+
+@register.simple_tag()
+def get_ordering_param(current_ordering, field):
+    """
+    :return: Ordering param for a sortable column, the column's direction is toggled when it is the current ordering.
+    """
+    return f'-{field}' if current_ordering == field else field
@@ -0,0 +1,145 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+
+from allauth.account.models import EmailAddress
+
+from ayrabo.utils.testing import BaseTestCase
+from common.models import GenericChoice
+from common.tests import GenericChoiceFactory
+from games.models import HockeyGame
+from leagues.tests import LeagueFactory
+from locations.tests import LocationFactory
+from players.models import HockeyPlayer
+from seasons.models import Season
+from sports.models import SportRegistration
+from sports.tests import SportFactory
+from standings.utils import rebuild_hockey_standings
+from stats.models import HockeyPlayerSeasonStats
+from stats.utils import rebuild_hockey_player_stats
+from teams.models import Team
+from userprofiles.models import UserProfile
+from users.models import User
+
+
+class BenchmarkBulkUploadCommandTests(BaseTestCase):
+    def test_benchmark_bulk_upload(self):
+        out = StringIO()
+        call_command('benchmark_bulk_upload', '--rows=5', '--chunk-size=2', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], 'Uploading 5 hockey players')
+        self.assertListEqual([line.split()[:2] for line in lines[-2:]], [['formset', '5'], ['streaming', '5']])
+        # Everything is rolled back
+        self.assertFalse(HockeyPlayer.objects.exists())
+        self.assertFalse(User.objects.exists())
+
+
+class BenchmarkCommandTests(BaseTestCase):
+    def setUp(self):
+        fd, self.output = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, self.output)
+
+    def test_benchmark(self):
+        out = StringIO()
+        call_command('benchmark', '--divisions=1', '--teams=2', '--players=2', '--games=4', '--iterations=2',
+                     f'--output={self.output}', stdout=out)
+        with open(self.output) as f:
+            report = json.load(f)
+        self.assertDictEqual(report['scale'], {'leagues': 1, 'divisions': 1, 'teams': 2, 'players': 2, 'games': 4})
+        self.assertEqual(len(report['results']), 11)
+        for name, result in report['results'].items():
+            self.assertEqual(result['status_code'], 200, msg=name)
+            self.assertGreater(result['queries'], 0, msg=name)
+            self.assertLessEqual(result['p50_ms'], result['p95_ms'], msg=name)
+        # Everything is rolled back
+        self.assertFalse(HockeyGame.objects.exists())
+        self.assertFalse(User.objects.exists())
+
+    def test_benchmark_seeds_standings_and_stats(self):
+        rebuilt = {}
+
+        def rebuild(func):
+            def wrapper(seasons):
+                rebuilt[func.__name__] = func(seasons)
+                return rebuilt[func.__name__]
+            return wrapper
+
+        patch_standings = mock.patch('common.management.commands.benchmark.rebuild_hockey_standings',
+                                     rebuild(rebuild_hockey_standings))
+        patch_stats = mock.patch('common.management.commands.benchmark.rebuild_hockey_player_stats',
+                                 rebuild(rebuild_hockey_player_stats))
+        with patch_standings, patch_stats:
+            call_command('benchmark', '--divisions=1', '--teams=2', '--players=2', '--games=4', '--iterations=1',
+                         '--only', 'v1:stats:leaders', f'--output={self.output}', stdout=StringIO())
+        # Past season games are completed and scored
+        num_results, num_standings = rebuilt['rebuild_hockey_standings']
+        self.assertGreaterEqual(num_results, 4)
+        self.assertEqual(num_standings, 4)
+        self.assertEqual(rebuilt['rebuild_hockey_player_stats'], 8)
+        self.assertFalse(HockeyPlayerSeasonStats.objects.exists())
+
+    def test_benchmark_only(self):
+        call_command('benchmark', '--divisions=1', '--teams=2', '--players=1', '--games=2', '--iterations=1',
+                     '--only', 'leagues:schedule', f'--output={self.output}', stdout=StringIO())
+        with open(self.output) as f:
+            self.assertListEqual(list(json.load(f)['results']), ['leagues:schedule'])
+
+
+class BenchmarkSerializersCommandTests(BaseTestCase):
+    def test_benchmark_serializers(self):
+        out = StringIO()
+        call_command('benchmark_serializers', '--rows=3', '--iterations=1', stdout=out)
+        lines = out.getvalue().splitlines()[-6:]
+        self.assertListEqual([line.split()[:3] for line in lines], [
+            ['players', 'standard', '3'],
+            ['players', 'values', '3'],
+            ['season_rosters', 'standard', '1'],
+            ['season_rosters', 'values', '1'],
+            ['game_players', 'standard', '3'],
+            ['game_players', 'values', '3'],
+        ])
+        for line in lines:
+            self.assertEqual(line.split()[-1], 'yes', msg=line)
+        # Everything is rolled back
+        self.assertFalse(HockeyPlayer.objects.exists())
+
+
+class SeedTestingDataCommandTests(BaseTestCase):
+    def setUp(self):
+        self.ice_hockey = SportFactory(name='Ice Hockey')
+        self.liahl = LeagueFactory(name='Long Island Amateur Hockey League', abbreviated_name='LIAHL',
+                                   sport=self.ice_hockey)
+        GenericChoiceFactory(short_value='league', long_value='League', type=GenericChoice.GAME_TYPE,
+                             content_object=self.ice_hockey)
+        GenericChoiceFactory(short_value='2', long_value='2', type=GenericChoice.GAME_POINT_VALUE,
+                             content_object=self.ice_hockey)
+        LocationFactory()
+
+    # Limit the seed data to a single division, there are 1000s of games per season otherwise
+    @mock.patch('common.management.commands.seed_testing_data.liahl_divisions', {
+        '16U Tier I': {'bday_year': [2000], 'teams': ['Long Island Gulls', 'Long Island Royals']},
+    })
+    def test_bulk(self):
+        call_command('seed_testing_data', 'LIAHL', '--bulk', '--players-per-team=3', '--scale=2', '--batch-size=2',
+                     '--seed=1', stdout=StringIO())
+
+        teams = Team.objects.filter(division__league=self.liahl)
+        self.assertListEqual(
+            sorted(teams.values_list('name', flat=True)),
+            ['Long Island Gulls', 'Long Island Gulls 2', 'Long Island Royals', 'Long Island Royals 2']
+        )
+        self.assertEqual(HockeyPlayer.objects.filter(team__in=teams).count(), 12)
+        self.assertEqual(UserProfile.objects.count(), 12)
+        self.assertEqual(EmailAddress.objects.filter(verified=True, primary=True).count(), 12)
+        self.assertEqual(SportRegistration.objects.filter(role=SportRegistration.PLAYER).count(), 12)
+        self.assertTrue(User.objects.first().check_password('myweakpassword'))
+
+        # Every team plays every other team at home
+        seasons = Season.objects.filter(league=self.liahl)
+        self.assertEqual(HockeyGame.objects.count(), 12 * seasons.count())
+        self.assertEqual(seasons.first().teams.count(), 4)
@@ -0,0 +1,103 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+
+from ayrabo.utils.testing import BaseTestCase
+from common.fragments import (
+    LEAGUE,
+    SEASON,
+    TEAM,
+    bump_fragment_versions,
+    get_fragment_cache_key,
+    get_fragment_versions,
+    get_or_render_fragment,
+)
+from common.models import GenericChoice
+from common.tests import GenericChoiceFactory
+from divisions.tests import DivisionFactory
+from games.tests import HockeyGameFactory
+from leagues.tests import LeagueFactory
+from players.tests import HockeyPlayerFactory
+from seasons.tests import SeasonFactory
+from sports.tests import SportFactory
+from teams.tests import TeamFactory
+
+
+@override_settings(FRAGMENT_CACHE_TIMEOUT=60)
+class FragmentsTests(BaseTestCase):
+    def setUp(self):
+        self.sport = SportFactory(name='Ice Hockey')
+        self.league = LeagueFactory(sport=self.sport)
+        self.division = DivisionFactory(league=self.league)
+        self.team = TeamFactory(division=self.division)
+        self.season = SeasonFactory(league=self.league, teams=[self.team])
+        self.scopes = [(LEAGUE, self.league.pk), (SEASON, self.season.pk), (TEAM, self.team.pk)]
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_get_fragment_versions(self):
+        versions = get_fragment_versions(self.scopes)
+        self.assertEqual(len(set(versions)), 3)
+        self.assertListEqual(get_fragment_versions(self.scopes), versions)
+
+    def test_get_or_render_fragment(self):
+        render = mock.Mock(return_value='<table></table>')
+        self.assertEqual(get_or_render_fragment('schedule', self.scopes, render), '<table></table>')
+        self.assertEqual(get_or_render_fragment('schedule', self.scopes, render), '<table></table>')
+        self.assertEqual(render.call_count, 1)
+        get_or_render_fragment('schedule', self.scopes, render, vary_on=['page=2'])
+        get_or_render_fragment('players', self.scopes, render)
+        self.assertEqual(render.call_count, 3)
+
+    @override_settings(FRAGMENT_CACHE_TIMEOUT=0)
+    def test_get_or_render_fragment_disabled(self):
+        render = mock.Mock(return_value='<table></table>')
+        get_or_render_fragment('schedule', self.scopes, render)
+        get_or_render_fragment('schedule', self.scopes, render)
+        self.assertEqual(render.call_count, 2)
+        self.assertIsNone(cache.get(get_fragment_cache_key('schedule', self.scopes)))
+
+    def test_bump_fragment_versions(self):
+        cache_key = get_fragment_cache_key('schedule', self.scopes)
+        bump_fragment_versions((TEAM, self.team.pk + 1), (SEASON, None))
+        self.assertEqual(get_fragment_cache_key('schedule', self.scopes), cache_key)
+        bump_fragment_versions((TEAM, self.team.pk))
+        self.assertNotEqual(get_fragment_cache_key('schedule', self.scopes), cache_key)
+
+    def test_versions_bumped_on_changes(self):
+        def assert_bumped(scope, pk, func):
+            versions = get_fragment_versions([(scope, pk)])
+            func()
+            self.assertNotEqual(get_fragment_versions([(scope, pk)]), versions)
+
+        assert_bumped(TEAM, self.team.pk, lambda: HockeyPlayerFactory(team=self.team, sport=self.sport))
+        assert_bumped(TEAM, self.team.pk, lambda: self.team.save())
+        assert_bumped(LEAGUE, self.league.pk, lambda: self.team.save())
+        assert_bumped(LEAGUE, self.league.pk, lambda: self.division.save())
+        assert_bumped(LEAGUE, self.league.pk, lambda: self.season.save())
+        assert_bumped(SEASON, self.season.pk, lambda: self.season.teams.remove(self.team))
+        assert_bumped(SEASON, self.season.pk, lambda: self.team.seasons.add(self.season))
+
+    def test_versions_bumped_on_displayed_name_changes(self):
+        game_type = GenericChoiceFactory(content_object=self.sport, short_value='exhibition', long_value='Exhibition',
+                                         type=GenericChoice.GAME_TYPE)
+        point_value = GenericChoiceFactory(content_object=self.sport, short_value='2', long_value='2',
+                                           type=GenericChoice.GAME_POINT_VALUE)
+        game = HockeyGameFactory(home_team=self.team, away_team=self.team, season=self.season, type=game_type,
+                                 point_value=point_value)
+        player = HockeyPlayerFactory(team=self.team, sport=self.sport)
+
+        def assert_bumped(scope, pk, func, bumped=True):
+            versions = get_fragment_versions([(scope, pk)])
+            func()
+            self.assertEqual(get_fragment_versions([(scope, pk)]) != versions, bumped)
+
+        assert_bumped(SEASON, self.season.pk, lambda: game.location.save())
+        assert_bumped(SEASON, self.season.pk, lambda: game_type.save())
+        assert_bumped(SEASON, self.season.pk, lambda: point_value.save(), bumped=False)
+        assert_bumped(TEAM, self.team.pk, lambda: player.user.save())
+        assert_bumped(TEAM, self.team.pk, lambda: player.user.save(update_fields=['last_name']))
+        # i.e. logging in
+        assert_bumped(TEAM, self.team.pk, lambda: player.user.save(update_fields=['last_login']), bumped=False)
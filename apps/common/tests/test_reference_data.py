@@ -0,0 +1,112 @@
+from django import forms
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import override_settings
+
+from ayrabo.utils.testing import BaseTestCase
+from common import reference_data
+from common.models import GenericChoice
+from common.reference_data import (
+    DIVISIONS,
+    LOCATIONS,
+    SPORTS,
+    get_generic_choices,
+    get_reference_data_version_cache_key,
+    get_reference_object,
+    get_reference_objects,
+    lazy_model_choices,
+)
+from common.tests import GenericChoiceFactory
+from divisions.tests import DivisionFactory
+from locations.models import Location
+from locations.tests import LocationFactory
+from sports.models import Sport
+from sports.tests import SportFactory
+
+
+class ReferenceDataDisabledTests(BaseTestCase):
+    def setUp(self):
+        self.ice_hockey = SportFactory(name='Ice Hockey')
+        self.baseball = SportFactory(name='Baseball')
+
+    def test_queries_each_time(self):
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                self.assertListEqual(get_reference_objects(SPORTS), [self.baseball, self.ice_hockey])
+
+    def test_get_reference_object(self):
+        self.assertEqual(get_reference_object(SPORTS, name='Ice Hockey'), self.ice_hockey)
+        with self.assertRaises(Sport.DoesNotExist):
+            get_reference_object(SPORTS, name='Basketball')
+
+
+@override_settings(REFERENCE_DATA_CACHE_TIMEOUT=60)
+class ReferenceDataTests(BaseTestCase):
+    def setUp(self):
+        self.ice_hockey = SportFactory(name='Ice Hockey')
+        self.baseball = SportFactory(name='Baseball')
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_loaded_once(self):
+        with self.assertNumQueries(1):
+            self.assertListEqual(get_reference_objects(SPORTS), [self.baseball, self.ice_hockey])
+        with self.assertNumQueries(0):
+            self.assertListEqual(get_reference_objects(SPORTS), [self.baseball, self.ice_hockey])
+            self.assertListEqual(get_reference_objects(SPORTS, name='Baseball'), [self.baseball])
+
+    def test_get_reference_object(self):
+        get_reference_objects(SPORTS)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_reference_object(SPORTS, name='Ice Hockey'), self.ice_hockey)
+            with self.assertRaises(Sport.DoesNotExist):
+                get_reference_object(SPORTS, name='Basketball')
+
+    def test_shared_cache(self):
+        get_reference_objects(SPORTS)
+        # i.e. another process
+        reference_data._reference_data.clear()
+        with self.assertNumQueries(0):
+            self.assertListEqual(get_reference_objects(SPORTS), [self.baseball, self.ice_hockey])
+
+    def test_invalidated_on_change(self):
+        get_reference_objects(SPORTS)
+        basketball = SportFactory(name='Basketball')
+        with self.assertNumQueries(1):
+            self.assertListEqual(get_reference_objects(SPORTS), [self.baseball, basketball, self.ice_hockey])
+        basketball.delete()
+        self.assertListEqual(get_reference_objects(SPORTS), [self.baseball, self.ice_hockey])
+
+    def test_invalidated_by_other_process(self):
+        get_reference_objects(SPORTS)
+        Sport.objects.filter(pk=self.baseball.pk).update(name='Softball')
+        # i.e. another process changed a sport, this process' objects are stale
+        cache.set(get_reference_data_version_cache_key(SPORTS), 'new version', None)
+        self.assertListEqual([sport.name for sport in get_reference_objects(SPORTS)], ['Ice Hockey', 'Softball'])
+
+    def test_invalidated_by_related_changes(self):
+        division = DivisionFactory(league__sport=self.ice_hockey)
+        self.assertEqual(get_reference_object(DIVISIONS, pk=division.pk).league.sport.name, 'Ice Hockey')
+        self.ice_hockey.name = 'Hockey'
+        self.ice_hockey.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_reference_object(DIVISIONS, pk=division.pk).league.sport.name, 'Hockey')
+
+    def test_get_generic_choices(self):
+        choice = GenericChoiceFactory(content_object=self.ice_hockey, type=GenericChoice.GAME_TYPE)
+        GenericChoiceFactory(content_object=self.baseball, type=GenericChoice.GAME_TYPE)
+        ContentType.objects.get_for_model(Sport)
+        with self.assertNumQueries(1):
+            self.assertListEqual(get_generic_choices(self.ice_hockey), [choice])
+
+    def test_lazy_model_choices(self):
+        locations = sorted(LocationFactory.create_batch(2), key=lambda location: location.name)
+        field = forms.ModelChoiceField(queryset=Location.objects.all())
+        with self.assertNumQueries(0):
+            field.choices = lazy_model_choices(field, lambda: get_reference_objects(LOCATIONS))
+        self.assertListEqual(list(field.choices), [('', field.empty_label)] + [
+            (location.pk, location.name) for location in locations
+        ])
+        with self.assertNumQueries(0):
+            list(field.widget.choices)
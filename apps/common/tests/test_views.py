@@ -0,0 +1,14 @@
+from django.urls import reverse
+
+from ayrabo.db.pool import get_connection_metrics
+from ayrabo.utils.testing import BaseTestCase
+
+
+class HealthCheckViewTests(BaseTestCase):
+    def test_get(self):
+        get_connection_metrics('default')
+        response = self.client.get(reverse('health-check'))
+        self.assert_200(response)
+        data = response.json()
+        self.assertEqual(data.get('status'), 'ayrabo.com is up')
+        self.assertIn('checkouts', data.get('connections').get('default'))
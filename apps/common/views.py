@@ -1,8 +1,10 @@
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.shortcuts import get_current_site
-from django.http import HttpResponse
+from django.http import JsonResponse
 from django.views import generic
 
+from ayrabo.db.pool import get_connection_stats
+
 
 class HealthCheckView(generic.View):
     def get(self, request, *args, **kwargs):
@@ -10,4 +12,8 @@ class HealthCheckView(generic.View):
         site = get_current_site(request)
         # Actually hit the database to check for connectivity
         ContentType.objects.first()
-        return HttpResponse('{} is up'.format(site.domain))
+        return JsonResponse({
+            'status': '{} is up'.format(site.domain),
+            # Connection metrics (checkouts, waits, reconnects, etc.) for the worker process that served the request
+            'connections': get_connection_stats(),
+        })
@@ -1,7 +1,11 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.text import slugify
 
+from common.fragments import LEAGUE, bump_fragment_versions
 from common.models import TimestampedModel
+from common.reference_data import DIVISIONS, bump_reference_data_versions
 
 
 class Division(TimestampedModel):
@@ -27,3 +31,28 @@ class Division(TimestampedModel):
 
     def __str__(self):
         return self.name
+
+
+@receiver(post_save, sender=Division)
+@receiver(post_delete, sender=Division)
+def bump_fragment_versions_on_division_change(sender, instance, **kwargs):
+    bump_fragment_versions((LEAGUE, instance.league_id))
+
+
+@receiver(post_save, sender=Division)
+@receiver(post_delete, sender=Division)
+def bump_reference_data_versions_on_division_change(sender, instance, **kwargs):
+    bump_reference_data_versions(DIVISIONS)
+
+
+@receiver(post_save, sender=Division)
+def sync_denormalized_keys_on_division_change(sender, instance, created, **kwargs):
+    """
+    Teams have their division's league and sport, which change if the division is moved to another league.
+    """
+    if created:
+        return
+    from teams.denormalized import sync_denormalized_keys
+    from teams.models import Team
+
+    sync_denormalized_keys(Team.objects.filter(division=instance))
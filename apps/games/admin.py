@@ -6,11 +6,11 @@ from django.utils import timezone
 from ayrabo.utils.admin.mixins import AdminBulkUploadMixin
 from ayrabo.utils.form_fields import SeasonModelChoiceField, TeamModelChoiceField
 from common.models import GenericChoice
+from common.reference_data import SPORTS, get_reference_object
 from games.models import HockeyGame, HockeyGamePlayer
 from seasons.models import Season
-from sports.models import Sport
 from teams.models import Team
-from .forms import HockeyGameCreateForm
+from .forms import HockeyGameCreateForm, set_game_choices
 from .models import HockeyAssist, HockeyGoal
 
 
@@ -31,10 +31,10 @@ class AbstractGameAdminForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        sport = Sport.objects.get(name=self.sport_name)
+        sport = get_reference_object(SPORTS, name=self.sport_name)
 
         TeamModel = self.fields['home_team'].queryset.model
-        teams = TeamModel.objects.select_related('division').filter(division__league__sport=sport)
+        teams = TeamModel.objects.select_related('division').filter(sport=sport)
         self.fields['home_team'].queryset = teams
         self.fields['away_team'].queryset = teams
 
@@ -42,6 +42,7 @@ class AbstractGameAdminForm(forms.ModelForm):
         choices = GenericChoiceModel.objects.get_choices(instance=sport)
         self.fields['type'].queryset = choices.filter(type=GenericChoice.GAME_TYPE)
         self.fields['point_value'].queryset = choices.filter(type=GenericChoice.GAME_POINT_VALUE)
+        set_game_choices(self.fields, sport)
 
         SeasonModel = self.fields['season'].queryset.model
         self.fields['season'].queryset = SeasonModel.objects.select_related('league').filter(league__sport=sport)
@@ -69,7 +70,7 @@ class HockeyGameAdminForm(AbstractGameAdminForm):
 class HockeyGoalAdminForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        sport = Sport.objects.get(name='Ice Hockey')
+        sport = get_reference_object(SPORTS, name='Ice Hockey')
 
         HockeyPlayerModel = self.fields['player'].queryset.model
         players = HockeyPlayerModel.objects.active().select_related('user').filter(sport=sport)
@@ -79,7 +80,7 @@ class HockeyGoalAdminForm(forms.ModelForm):
 class HockeyAssistAdminForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        sport = Sport.objects.get(name='Ice Hockey')
+        sport = get_reference_object(SPORTS, name='Ice Hockey')
 
         HockeyPlayerModel = self.fields['player'].queryset.model
         players = HockeyPlayerModel.objects.active().select_related('user').filter(sport=sport)
@@ -0,0 +1,80 @@
+import datetime
+
+import django_filters
+from django import forms
+from django.db.models import Q
+from django.utils import timezone
+
+from locations.models import Location
+from teams.models import Team
+from .models import AbstractGame
+
+
+class GameScheduleFilterSet(django_filters.FilterSet):
+    """
+    Filters and sorting for a season's schedule. The choices for the team and location filters are limited to the
+    season's teams and the locations the season's games are played at.
+    """
+    DEFAULT_ORDERING = '-start'
+
+    team = django_filters.ModelChoiceFilter(queryset=Team.objects.none(), method='filter_team', label='Team',
+                                            empty_label='All teams')
+    status = django_filters.ChoiceFilter(choices=AbstractGame.GAME_STATUSES, empty_label='All statuses')
+    location = django_filters.ModelChoiceFilter(queryset=Location.objects.none(), empty_label='All locations')
+    start_after = django_filters.DateFilter(method='filter_start_after', label='From',
+                                            widget=forms.DateInput(attrs={'type': 'date', 'title': 'From'}))
+    start_before = django_filters.DateFilter(method='filter_start_before', label='To',
+                                             widget=forms.DateInput(attrs={'type': 'date', 'title': 'To'}))
+    ordering = django_filters.OrderingFilter(
+        fields=(
+            ('pk', 'id'),
+            ('home_team__name', 'home'),
+            ('away_team__name', 'away'),
+            ('type__long_value', 'type'),
+            ('status', 'status'),
+            ('location__name', 'location'),
+            ('start', 'start'),
+            ('end', 'end'),
+        )
+    )
+
+    def __init__(self, *args, season, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.filters['team'].queryset = season.teams.order_by('name')
+        location_ids = self.queryset.model.objects.filter(season=season).values('location_id')
+        self.filters['location'].queryset = Location.objects.filter(id__in=location_ids).order_by('name')
+        for field in self.form.fields.values():
+            field.widget.attrs['class'] = 'form-control input-sm'
+
+    def filter_team(self, queryset, name, value):
+        return queryset.filter(Q(home_team=value) | Q(away_team=value))
+
+    def _start_of_day(self, value):
+        return timezone.make_aware(datetime.datetime.combine(value, datetime.time.min))
+
+    def filter_start_after(self, queryset, name, value):
+        # Compare against the start of the day, filtering on `start__date` would prevent the db from using the index
+        return queryset.filter(start__gte=self._start_of_day(value))
+
+    def filter_start_before(self, queryset, name, value):
+        return queryset.filter(start__lt=self._start_of_day(value + datetime.timedelta(days=1)))
+
+    @property
+    def is_filtered(self):
+        return self.is_valid() and any(
+            self.form.cleaned_data.get(name) not in [None, ''] for name in self.filters if name != 'ordering'
+        )
+
+    def get_ordering(self):
+        """
+        :return: The requested ordering param, i.e. `-start`, or the default ordering
+        """
+        ordering = self.form.cleaned_data.get('ordering') if self.is_valid() else None
+        return ordering[0] if ordering else self.DEFAULT_ORDERING
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not self.form.cleaned_data.get('ordering'):
+            queryset = queryset.order_by(self.DEFAULT_ORDERING)
+        # Games with the same value for the sorted column need a consistent order to paginate over
+        return queryset.order_by(*queryset.query.order_by, 'pk')
@@ -9,6 +9,7 @@ from django.utils import timezone
 from ayrabo.utils.form_fields import SeasonModelChoiceField, TeamModelChoiceField
 from ayrabo.utils.mixins import DisableFormFieldsMixin
 from common.models import GenericChoice
+from common.reference_data import LOCATIONS, get_generic_choices, get_reference_objects, lazy_model_choices
 from games.form_fields import GamePlayerField
 from games.models import HockeyGame
 from seasons.models import Season
@@ -18,6 +19,30 @@ from teams.models import Team
 DATETIME_INPUT_FORMAT = '%m/%d/%Y %I:%M %p'
 
 
+def set_game_choices(fields, sport, ordering=None):
+    """
+    Build the choices of a game form's type, point value and location fields from reference data, so rendering the form
+    doesn't query for them.
+
+    :param fields: The form's fields
+    :param sport: Sport of the game
+    :param ordering: Optional, `GenericChoice` field to sort the type and point value choices by
+    """
+    def get_generic_choices_for_type(choice_type):
+        choices = [choice for choice in get_generic_choices(sport) if choice.type == choice_type]
+        if ordering is not None:
+            choices.sort(key=lambda choice: getattr(choice, ordering))
+        return choices
+
+    fields['type'].choices = lazy_model_choices(
+        fields['type'], lambda: get_generic_choices_for_type(GenericChoice.GAME_TYPE)
+    )
+    fields['point_value'].choices = lazy_model_choices(
+        fields['point_value'], lambda: get_generic_choices_for_type(GenericChoice.GAME_POINT_VALUE)
+    )
+    fields['location'].choices = lazy_model_choices(fields['location'], lambda: get_reference_objects(LOCATIONS))
+
+
 class AbstractGameCreateUpdateForm(forms.ModelForm):
     season = SeasonModelChoiceField(queryset=Season.objects.all())
     home_team = TeamModelChoiceField(queryset=Team.objects.all(), label='Home Team')
@@ -79,6 +104,8 @@ class AbstractGameCreateUpdateForm(forms.ModelForm):
         choices = GenericChoiceModel.objects.get_choices(instance=sport).order_by('long_value')
         self.fields['type'].queryset = choices.filter(type=GenericChoice.GAME_TYPE)
         self.fields['point_value'].queryset = choices.filter(type=GenericChoice.GAME_POINT_VALUE)
+        # The querysets validate the submitted choices, the dropdowns are built from the reference data
+        set_game_choices(self.fields, sport, ordering='long_value')
 
         SeasonModel = self.fields['season'].queryset.model
         self.fields['season'].queryset = SeasonModel.objects.select_related('league').filter(league=league)
@@ -4,6 +4,7 @@ from api.v1.games.serializers import (
     HockeyGamePlayerBulkDeleteSerializer,
     HockeyGamePlayerBulkUpdateSerializer,
     HockeyGamePlayerSerializer,
+    HockeyGameRosterSyncSerializer,
 )
 from ayrabo.utils.exceptions import SportNotConfiguredException
 from games.forms import HockeyGameCreateForm, HockeyGameScoresheetForm, HockeyGameUpdateForm
@@ -49,6 +50,10 @@ SPORT_GAME_PLAYER_BULK_DELETE_SERIALIZER_CLASS_MAPPINGS = {
     'ice-hockey': HockeyGamePlayerBulkDeleteSerializer,
 }
 
+SPORT_GAME_ROSTER_SYNC_SERIALIZER_CLASS_MAPPINGS = {
+    'ice-hockey': HockeyGameRosterSyncSerializer,
+}
+
 
 def get_game_model_cls(sport, exception_cls=SportNotConfiguredException):
     model_cls = SPORT_GAME_MODEL_MAPPINGS.get(sport.name)
@@ -82,7 +87,8 @@ def get_game_player_serializer_cls_mappings(action):
     mappings = {
         'bulk_create': SPORT_GAME_PLAYER_BULK_CREATE_SERIALIZER_CLASS_MAPPINGS,
         'bulk_update': SPORT_GAME_PLAYER_BULK_UPDATE_SERIALIZER_CLASS_MAPPINGS,
-        'bulk_delete': SPORT_GAME_PLAYER_BULK_DELETE_SERIALIZER_CLASS_MAPPINGS
+        'bulk_delete': SPORT_GAME_PLAYER_BULK_DELETE_SERIALIZER_CLASS_MAPPINGS,
+        'sync': SPORT_GAME_ROSTER_SYNC_SERIALIZER_CLASS_MAPPINGS,
     }
     return mappings.get(action, SPORT_GAME_PLAYER_SERIALIZER_CLASS_MAPPINGS)
 
@@ -0,0 +1,37 @@
+# Generated by Django 2.2.28 on 2026-10-18 13:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0008_auto_20201225_0134'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='baseballgame',
+            index=models.Index(fields=['season', 'start'], name='baseballgame_season_start'),
+        ),
+        migrations.AddIndex(
+            model_name='baseballgame',
+            index=models.Index(fields=['home_team', 'start'], name='baseballgame_home_team_start'),
+        ),
+        migrations.AddIndex(
+            model_name='baseballgame',
+            index=models.Index(fields=['away_team', 'start'], name='baseballgame_away_team_start'),
+        ),
+        migrations.AddIndex(
+            model_name='hockeygame',
+            index=models.Index(fields=['season', 'start'], name='hockeygame_season_start'),
+        ),
+        migrations.AddIndex(
+            model_name='hockeygame',
+            index=models.Index(fields=['home_team', 'start'], name='hockeygame_home_team_start'),
+        ),
+        migrations.AddIndex(
+            model_name='hockeygame',
+            index=models.Index(fields=['away_team', 'start'], name='hockeygame_away_team_start'),
+        ),
+    ]
@@ -4,9 +4,13 @@ import pytz
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone as timezone_util
 
-from common.models import TimestampedModel
+from common.fragments import SEASON, bump_fragment_versions, is_fragment_cache_enabled
+from common.models import GenericChoice, TimestampedModel
+from locations.models import Location
 from periods.model_fields import PeriodDurationField
 from periods.models import HockeyPeriod
 from userprofiles.models import UserProfile
@@ -212,6 +216,14 @@ class HockeyGame(AbstractGame):
         related_name='away_games'
     )
 
+    class Meta(AbstractGame.Meta):
+        # Schedules list a season's or a team's games by start
+        indexes = [
+            models.Index(fields=['season', 'start'], name='hockeygame_season_start'),
+            models.Index(fields=['home_team', 'start'], name='hockeygame_home_team_start'),
+            models.Index(fields=['away_team', 'start'], name='hockeygame_away_team_start'),
+        ]
+
     def _get_game_players(self, team_or_team_pk):
         return HockeyGamePlayer.objects.filter(
             game=self,
@@ -246,6 +258,14 @@ class BaseballGame(AbstractGame):
         related_name='away_games'
     )
 
+    class Meta(AbstractGame.Meta):
+        # Schedules list a season's or a team's games by start
+        indexes = [
+            models.Index(fields=['season', 'start'], name='baseballgame_season_start'),
+            models.Index(fields=['home_team', 'start'], name='baseballgame_home_team_start'),
+            models.Index(fields=['away_team', 'start'], name='baseballgame_away_team_start'),
+        ]
+
     def _get_game_players(self, team_or_team_pk):
         return BaseballGamePlayer.objects.filter(
             game=self,
@@ -345,3 +365,42 @@ class HockeyAssist(TimestampedModel):
 
     def __str__(self):
         return '{} {}'.format(self.player.user.last_name, self.goal)
+
+
+@receiver(post_save, sender=HockeyGame)
+@receiver(post_delete, sender=HockeyGame)
+@receiver(post_save, sender=BaseballGame)
+@receiver(post_delete, sender=BaseballGame)
+def bump_fragment_versions_on_game_change(sender, instance, **kwargs):
+    """
+    Schedules are cached per season (see `games.utils.get_game_list_fragment`).
+    """
+    bump_fragment_versions((SEASON, instance.season_id))
+
+
+def _bump_game_season_fragment_versions(**filters):
+    """
+    Bump the schedules of the seasons that have games matching the filters, i.e. `location_id=1`.
+    """
+    season_ids = set()
+    for game_model_cls in [HockeyGame, BaseballGame]:
+        season_ids.update(game_model_cls.objects.filter(**filters).order_by().values_list('season_id', flat=True))
+    bump_fragment_versions(*[(SEASON, season_id) for season_id in season_ids])
+
+
+@receiver(post_save, sender=Location)
+def bump_fragment_versions_on_location_change(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Schedules display the names of the locations games are played at. Locations with games can't be deleted.
+    """
+    if is_fragment_cache_enabled() and not created and not raw:
+        _bump_game_season_fragment_versions(location_id=instance.pk)
+
+
+@receiver(post_save, sender=GenericChoice)
+def bump_fragment_versions_on_generic_choice_change(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Schedules display the games' types. Generic choices used by games can't be deleted.
+    """
+    if is_fragment_cache_enabled() and not created and not raw and instance.type == GenericChoice.GAME_TYPE:
+        _bump_game_season_fragment_versions(type_id=instance.pk)
@@ -0,0 +1,76 @@
+import hashlib
+
+from django.db import transaction
+from django.utils import timezone
+
+
+class StaleGameRosterException(Exception):
+    """
+    Raised when a game roster has changed since the client fetched it, i.e. someone else updated it in the meantime.
+    """
+    pass
+
+
+def get_game_roster_version(game_players):
+    """
+    Compute a version token for a team's game roster, the token changes whenever a game player is added, removed or
+    has its `is_starting` changed. Clients send the token back when syncing the roster so changes made by someone
+    else in the meantime aren't overwritten.
+
+    :param game_players: Game players (i.e. `HockeyGamePlayer`) for the game and team
+    :return: Version token (str)
+    """
+    rows = sorted((obj.pk, obj.player_id, obj.is_starting) for obj in game_players)
+    return hashlib.sha1(repr(rows).encode('utf-8')).hexdigest()
+
+
+def _get_game_players(game_player_model_cls, game, team):
+    # Game players for inactive players can't be managed by users, leave them alone
+    return game_player_model_cls.objects.filter(game=game, team=team, player__is_active=True)
+
+
+def sync_game_roster(game_player_model_cls, game, team, players, version):
+    """
+    Make a team's game roster match the desired end state. The differences are applied with one delete, one bulk
+    update and one bulk insert, in a single transaction. The game's row is locked for the duration of the transaction,
+    so concurrent syncs for the game are applied one at a time.
+
+    :param game_player_model_cls: Game player model class for the game's sport, i.e. `HockeyGamePlayer`
+    :param game: Game the roster is for
+    :param team: Home or away team of the game
+    :param players: Dict of player id -> whether the player is starting, validated by the caller
+    :param version: Version token of the roster the desired state is based off of, see `get_game_roster_version`
+    :raises StaleGameRosterException: If the roster has changed since `version` was computed
+    :return: List of game players for the team after the sync
+    """
+    with transaction.atomic():
+        list(game.__class__.objects.select_for_update().filter(pk=game.pk).values_list('pk', flat=True))
+        current = list(_get_game_players(game_player_model_cls, game, team))
+        if get_game_roster_version(current) != version:
+            raise StaleGameRosterException()
+
+        now = timezone.now()
+        current_player_ids = set()
+        delete_ids = []
+        updates = []
+        for obj in current:
+            current_player_ids.add(obj.player_id)
+            if obj.player_id not in players:
+                delete_ids.append(obj.pk)
+            elif obj.is_starting != players[obj.player_id]:
+                obj.is_starting = players[obj.player_id]
+                # `bulk_update` doesn't set `auto_now` fields
+                obj.updated = now
+                updates.append(obj)
+        creates = [
+            game_player_model_cls(game=game, team=team, player_id=player_id, is_starting=is_starting)
+            for player_id, is_starting in players.items() if player_id not in current_player_ids
+        ]
+
+        if delete_ids:
+            game_player_model_cls.objects.filter(pk__in=delete_ids).delete()
+        if updates:
+            game_player_model_cls.objects.bulk_update(updates, ['is_starting', 'updated'])
+        if creates:
+            game_player_model_cls.objects.bulk_create(creates)
+        return list(_get_game_players(game_player_model_cls, game, team).order_by('pk'))
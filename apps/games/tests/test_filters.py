@@ -0,0 +1,98 @@
+import datetime
+
+from django.http import QueryDict
+from django.utils import timezone
+
+from ayrabo.utils.testing import BaseTestCase
+from common.models import GenericChoice
+from common.tests import GenericChoiceFactory
+from games import utils
+from games.models import HockeyGame
+from games.tests import HockeyGameFactory
+from locations.tests import LocationFactory
+from seasons.tests import SeasonFactory
+from sports.tests import SportFactory
+from teams.tests import TeamFactory
+from users.tests import UserFactory
+
+
+class GameScheduleFilterSetTests(BaseTestCase):
+    def setUp(self):
+        self.sport = SportFactory(name='Ice Hockey')
+        self.t1 = TeamFactory(name='Green Machine IceCats', division__league__sport=self.sport)
+        self.t2 = TeamFactory(name='Long Island Edge', division=self.t1.division)
+        self.t3 = TeamFactory(name='Aces', division=self.t1.division)
+        self.season = SeasonFactory(league=self.t1.division.league, teams=[self.t1, self.t2, self.t3])
+        self.rink1 = LocationFactory(name='Iceland')
+        self.rink2 = LocationFactory(name='Dix Hills')
+        self.user = UserFactory()
+        self.start = timezone.make_aware(datetime.datetime.combine(self.season.start_date, datetime.time(hour=19)))
+        self.game_kwargs = {
+            'season': self.season,
+            'type': GenericChoiceFactory(content_object=self.sport, short_value='exhibition',
+                                         long_value='Exhibition', type=GenericChoice.GAME_TYPE),
+            'point_value': GenericChoiceFactory(content_object=self.sport, short_value='2', long_value='2',
+                                                type=GenericChoice.GAME_POINT_VALUE),
+        }
+        self.g1 = self._create_game(self.t1, self.t2, self.rink1, days=0, status=HockeyGame.COMPLETED)
+        self.g2 = self._create_game(self.t2, self.t3, self.rink2, days=1, status=HockeyGame.COMPLETED)
+        self.g3 = self._create_game(self.t3, self.t1, self.rink1, days=2)
+        self.g4 = self._create_game(self.t1, self.t3, self.rink2, days=3)
+
+    def _create_game(self, home_team, away_team, location, days, status=HockeyGame.SCHEDULED):
+        return HockeyGameFactory(home_team=home_team, away_team=away_team, location=location, status=status,
+                                 start=self.start + datetime.timedelta(days=days), **self.game_kwargs)
+
+    def _get_context(self, query_string='', team=None, page_size=utils.GAMES_PAGE_SIZE):
+        return utils.get_game_list_view_context(self.user, self.sport, self.season, team=team,
+                                                query_params=QueryDict(query_string), page_size=page_size)
+
+    def assertGames(self, query_string, expected, **kwargs):
+        context = self._get_context(query_string, **kwargs)
+        self.assertListEqual(list(context['page_obj']), expected)
+
+    def test_default_ordering(self):
+        self.assertGames('', [self.g4, self.g3, self.g2, self.g1])
+        self.assertGames('', [self.g4, self.g3, self.g1], team=self.t1)
+
+    def test_filters(self):
+        self.assertGames(f'team={self.t2.pk}', [self.g2, self.g1])
+        self.assertGames(f'status={HockeyGame.COMPLETED}', [self.g2, self.g1])
+        self.assertGames(f'location={self.rink2.pk}', [self.g4, self.g2])
+        start_date = self.start.date()
+        start_after = start_date + datetime.timedelta(days=1)
+        start_before = start_date + datetime.timedelta(days=2)
+        self.assertGames(f'start_after={start_after}&start_before={start_before}', [self.g3, self.g2])
+        self.assertGames(f'team={self.t3.pk}&location={self.rink1.pk}', [self.g3])
+        # Opponents on a team's schedule
+        self.assertGames(f'team={self.t2.pk}', [self.g1], team=self.t1)
+
+    def test_filter_choices(self):
+        other_location = LocationFactory()
+        filterset = self._get_context()['filterset']
+        self.assertListEqual(list(filterset.filters['team'].queryset), [self.t3, self.t1, self.t2])
+        self.assertListEqual(list(filterset.filters['location'].queryset), [self.rink2, self.rink1])
+        # Invalid choices are ignored
+        self.assertGames(f'location={other_location.pk}&status=invalid', [self.g4, self.g3, self.g2, self.g1])
+
+    def test_is_filtered(self):
+        self.assertFalse(self._get_context('ordering=home')['filterset'].is_filtered)
+        self.assertTrue(self._get_context(f'team={self.t1.pk}')['filterset'].is_filtered)
+
+    def test_ordering(self):
+        self.assertGames('ordering=home', [self.g3, self.g1, self.g4, self.g2])
+        self.assertGames('ordering=-home', [self.g2, self.g1, self.g4, self.g3])
+        self.assertGames('ordering=start', [self.g1, self.g2, self.g3, self.g4])
+        self.assertEqual(self._get_context('ordering=-home')['ordering'], '-home')
+        self.assertEqual(self._get_context('ordering=invalid')['ordering'], '-start')
+
+    def test_pagination(self):
+        context = self._get_context('page=2', page_size=3)
+        self.assertListEqual(list(context['page_obj']), [self.g1])
+        self.assertEqual(context['page_obj'].paginator.count, 4)
+        # Only the games on the page are authorized
+        self.assertListEqual(list(context['game_authorizations'].keys()), [self.g1.pk])
+        # Out of range pages show the last page
+        self.assertListEqual(list(self._get_context('page=100', page_size=3)['page_obj']), [self.g1])
+        context = self._get_context(f'team={self.t1.pk}&status={HockeyGame.POSTPONED}')
+        self.assertEqual(context['page_obj'].paginator.count, 0)
@@ -1,6 +1,8 @@
 import datetime
 
 import pytz
+from django.core.cache import cache
+from django.test import override_settings
 from django.utils import timezone
 
 from ayrabo.utils.testing import BaseTestCase
@@ -11,6 +13,7 @@ from games.forms import HockeyGameCreateForm, HockeyGameScoresheetForm, HockeyGa
 from games.models import AbstractGame
 from games.tests import HockeyGameFactory, HockeyGamePlayerFactory
 from leagues.tests import LeagueFactory
+from locations.tests import LocationFactory
 from players.tests import HockeyPlayerFactory
 from seasons.tests import SeasonFactory
 from sports.tests import SportFactory
@@ -70,6 +73,30 @@ class AbstractGameCreateUpdateFormTests(BaseTestCase):
         point_value_qs = form.fields['point_value'].queryset
         self.assertListEqual(list(point_value_qs.values_list('id', flat=True)), [2])
 
+    def test_choices(self):
+        location = LocationFactory()
+        league = GenericChoiceFactory(short_value='league', long_value='League', type=GenericChoice.GAME_TYPE,
+                                      content_object=self.ice_hockey)
+        GenericChoiceFactory(type=GenericChoice.GAME_TYPE, content_object=SportFactory(name='Baseball'))
+        form = self.form_cls(team=self.t4)
+        self.assertListEqual(list(form.fields['type'].choices), [
+            ('', '---------'), (1, 'Exhibition'), (league.pk, 'League')
+        ])
+        self.assertListEqual(list(form.fields['point_value'].choices), [('', '---------'), (2, '2')])
+        self.assertListEqual(list(form.fields['location'].choices), [('', '---------'), (location.pk, location.name)])
+
+    @override_settings(REFERENCE_DATA_CACHE_TIMEOUT=60)
+    def test_choices_from_reference_data(self):
+        self.addCleanup(cache.clear)
+        LocationFactory()
+        form = self.form_cls(team=self.t4)
+        form.as_p()
+        with self.assertNumQueries(0):
+            form = self.form_cls(team=self.t4)
+            list(form.fields['type'].choices)
+            list(form.fields['point_value'].choices)
+            list(form.fields['location'].choices)
+
     def test_season_filtered_by_league(self):
         SeasonFactory(id=1, league=self.liahl)
         SeasonFactory(id=2, league=self.liahl, start_date=datetime.date(month=12, day=26, year=2000))
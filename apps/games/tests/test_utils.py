@@ -8,6 +8,7 @@ from common.models import GenericChoice
 from common.tests import GenericChoiceFactory
 from divisions.tests import DivisionFactory
 from games import utils
+from games.filters import GameScheduleFilterSet
 from games.tests import HockeyGameFactory
 from games.utils import get_start_game_not_allowed_msg
 from leagues.tests import LeagueFactory
@@ -60,14 +61,18 @@ class UtilsTests(BaseTestCase):
         season = SeasonFactory(league=self.liahl)
         user = UserFactory()
         context = utils.get_game_list_view_context(user, self.ice_hockey, season)
+        page_obj = context.pop('page_obj')
+        filterset = context.pop('filterset')
         self.assertDictWithQuerySetEqual(context, {
             'active_tab': 'schedule',
             'season': season,
-            'games': [],
-            'has_games': False,
+            'ordering': '-start',
             'sport': self.ice_hockey,
             'game_authorizations': {},
         })
+        self.assertEqual(page_obj.number, 1)
+        self.assertListEqual(list(page_obj), [])
+        self.assertIsInstance(filterset, GameScheduleFilterSet)
 
     def test_get_start_game_not_allowed_msg(self):
         self.assertEqual(
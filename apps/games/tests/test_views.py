@@ -8,7 +8,7 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from django.utils import timezone as timezone_util
 
-from ayrabo.utils.testing import BaseTestCase
+from ayrabo.utils.testing import BaseTestCase, QueryBudgetMixin
 from common.models import GenericChoice
 from common.tests import GenericChoiceFactory
 from divisions.tests import DivisionFactory
@@ -500,7 +500,7 @@ class HockeyGameUpdateViewTests(BaseTestCase):
         self.assertEqual(self.game._get_game_players(self.t2).count(), 0)
 
 
-class HockeyGameScoresheetViewTests(BaseTestCase):
+class HockeyGameScoresheetViewTests(QueryBudgetMixin, BaseTestCase):
     url = 'sports:games:scoresheet'
 
     def _set_starting_goalies(self):
@@ -648,6 +648,14 @@ class HockeyGameScoresheetViewTests(BaseTestCase):
         )
         self.assertEqual(context.get('sport'), self.ice_hockey)
 
+    def test_query_budget(self):
+        def seed(count):
+            for team in [self.home_team, self.away_team]:
+                for player in HockeyPlayerFactory.create_batch(count, sport=self.ice_hockey, team=team):
+                    HockeyGamePlayerFactory(team=team, is_starting=False, game=self.game, player=player)
+
+        self.assertQueriesDoNotScale(lambda: self.client.get(self.formatted_url), seed, sizes=(1, 20), max_queries=12)
+
     def test_post_save_action_invalid(self):
         self.home_team_game_player1.delete()
         self.home_team_game_player2.delete()
@@ -747,7 +755,7 @@ class HockeyGameScoresheetViewTests(BaseTestCase):
         self.assertTemplateUsed('403.html')
 
 
-class GameRostersUpdateViewTests(BaseTestCase):
+class GameRostersUpdateViewTests(QueryBudgetMixin, BaseTestCase):
     url = 'sports:games:rosters:update'
 
     def setUp(self):
@@ -874,6 +882,19 @@ class GameRostersUpdateViewTests(BaseTestCase):
         self.assertFalse(context.get('can_update_away_team_roster'))
         self.assertEqual(context.get('sport'), self.ice_hockey)
 
+    @mock.patch('django.utils.timezone.now')
+    def test_query_budget(self, mock_now):
+        mock_now.return_value = pytz.utc.localize(datetime.datetime(month=12, day=26, year=2017, hour=19, minute=0))
+        SportRegistrationFactory(user=self.user, sport=self.ice_hockey, role=SportRegistration.MANAGER)
+        ManagerFactory(user=self.user, team=self.t1)
+
+        def seed(count):
+            for team in [self.t1, self.t2]:
+                for player in HockeyPlayerFactory.create_batch(count, sport=self.ice_hockey, team=team):
+                    HockeyGamePlayerFactory(team=team, is_starting=False, game=self.game, player=player)
+
+        self.assertQueriesDoNotScale(lambda: self.client.get(self.formatted_url), seed, sizes=(1, 20), max_queries=9)
+
 
 class HockeyGameAdminBulkUploadViewTests(BaseTestCase):
     url = 'admin:games_hockeygame_bulk_upload'
@@ -1,11 +1,18 @@
+from django.core.paginator import Paginator
 from django.db.models import Q
+from django.template.loader import render_to_string
 
 from ayrabo.utils import timedelta_to_hours_minutes_seconds
+from common.fragments import LEAGUE, SEASON, TEAM, get_or_render_fragment
+from games.filters import GameScheduleFilterSet
 from games.mappings import get_game_model_cls
 from games.models import AbstractGame
 from users.authorizers import GameAuthorizer
 
 
+GAMES_PAGE_SIZE = 25
+
+
 def get_game_list_context(user, sport, games):
     """
     Computes common values used when listing games.
@@ -15,17 +22,7 @@ def get_game_list_context(user, sport, games):
     :param games: List of games
     :return: Dict containing common values for listing games
     """
-    game_authorizer = GameAuthorizer(user=user)
-    game_authorizations = {}
-    for game in games:
-        game_authorizations.update({
-            game.pk: {
-                'can_user_update': game_authorizer.can_user_update(team=game.team),
-                'can_user_update_game_rosters': game_authorizer.can_user_update_game_rosters(
-                    home_team=game.home_team, away_team=game.away_team, sport=sport
-                )
-            }
-        })
+    game_authorizations = GameAuthorizer(user=user).get_game_authorizations(games, sport)
 
     return {
         'game_authorizations': game_authorizations,
@@ -40,20 +37,19 @@ def optimize_games_query(qs):
     In the future, we will need to selectively choose what fields to select related, prefetch related on because qs
     can be for HockeyGames, BaseballGames, etc and the fields may not be common among those model classes.
 
+    Organizations aren't joined, authorizations only need the teams' organization ids
+    (see `GameAuthorizer.get_game_authorizations`).
+
     :param qs: QuerySet of games
     :return: The QuerySet with any query optimizations applied
     """
     return qs.select_related(
         'home_team',
         'home_team__division',
-        'home_team__organization',
         'away_team',
         'away_team__division',
-        'away_team__organization',
         'type',
         'location',
-        'team',
-        'team__organization',
     )
 
 
@@ -65,30 +61,78 @@ def get_games(sport, season, team=None):
     :param season: Season to get games for
     :param team: Optional team to further narrow queryset down by
     :raises SportNotConfiguredException: if the sport argument has not been configured
-    :return: QuerySet of games for the given sport (HockeyGame, BaseballGame, etc)
+    :return: QuerySet of games for the given sport (HockeyGame, BaseballGame, etc), most recent first
     """
     model_cls = get_game_model_cls(sport)
     # Seasons are tied to leagues so we don't need to exclude games for other leagues
     qs = model_cls.objects.filter(season=season)
     if team is not None:
         qs = qs.filter(Q(home_team=team) | Q(away_team=team))
-    return optimize_games_query(qs)
+    return optimize_games_query(qs.order_by('-start'))
 
 
-def get_game_list_view_context(user, sport, season, team=None):
+def get_game_list_view_context(user, sport, season, team=None, query_params=None, page_size=GAMES_PAGE_SIZE):
+    """
+    Computes the context for a season's schedule. Games are filtered, sorted and paginated in the db, only the games on
+    the requested page are fetched and authorized.
+
+    :param user: User viewing the schedule
+    :param sport: Sport the season belongs to
+    :param season: Season to list games for
+    :param team: Optional team to only list games for
+    :param query_params: Filter, ordering and page params, i.e. `request.GET`
+    :param page_size: # of games per page
+    :return: Dict containing values for listing games
+    """
     context = {}
+    query_params = query_params if query_params is not None else {}
     games = get_games(sport, season, team=team)
-    game_list_context = get_game_list_context(user, sport, games)
+    filterset = GameScheduleFilterSet(query_params, queryset=games, season=season)
+    games = filterset.qs
+    paginator = Paginator(games, page_size)
+    page_obj = paginator.get_page(query_params.get('page'))
+    game_list_context = get_game_list_context(user, sport, page_obj.object_list)
     context.update({
         'active_tab': 'schedule',
         'season': season,  # Note `get_team_detail_view_context` is also setting this context key to the same value.
-        'games': games,
-        'has_games': games.exists()
+        'page_obj': page_obj,
+        'filterset': filterset,
+        'ordering': filterset.get_ordering(),
     })
     context.update(game_list_context)
     return context
 
 
+def get_game_list_fragment(request, sport, season, team=None):
+    """
+    Renders the games table for a season's schedule. The table looks the same for all users that can't update any of
+    the sport's games, so it's cached as a fragment shared by them. Users with per game actions get a table rendered
+    for them on each request.
+
+    :param request: The current request, its query params are used to filter, sort and paginate the games
+    :param sport: Sport the season belongs to
+    :param season: Season to list games for
+    :param team: Optional team to only list games for
+    :return: Dict containing the rendered `games_table` and whether the games were `is_filtered`
+    """
+    user = request.user
+    query_params = request.GET
+
+    def render():
+        context = get_game_list_view_context(user, sport, season, team=team, query_params=query_params)
+        return {
+            'games_table': render_to_string('games/_games_table.html', context, request=request),
+            'is_filtered': context.get('filterset').is_filtered,
+        }
+
+    if GameAuthorizer(user=user).can_user_update_any_game(sport):
+        return render()
+    scopes = [(LEAGUE, season.league_id), (SEASON, season.pk)]
+    if team is not None:
+        scopes.append((TEAM, team.pk))
+    return get_or_render_fragment('game_list', scopes, render, vary_on=[query_params.urlencode()])
+
+
 def get_start_game_not_allowed_msg():
     _, minutes, _ = timedelta_to_hours_minutes_seconds(AbstractGame.START_GAME_GRACE_PERIOD)
     return f'Games can only be started {int(minutes)} minutes before the scheduled start time.'
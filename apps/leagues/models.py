@@ -1,10 +1,13 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.text import slugify
 from easy_thumbnails.fields import ThumbnailerImageField
 
 from ayrabo.utils import UploadTo
 from ayrabo.utils.model_fields import WebsiteField
 from common.models import TimestampedModel
+from common.reference_data import DIVISIONS, LEAGUES, bump_reference_data_versions
 from sports.models import Sport
 
 
@@ -44,3 +47,23 @@ class League(TimestampedModel):
 
     def __str__(self):
         return self.name
+
+
+@receiver(post_save, sender=League)
+@receiver(post_delete, sender=League)
+def bump_reference_data_versions_on_league_change(sender, instance, **kwargs):
+    # Divisions are loaded with their league
+    bump_reference_data_versions(LEAGUES, DIVISIONS)
+
+
+@receiver(post_save, sender=League)
+def sync_denormalized_keys_on_league_change(sender, instance, created, **kwargs):
+    """
+    Teams have their league's sport.
+    """
+    if created:
+        return
+    from teams.denormalized import sync_denormalized_keys
+    from teams.models import Team
+
+    sync_denormalized_keys(Team.objects.filter(division__league=instance))
@@ -1,15 +1,25 @@
+from django.core.cache import cache
 from django.shortcuts import reverse
+from django.test import override_settings
 
-from ayrabo.utils.testing import BaseTestCase
+from ayrabo.utils.testing import BaseTestCase, QueryBudgetMixin
 from common.models import GenericChoice
 from common.tests import GenericChoiceFactory
 from divisions.tests import DivisionFactory
+from games.models import HockeyGame
 from games.tests import HockeyGameFactory
+from games.utils import GAMES_PAGE_SIZE
 from leagues.tests import LeagueFactory
+from locations.tests import LocationFactory
 from managers.tests import ManagerFactory
 from organizations.tests import OrganizationFactory
+from players.tests import HockeyPlayerFactory
+from seasons.models import Season
 from seasons.tests import SeasonFactory
 from sports.tests import SportFactory
+from standings.models import HockeyStanding
+from standings.utils import rebuild_hockey_standings
+from stats.models import HockeyPlayerSeasonStats
 from teams.tests import TeamFactory
 from users.tests import UserFactory
 
@@ -78,7 +88,7 @@ class AbstractLeagueDetailViewTestCase(BaseTestCase):
         self.future_season.teams.add(self.icecats_mm_aa)
 
 
-class LeagueDetailScheduleViewTests(AbstractLeagueDetailViewTestCase):
+class LeagueDetailScheduleViewTests(QueryBudgetMixin, AbstractLeagueDetailViewTestCase):
     url = 'leagues:schedule'
 
     def _create_game(self, home_team, away_team, season):
@@ -144,8 +154,7 @@ class LeagueDetailScheduleViewTests(AbstractLeagueDetailViewTestCase):
         self.assertEqual(context.get('current_season_page_url'), reverse('leagues:schedule', kwargs=kwargs))
 
         self.assertEqual(context.get('active_tab'), 'schedule')
-        self.assertListEqual(list(context.get('games').order_by('id')), self.games)
-        self.assertTrue(context.get('has_games'))
+        self.assertListEqual(sorted(context.get('page_obj'), key=lambda game: game.pk), self.games)
 
         self.assertEqual(context.get('sport'), self.ice_hockey)
 
@@ -179,11 +188,44 @@ class LeagueDetailScheduleViewTests(AbstractLeagueDetailViewTestCase):
         )
 
         self.assertEqual(context.get('active_tab'), 'schedule')
-        self.assertListEqual(list(context.get('games').order_by('id')), self.past_season_games)
-        self.assertTrue(context.get('has_games'))
+        self.assertListEqual(sorted(context.get('page_obj'), key=lambda game: game.pk), self.past_season_games)
 
         self.assertEqual(context.get('sport'), self.ice_hockey)
 
+    def test_get_filtered_and_sorted(self):
+        url = self.format_url(slug=self.liahl.slug)
+        response = self.client.get(url, {'team': self.edge_mm_aa.pk, 'ordering': 'away'})
+        context = response.context
+
+        self.assert_200(response)
+        self.assertListEqual(list(context.get('page_obj')), [self.game1])
+        self.assertEqual(context.get('ordering'), 'away')
+        self.assertTrue(context.get('filterset').is_filtered)
+        # Sort links keep the filters and toggle the direction of the current ordering
+        self.assertContains(response, f'href="?team={self.edge_mm_aa.pk}&amp;ordering=-away"')
+        self.assertContains(response, f'href="?team={self.edge_mm_aa.pk}&amp;ordering=start"')
+
+    @override_settings(FRAGMENT_CACHE_TIMEOUT=60)
+    def test_get_cached_games_table(self):
+        self.addCleanup(cache.clear)
+        url = self.format_url(slug=self.liahl.slug)
+        self.login(user=UserFactory())
+        self.assertContains(self.client.get(url), self.game1.location.name)
+
+        # Updates that don't send signals aren't displayed until the fragment is invalidated
+        HockeyGame.objects.filter(pk=self.game1.pk).update(location=LocationFactory(name='Iceland'))
+        self.assertNotContains(self.client.get(url), 'Iceland')
+        # Managers have per game actions, the table isn't shared with them
+        self.login(user=self.user)
+        self.assertContains(self.client.get(url), 'Iceland')
+
+        self.login(user=UserFactory())
+        HockeyGame.objects.filter(pk=self.game1.pk).update(location=LocationFactory(name='Dix Hills'))
+        HockeyGame.objects.get(pk=self.game1.pk).save()
+        response = self.client.get(url)
+        self.assertContains(response, 'Dix Hills')
+        self.assertNotContains(response, f'id="update-game-{self.game1.pk}"')
+
     def test_get_future_season(self):
         url = reverse('leagues:seasons:schedule', kwargs={'slug': self.liahl.slug, 'season_pk': self.future_season.pk})
         response = self.client.get(url)
@@ -191,6 +233,19 @@ class LeagueDetailScheduleViewTests(AbstractLeagueDetailViewTestCase):
         self.assert_200(response)
         self.assertEqual(context.get('season'), self.future_season)
 
+    def test_query_budget(self):
+        matchups = [(self.icecats_mm_aa, self.edge_mm_aa), (self.rebels_peewee, self.edge_peewee)]
+
+        def seed(count):
+            for i in range(count):
+                self._create_game(*matchups[i % len(matchups)], self.current_season)
+
+        url = self.format_url(slug=self.liahl.slug)
+        # More games than fit on a page
+        sizes = (1, GAMES_PAGE_SIZE + 5)
+        self.assertQueriesDoNotScale(lambda: self.client.get(url), seed, sizes=sizes, max_queries=19)
+        self.assertQueryBudget(lambda: self.client.get(url, {'page': 2}), max_queries=19)
+
 
 class LeagueDetailDivisionsViewTests(AbstractLeagueDetailViewTestCase):
     url = 'leagues:divisions'
@@ -267,3 +322,124 @@ class LeagueDetailDivisionsViewTests(AbstractLeagueDetailViewTestCase):
                 [self.mm_aa],
             ]
         )
+
+
+class LeagueDetailStandingsViewTests(AbstractLeagueDetailViewTestCase):
+    url = 'leagues:standings'
+
+    def setUp(self):
+        super().setUp()
+        self.login(user=self.user)
+
+    def test_login_required(self):
+        self.client.logout()
+        self.assertLoginRequired(self.format_url(slug=self.liahl.slug))
+
+    def test_sport_not_configured(self):
+        sport = SportFactory()
+        league = LeagueFactory(sport=sport)
+        self.create_past_current_future_seasons(league=league)
+        self.assertSportNotConfigured(self.format_url(slug=league.slug))
+
+    # GET
+    def test_get(self):
+        rebuild_hockey_standings(Season.objects.filter(pk=self.current_season.pk))
+        HockeyStanding.objects.filter(team=self.edge_mm_aa).update(points=4, wins=2)
+        HockeyStanding.objects.filter(team=self.rebels_mm_aa).update(points=4, wins=1, ties=2)
+        response = self.client.get(self.format_url(slug=self.liahl.slug))
+        context = response.context
+
+        self.assert_200(response)
+        self.assertTemplateUsed(response, 'leagues/league_detail_standings.html')
+
+        self.assertEqual(context.get('league'), self.liahl)
+        self.assertEqual(context.get('season'), self.current_season)
+        kwargs = {'slug': self.liahl.slug}
+        self.assertEqual(context.get('standings_link'), reverse('leagues:standings', kwargs=kwargs))
+        self.assertEqual(context.get('current_season_page_url'), reverse('leagues:standings', kwargs=kwargs))
+        self.assertEqual(context.get('active_tab'), 'standings')
+
+        standings_by_division = [
+            (division, [standing.team for standing in standings])
+            for division, standings in context.get('standings_by_division')
+        ]
+        self.assertListEqual(standings_by_division, [
+            (self.mm_aa, [self.edge_mm_aa, self.rebels_mm_aa, self.icecats_mm_aa]),
+            (self.peewee, [self.icecats_peewee, self.edge_peewee, self.rebels_peewee]),
+        ])
+
+    def test_get_past_season(self):
+        url = reverse('leagues:seasons:standings', kwargs={'slug': self.liahl.slug, 'season_pk': self.past_season.pk})
+        response = self.client.get(url)
+        context = response.context
+
+        self.assert_200(response)
+        self.assertEqual(context.get('season'), self.past_season)
+        kwargs = {'slug': self.liahl.slug, 'season_pk': self.past_season.pk}
+        self.assertEqual(context.get('standings_link'), reverse('leagues:seasons:standings', kwargs=kwargs))
+        self.assertEqual(
+            context.get('current_season_page_url'),
+            reverse('leagues:standings', kwargs={'slug': self.liahl.slug})
+        )
+        # The past season's games aren't completed, its teams have zero standings
+        standings_by_division = [
+            (division, [(standing.team, standing.games_played) for standing in standings])
+            for division, standings in context.get('standings_by_division')
+        ]
+        self.assertListEqual(standings_by_division, [
+            (self.mm_aa, [(self.icecats_mm_aa, 0), (self.edge_mm_aa, 0), (self.rebels_mm_aa, 0)]),
+            (self.peewee, [(self.icecats_peewee, 0), (self.edge_peewee, 0), (self.rebels_peewee, 0)]),
+        ])
+
+
+class LeagueDetailLeadersViewTests(AbstractLeagueDetailViewTestCase):
+    url = 'leagues:leaders'
+
+    def _create_stats(self, team, season, **kwargs):
+        player = HockeyPlayerFactory(team=team, sport=self.ice_hockey)
+        return HockeyPlayerSeasonStats.objects.create(player=player, team=team, season=season, **kwargs)
+
+    def setUp(self):
+        super().setUp()
+        self.s1 = self._create_stats(self.icecats_mm_aa, self.current_season, goals=1, points=1, penalty_minutes=2)
+        self.s2 = self._create_stats(self.edge_peewee, self.current_season, goals=2, assists=1, points=3)
+        self.s3 = self._create_stats(self.edge_mm_aa, self.past_season, goals=2, points=2, penalty_minutes=4)
+        self.login(user=self.user)
+
+    def test_login_required(self):
+        self.client.logout()
+        self.assertLoginRequired(self.format_url(slug=self.liahl.slug))
+
+    def test_sport_not_configured(self):
+        sport = SportFactory()
+        league = LeagueFactory(sport=sport)
+        self.create_past_current_future_seasons(league=league)
+        self.assertSportNotConfigured(self.format_url(slug=league.slug))
+
+    # GET
+    def test_get(self):
+        response = self.client.get(self.format_url(slug=self.liahl.slug))
+        context = response.context
+
+        self.assert_200(response)
+        self.assertTemplateUsed(response, 'leagues/league_detail_leaders.html')
+
+        self.assertEqual(context.get('season'), self.current_season)
+        kwargs = {'slug': self.liahl.slug}
+        self.assertEqual(context.get('leaders_link'), reverse('leagues:leaders', kwargs=kwargs))
+        self.assertEqual(context.get('current_season_page_url'), reverse('leagues:leaders', kwargs=kwargs))
+        self.assertEqual(context.get('active_tab'), 'leaders')
+        self.assertListEqual(list(context.get('top_scorers')), [self.s2, self.s1])
+        self.assertListEqual(list(context.get('penalty_leaders')), [self.s1])
+
+    def test_get_past_season(self):
+        url = reverse('leagues:seasons:leaders', kwargs={'slug': self.liahl.slug, 'season_pk': self.past_season.pk})
+        response = self.client.get(url)
+        context = response.context
+
+        self.assert_200(response)
+        self.assertEqual(context.get('season'), self.past_season)
+        kwargs = {'slug': self.liahl.slug, 'season_pk': self.past_season.pk}
+        self.assertEqual(context.get('leaders_link'), reverse('leagues:seasons:leaders', kwargs=kwargs))
+        self.assertListEqual(list(context.get('top_scorers')), [self.s3])
+        self.assertListEqual(list(context.get('penalty_leaders')), [self.s3])
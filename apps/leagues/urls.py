@@ -7,11 +7,15 @@ from . import views
 season_urls = [
     url(r'^$', views.LeagueDetailScheduleView.as_view(), name='schedule'),
     url(r'^divisions/$', views.LeagueDetailDivisionsView.as_view(), name='divisions'),
+    url(r'^standings/$', views.LeagueDetailStandingsView.as_view(), name='standings'),
+    url(r'^leaders/$', views.LeagueDetailLeadersView.as_view(), name='leaders'),
 ]
 
 app_name = 'leagues'
 urlpatterns = [
     url(r'^(?P<slug>[-\w]+)/$', views.LeagueDetailScheduleView.as_view(), name='schedule'),
     url(r'^(?P<slug>[-\w]+)/divisions/$', views.LeagueDetailDivisionsView.as_view(), name='divisions'),
+    url(r'^(?P<slug>[-\w]+)/standings/$', views.LeagueDetailStandingsView.as_view(), name='standings'),
+    url(r'^(?P<slug>[-\w]+)/leaders/$', views.LeagueDetailLeadersView.as_view(), name='leaders'),
     url(r'^(?P<slug>[-\w]+)/seasons/(?P<season_pk>\d+)/', include((season_urls, 'seasons'))),
 ]
@@ -1,16 +1,20 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import render
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.views.generic import DetailView
 
 from ayrabo.utils import send_season_not_configured_email
 from ayrabo.utils.mixins import HandleSportNotConfiguredMixin
+from common.fragments import LEAGUE, SEASON, get_or_render_fragment
 from divisions.models import Division
-from games.utils import get_game_list_view_context
+from games.utils import get_game_list_fragment
 from leagues.models import League
 from leagues.utils import get_chunked_divisions
 from seasons.models import Season
 from seasons.utils import get_current_season_or_from_pk
+from standings.mappings import get_standing_model_cls
+from stats.mappings import get_player_season_stats_model_cls
 
 
 class AbstractLeagueDetailView(LoginRequiredMixin, HandleSportNotConfiguredMixin, DetailView):
@@ -33,6 +37,8 @@ class AbstractLeagueDetailView(LoginRequiredMixin, HandleSportNotConfiguredMixin
             'season': self.season,
             'schedule_link': schedule_link,
             'divisions_link': divisions_link,
+            'standings_link': self.season.league_detail_standings_url,
+            'leaders_link': self.season.league_detail_leaders_url,
             'seasons': Season.objects.get_for_league(league=league)
         })
         return context
@@ -51,31 +57,42 @@ class LeagueDetailScheduleView(AbstractLeagueDetailView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        user = self.request.user
         league = context.get('league')
         season = context.get('season')
         sport = league.sport
         context.update({
             'current_season_page_url': reverse('leagues:schedule', kwargs={'slug': league.slug})
         })
-        context.update(get_game_list_view_context(user, sport, season))
+        context.update(get_game_list_fragment(self.request, sport, season))
         return context
 
 
 class LeagueDetailDivisionsView(AbstractLeagueDetailView):
     template_name = 'leagues/league_detail_divisions.html'
-    queryset = AbstractLeagueDetailView.queryset.prefetch_related('divisions', 'divisions__teams')
 
     def _get_divisions(self, league, season):
         # This is a little confusing, but all we're doing is showing all divisions when viewing the current season
         # because we don't have a general list view, and only showing the divisions for the current season here would
         # mean we never actually show all divisions for the league
         if season.is_current:
-            return league.divisions.all()
+            return league.divisions.prefetch_related('teams')
         teams = season.teams.all()
         division_ids = teams.values_list('division', flat=True)
         return Division.objects.prefetch_related('teams').filter(id__in=division_ids)
 
+    def get_divisions_fragment(self, league, season):
+        """
+        The divisions panels are the same for all users, they're cached as a fragment so the divisions and teams are
+        only fetched on a miss.
+        """
+        def render():
+            divisions = self._get_divisions(league, season)
+            context = {'league': league, 'chunked_divisions': get_chunked_divisions(divisions)}
+            return render_to_string('leagues/_divisions.html', context)
+
+        scopes = [(LEAGUE, league.pk), (SEASON, season.pk)]
+        return get_or_render_fragment('league_divisions', scopes, render, vary_on=[season.is_current])
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         league = context.get('league')
@@ -84,12 +101,50 @@ class LeagueDetailDivisionsView(AbstractLeagueDetailView):
             header_text = 'All Divisions'
         else:
             header_text = f'{season} Divisions'
-        divisions = self._get_divisions(league, season)
-        chunked_divisions = get_chunked_divisions(divisions)
         context.update({
             'active_tab': 'divisions',
-            'chunked_divisions': chunked_divisions,
+            'divisions_panels': self.get_divisions_fragment(league, season),
             'current_season_page_url': reverse('leagues:divisions', kwargs={'slug': league.slug}),
             'header_text': header_text
         })
         return context
+
+
+class LeagueDetailStandingsView(AbstractLeagueDetailView):
+    template_name = 'leagues/league_detail_standings.html'
+
+    def _get_standings_by_division(self, league, season):
+        standing_model_cls = get_standing_model_cls(league.sport)
+        standings_by_division = {}
+        # Standings are already sorted, grouping them keeps each division sorted.
+        for standing in standing_model_cls.objects.get_for_season(season):
+            standings_by_division.setdefault(standing.team.division, []).append(standing)
+        return sorted(standings_by_division.items(), key=lambda item: item[0].name)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        league = context.get('league')
+        season = context.get('season')
+        context.update({
+            'active_tab': 'standings',
+            'standings_by_division': self._get_standings_by_division(league, season),
+            'current_season_page_url': reverse('leagues:standings', kwargs={'slug': league.slug}),
+        })
+        return context
+
+
+class LeagueDetailLeadersView(AbstractLeagueDetailView):
+    template_name = 'leagues/league_detail_leaders.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        league = context.get('league')
+        season = context.get('season')
+        stats_model_cls = get_player_season_stats_model_cls(league.sport)
+        context.update({
+            'active_tab': 'leaders',
+            'top_scorers': stats_model_cls.objects.get_leaders(season, stats_model_cls.POINTS),
+            'penalty_leaders': stats_model_cls.objects.get_leaders(season, stats_model_cls.PENALTY_MINUTES),
+            'current_season_page_url': reverse('leagues:leaders', kwargs={'slug': league.slug}),
+        })
+        return context
@@ -2,12 +2,15 @@ import re
 
 from django.core.validators import RegexValidator
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.text import slugify
 from localflavor.us import models as us_models
 from localflavor.us.us_states import US_STATES
 
 from ayrabo.utils.model_fields import WebsiteField
 from common.models import TimestampedModel
+from common.reference_data import LOCATIONS, bump_reference_data_versions
 
 
 PHONE_NUMBER_REGEX = re.compile(r'^\(?[2-9]\d{2}\)? \d{3}-\d{4}$')
@@ -57,3 +60,9 @@ class TeamLocation(TimestampedModel):
 
     def __str__(self):
         return '{}: {}'.format(self.team.name, self.location.name)
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def bump_reference_data_versions_on_location_change(sender, instance, **kwargs):
+    bump_reference_data_versions(LOCATIONS)
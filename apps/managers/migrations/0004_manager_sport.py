@@ -0,0 +1,34 @@
+# Generated by Django 2.2.28 on 2026-10-18 15:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import OuterRef, Subquery
+
+
+def forwards_func(apps, schema_editor):
+    Manager = apps.get_model('managers', 'Manager')
+    Team = apps.get_model('teams', 'Team')
+    teams = Team.objects.filter(pk=OuterRef('team_id'))
+    Manager.objects.update(sport_id=Subquery(teams.values('sport_id')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0008_team_league_sport'),
+        ('sports', '0007_auto_20180924_0034'),
+        ('managers', '0003_auto_20190421_2008'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='manager',
+            name='sport',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='sports.Sport'),
+        ),
+        migrations.AddIndex(
+            model_name='manager',
+            index=models.Index(fields=['user', 'sport'], name='manager_user_sport'),
+        ),
+        migrations.RunPython(forwards_func, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 2.2.28 on 2026-10-18 16:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import OuterRef, Subquery
+
+
+def forwards_func(apps, schema_editor):
+    # Managers bulk created since the column was added
+    Manager = apps.get_model('managers', 'Manager')
+    Team = apps.get_model('teams', 'Team')
+    teams = Team.objects.filter(pk=OuterRef('team_id'))
+    Manager.objects.filter(sport__isnull=True).update(sport_id=Subquery(teams.values('sport_id')[:1]))
+
+
+class Migration(migrations.Migration):
+    # Postgres can't alter a table with pending trigger events, i.e. the backfill's updates in the same transaction
+    atomic = False
+
+    dependencies = [
+        ('teams', '0009_team_league_sport_not_null'),
+        ('managers', '0004_manager_sport'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards_func, reverse_code=migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='manager',
+            name='sport',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='sports.Sport'),
+        ),
+    ]
@@ -13,12 +13,28 @@ class Manager(TimestampedModel):
     """
     user = models.ForeignKey('users.User', related_name='managers', on_delete=models.PROTECT)
     team = models.ForeignKey(Team, on_delete=models.PROTECT)
+    # Denormalized from the team (see `clean` and `save`), so filtering by sport doesn't join through the team, division
+    # and league tables
+    sport = models.ForeignKey('sports.Sport', editable=False, on_delete=models.PROTECT, related_name='+')
     is_active = models.BooleanField(default=True, verbose_name='Is Active')
 
     objects = managers.ActiveManager()
 
     class Meta:
         unique_together = (('user', 'team'),)
+        indexes = [
+            models.Index(fields=['user', 'sport'], name='manager_user_sport'),
+        ]
+
+    def clean(self):
+        # Bulk created objects (i.e. admin bulk uploads) are cleaned but not saved
+        if self.team_id is not None:
+            self.sport_id = self.team.sport_id
+
+    def save(self, *args, **kwargs):
+        if self.team_id is not None:
+            self.sport_id = self.team.sport_id
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return 'Manager {last_name}'.format(last_name=self.user.last_name)
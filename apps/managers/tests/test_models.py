@@ -1,6 +1,7 @@
 from django.db import IntegrityError
 
 from ayrabo.utils.testing import BaseTestCase
+from managers.models import Manager
 from managers.tests import ManagerFactory
 from teams.tests import TeamFactory
 from users.tests import UserFactory
@@ -19,3 +20,11 @@ class ManagerModelTests(BaseTestCase):
         ManagerFactory(user=user, team=team)
         with self.assertRaises(IntegrityError):
             ManagerFactory(user=user, team=team)
+
+    def test_clean_sets_sport(self):
+        # i.e. admin bulk uploads, the cleaned managers are bulk created
+        team = TeamFactory()
+        manager = ManagerFactory.build(user=UserFactory(), team=team)
+        manager.full_clean()
+        Manager.objects.bulk_create([manager])
+        self.assertEqual(Manager.objects.get().sport_id, team.sport_id)
@@ -1,16 +1,25 @@
 from django import forms
 
-from sports.models import Sport
+from common.reference_data import (
+    GENERIC_PENALTY_CHOICES,
+    SPORTS,
+    get_reference_object,
+    get_reference_objects,
+    lazy_model_choices,
+)
 from .models import HockeyPenalty
 
 
 class HockeyPenaltyAdminForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        sport = Sport.objects.get(name='Ice Hockey')
+        sport = get_reference_object(SPORTS, name='Ice Hockey')
 
         HockeyPlayerModel = self.fields['player'].queryset.model
         self.fields['player'].queryset = HockeyPlayerModel.objects.active().select_related('user').filter(sport=sport)
+        self.fields['type'].choices = lazy_model_choices(
+            self.fields['type'], lambda: get_reference_objects(GENERIC_PENALTY_CHOICES)
+        )
 
     class Meta:
         model = HockeyPenalty
@@ -1,9 +1,12 @@
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from common.managers import GenericChoiceManager
 from common.models import TimestampedModel
+from common.reference_data import GENERIC_PENALTY_CHOICES, bump_reference_data_versions
 
 
 class GenericPenaltyChoice(TimestampedModel):
@@ -46,3 +49,9 @@ class HockeyPenalty(AbstractPenalty):
 
     def __str__(self):
         return '{}: {} {}'.format(self.player.user.last_name, self.duration, self.type.name)
+
+
+@receiver(post_save, sender=GenericPenaltyChoice)
+@receiver(post_delete, sender=GenericPenaltyChoice)
+def bump_reference_data_versions_on_generic_penalty_choice_change(sender, instance, **kwargs):
+    bump_reference_data_versions(GENERIC_PENALTY_CHOICES)
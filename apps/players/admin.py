@@ -2,30 +2,41 @@ from django import forms
 from django.contrib import admin
 
 from ayrabo.utils.admin.mixins import AdminBulkUploadMixin
+from common.fragments import TEAM, bump_fragment_versions
 from sports.models import Sport, SportRegistration
+from teams.models import Team
 from . import models
 
 
 class PlayerAdminModelFormSet(forms.BaseModelFormSet):
     def save(self, commit=True):
         instances = super().save(commit=commit)
-        for instance in instances:
-            SportRegistration.objects.get_or_create(
-                user=instance.user,
-                sport=instance.sport,
-                role=SportRegistration.PLAYER,
-                defaults={'is_complete': True},
-            )
+        # Create any missing player sport registrations with one query instead of a `get_or_create` per player
+        keys = {(instance.user_id, instance.sport_id) for instance in instances}
+        existing = set(
+            SportRegistration.objects.filter(
+                user_id__in={user_id for user_id, _ in keys},
+                role=SportRegistration.PLAYER
+            ).values_list('user_id', 'sport_id')
+        )
+        SportRegistration.objects.bulk_create([
+            SportRegistration(user_id=user_id, sport_id=sport_id, role=SportRegistration.PLAYER, is_complete=True)
+            for user_id, sport_id in sorted(keys - existing)
+        ])
+        # Bulk created players don't send the signals that invalidate the teams' cached players tables
+        bump_fragment_versions(*[(TEAM, team_id) for team_id in {instance.team_id for instance in instances}])
         return instances
 
 
 class HockeyPlayerAdminForm(forms.ModelForm):
     sport = forms.ModelChoiceField(queryset=Sport.objects.all(), required=False)
+    team = forms.ModelChoiceField(queryset=Team.objects.select_related('division__league__sport'))
 
     def clean(self):
         super().clean()
         team = self.cleaned_data.get('team')
-        self.cleaned_data.update({'sport': team.division.league.sport})
+        if team is not None:
+            self.cleaned_data.update({'sport': team.division.league.sport})
         return self.cleaned_data
 
     class Meta:
@@ -52,6 +63,7 @@ class HockeyPlayerAdmin(AdminBulkUploadMixin, admin.ModelAdmin):
     bulk_upload_form_fields = ('user', 'sport', 'team', 'jersey_number', 'position', 'handedness')
     bulk_upload_model_formset_class = PlayerAdminModelFormSet
     bulk_upload_model_form_class = HockeyPlayerAdminForm
+    bulk_upload_chunk_size = 500
 
 
 @admin.register(models.BaseballPlayer)
@@ -31,7 +31,7 @@ class BasePlayerForm(forms.ModelForm):
 
         qs = Team.objects.all().select_related('division')
         if sport is not None:
-            qs = qs.filter(division__league__sport=sport)
+            qs = qs.filter(sport=sport)
         if already_registered_for is not None:
             qs = qs.exclude(id__in=already_registered_for)
         self.fields['team'].queryset = qs
@@ -2,9 +2,12 @@ from collections import OrderedDict
 
 from django.core.validators import MaxValueValidator, MinValueValidator, ValidationError
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
 
 from common import managers
+from common.fragments import TEAM, bump_fragment_versions, is_fragment_cache_enabled
 from common.models import TimestampedModel
 from sports.models import Sport
 from teams.models import Team
@@ -134,7 +137,7 @@ class HockeyPlayer(AbstractPlayer):
             # If we do not exclude the current user this validation error will always be triggered.
             qs = HockeyPlayer.objects.active().filter(
                 team=self.team, jersey_number=self.jersey_number
-            ).exclude(user=self.user)
+            ).exclude(user_id=self.user_id)
             if qs.exists():
                 error_msg = (
                     f'Please choose another number, {self.jersey_number} is currently unavailable for {self.team.name}'
@@ -207,7 +210,7 @@ class BaseballPlayer(AbstractPlayer):
             # If we do not exclude the current user this validation error will always be triggered.
             qs = BaseballPlayer.objects.active().filter(
                 team=self.team, jersey_number=self.jersey_number
-            ).exclude(user=self.user)
+            ).exclude(user_id=self.user_id)
             if qs.exists():
                 error_msg = 'Please choose another number, {jersey_number} is currently unavailable for {team}'.format(
                     jersey_number=self.jersey_number, team=self.team.name)
@@ -266,3 +269,31 @@ class BasketballPlayer(AbstractPlayer):
                     jersey_number=self.jersey_number, team=self.team.name)
                 raise ValidationError({
                     'jersey_number': _(error_msg)})
+
+
+@receiver(post_save, sender=HockeyPlayer)
+@receiver(post_delete, sender=HockeyPlayer)
+@receiver(post_save, sender=BaseballPlayer)
+@receiver(post_delete, sender=BaseballPlayer)
+@receiver(post_save, sender=BasketballPlayer)
+@receiver(post_delete, sender=BasketballPlayer)
+def bump_fragment_versions_on_player_change(sender, instance, **kwargs):
+    """
+    Team players tables are cached per team (see `TeamDetailPlayersView.get_players_fragment`).
+    """
+    bump_fragment_versions((TEAM, instance.team_id))
+
+
+@receiver(post_save, sender=User)
+def bump_fragment_versions_on_user_change(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    """
+    Team players tables display the players' names. Logins only update `last_login`, they don't bump anything.
+    """
+    if not is_fragment_cache_enabled() or created or raw:
+        return
+    if update_fields is not None and not {'first_name', 'last_name'}.intersection(update_fields):
+        return
+    team_ids = set()
+    for player_model_cls in [HockeyPlayer, BaseballPlayer, BasketballPlayer]:
+        team_ids.update(player_model_cls.objects.filter(user_id=instance.pk).values_list('team_id', flat=True))
+    bump_fragment_versions(*[(TEAM, team_id) for team_id in team_ids])
@@ -160,17 +160,11 @@ class HockeyProfileAdminBulkUploadViewTests(BaseTestCase):
         f = SimpleUploadedFile('test.csv', content)
         response = self.client.post(self.url, {'file': f}, follow=True)
 
-        self.assertFormsetError(
-            response,
-            'formset',
-            0,
-            'jersey_number',
-            ['This field is required.']
-        )
-        self.assertFormsetError(
-            response,
-            'formset',
-            0,
-            'position',
+        # Hockey players are uploaded in chunks, errors are reported per line of the csv
+        line_number, errors = response.context['row_errors'][0]
+        self.assertEqual(line_number, 2)
+        self.assertListEqual(errors['jersey_number'], ['This field is required.'])
+        self.assertListEqual(
+            errors['position'],
             ['Select a valid choice. INVALID is not one of the available choices.']
         )
@@ -2,6 +2,7 @@ from django import forms
 
 from ayrabo.utils import set_fields_disabled
 from ayrabo.utils.formsets import BaseModelFormSet
+from common.reference_data import LEAGUES, get_reference_objects, lazy_model_choices
 from leagues.models import League
 from users.models import User
 from .models import Referee
@@ -32,6 +33,14 @@ class RefereeForm(forms.ModelForm):
             qs = qs.exclude(id__in=already_registered_for)
         self.fields['league'].queryset = qs
 
+        def get_leagues():
+            filters = {} if sport is None else {'sport_id': sport.id}
+            excluded = already_registered_for or []
+            return [league for league in get_reference_objects(LEAGUES, **filters) if league.id not in excluded]
+
+        # The queryset validates the submitted league, the dropdown is built from the reference data
+        self.fields['league'].choices = lazy_model_choices(self.fields['league'], get_leagues)
+
         if read_only_fields is not None:
             set_fields_disabled(read_only_fields, self.fields)
 
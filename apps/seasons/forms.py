@@ -14,6 +14,7 @@ from ayrabo.utils.mixins import DisableFormFieldsMixin
 from players.models import HockeyPlayer
 from teams.models import Team
 from .models import HockeySeasonRoster, Season
+from .utils import get_objects_outside_league
 
 
 class SeasonAdminForm(forms.ModelForm):
@@ -28,13 +29,13 @@ class SeasonAdminForm(forms.ModelForm):
         super().clean()
         league = self.cleaned_data.get('league', None)
         teams = self.cleaned_data.get('teams', [])
-        errors = {'teams': []}
         if league and teams:
-            for team in teams:
-                if team.division.league_id != league.id:
-                    errors['teams'].append(
-                        'The team specified ({team_name}) does not belong to {league}'.format(
-                            team_name=team.name, league=league.name))
+            invalid, _ = get_objects_outside_league(Team, teams, league.id)
+            errors = {'teams': [
+                'The team specified ({team_name}) does not belong to {league}'.format(
+                    team_name=team.name, league=league.name)
+                for team in invalid
+            ]}
 
             if errors['teams']:
                 raise ValidationError(errors)
@@ -51,7 +52,7 @@ class HockeySeasonRosterAdminForm(forms.ModelForm):
         queryset=Season.objects.filter(league__sport__name__icontains=sport_name).select_related(
             'league'))
     team = TeamModelChoiceField(
-        queryset=Team.objects.filter(division__league__sport__name__icontains=sport_name).select_related(
+        queryset=Team.objects.filter(sport__name__icontains=sport_name).select_related(
             'division'))
 
     players = forms.ModelMultipleChoiceField(queryset=HockeyPlayer.objects.active().select_related('user'),
@@ -3,7 +3,7 @@ from datetime import date
 
 from django.core.management.base import BaseCommand
 
-from seasons.models import Season
+from seasons.utils import copy_expiring_seasons
 
 EXPIRATION_DAYS = 30
 
@@ -11,30 +11,40 @@ EXPIRATION_DAYS = 30
 class Command(BaseCommand):
     help = 'Creates new seasons based off of seasons that are about to expire.'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--copy-rosters',
+            action='store_true',
+            help='Carry the default season rosters forward, with the players that are still active and on the team.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report the seasons that would be copied without creating them.'
+        )
+
     def handle(self, *args, **options):
         today = date.today()
-        one_year = datetime.timedelta(days=365)
-        copied = 0
-        skipped = 0
-        seasons = Season.objects.filter(end_date__lte=today + datetime.timedelta(days=EXPIRATION_DAYS))
-        for s in seasons:
-            start_date = s.end_date
-            end_date = s.end_date + one_year
-            if Season.objects.filter(start_date__year=start_date.year, end_date__year=end_date.year,
-                                     league=s.league).exists():
-                skipped += 1
-            else:
-                old_teams = s.teams.all()
-
-                # Create a copy
-                s.pk = None
-                s.start_date = start_date
-                s.end_date = end_date
-                s.save()
-                s.teams.set(old_teams)
-                copied += 1
-
-        total = seasons.count()
+        dry_run = options['dry_run']
+        report = copy_expiring_seasons(
+            today + datetime.timedelta(days=EXPIRATION_DAYS),
+            copy_rosters=options['copy_rosters'],
+            dry_run=dry_run
+        )
+        copied = len(report['copied'])
+        skipped = len(report['skipped'])
+        total = report['total']
+
+        if options['verbosity'] > 1:
+            for season, copy in report['copied']:
+                self.stdout.write('{} {}: {} -> {}'.format(
+                    'Would copy' if dry_run else 'Copied', season.league.name, season, copy
+                ))
+        if dry_run:
+            self.stdout.write('Dry run, no seasons were created.')
+        elif options['copy_rosters']:
+            self.stdout.write('Season rosters copied: {}'.format(report['rosters']))
+
         status = 'SUCCESS' if copied + skipped == total else 'FAILURE'
         msg = '[{}] Total: {} Copied: {} Skipped: {} {}'.format(datetime.datetime.now(), total, copied, skipped, status)
         self.stdout.write(msg)
@@ -12,17 +12,19 @@ SPORT_SEASON_ROSTER_CREATE_UPDATE_FORM_MAPPINGS = {
 }
 
 
-def get_season_roster_model_cls(sport):
+def get_season_roster_model_cls(sport, exception_cls=SportNotConfiguredException):
     """
-    Gets the appropriate season roster model for the given sport.
+    Gets the appropriate season roster model for the given sport. May be used by api views in which case the necessary
+    API exception should be raised.
 
     :param sport: Sport that will be used to fetch the correct model class.
+    :param exception_cls: Exception class to raise.
     :raises SportNotConfiguredException: If a season roster model class can't be found for the given sport.
     :return: Season roster model class for the specified sport.
     """
     model_cls = SPORT_SEASON_ROSTER_MODEL_MAPPINGS.get(sport.name)
     if model_cls is None:
-        raise SportNotConfiguredException(sport)
+        raise exception_cls(sport)
     return model_cls
 
 
@@ -2,11 +2,12 @@ import logging
 
 from django.core.validators import ValidationError
 from django.db import models
-from django.db.models.signals import m2m_changed
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.urls import reverse
 from django.utils import timezone
 
+from common.fragments import LEAGUE, SEASON, TEAM, bump_fragment_versions
 from common.models import TimestampedModel
 from seasons.managers import SeasonManager
 from teams.models import Team
@@ -63,6 +64,22 @@ class Season(TimestampedModel):
         kwargs.update({'season_pk': self.pk})
         return reverse('leagues:seasons:divisions', kwargs=kwargs)
 
+    @property
+    def league_detail_standings_url(self):
+        kwargs = {'slug': self.league.slug}
+        if self.is_current:
+            return reverse('leagues:standings', kwargs=kwargs)
+        kwargs.update({'season_pk': self.pk})
+        return reverse('leagues:seasons:standings', kwargs=kwargs)
+
+    @property
+    def league_detail_leaders_url(self):
+        kwargs = {'slug': self.league.slug}
+        if self.is_current:
+            return reverse('leagues:leaders', kwargs=kwargs)
+        kwargs.update({'season_pk': self.pk})
+        return reverse('leagues:seasons:leaders', kwargs=kwargs)
+
     def __str__(self):
         return f'{self.start_date.year}-{self.end_date.year} Season'
 
@@ -87,43 +104,76 @@ def validate_leagues(action, instance, pk_set, reverse, **kwargs):
     This function is meant to work in conjunction with a model form, i.e. SeasonAdminForm that will actually display
     form errors if a user ever needs to manually add teams to a season.
 
+    The objects being added are validated in a single query, see `seasons.utils.get_objects_outside_league`.
+
     :param action: The type of m2m action that has occurred.
     :param instance: The object being acted upon (being updated). Can be of class Team or Season depending on reverse.
     :param pk_set: List of pks for objects being added
     :param reverse: True if team_obj.seasons was used, False if season_obj.teams was used
     :param kwargs: Other kwargs sent by the signal
     """
-    if action == 'pre_add':
-        if reverse:
-            # i.e. team_obj.season_set.add(season_obj), so pk_set contains pks for season objects
-            cls = Season
-            error_msg = 'The {0} specified ({1} - pk={2}) is not configured for {3}'
-        else:
-            # i.e. season_obj.teams.add(team_obj), so pk_set contains pks for team objects
-            cls = Team
-            error_msg = 'The {0} specified ({1} - pk={2}) does not belong to {3}'
-
+    if action != 'pre_add':
+        return
+
+    from seasons.utils import get_objects_outside_league
+
+    if reverse:
+        # i.e. team_obj.season_set.add(season_obj), so pk_set contains pks for season objects
+        cls = Season
+        error_msg = 'The {0} specified ({1} - pk={2}) is not configured for {3}'
+        league_id = instance.league_id
+    else:
+        # i.e. season_obj.teams.add(team_obj), so pk_set contains pks for team objects
+        cls = Team
+        error_msg = 'The {0} specified ({1} - pk={2}) does not belong to {3}'
+        league_id = instance.league_id
+
+    invalid, missing = get_objects_outside_league(cls, pk_set, league_id)
+    for pk in missing:
+        logger.error('{cls} with pk {pk} does not exist'.format(cls=cls.__name__, pk=pk))
+    if invalid:
+        league = instance.division.league if reverse else instance.league
         errors = []
-        pks = pk_set.copy()
-        for pk in pks:
-            qs = cls.objects.filter(pk=pk)
-            if qs.exists():
-                obj = qs.first()
-                if reverse and obj.league_id != instance.division.league_id:
-                    # Remove the pk from the set so it is not added
-                    pk_set.remove(pk)
-                    errors.append(
-                        error_msg.format(cls.__name__.lower(), str(obj), obj.pk,
-                                         instance.division.league.name))
-                elif not reverse and obj.division.league_id != instance.league_id:
-                    # Remove the pk from the set so it is not added
-                    pk_set.remove(pk)
-                    errors.append(error_msg.format(cls.__name__.lower(), str(obj), obj.pk, instance.league.name))
-            else:
-                logger.error('{cls} with pk {pk} does not exist'.format(cls=cls.__name__, pk=pk))
-        if errors:
-            logger.error('. '.join(errors))
-            # raise ValidationError(errors)
+        for obj in invalid:
+            # Remove the pk from the set so it is not added
+            pk_set.remove(obj.pk)
+            errors.append(error_msg.format(cls.__name__.lower(), str(obj), obj.pk, league.name))
+        logger.error('. '.join(errors))
+        # raise ValidationError(errors)
+
+
+@receiver(post_save, sender=Season)
+@receiver(post_delete, sender=Season)
+def bump_fragment_versions_on_season_change(sender, instance, **kwargs):
+    """
+    A league's seasons are listed on all of its pages, the season's dates determine what is displayed for it.
+    """
+    bump_fragment_versions((LEAGUE, instance.league_id), (SEASON, instance.pk))
+
+
+@receiver(post_save, sender=Season)
+@receiver(post_delete, sender=Season)
+def invalidate_current_season_on_change(sender, instance, **kwargs):
+    from seasons.utils import invalidate_current_season
+
+    invalidate_current_season(instance.league_id)
+
+
+@receiver(m2m_changed, sender=Season.teams.through)
+def bump_fragment_versions_on_season_teams_change(action, instance, pk_set, reverse, **kwargs):
+    """
+    A season's teams determine the teams that can be filtered on in the schedule and the divisions of past seasons.
+    """
+    if action not in ['post_add', 'post_remove', 'post_clear']:
+        return
+    if not reverse:
+        bump_fragment_versions((SEASON, instance.pk))
+    elif pk_set:
+        # i.e. team_obj.seasons.add(season_obj)
+        bump_fragment_versions(*[(SEASON, pk) for pk in pk_set])
+    else:
+        # `pk_set` is None when clearing, the team's seasons are unknown at this point
+        bump_fragment_versions((TEAM, instance.pk), (LEAGUE, instance.league_id))
 
 
 class AbstractSeasonRoster(TimestampedModel):
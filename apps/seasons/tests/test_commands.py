@@ -7,11 +7,16 @@ from django.utils.six import StringIO
 from divisions.tests import DivisionFactory
 from ayrabo.utils.testing import BaseTestCase
 from leagues.tests import LeagueFactory
-from seasons.models import Season
-from seasons.tests import SeasonFactory
+from players.tests import HockeyPlayerFactory
+from seasons.models import HockeySeasonRoster, Season
+from seasons.tests import HockeySeasonRosterFactory, SeasonFactory
+from standings.models import HockeyStanding
 from teams.tests import TeamFactory
 
 EXPIRATION_DAYS = 30
+# Expiring seasons, existing seasons, savepoint, insert seasons, refetch seasons (sqlite), read teams, insert teams,
+# insert standings and release savepoint
+COPY_NUM_QUERIES = 9
 
 
 class CopyExpiringSeasonsTests(BaseTestCase):
@@ -91,3 +96,58 @@ class CopyExpiringSeasonsTests(BaseTestCase):
         call_command('copy_expiring_seasons', stdout=out)
         result = out.getvalue()
         self.assertRegex(result, r'Total: 6 Copied: 1 Skipped: 5 SUCCESS\n$')
+
+    def test_dry_run(self):
+        out = StringIO()
+        call_command('copy_expiring_seasons', '--dry-run', verbosity=2, stdout=out)
+        result = out.getvalue()
+        self.assertEqual(Season.objects.count(), 4)
+        self.assertIn('Would copy Long Island Amateur Hockey League: 2012-2013 Season -> 2013-2014 Season', result)
+        self.assertRegex(result, r'Total: 3 Copied: 3 Skipped: 0 SUCCESS\n$')
+
+    def test_copy_rosters(self):
+        players = HockeyPlayerFactory.create_batch(3, team=self.teams[0], sport=self.league.sport)
+        inactive_player = HockeyPlayerFactory(team=self.teams[0], sport=self.league.sport, is_active=False)
+        traded_player = HockeyPlayerFactory(team=self.teams[0], sport=self.league.sport)
+        HockeySeasonRosterFactory(name='Main', season=self.season_3, team=self.teams[0], default=True,
+                                  players=players + [inactive_player, traded_player])
+        HockeySeasonRosterFactory(name='Scrimmage', season=self.season_3, team=self.teams[0], default=False,
+                                  players=players)
+        traded_player.team = self.teams[1]
+        traded_player.save()
+
+        out = StringIO()
+        call_command('copy_expiring_seasons', '--copy-rosters', stdout=out)
+        end_date = self.today + datetime.timedelta(days=EXPIRATION_DAYS)
+        copy = Season.objects.get(league=self.league, start_date=end_date)
+        roster = HockeySeasonRoster.objects.get(season=copy)
+        self.assertEqual(roster.name, 'Main')
+        self.assertEqual(roster.team, self.teams[0])
+        self.assertTrue(roster.default)
+        self.assertSetEqual(set(roster.players.all()), set(players))
+        self.assertIn('Season rosters copied: 1', out.getvalue())
+
+    def test_teams_from_other_leagues_not_copied(self):
+        other_team = TeamFactory()
+        Season.teams.through.objects.create(season=self.season_3, team=other_team)
+        call_command('copy_expiring_seasons', stdout=StringIO())
+        end_date = self.today + datetime.timedelta(days=EXPIRATION_DAYS)
+        copy = Season.objects.get(league=self.league, start_date=end_date)
+        self.assertSetEqual(set(copy.teams.all()), set(self.teams))
+        self.assertSetEqual(set(HockeyStanding.objects.filter(season=copy).values_list('team_id', flat=True)),
+                            {team.pk for team in self.teams})
+
+    def test_num_queries(self):
+        with self.assertNumQueries(COPY_NUM_QUERIES):
+            call_command('copy_expiring_seasons', stdout=StringIO())
+
+    def test_num_queries_does_not_depend_on_seasons(self):
+        for _ in range(2):
+            league = LeagueFactory()
+            teams = TeamFactory.create_batch(2, division__league=league)
+            for year in (2010, 2012, 2014):
+                SeasonFactory(start_date=datetime.date(year, 8, 15), end_date=datetime.date(year + 1, 8, 15),
+                              league=league, teams=teams)
+        with self.assertNumQueries(COPY_NUM_QUERIES):
+            call_command('copy_expiring_seasons', stdout=StringIO())
+        self.assertEqual(Season.objects.count(), 4 + 6 + 3 + 6)
@@ -5,7 +5,7 @@ from ayrabo.utils.testing import BaseTestCase
 from divisions.tests import DivisionFactory
 from leagues.tests import LeagueFactory
 from players.tests import HockeyPlayerFactory
-from seasons.forms import HockeySeasonRosterCreateUpdateForm
+from seasons.forms import HockeySeasonRosterCreateUpdateForm, SeasonAdminForm
 from seasons.tests import SeasonFactory
 from sports.tests import SportFactory
 from teams.tests import TeamFactory
@@ -53,3 +53,29 @@ class HockeySeasonRosterCreateUpdateFormTests(BaseTestCase):
     def test_disabling_fields(self):
         form = self.get_form(disable=['season'])
         self.assertTrue(form.fields['season'].disabled)
+
+
+class SeasonAdminFormTests(BaseTestCase):
+    def setUp(self):
+        self.league = LeagueFactory(name='Long Island Amateur Hockey League')
+        self.teams = TeamFactory.create_batch(3, division__league=self.league)
+        self.other_team = TeamFactory(name='San Jose Sharks')
+
+    def get_form(self, teams):
+        return SeasonAdminForm(data={
+            'league': self.league.pk,
+            'start_date': '2020-08-15',
+            'end_date': '2021-08-15',
+            'teams': [team.pk for team in teams],
+        })
+
+    def test_teams_same_league(self):
+        form = self.get_form(self.teams)
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_teams_diff_league(self):
+        form = self.get_form(self.teams + [self.other_team])
+        self.assertFalse(form.is_valid())
+        self.assertListEqual(form.errors['teams'], [
+            'The team specified (San Jose Sharks) does not belong to Long Island Amateur Hockey League'
+        ])
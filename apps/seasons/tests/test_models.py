@@ -135,6 +135,19 @@ class SeasonModelTests(BaseTestCase):
             })
         )
 
+    def test_league_detail_leaders_url(self):
+        self.assertEqual(
+            self.past_season.league_detail_leaders_url,
+            reverse('leagues:seasons:leaders', kwargs={
+                'slug': self.league.slug,
+                'season_pk': self.past_season.pk,
+            })
+        )
+        self.assertEqual(
+            self.current_season.league_detail_leaders_url,
+            reverse('leagues:leaders', kwargs={'slug': self.league.slug})
+        )
+
 
 class SeasonTeamM2MSignalTests(BaseTestCase):
     def setUp(self):
@@ -197,6 +210,13 @@ class SeasonTeamM2MSignalTests(BaseTestCase):
         self.liahl_season.teams.add(team.id)
         self.assertListEqual([], list(self.liahl_season.teams.all()))
 
+    def test_add_teams_num_queries(self):
+        teams = TeamFactory.create_batch(40, division=self.mites) + TeamFactory.create_batch(5, division=self.pacific)
+        # Validate, fetch existing teams, insert and fetch the league for the standings
+        with self.assertNumQueries(4):
+            self.liahl_season.teams.add(*teams)
+        self.assertSetEqual(set(self.liahl_season.teams.all()), set(teams[:40]))
+
 
 class AbstractSeasonRosterModelTests(BaseTestCase):
     """
@@ -1,9 +1,26 @@
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
 from django.http import Http404
+from django.test import override_settings
+from django.utils import timezone
 
 from ayrabo.utils.testing import BaseTestCase
+from divisions.tests import DivisionFactory
 from leagues.tests import LeagueFactory
-from seasons.utils import get_current_season_or_from_pk
+from seasons.models import Season
+from seasons.tests import SeasonFactory
+from seasons.utils import (
+    get_current_season,
+    get_current_season_or_from_pk,
+    get_objects_outside_league,
+    invalidate_current_season,
+)
 from sports.tests import SportFactory
+from teams.models import Team
+from teams.tests import TeamFactory
 
 
 class UtilsTests(BaseTestCase):
@@ -11,6 +28,9 @@ class UtilsTests(BaseTestCase):
         self.ice_hockey = SportFactory(name='Ice Hockey')
         self.liahl = LeagueFactory(sport=self.ice_hockey, name='Long Island Amateur Hockey League')
         self.past_season, self.current_season, _ = self.create_past_current_future_seasons(league=self.liahl)
+        # Divisions are fetched by name, the names need to be unique so the teams end up in the expected leagues
+        self.liahl_division = DivisionFactory(name='Midget Minor AA', league=self.liahl)
+        self.other_division = DivisionFactory(name='Other Division', league=LeagueFactory(sport=self.ice_hockey))
 
     def test_get_current_season_or_from_pk_current_season(self):
         season = get_current_season_or_from_pk(self.liahl, None)
@@ -27,3 +47,106 @@ class UtilsTests(BaseTestCase):
     def test_get_current_season_or_from_pk_past_season(self):
         season = get_current_season_or_from_pk(self.liahl, self.past_season.pk)
         self.assertEqual(season, self.past_season)
+
+    def test_get_objects_outside_league_teams(self):
+        teams = TeamFactory.create_batch(2, division=self.liahl_division)
+        other_team = TeamFactory(division=self.other_division)
+        with self.assertNumQueries(1):
+            invalid, missing = get_objects_outside_league(Team, [teams[0].pk, teams[1].pk, other_team.pk, 0],
+                                                          self.liahl.pk)
+        self.assertListEqual(invalid, [other_team])
+        self.assertSetEqual(missing, {0})
+
+    def test_get_objects_outside_league_seasons(self):
+        other_season = SeasonFactory(league__sport=self.ice_hockey)
+        invalid, missing = get_objects_outside_league(Season, {self.past_season.pk, other_season.pk}, self.liahl.pk)
+        self.assertListEqual(invalid, [other_season])
+        self.assertSetEqual(missing, set())
+
+    def test_get_objects_outside_league_queryset(self):
+        TeamFactory.create_batch(2, division=self.liahl_division)
+        other_team = TeamFactory(division=self.other_division)
+        invalid, missing = get_objects_outside_league(Team, Team.objects.all(), self.liahl.pk)
+        self.assertListEqual(invalid, [other_team])
+        self.assertSetEqual(missing, set())
+
+
+@override_settings(CURRENT_SEASON_CACHE_ENABLED=True)
+class CurrentSeasonCacheTests(BaseTestCase):
+    def setUp(self):
+        self.ice_hockey = SportFactory(name='Ice Hockey')
+        self.liahl = LeagueFactory(sport=self.ice_hockey, name='Long Island Amateur Hockey League')
+        self.past_season, self.current_season, self.future_season = self.create_past_current_future_seasons(
+            league=self.liahl
+        )
+        self.addCleanup(cache.clear)
+        self.addCleanup(invalidate_current_season, self.liahl.pk)
+
+    def test_get_current_season_cached(self):
+        with self.assertNumQueries(1):
+            season = get_current_season(self.liahl)
+        self.assertEqual(season, self.current_season)
+        with self.assertNumQueries(0):
+            season = get_current_season(self.liahl)
+            # The league isn't fetched again
+            self.assertEqual(season.league, self.liahl)
+        self.assertEqual(season.start_date, self.current_season.start_date)
+        self.assertEqual(season.end_date, self.current_season.end_date)
+
+    def test_get_current_season_no_seasons(self):
+        league = LeagueFactory(sport=self.ice_hockey)
+        self.addCleanup(invalidate_current_season, league.pk)
+        self.assertIsNone(get_current_season(league))
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_current_season(league))
+
+    def test_get_current_season_expires_at_boundary(self):
+        get_current_season(self.liahl)
+        now = timezone.now()
+        with mock.patch('django.utils.timezone.now') as mock_now:
+            # The current season's last day is covered
+            mock_now.return_value = now + datetime.timedelta(days=364)
+            with self.assertNumQueries(0):
+                self.assertEqual(get_current_season(self.liahl), self.current_season)
+            # The current season's end date is a boundary
+            mock_now.return_value = now + datetime.timedelta(days=365)
+            with self.assertNumQueries(1):
+                self.assertIsNone(get_current_season(self.liahl))
+            # So is the future season's start date
+            mock_now.return_value = now + datetime.timedelta(days=366)
+            with self.assertNumQueries(1):
+                self.assertEqual(get_current_season(self.liahl), self.future_season)
+            # Matches the uncached version
+            for days in [-400, -1, 0, 364, 365, 366, 731]:
+                mock_now.return_value = now + datetime.timedelta(days=days)
+                self.assertEqual(get_current_season(self.liahl), Season.objects.get_current(self.liahl))
+
+    def test_get_current_season_invalidated_on_change(self):
+        today = timezone.now().date()
+        get_current_season(self.liahl)
+        self.current_season.end_date = today
+        self.current_season.save()
+        self.assertIsNone(get_current_season(self.liahl))
+
+        self.past_season.end_date = today + datetime.timedelta(days=1)
+        self.past_season.save()
+        self.assertEqual(get_current_season(self.liahl), self.past_season)
+
+        self.past_season.delete()
+        self.assertIsNone(get_current_season(self.liahl))
+
+    def test_get_current_season_invalidated_by_copy_expiring_seasons(self):
+        self.future_season.delete()
+        now = timezone.now() + datetime.timedelta(days=366)
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            self.assertIsNone(get_current_season(self.liahl))
+            with mock.patch('seasons.management.commands.copy_expiring_seasons.date') as mock_date:
+                mock_date.today.return_value = now.date()
+                call_command('copy_expiring_seasons', stdout=mock.Mock())
+            self.assertEqual(get_current_season(self.liahl).start_date, self.current_season.end_date)
+
+    @override_settings(CURRENT_SEASON_CACHE_ENABLED=False)
+    def test_get_current_season_disabled(self):
+        get_current_season(self.liahl)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_current_season(self.liahl), self.current_season)
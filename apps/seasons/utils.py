@@ -1,8 +1,127 @@
+import datetime
+import math
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, QuerySet
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
+from common.fragments import LEAGUE, bump_fragment_versions
 from seasons.models import Season
 
 
+CURRENT_SEASON_CACHE_KEY = 'seasons:current:{league_id}'
+# Seconds a process reuses a resolved current season before checking the shared cache again. Changes to seasons are
+# visible right away in the process that made them, other processes may take this long to notice them.
+CURRENT_SEASON_LOCAL_TIMEOUT = 60
+
+# league id -> (entry, time.monotonic() when the entry was fetched from the shared cache)
+_current_seasons = {}
+
+
+def is_current_season_cache_enabled():
+    return getattr(settings, 'CURRENT_SEASON_CACHE_ENABLED', False)
+
+
+def get_current_season_cache_key(league_id):
+    return CURRENT_SEASON_CACHE_KEY.format(league_id=league_id)
+
+
+def _is_entry_valid(entry, today):
+    valid_until = entry['valid_until']
+    return entry['valid_from'] <= today and (valid_until is None or today < valid_until)
+
+
+def _resolve_current_season(league_id, today):
+    """
+    Resolve the current season for the league, along with the next season boundary (the earliest start or end date that
+    would change the result). Matches `SeasonManager.get_current`, using one query for all of the league's current and
+    future seasons.
+
+    :param league_id: Id of the league to resolve the current season for
+    :param today: Date to resolve the current season for
+    :return: Dict containing the current season's field values (or None), `valid_from` and `valid_until` dates
+    """
+    seasons = list(Season.objects.filter(league_id=league_id, end_date__gt=today))
+    started = [season for season in seasons if season.start_date <= today]
+    # `SeasonManager.get_current` uses the default ordering (most recent end date first) for overlapping seasons
+    current = max(started, key=lambda season: (season.end_date, season.start_date), default=None)
+    boundaries = [season.start_date for season in seasons if season.start_date > today]
+    boundaries.extend(season.end_date for season in started)
+    values = None
+    if current is not None:
+        values = [getattr(current, field.attname) for field in Season._meta.concrete_fields]
+    return {
+        'values': values,
+        'valid_from': today,
+        'valid_until': min(boundaries, default=None),
+    }
+
+
+def _get_cache_timeout(entry, now):
+    if entry['valid_until'] is None:
+        # Nothing changes the result until the league's seasons change, which invalidates the entry
+        return None
+    boundary = datetime.datetime.combine(entry['valid_until'], datetime.time.min, tzinfo=now.tzinfo)
+    return max(math.ceil((boundary - now).total_seconds()), 1)
+
+
+def _get_current_season_entry(league_id):
+    now = timezone.now()
+    today = now.date()
+    local_entry = _current_seasons.get(league_id)
+    if local_entry is not None:
+        entry, fetched = local_entry
+        if time.monotonic() - fetched < CURRENT_SEASON_LOCAL_TIMEOUT and _is_entry_valid(entry, today):
+            return entry
+
+    cache_key = get_current_season_cache_key(league_id)
+    entry = cache.get(cache_key)
+    if entry is None or not _is_entry_valid(entry, today):
+        entry = _resolve_current_season(league_id, today)
+        cache.set(cache_key, entry, _get_cache_timeout(entry, now))
+    _current_seasons[league_id] = (entry, time.monotonic())
+    return entry
+
+
+def get_current_season(league):
+    """
+    Cached version of `SeasonManager.get_current`. The current season is resolved once per league and cached (in the
+    process and the shared cache) until the next season boundary, or until one of the league's seasons changes.
+
+    :param league: The league to get the current season for
+    :return: The currently active season for the given league if exists, else None
+    """
+    if not is_current_season_cache_enabled():
+        return Season.objects.get_current(league=league)
+    entry = _get_current_season_entry(league.pk)
+    if entry['values'] is None:
+        return None
+    # A new instance for each call, callers are free to modify it
+    season = Season.from_db('default', [field.attname for field in Season._meta.concrete_fields], entry['values'])
+    season.league = league
+    return season
+
+
+def invalidate_current_season(league_id):
+    """
+    Remove the cached current season for the league, the next call to `get_current_season` resolves it again. A no-op
+    if the current season cache has been disabled.
+
+    NOTE: `QuerySet.update` and `bulk_create` don't send signals, code bulk changing seasons needs to call this function
+    manually.
+
+    :param league_id: Id of the league whose seasons have changed
+    """
+    if is_current_season_cache_enabled():
+        _current_seasons.pop(league_id, None)
+        cache.delete(get_current_season_cache_key(league_id))
+
+
 def get_current_season_or_from_pk(league, season_pk):
     """
     Gets the current season or the season specified by the season_pk param for the given league.
@@ -16,5 +135,179 @@ def get_current_season_or_from_pk(league, season_pk):
     if season_pk is None:
         # It's possible for this to return `None` if there is no current season for the league. That case should be
         # extremely rare, but may happen when writing tests.
-        return Season.objects.get_current(league=league)
+        return get_current_season(league)
     return get_object_or_404(Season.objects.filter(league=league), pk=season_pk)
+
+
+def get_objects_outside_league(model_cls, pks, league_id):
+    """
+    Find the teams or seasons that don't belong to a league, i.e. the ones that can't be added to a season or team of
+    that league. The objects and their league ids are fetched in a single query, so this can validate any # of teams
+    (season admin form, bulk imports) or seasons at once.
+
+    :param model_cls: Team or Season
+    :param pks: Pks of the objects to validate, can also be a queryset of the objects
+    :param league_id: Id of the league the objects should belong to
+    :return: Tuple of (list of objects that don't belong to the league, set of pks that don't exist). Pks that don't
+        exist can't be determined when `pks` is a queryset.
+    """
+    objs = list(model_cls.objects.filter(pk__in=pks))
+    invalid = [obj for obj in objs if obj.league_id != league_id]
+    missing = set() if isinstance(pks, QuerySet) else set(pks) - {obj.pk for obj in objs}
+    return invalid, missing
+
+
+def copy_expiring_seasons(expiring_before, copy_rosters=False, dry_run=False):
+    """
+    Create next year's season for every season ending on or before `expiring_before` that doesn't have one yet. The
+    copy starts the day the season ends, lasts a year and has the same teams. A season already has a copy when its
+    league has a season starting and ending in the same years as the copy would.
+
+    The missing seasons are computed in a single pass and created (along with their teams and rosters) in bulk, in a
+    single transaction. The # of queries doesn't depend on the # of seasons being copied.
+
+    :param expiring_before: Seasons ending on or before this date are copied
+    :param copy_rosters: Whether to carry the default season rosters of the seasons forward. Only players that are still
+        active and on the team are carried forward.
+    :param dry_run: Compute what would be copied without writing anything
+    :return: Dict with the # of expiring seasons (`total`), list of (season, copy) tuples for the seasons that were
+        copied (`copied`), list of seasons that already had a copy (`skipped`) and the # of season rosters carried
+        forward (`rosters`)
+    """
+    one_year = datetime.timedelta(days=365)
+    expiring = list(Season.objects.filter(end_date__lte=expiring_before).select_related('league__sport'))
+    league_ids = Season.objects.filter(end_date__lte=expiring_before).values('league_id')
+    existing = {
+        (league_id, start_date.year, end_date.year)
+        for league_id, start_date, end_date in Season.objects.filter(league_id__in=league_ids).order_by().values_list(
+            'league_id', 'start_date', 'end_date'
+        )
+    }
+
+    copies = []
+    skipped = []
+    # Seasons are processed latest first, a copy created for one season counts as the copy of any earlier season that
+    # would be copied to the same years.
+    for season in expiring:
+        start_date = season.end_date
+        end_date = start_date + one_year
+        key = (season.league_id, start_date.year, end_date.year)
+        if key in existing:
+            skipped.append(season)
+            continue
+        existing.add(key)
+        copies.append((season, Season(league=season.league, start_date=start_date, end_date=end_date)))
+
+    report = {'total': len(expiring), 'copied': copies, 'skipped': skipped, 'rosters': 0}
+    if dry_run or not copies:
+        return report
+
+    with transaction.atomic():
+        _bulk_create_seasons([copy for _, copy in copies])
+        copy_ids = {season.pk: copy.pk for season, copy in copies}
+
+        # Bulk inserts don't send `m2m_changed`, only copy the teams `validate_leagues` would have allowed
+        through_model = Season.teams.through
+        memberships = through_model.objects.filter(
+            season_id__in=list(copy_ids),
+            team__league_id=F('season__league_id')
+        ).values_list('season_id', 'team_id')
+        copy_memberships = [(copy_ids[season_id], team_id) for season_id, team_id in memberships]
+        through_model.objects.bulk_create([
+            through_model(season_id=season_id, team_id=team_id) for season_id, team_id in copy_memberships
+        ])
+        _create_copy_standings(copies, copy_memberships)
+
+        if copy_rosters:
+            report['rosters'] = _copy_default_season_rosters(copy_ids)
+
+    # Bulk inserts don't send `post_save`, the copies are new so only their leagues' pages need to change
+    league_ids = {season.league_id for season, _ in copies}
+    bump_fragment_versions(*[(LEAGUE, league_id) for league_id in league_ids])
+    for league_id in league_ids:
+        invalidate_current_season(league_id)
+    return report
+
+
+def _create_copy_standings(copies, copy_memberships):
+    """
+    Give the teams of the copies zero standings, `m2m_changed` (see `standings.models`) isn't sent for bulk inserts.
+    """
+    from standings.mappings import SPORT_STANDING_MODEL_MAPPINGS
+    from standings.utils import create_standings
+
+    sport_names = {copy.pk: copy.league.sport.name for _, copy in copies}
+    season_team_ids_by_sport = defaultdict(list)
+    for season_id, team_id in copy_memberships:
+        season_team_ids_by_sport[sport_names[season_id]].append((season_id, team_id))
+    for sport_name, season_team_ids in season_team_ids_by_sport.items():
+        standing_model_cls = SPORT_STANDING_MODEL_MAPPINGS.get(sport_name)
+        if standing_model_cls is not None:
+            create_standings(standing_model_cls, season_team_ids)
+
+
+def _bulk_create_seasons(seasons):
+    Season.objects.bulk_create(seasons)
+    if seasons[0].pk is not None:
+        return
+    # Not all dbs set the pk of bulk created objects, a league's seasons have unique start dates
+    pks = {
+        (league_id, start_date): pk
+        for pk, league_id, start_date in Season.objects.filter(
+            league_id__in={season.league_id for season in seasons},
+            start_date__in={season.start_date for season in seasons}
+        ).values_list('pk', 'league_id', 'start_date')
+    }
+    for season in seasons:
+        season.pk = pks[(season.league_id, season.start_date)]
+
+
+def _copy_default_season_rosters(copy_ids):
+    """
+    :param copy_ids: Dict of season id -> id of the season's copy
+    :return: # of season rosters created
+    """
+    from seasons.mappings import SPORT_SEASON_ROSTER_MODEL_MAPPINGS
+
+    created = 0
+    for model_cls in set(SPORT_SEASON_ROSTER_MODEL_MAPPINGS.values()):
+        # Only forms validate a team has a single default roster for a season, the most recent one wins
+        rosters = {
+            (season_id, team_id): (pk, name, season_id, team_id, created_by_id)
+            for pk, name, season_id, team_id, created_by_id in model_cls.objects.filter(
+                season_id__in=list(copy_ids), default=True
+            ).order_by('pk').values_list('pk', 'name', 'season_id', 'team_id', 'created_by_id')
+        }
+        rosters = list(rosters.values())
+        if not rosters:
+            continue
+        model_cls.objects.bulk_create([
+            model_cls(name=name, season_id=copy_ids[season_id], team_id=team_id, default=True,
+                      created_by_id=created_by_id)
+            for _, name, season_id, team_id, created_by_id in rosters
+        ])
+        # A team's default roster for a season is unique
+        new_ids = dict(
+            ((season_id, team_id), pk)
+            for pk, season_id, team_id in model_cls.objects.filter(
+                season_id__in=list(copy_ids.values()), default=True
+            ).values_list('pk', 'season_id', 'team_id')
+        )
+        roster_ids = {pk: new_ids[(copy_ids[season_id], team_id)] for pk, _, season_id, team_id, _ in rosters}
+
+        through_model = model_cls.players.through
+        roster_field = model_cls.players.field.m2m_field_name()
+        player_field = model_cls.players.field.m2m_reverse_field_name()
+        players = through_model.objects.filter(
+            **{
+                f'{roster_field}_id__in': list(roster_ids),
+                f'{player_field}__is_active': True,
+                f'{player_field}__team_id': F(f'{roster_field}__team_id'),
+            }
+        ).values_list(f'{roster_field}_id', f'{player_field}_id')
+        through_model.objects.bulk_create([
+            through_model(**{f'{roster_field}_id': roster_ids[roster_id], f'{player_field}_id': player_id})
+            for roster_id, player_id in players
+        ])
+        created += len(rosters)
+    return created
@@ -25,13 +25,11 @@ class SeasonRosterCreateView(LoginRequiredMixin,
         if hasattr(self, 'team'):
             return self.team
         self.team = get_object_or_404(
-            Team.objects.select_related('division__league__sport', 'organization'),
+            Team.objects.select_related('division', 'league', 'sport', 'organization'),
             pk=self.kwargs.get('team_pk')
         )
-        division = self.team.division
-        league = division.league
-        self.sport = league.sport
-        self.season = get_current_season_or_from_pk(league=league, season_pk=None)
+        self.sport = self.team.sport
+        self.season = get_current_season_or_from_pk(league=self.team.league, season_pk=None)
         return self.team
 
     def has_permission_func(self):
@@ -88,13 +86,11 @@ class SeasonRosterUpdateView(LoginRequiredMixin,
         if hasattr(self, 'team'):
             return self.team
         self.team = get_object_or_404(
-            Team.objects.select_related('division__league__sport', 'organization'),
+            Team.objects.select_related('division', 'league', 'sport', 'organization'),
             pk=self.kwargs.get('team_pk')
         )
-        division = self.team.division
-        league = division.league
-        self.sport = league.sport
-        self.season = get_current_season_or_from_pk(league=league, season_pk=None)
+        self.sport = self.team.sport
+        self.season = get_current_season_or_from_pk(league=self.team.league, season_pk=None)
         return self.team
 
     def has_permission_func(self):
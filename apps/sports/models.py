@@ -1,7 +1,10 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.text import slugify
 
 from common.models import TimestampedModel
+from common.reference_data import DIVISIONS, LEAGUES, SPORTS, bump_reference_data_versions
 from sports.managers import SportRegistrationManager
 
 
@@ -57,3 +60,10 @@ class SportRegistration(TimestampedModel):
 
     def __str__(self):
         return '{}: {} - {}'.format(self.user.email, self.get_role_display(), self.sport.name)
+
+
+@receiver(post_save, sender=Sport)
+@receiver(post_delete, sender=Sport)
+def bump_reference_data_versions_on_sport_change(sender, instance, **kwargs):
+    # Leagues and divisions are loaded with their sport
+    bump_reference_data_versions(SPORTS, LEAGUES, DIVISIONS)
@@ -1,6 +1,6 @@
 from django.urls import reverse
 
-from ayrabo.utils.testing import BaseTestCase
+from ayrabo.utils.testing import BaseTestCase, QueryBudgetMixin
 from coaches.tests import CoachFactory
 from common.tests import WaffleSwitchFactory
 from divisions.tests import DivisionFactory
@@ -185,7 +185,7 @@ class SportRegistrationCreateViewTests(BaseTestCase):
         self.assertRedirects(response, reverse('home'))
 
 
-class SportDashboardViewTests(BaseTestCase):
+class SportDashboardViewTests(QueryBudgetMixin, BaseTestCase):
     url = 'sports:dashboard'
 
     def setUp(self):
@@ -211,6 +211,20 @@ class SportDashboardViewTests(BaseTestCase):
         response = self.client.get(self.format_url(slug='ice-hockey'))
         self.assert_404(response)
 
+    def test_query_budget(self):
+        SportRegistrationFactory(user=self.user, sport=self.ice_hockey, role=SportRegistration.PLAYER)
+        SportRegistrationFactory(user=self.user, sport=self.ice_hockey, role=SportRegistration.COACH)
+        self.login(user=self.user)
+
+        def seed(count):
+            for _ in range(count):
+                team = TeamFactory(division=self.mm_aa)
+                HockeyPlayerFactory(user=self.user, sport=self.ice_hockey, team=team)
+                CoachFactory(user=self.user, team=team)
+
+        url = self.format_url(slug='ice-hockey')
+        self.assertQueriesDoNotScale(lambda: self.client.get(url), seed, sizes=(1, 10), max_queries=9)
+
     # GET
     def test_get(self):
         sr_1 = SportRegistrationFactory(user=self.user, sport=self.ice_hockey, role=SportRegistration.PLAYER)
@@ -7,6 +7,7 @@ from django.views import generic
 from django.views.generic.base import ContextMixin
 
 from ayrabo.utils.mixins import HasPermissionMixin, PreSelectedTabMixin, WaffleSwitchMixin
+from common.reference_data import SPORTS, get_reference_objects
 from scorekeepers.models import Scorekeeper
 from sports.forms import SportRegistrationCreateForm, SportRegistrationFormSet
 from sports.formset_helpers import SportRegistrationCreateFormSetHelper
@@ -31,7 +32,7 @@ class SportRegistrationCreateView(LoginRequiredMixin,
         self.sports_already_registered_for = {sr.sport.id for sr in
                                               user.sport_registrations.all().select_related('sport')}
         # This should never be negative
-        self.remaining_sport_count = Sport.objects.count() - len(self.sports_already_registered_for)
+        self.remaining_sport_count = len(get_reference_objects(SPORTS)) - len(self.sports_already_registered_for)
         return self.remaining_sport_count > 0
 
     def on_has_permission_failure(self):
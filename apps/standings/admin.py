@@ -0,0 +1,33 @@
+from django.contrib import admin
+
+from .models import HockeyGameResult, HockeyStanding
+
+
+@admin.register(HockeyStanding)
+class HockeyStandingAdmin(admin.ModelAdmin):
+    list_display = ['id', 'team', 'season', 'games_played', 'wins', 'losses', 'ties', 'overtime_losses', 'points',
+                    'goals_for', 'goals_against', 'streak']
+    search_fields = ['team__name']
+    list_select_related = ['team', 'season']
+
+    def has_add_permission(self, request):
+        """
+        Standings are maintained automatically, use the `rebuild_standings` management command to fix bad data.
+        """
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(HockeyGameResult)
+class HockeyGameResultAdmin(admin.ModelAdmin):
+    list_display = ['id', 'game', 'home_team', 'away_team', 'home_goals', 'away_goals', 'overtime', 'point_value']
+    raw_id_fields = ['game']
+    list_select_related = ['game__home_team', 'game__away_team', 'home_team', 'away_team']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from seasons.models import Season
+from standings.mappings import SPORT_REBUILD_STANDINGS_FUNC_MAPPINGS
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds standings from completed games. Useful for backfills and fixing data that drifted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seasons', nargs='+', type=int, help='Only rebuild standings for these season ids.')
+
+    def handle(self, *args, **options):
+        season_ids = options.get('seasons')
+        for sport_name, rebuild_func in SPORT_REBUILD_STANDINGS_FUNC_MAPPINGS.items():
+            seasons = Season.objects.filter(league__sport__name=sport_name)
+            if season_ids:
+                seasons = seasons.filter(id__in=season_ids)
+            num_results, num_standings = rebuild_func(seasons)
+            self.stdout.write(f'{sport_name}: Rebuilt {num_standings} standings from {num_results} games')
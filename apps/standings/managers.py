@@ -0,0 +1,17 @@
+from django.db import models
+
+
+class StandingManager(models.Manager):
+    def get_for_season(self, season, division=None):
+        """
+        Fetches standings for the season, ordered by points desc. Backed by the (season, -points) index so this is a
+        cheap read regardless of how many games have been played.
+
+        :param season: Season to get standings for
+        :param division: Optional division to narrow the standings down to
+        :return: Standings for the season
+        """
+        qs = self.filter(season=season)
+        if division is not None:
+            qs = qs.filter(team__division=division)
+        return qs.select_related('team', 'team__division').order_by('-points', '-wins', 'team__name')
@@ -0,0 +1,26 @@
+from ayrabo.utils.exceptions import SportNotConfiguredException
+from standings.models import HockeyStanding
+from standings.utils import rebuild_hockey_standings
+
+
+SPORT_STANDING_MODEL_MAPPINGS = {
+    'Ice Hockey': HockeyStanding,
+}
+
+SPORT_REBUILD_STANDINGS_FUNC_MAPPINGS = {
+    'Ice Hockey': rebuild_hockey_standings,
+}
+
+
+def get_standing_model_cls(sport):
+    """
+    Gets the appropriate standing model for the given sport.
+
+    :param sport: Sport that will be used to fetch the correct model class.
+    :raises SportNotConfiguredException: If a standing model class can't be found for the given sport.
+    :return: Standing model class for the specified sport.
+    """
+    model_cls = SPORT_STANDING_MODEL_MAPPINGS.get(sport.name)
+    if model_cls is None:
+        raise SportNotConfiguredException(sport)
+    return model_cls
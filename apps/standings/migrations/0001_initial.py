@@ -0,0 +1,76 @@
+# Generated by Django 2.2.28 on 2026-10-18 13:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('teams', '0007_auto_20181110_0412'),
+        ('games', '0008_auto_20201225_0134'),
+        ('seasons', '0003_auto_20190421_2008'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HockeyStanding',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Updated')),
+                ('games_played', models.PositiveIntegerField(default=0, verbose_name='Games Played')),
+                ('wins', models.PositiveIntegerField(default=0, verbose_name='Wins')),
+                ('losses', models.PositiveIntegerField(default=0, verbose_name='Losses')),
+                ('ties', models.PositiveIntegerField(default=0, verbose_name='Ties')),
+                ('points', models.PositiveIntegerField(default=0, verbose_name='Points')),
+                ('goals_for', models.PositiveIntegerField(default=0, verbose_name='Goals For')),
+                ('goals_against', models.PositiveIntegerField(default=0, verbose_name='Goals Against')),
+                ('streak_type', models.CharField(blank=True, choices=[('W', 'Win'), ('L', 'Loss'), ('T', 'Tie'), ('OTL', 'Overtime Loss')], max_length=3, verbose_name='Streak Type')),
+                ('streak_count', models.PositiveIntegerField(default=0, verbose_name='Streak Count')),
+                ('overtime_losses', models.PositiveIntegerField(default=0, verbose_name='Overtime Losses')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='hockeystandings', to='seasons.Season', verbose_name='Season')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='hockeystandings', to='teams.Team', verbose_name='Team')),
+            ],
+            options={
+                'ordering': ['-points', '-wins', 'team__name'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='HockeyGameResult',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Updated')),
+                ('home_goals', models.PositiveIntegerField(default=0, verbose_name='Home Goals')),
+                ('away_goals', models.PositiveIntegerField(default=0, verbose_name='Away Goals')),
+                ('overtime', models.BooleanField(default=False, verbose_name='Decided In Overtime')),
+                ('point_value', models.PositiveIntegerField(default=0, verbose_name='Point Value')),
+                ('start', models.DateTimeField(verbose_name='Game Start')),
+                ('away_team', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='teams.Team', verbose_name='Away Team')),
+                ('game', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='result', to='games.HockeyGame', verbose_name='Game')),
+                ('home_team', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='teams.Team', verbose_name='Home Team')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='seasons.Season', verbose_name='Season')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='hockeystanding',
+            index=models.Index(fields=['season', '-points'], name='hockeystanding_season_points'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='hockeystanding',
+            unique_together={('team', 'season')},
+        ),
+        migrations.AddIndex(
+            model_name='hockeygameresult',
+            index=models.Index(fields=['season', 'home_team', '-start'], name='hockeygameresult_home_start'),
+        ),
+        migrations.AddIndex(
+            model_name='hockeygameresult',
+            index=models.Index(fields=['season', 'away_team', '-start'], name='hockeygameresult_away_start'),
+        ),
+    ]
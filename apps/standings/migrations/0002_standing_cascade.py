@@ -0,0 +1,24 @@
+# Generated by Django 2.2.28 on 2026-10-18 16:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('standings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='hockeystanding',
+            name='season',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hockeystandings', to='seasons.Season', verbose_name='Season'),
+        ),
+        migrations.AlterField(
+            model_name='hockeystanding',
+            name='team',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='hockeystandings', to='teams.Team', verbose_name='Team'),
+        ),
+    ]
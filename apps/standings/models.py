@@ -0,0 +1,178 @@
+from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from common.models import TimestampedModel
+from common.reference_data import LEAGUES, get_reference_object
+from games.models import HockeyGame, HockeyGoal
+from seasons.models import Season
+from standings.managers import StandingManager
+
+
+class AbstractStanding(TimestampedModel):
+    """
+    Denormalized record for a team in a season. Rows are incrementally updated as games are completed and goals are
+    added/removed (see `standings.utils`), so reading standings never requires aggregating games or goals. The
+    `rebuild_standings` management command recomputes everything from scratch.
+    """
+    WIN = 'W'
+    LOSS = 'L'
+    TIE = 'T'
+    OVERTIME_LOSS = 'OTL'
+    OUTCOMES = (
+        (WIN, 'Win'),
+        (LOSS, 'Loss'),
+        (TIE, 'Tie'),
+        (OVERTIME_LOSS, 'Overtime Loss'),
+    )
+
+    # Standings without games don't prevent teams and seasons from being deleted, games do
+    team = models.ForeignKey('teams.Team', verbose_name='Team', on_delete=models.CASCADE, related_name='%(class)ss')
+    season = models.ForeignKey('seasons.Season', verbose_name='Season', on_delete=models.CASCADE,
+                               related_name='%(class)ss')
+    games_played = models.PositiveIntegerField(verbose_name='Games Played', default=0)
+    wins = models.PositiveIntegerField(verbose_name='Wins', default=0)
+    losses = models.PositiveIntegerField(verbose_name='Losses', default=0)
+    ties = models.PositiveIntegerField(verbose_name='Ties', default=0)
+    points = models.PositiveIntegerField(verbose_name='Points', default=0)
+    goals_for = models.PositiveIntegerField(verbose_name='Goals For', default=0)
+    goals_against = models.PositiveIntegerField(verbose_name='Goals Against', default=0)
+    streak_type = models.CharField(verbose_name='Streak Type', max_length=3, choices=OUTCOMES, blank=True)
+    streak_count = models.PositiveIntegerField(verbose_name='Streak Count', default=0)
+
+    objects = StandingManager()
+
+    @property
+    def goal_differential(self):
+        return self.goals_for - self.goals_against
+
+    @property
+    def streak(self):
+        return f'{self.streak_type}{self.streak_count}' if self.streak_type else ''
+
+    class Meta:
+        abstract = True
+        ordering = ['-points', '-wins', 'team__name']
+
+    def __str__(self):
+        return f'{self.team.name} {self.season}'
+
+
+class HockeyStanding(AbstractStanding):
+    overtime_losses = models.PositiveIntegerField(verbose_name='Overtime Losses', default=0)
+
+    class Meta(AbstractStanding.Meta):
+        unique_together = (
+            ('team', 'season'),
+        )
+        indexes = [
+            models.Index(fields=['season', '-points'], name='hockeystanding_season_points'),
+        ]
+
+
+class HockeyGameResult(TimestampedModel):
+    """
+    The result of a completed game as it was last applied to `HockeyStanding`. Keeping this around means a change to a
+    completed game (goal added/removed, status changed, etc.) can be applied to the standings as a delta: the old result
+    is reverted and the new result applied.
+    """
+    game = models.OneToOneField(HockeyGame, verbose_name='Game', on_delete=models.CASCADE, related_name='result')
+    season = models.ForeignKey('seasons.Season', verbose_name='Season', on_delete=models.PROTECT, related_name='+')
+    home_team = models.ForeignKey('teams.Team', verbose_name='Home Team', on_delete=models.PROTECT, related_name='+')
+    away_team = models.ForeignKey('teams.Team', verbose_name='Away Team', on_delete=models.PROTECT, related_name='+')
+    home_goals = models.PositiveIntegerField(verbose_name='Home Goals', default=0)
+    away_goals = models.PositiveIntegerField(verbose_name='Away Goals', default=0)
+    overtime = models.BooleanField(verbose_name='Decided In Overtime', default=False)
+    point_value = models.PositiveIntegerField(verbose_name='Point Value', default=0)
+    start = models.DateTimeField(verbose_name='Game Start')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['season', 'home_team', '-start'], name='hockeygameresult_home_start'),
+            models.Index(fields=['season', 'away_team', '-start'], name='hockeygameresult_away_start'),
+        ]
+
+    def get_outcome(self, team_id):
+        """
+        Compute the outcome of the game for the given team.
+
+        :param team_id: Id of the home or away team
+        :return: One of the `AbstractStanding.OUTCOMES`
+        """
+        if self.home_goals == self.away_goals:
+            return AbstractStanding.TIE
+        if team_id == self.home_team_id:
+            goals_for, goals_against = self.home_goals, self.away_goals
+        else:
+            goals_for, goals_against = self.away_goals, self.home_goals
+        if goals_for > goals_against:
+            return AbstractStanding.WIN
+        return AbstractStanding.OVERTIME_LOSS if self.overtime else AbstractStanding.LOSS
+
+    def __str__(self):
+        return f'{self.game_id}: {self.home_goals}-{self.away_goals}'
+
+
+@receiver(post_save, sender=HockeyGame)
+def sync_standings_on_game_save(sender, instance, raw=False, **kwargs):
+    from standings.utils import sync_hockey_game_standings
+
+    if not raw:
+        sync_hockey_game_standings(instance)
+
+
+@receiver(pre_delete, sender=HockeyGame)
+def revert_standings_on_game_delete(sender, instance, **kwargs):
+    from standings.utils import revert_hockey_game_standings
+
+    revert_hockey_game_standings(instance)
+
+
+@receiver(post_save, sender=HockeyGoal)
+@receiver(post_delete, sender=HockeyGoal)
+def sync_standings_on_goal_change(sender, instance, raw=False, **kwargs):
+    from standings.utils import sync_hockey_game_standings
+
+    if not raw:
+        # Refetch the game, the goal's cached game may have a stale status. Goals for games that aren't completed
+        # don't count towards the standings yet, they'll be counted once the game is completed.
+        game = HockeyGame.objects.select_related('point_value').filter(pk=instance.game_id).first()
+        if game is not None and game.is_completed:
+            sync_hockey_game_standings(game)
+
+
+@receiver(m2m_changed, sender=Season.teams.through)
+def update_standings_on_season_teams_change(action, instance, pk_set, reverse, **kwargs):
+    """
+    Teams get zero standings when they're added to a season, so they're listed before their first completed game. The
+    standings are removed along with the team unless the team has played games in the season.
+    """
+    from standings.mappings import SPORT_STANDING_MODEL_MAPPINGS
+    from standings.utils import create_standings
+
+    if action not in ['post_add', 'post_remove', 'post_clear'] or (action != 'post_clear' and not pk_set):
+        return
+    # Teams and seasons are validated to be in the same league, see `seasons.models.validate_leagues`
+    sport = get_reference_object(LEAGUES, pk=instance.league_id).sport
+    standing_model_cls = SPORT_STANDING_MODEL_MAPPINGS.get(sport.name)
+    if standing_model_cls is None:
+        return
+
+    if action == 'post_add':
+        if reverse:
+            # i.e. team_obj.seasons.add(season_obj)
+            create_standings(standing_model_cls, [(pk, instance.pk) for pk in pk_set])
+        else:
+            create_standings(standing_model_cls, [(instance.pk, pk) for pk in pk_set])
+        return
+
+    standings = standing_model_cls.objects.filter(games_played=0)
+    if reverse:
+        standings = standings.filter(team_id=instance.pk)
+        if pk_set:
+            standings = standings.filter(season_id__in=pk_set)
+    else:
+        standings = standings.filter(season_id=instance.pk)
+        if pk_set:
+            standings = standings.filter(team_id__in=pk_set)
+    standings.delete()
@@ -0,0 +1,28 @@
+from django.core.management import call_command
+from django.utils.six import StringIO
+
+from ayrabo.utils.testing import BaseTestCase
+from divisions.tests import DivisionFactory
+from standings.models import HockeyStanding
+from teams.tests import TeamFactory
+
+
+class RebuildStandingsTests(BaseTestCase):
+    def setUp(self):
+        self.division = DivisionFactory(league__sport__name='Ice Hockey')
+        self.league = self.division.league
+        self.teams = TeamFactory.create_batch(2, division=self.division)
+        _, self.season, _ = self.create_past_current_future_seasons(league=self.league, teams=self.teams)
+
+    def test_rebuild_standings(self):
+        out = StringIO()
+        call_command('rebuild_standings', stdout=out)
+        self.assertEqual(out.getvalue(), 'Ice Hockey: Rebuilt 6 standings from 0 games\n')
+        self.assertEqual(HockeyStanding.objects.count(), 6)
+
+    def test_rebuild_standings_for_seasons(self):
+        HockeyStanding.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_standings', '--seasons', str(self.season.pk), stdout=out)
+        self.assertEqual(out.getvalue(), 'Ice Hockey: Rebuilt 2 standings from 0 games\n')
+        self.assertSetEqual(set(HockeyStanding.objects.values_list('season_id', flat=True)), {self.season.pk})
@@ -0,0 +1,285 @@
+import datetime
+from unittest import mock
+
+from django.utils import timezone
+
+from ayrabo.utils.testing import BaseTestCase
+from common.models import GenericChoice
+from common.tests import GenericChoiceFactory
+from games.models import HockeyGame
+from games.tests import HockeyGameFactory, HockeyGoalFactory
+from organizations.tests import OrganizationFactory
+from periods.models import HockeyPeriod
+from periods.tests import HockeyPeriodFactory
+from players.tests import HockeyPlayerFactory
+from seasons.models import Season
+from seasons.tests import SeasonFactory
+from sports.tests import SportFactory
+from standings.models import HockeyGameResult, HockeyStanding
+from standings.utils import compute_streak, rebuild_hockey_standings
+from teams.tests import TeamFactory
+
+
+class HockeyStandingsTests(BaseTestCase):
+    def setUp(self):
+        self.sport = SportFactory(name='Ice Hockey')
+        self.point_value = GenericChoiceFactory(
+            content_object=self.sport,
+            short_value='2',
+            long_value='2',
+            type=GenericChoice.GAME_POINT_VALUE
+        )
+        self.game_type = GenericChoiceFactory(
+            content_object=self.sport,
+            short_value='exhibition',
+            long_value='Exhibition',
+            type=GenericChoice.GAME_TYPE
+        )
+        self.home_team = TeamFactory(
+            name='Green Machine IceCats',
+            division__league__sport=self.sport,
+            organization=OrganizationFactory(sport=self.sport)
+        )
+        self.away_team = TeamFactory(
+            name='Long Island Edge',
+            division=self.home_team.division,
+            organization=OrganizationFactory(sport=self.sport)
+        )
+        self.season = SeasonFactory(league=self.home_team.division.league, teams=[self.home_team, self.away_team])
+        self.home_player = HockeyPlayerFactory(team=self.home_team, sport=self.sport)
+        self.away_player = HockeyPlayerFactory(team=self.away_team, sport=self.sport)
+        self.start = timezone.now() - datetime.timedelta(days=7)
+        self.periods = {}
+
+    def _create_game(self, status=HockeyGame.IN_PROGRESS, days=0):
+        game = HockeyGameFactory(
+            home_team=self.home_team,
+            away_team=self.away_team,
+            season=self.season,
+            type=self.game_type,
+            point_value=self.point_value,
+            status=status,
+            start=self.start + datetime.timedelta(days=days),
+        )
+        self.periods[game.pk] = {
+            name: HockeyPeriodFactory(game=game, name=name) for name in [HockeyPeriod.ONE, HockeyPeriod.OT1]
+        }
+        return game
+
+    def _create_goals(self, game, home_goals, away_goals, period=HockeyPeriod.ONE):
+        goals = []
+        for player, num_goals in [(self.home_player, home_goals), (self.away_player, away_goals)]:
+            for _ in range(num_goals):
+                goals.append(HockeyGoalFactory(game=game, period=self.periods[game.pk][period], player=player))
+        return goals
+
+    def _complete(self, game):
+        game.status = HockeyGame.COMPLETED
+        game.save()
+
+    def _get_standing(self, team):
+        return HockeyStanding.objects.get(team=team, season=self.season)
+
+    def assertStanding(self, team, **expected):
+        standing = self._get_standing(team)
+        actual = {field: getattr(standing, field) for field in expected}
+        self.assertDictEqual(actual, expected)
+
+    def test_game_not_completed(self):
+        game = self._create_game()
+        self._create_goals(game, 2, 1)
+        self.assertFalse(HockeyGameResult.objects.exists())
+        self.assertStanding(self.home_team, games_played=0, points=0, goals_for=0, streak_type='', streak_count=0)
+        self.assertStanding(self.away_team, games_played=0, points=0, goals_for=0, streak_type='', streak_count=0)
+
+    def test_teams_added_to_season(self):
+        HockeyStanding.objects.filter(team=self.away_team).update(points=2)
+        team = TeamFactory(division=self.home_team.division, organization=OrganizationFactory(sport=self.sport))
+        other_team = TeamFactory(division=self.home_team.division, organization=OrganizationFactory(sport=self.sport))
+
+        self.season.teams.add(self.away_team, team)
+        other_team.seasons.add(self.season)
+
+        self.assertStanding(team, games_played=0, points=0)
+        self.assertStanding(other_team, games_played=0, points=0)
+        # Existing standings are kept
+        self.assertStanding(self.away_team, points=2)
+
+    def test_teams_removed_from_season(self):
+        team = TeamFactory(division=self.home_team.division, organization=OrganizationFactory(sport=self.sport))
+        self.season.teams.add(team)
+        game = self._create_game()
+        self._complete(game)
+
+        self.season.teams.remove(self.home_team, team)
+        self.assertFalse(HockeyStanding.objects.filter(team=team).exists())
+        # Standings of teams that have played games are kept
+        self.assertStanding(self.home_team, games_played=1)
+
+        self.away_team.seasons.clear()
+        self.assertStanding(self.away_team, games_played=1)
+
+    def test_standing_missing(self):
+        # i.e. the team was added to the season with a bulk insert
+        self._get_standing(self.home_team).delete()
+        game = self._create_game()
+        self._create_goals(game, 1, 0)
+        self._complete(game)
+        self.assertStanding(self.home_team, games_played=1, wins=1, points=2, streak_type='W', streak_count=1)
+
+    def test_game_completed(self):
+        game = self._create_game()
+        self._create_goals(game, 3, 1)
+        self._complete(game)
+        self.assertStanding(
+            self.home_team,
+            games_played=1, wins=1, losses=0, ties=0, overtime_losses=0, points=2, goals_for=3, goals_against=1,
+            streak_type='W', streak_count=1,
+        )
+        self.assertStanding(
+            self.away_team,
+            games_played=1, wins=0, losses=1, ties=0, overtime_losses=0, points=0, goals_for=1, goals_against=3,
+            streak_type='L', streak_count=1,
+        )
+
+    def test_game_completed_tie(self):
+        game = self._create_game()
+        self._create_goals(game, 2, 2)
+        self._complete(game)
+        self.assertStanding(self.home_team, ties=1, points=1, streak_type='T')
+        self.assertStanding(self.away_team, ties=1, points=1, streak_type='T')
+
+    def test_game_completed_overtime_loss(self):
+        game = self._create_game()
+        self._create_goals(game, 1, 1)
+        self._create_goals(game, 0, 1, period=HockeyPeriod.OT1)
+        self._complete(game)
+        self.assertStanding(self.home_team, losses=0, overtime_losses=1, points=1, streak_type='OTL')
+        self.assertStanding(self.away_team, wins=1, points=2, goals_for=2, goals_against=1)
+
+    def test_game_saved_multiple_times(self):
+        game = self._create_game()
+        self._create_goals(game, 1, 0)
+        self._complete(game)
+        game.save()
+        self.assertStanding(self.home_team, games_played=1, wins=1, points=2)
+        self.assertEqual(HockeyGameResult.objects.count(), 1)
+
+    def test_goals_changed_after_completion(self):
+        game = self._create_game()
+        home_goal, = self._create_goals(game, 1, 0)
+        self._complete(game)
+        self.assertStanding(self.home_team, wins=1, points=2)
+
+        away_goals = self._create_goals(game, 0, 2)
+        self.assertStanding(self.home_team, games_played=1, wins=0, losses=1, points=0, goals_for=1, goals_against=2)
+        self.assertStanding(self.away_team, games_played=1, wins=1, losses=0, points=2, goals_for=2, goals_against=1)
+
+        away_goals[0].delete()
+        self.assertStanding(self.home_team, wins=0, losses=0, ties=1, points=1)
+        self.assertStanding(self.away_team, wins=0, losses=0, ties=1, points=1)
+
+    def test_game_no_longer_completed(self):
+        game = self._create_game()
+        self._create_goals(game, 1, 0)
+        self._complete(game)
+        game.status = HockeyGame.IN_PROGRESS
+        game.save()
+        self.assertStanding(
+            self.home_team,
+            games_played=0, wins=0, points=0, goals_for=0, goals_against=0, streak_type='', streak_count=0
+        )
+        self.assertFalse(HockeyGameResult.objects.exists())
+
+    def test_game_deleted(self):
+        game = self._create_game()
+        self._complete(game)
+        self.assertStanding(self.home_team, games_played=1, ties=1)
+        for period in self.periods[game.pk].values():
+            period.delete()
+        game.delete()
+        self.assertStanding(self.home_team, games_played=0, ties=0, points=0)
+
+    def test_streak(self):
+        for days, (home_goals, away_goals) in enumerate([(0, 1), (2, 1), (3, 1), (4, 0)]):
+            game = self._create_game(days=days)
+            self._create_goals(game, home_goals, away_goals)
+            self._complete(game)
+        self.assertStanding(self.home_team, wins=3, losses=1, streak_type='W', streak_count=3)
+        self.assertStanding(self.away_team, wins=1, losses=3, streak_type='L', streak_count=3)
+        self.assertEqual(self._get_standing(self.home_team).streak, 'W3')
+
+    def test_streak_extended(self):
+        game = self._create_game()
+        self._create_goals(game, 1, 0)
+        self._complete(game)
+        game = self._create_game(days=1)
+        self._create_goals(game, 2, 0)
+        with mock.patch('standings.utils._update_hockey_streak') as update_hockey_streak:
+            self._complete(game)
+        update_hockey_streak.assert_not_called()
+        self.assertStanding(self.home_team, wins=2, streak_type='W', streak_count=2)
+        self.assertStanding(self.away_team, losses=2, streak_type='L', streak_count=2)
+
+    def test_streak_out_of_order(self):
+        later_game = self._create_game(days=1)
+        self._create_goals(later_game, 1, 0)
+        self._complete(later_game)
+        # Completing an earlier game doesn't change the streak of the most recent game
+        game = self._create_game()
+        self._create_goals(game, 0, 1)
+        self._complete(game)
+        self.assertStanding(self.home_team, wins=1, losses=1, streak_type='W', streak_count=1)
+        self.assertStanding(self.away_team, wins=1, losses=1, streak_type='L', streak_count=1)
+
+        self._create_goals(game, 2, 0)
+        self.assertStanding(self.home_team, wins=2, losses=0, streak_type='W', streak_count=2)
+
+        later_game.status = HockeyGame.IN_PROGRESS
+        later_game.save()
+        self.assertStanding(self.home_team, wins=1, streak_type='W', streak_count=1)
+        self.assertStanding(self.away_team, losses=1, streak_type='L', streak_count=1)
+
+    def test_compute_streak(self):
+        self.assertTupleEqual(compute_streak([]), ('', 0))
+        self.assertTupleEqual(compute_streak(['W', 'W', 'L', 'W']), ('W', 2))
+        self.assertTupleEqual(compute_streak(['OTL']), ('OTL', 1))
+
+    def test_rebuild_hockey_standings(self):
+        other_team = TeamFactory(
+            division=self.home_team.division,
+            organization=OrganizationFactory(sport=self.sport)
+        )
+        self.season.teams.add(other_team)
+        game1 = self._create_game()
+        self._create_goals(game1, 2, 1)
+        self._complete(game1)
+        game2 = self._create_game(days=1)
+        self._create_goals(game2, 1, 1)
+        self._create_goals(game2, 1, 0, period=HockeyPeriod.OT1)
+        self._complete(game2)
+        # Not completed, excluded from the standings
+        game3 = self._create_game(days=2)
+        self._create_goals(game3, 0, 5)
+
+        expected = {
+            team.pk: {field: getattr(self._get_standing(team), field) for field in [
+                'games_played', 'wins', 'losses', 'ties', 'overtime_losses', 'points', 'goals_for', 'goals_against',
+                'streak_type', 'streak_count',
+            ]}
+            for team in [self.home_team, self.away_team]
+        }
+        HockeyStanding.objects.update(points=100, streak_count=10)
+
+        with self.assertNumQueries(10):
+            result = rebuild_hockey_standings(Season.objects.filter(pk=self.season.pk))
+
+        self.assertTupleEqual(result, (2, 3))
+        for team in [self.home_team, self.away_team]:
+            standing = self._get_standing(team)
+            actual = {field: getattr(standing, field) for field in expected[team.pk]}
+            self.assertDictEqual(actual, expected[team.pk])
+        self.assertStanding(self.home_team, wins=2, points=4, streak_count=2)
+        self.assertStanding(self.away_team, losses=1, overtime_losses=1, points=1, streak_type='OTL')
+        self.assertStanding(other_team, games_played=0, points=0)
+        self.assertSetEqual(set(HockeyGameResult.objects.values_list('game_id', flat=True)), {game1.pk, game2.pk})
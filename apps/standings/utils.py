@@ -0,0 +1,309 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, PositiveIntegerField, Q, Sum, Value, When
+
+from games.models import HockeyGame, HockeyGoal
+from periods.models import HockeyPeriod
+from seasons.models import Season
+from .models import AbstractStanding, HockeyGameResult, HockeyStanding
+
+
+HOCKEY_REGULATION_PERIODS = [HockeyPeriod.ONE, HockeyPeriod.TWO, HockeyPeriod.THREE]
+RESULT_FIELDS = ['season_id', 'home_team_id', 'away_team_id', 'home_goals', 'away_goals', 'overtime', 'point_value',
+                 'start']
+
+
+def get_point_value(game):
+    """
+    The game's point value is the number of points awarded for a win. Ties and overtime losses are worth half of that.
+    Point values that aren't numbers (misconfigured generic choices) are treated as 0 points.
+
+    :param game: Game to get the point value for, `point_value` should be select related
+    :return: Points awarded for a win
+    """
+    try:
+        return int(game.point_value.short_value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _build_hockey_game_result(game, goal_totals):
+    """
+    :param game: The game to build the result for
+    :param goal_totals: Iterable of dicts containing `team_id`, `period_name` and `total` keys for the game's goals
+    :return: Unsaved `HockeyGameResult`
+    """
+    result = HockeyGameResult(
+        game_id=game.pk,
+        season_id=game.season_id,
+        home_team_id=game.home_team_id,
+        away_team_id=game.away_team_id,
+        point_value=get_point_value(game),
+        start=game.start,
+    )
+    for row in goal_totals:
+        if row['team_id'] == game.home_team_id:
+            result.home_goals += row['total']
+        elif row['team_id'] == game.away_team_id:
+            result.away_goals += row['total']
+        if row['period_name'] not in HOCKEY_REGULATION_PERIODS:
+            result.overtime = True
+    return result
+
+
+def _get_goal_totals(games_qs):
+    return HockeyGoal.objects.filter(game__in=games_qs).values(
+        'game_id',
+        team_id=F('player__team_id'),
+        period_name=F('period__name'),
+    ).annotate(total=Sum('value')).order_by()
+
+
+def compute_hockey_game_result(game):
+    """
+    Compute the result of the game from its goals, in one query.
+
+    :param game: The game to compute the result for
+    :return: Unsaved `HockeyGameResult`
+    """
+    goal_totals = _get_goal_totals(HockeyGame.objects.filter(pk=game.pk))
+    return _build_hockey_game_result(game, goal_totals)
+
+
+def get_standing_deltas(result, team_id):
+    """
+    Compute how much the result adds to the team's standing.
+
+    :param result: `HockeyGameResult` instance
+    :param team_id: Id of the home or away team
+    :return: Dict of standing field name -> amount to add
+    """
+    if team_id == result.home_team_id:
+        goals_for, goals_against = result.home_goals, result.away_goals
+    else:
+        goals_for, goals_against = result.away_goals, result.home_goals
+    deltas = {'games_played': 1, 'goals_for': goals_for, 'goals_against': goals_against}
+    outcome = result.get_outcome(team_id)
+    if outcome == AbstractStanding.WIN:
+        deltas.update({'wins': 1, 'points': result.point_value})
+    elif outcome == AbstractStanding.LOSS:
+        deltas.update({'losses': 1})
+    elif outcome == AbstractStanding.TIE:
+        deltas.update({'ties': 1, 'points': result.point_value // 2})
+    elif outcome == AbstractStanding.OVERTIME_LOSS:
+        deltas.update({'overtime_losses': 1, 'points': result.point_value // 2})
+    return deltas
+
+
+def _apply_hockey_game_result(result, sign, extend_streak_team_ids=()):
+    """
+    Add (`sign` is 1) or subtract (`sign` is -1) the result to/from the teams' standings, with one update per team.
+
+    :param result: `HockeyGameResult` instance
+    :param sign: 1 or -1
+    :param extend_streak_team_ids: Ids of the teams the result is the most recent game of, their streaks are extended
+        with the result's outcome
+    """
+    for team_id in [result.home_team_id, result.away_team_id]:
+        values = {field: F(field) + sign * value for field, value in get_standing_deltas(result, team_id).items()}
+        if team_id in extend_streak_team_ids:
+            outcome = result.get_outcome(team_id)
+            values.update({
+                'streak_type': outcome,
+                'streak_count': Case(
+                    When(streak_type=outcome, then=F('streak_count') + 1),
+                    default=Value(1),
+                    output_field=PositiveIntegerField()
+                ),
+            })
+        standings = HockeyStanding.objects.filter(team_id=team_id, season_id=result.season_id)
+        if not standings.update(**values) and sign > 0:
+            # Standings are created when teams are added to a season (see `create_standings`), teams added with a
+            # bulk insert may not have one yet. `get_or_create` handles a concurrent insert of the same standing.
+            HockeyStanding.objects.get_or_create(team_id=team_id, season_id=result.season_id)
+            standings.update(**values)
+
+
+def create_standings(standing_model_cls, season_team_ids):
+    """
+    Create zero standings for teams that have been added to seasons, so they're listed before their first completed
+    game. Existing standings are kept.
+
+    :param standing_model_cls: Standing model of the seasons' sport, i.e. `HockeyStanding`
+    :param season_team_ids: Iterable of (season id, team id) tuples
+    """
+    standing_model_cls.objects.bulk_create(
+        [standing_model_cls(season_id=season_id, team_id=team_id) for season_id, team_id in season_team_ids],
+        ignore_conflicts=True
+    )
+
+
+def compute_streak(outcomes):
+    """
+    :param outcomes: Outcomes for a team, most recent game first
+    :return: Tuple of (streak type, streak count)
+    """
+    streak_type, streak_count = '', 0
+    for outcome in outcomes:
+        if streak_type and outcome != streak_type:
+            break
+        streak_type = outcome
+        streak_count += 1
+    return streak_type, streak_count
+
+
+def _update_hockey_streak(season_id, team_id):
+    """
+    Recompute the team's streak from all of its results, for changes that can't extend the streak (deleted results,
+    results of earlier games, etc).
+    """
+    results = HockeyGameResult.objects.filter(
+        Q(home_team_id=team_id) | Q(away_team_id=team_id),
+        season_id=season_id
+    ).order_by('-start').only('home_team_id', 'away_team_id', 'home_goals', 'away_goals', 'overtime')
+    outcomes = (result.get_outcome(team_id) for result in results.iterator())
+    streak_type, streak_count = compute_streak(outcomes)
+    HockeyStanding.objects.filter(team_id=team_id, season_id=season_id).update(
+        streak_type=streak_type,
+        streak_count=streak_count
+    )
+
+
+def _is_most_recent_result(result, team_id):
+    return not HockeyGameResult.objects.filter(
+        Q(home_team_id=team_id) | Q(away_team_id=team_id),
+        season_id=result.season_id,
+        start__gt=result.start
+    ).exists()
+
+
+def _is_same_result(old, new):
+    return all(getattr(old, field) == getattr(new, field) for field in RESULT_FIELDS)
+
+
+def _is_same_outcome(old, new, team_id):
+    """
+    :return: Whether the team's streak is unaffected by the game's result changing from `old` to `new`
+    """
+    return (
+        old.season_id == new.season_id and
+        old.start == new.start and
+        team_id in [old.home_team_id, old.away_team_id] and
+        team_id in [new.home_team_id, new.away_team_id] and
+        old.get_outcome(team_id) == new.get_outcome(team_id)
+    )
+
+
+@transaction.atomic
+def sync_hockey_game_standings(game):
+    """
+    Bring the standings up to date with the game. Completed games are counted, everything else is not. Only the delta
+    between the previously applied result for the game (if any) and the new result is written, so this is safe to call
+    every time a game or one of its goals changes.
+
+    A newly completed game that is the most recent game of a team extends the team's streak. The streak is only
+    recomputed from all of the team's results when an earlier game is completed or a result is changed or removed.
+
+    :param game: The game that changed, `point_value` should be select related
+    :return: The game's current `HockeyGameResult`, or None if the game doesn't count towards the standings
+    """
+    old = HockeyGameResult.objects.select_for_update().filter(game_id=game.pk).first()
+    new = compute_hockey_game_result(game) if game.is_completed else None
+    if old is None and new is None:
+        return None
+    if old is not None and new is not None and _is_same_result(old, new):
+        return old
+
+    # (season id, team id) of the streaks that need to be recomputed
+    recompute_streaks = set()
+    if old is not None:
+        _apply_hockey_game_result(old, -1)
+        for team_id in [old.home_team_id, old.away_team_id]:
+            if new is None or not _is_same_outcome(old, new, team_id):
+                recompute_streaks.add((old.season_id, team_id))
+    if new is not None:
+        team_ids = [new.home_team_id, new.away_team_id]
+        extend_streak_team_ids = set()
+        if old is None:
+            # Serializes the results of the teams' games, so a game completed at the same time can't be missed by the
+            # most recent game check
+            list(HockeyStanding.objects.select_for_update().filter(
+                season_id=new.season_id, team_id__in=team_ids
+            ).order_by('pk').values_list('pk', flat=True))
+            extend_streak_team_ids = {team_id for team_id in team_ids if _is_most_recent_result(new, team_id)}
+        else:
+            new.pk = old.pk
+            new.created = old.created
+        for team_id in team_ids:
+            if team_id not in extend_streak_team_ids and (old is None or not _is_same_outcome(old, new, team_id)):
+                recompute_streaks.add((new.season_id, team_id))
+        new.save()
+        _apply_hockey_game_result(new, 1, extend_streak_team_ids=extend_streak_team_ids)
+    else:
+        old.delete()
+
+    for season_id, team_id in recompute_streaks:
+        _update_hockey_streak(season_id, team_id)
+    return new
+
+
+@transaction.atomic
+def revert_hockey_game_standings(game):
+    """
+    Remove the game's contribution to the standings, used when a game is being deleted.
+
+    :param game: The game to revert
+    """
+    old = HockeyGameResult.objects.select_for_update().filter(game_id=game.pk).first()
+    if old is None:
+        return
+    _apply_hockey_game_result(old, -1)
+    old.delete()
+    for team_id in [old.home_team_id, old.away_team_id]:
+        _update_hockey_streak(old.season_id, team_id)
+
+
+@transaction.atomic
+def rebuild_hockey_standings(seasons, batch_size=1000):
+    """
+    Recompute hockey standings for the given seasons from scratch. Game results are computed from one aggregate query
+    over the goals for all completed games and everything is written with `bulk_create`. Every team in the season gets a
+    standing, even if they haven't played any games yet.
+
+    :param seasons: Season QuerySet
+    :param batch_size: Batch size used for the bulk inserts
+    :return: Tuple of (# of game results, # of standings) created
+    """
+    season_ids = list(seasons.values_list('id', flat=True))
+    HockeyGameResult.objects.filter(season_id__in=season_ids).delete()
+    HockeyStanding.objects.filter(season_id__in=season_ids).delete()
+
+    games = HockeyGame.objects.filter(season_id__in=season_ids, status=HockeyGame.COMPLETED)
+    goal_totals_by_game = defaultdict(list)
+    for row in _get_goal_totals(games):
+        goal_totals_by_game[row['game_id']].append(row)
+
+    results = [
+        _build_hockey_game_result(game, goal_totals_by_game.get(game.pk, []))
+        for game in games.select_related('point_value').order_by('start')
+    ]
+    HockeyGameResult.objects.bulk_create(results, batch_size=batch_size)
+
+    standings = {}
+    outcomes = defaultdict(list)
+    season_teams = Season.teams.through.objects.filter(season_id__in=season_ids).values_list('season_id', 'team_id')
+    for season_id, team_id in season_teams:
+        standings[(season_id, team_id)] = HockeyStanding(season_id=season_id, team_id=team_id)
+    for result in results:
+        for team_id in [result.home_team_id, result.away_team_id]:
+            key = (result.season_id, team_id)
+            standing = standings.setdefault(key, HockeyStanding(season_id=result.season_id, team_id=team_id))
+            for field, value in get_standing_deltas(result, team_id).items():
+                setattr(standing, field, getattr(standing, field) + value)
+            outcomes[key].append(result.get_outcome(team_id))
+    for key, standing in standings.items():
+        # Results are ordered by start asc, streaks need the most recent game first
+        standing.streak_type, standing.streak_count = compute_streak(reversed(outcomes[key]))
+    HockeyStanding.objects.bulk_create(standings.values(), batch_size=batch_size)
+    return len(results), len(standings)
@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from .models import HockeyPlayerSeasonStats
+
+
+@admin.register(HockeyPlayerSeasonStats)
+class HockeyPlayerSeasonStatsAdmin(admin.ModelAdmin):
+    list_display = ['id', 'player', 'team', 'season', 'goals', 'assists', 'points', 'penalty_minutes']
+    search_fields = ['player__user__first_name', 'player__user__last_name', 'team__name']
+    list_select_related = ['player__user', 'team', 'season']
+
+    def has_add_permission(self, request):
+        """
+        Stats are maintained automatically, use the `rebuild_player_stats` management command to fix bad data.
+        """
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
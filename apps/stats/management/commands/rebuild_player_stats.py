@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from seasons.models import Season
+from stats.mappings import SPORT_REBUILD_PLAYER_STATS_FUNC_MAPPINGS, SPORT_VERIFY_PLAYER_STATS_FUNC_MAPPINGS
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds player season stats from goals, assists and penalties. Useful for backfills and fixing drift.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seasons', nargs='+', type=int, help='Only rebuild stats for these season ids.')
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Compare the stats with recomputed stats and report differences instead of rebuilding them.'
+        )
+
+    def handle(self, *args, **options):
+        season_ids = options.get('seasons')
+        for sport_name, rebuild_func in SPORT_REBUILD_PLAYER_STATS_FUNC_MAPPINGS.items():
+            seasons = Season.objects.filter(league__sport__name=sport_name)
+            if season_ids:
+                seasons = seasons.filter(id__in=season_ids)
+            if options.get('verify'):
+                out_of_sync = SPORT_VERIFY_PLAYER_STATS_FUNC_MAPPINGS[sport_name](seasons)
+                self.stdout.write(f'{sport_name}: {len(out_of_sync)} player stats out of sync')
+                for player_id, season_id in out_of_sync:
+                    self.stdout.write(f'Player {player_id}, season {season_id}')
+            else:
+                num_stats = rebuild_func(seasons)
+                self.stdout.write(f'{sport_name}: Rebuilt {num_stats} player stats')
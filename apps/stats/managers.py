@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class PlayerSeasonStatsManager(models.Manager):
+    def get_leaders(self, season, category, team=None, limit=10):
+        """
+        Fetches the top players in the season for the given stat. Every leaderboard category is backed by a
+        (season, -<category>) and (team, season, -<category>) index so this is a cheap read no matter how many goals,
+        assists or penalties have been recorded.
+
+        :param season: Season to get the leaders for
+        :param category: One of the model's `LEADERBOARD_ORDERINGS` keys, i.e. `points`
+        :param team: Optional team to narrow the leaders down to
+        :param limit: Max number of players to return
+        :return: Player season stats ordered by the category desc
+        """
+        ordering = self.model.LEADERBOARD_ORDERINGS[category]
+        qs = self.filter(season=season, **{f'{category}__gt': 0})
+        if team is not None:
+            qs = qs.filter(team=team)
+        return qs.select_related('player__user', 'team').order_by(*ordering)[:limit]
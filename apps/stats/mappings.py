@@ -0,0 +1,51 @@
+from api.v1.stats import serializers
+from ayrabo.utils.exceptions import SportNotConfiguredException
+from stats.models import HockeyPlayerSeasonStats
+from stats.utils import rebuild_hockey_player_stats, verify_hockey_player_stats
+
+
+SPORT_PLAYER_SEASON_STATS_MODEL_MAPPINGS = {
+    'Ice Hockey': HockeyPlayerSeasonStats,
+}
+
+SPORT_PLAYER_SEASON_STATS_SERIALIZER_MAPPINGS = {
+    'Ice Hockey': serializers.HockeyPlayerSeasonStatsSerializer,
+}
+
+SPORT_REBUILD_PLAYER_STATS_FUNC_MAPPINGS = {
+    'Ice Hockey': rebuild_hockey_player_stats,
+}
+
+SPORT_VERIFY_PLAYER_STATS_FUNC_MAPPINGS = {
+    'Ice Hockey': verify_hockey_player_stats,
+}
+
+
+def get_player_season_stats_model_cls(sport, exception_cls=SportNotConfiguredException):
+    """
+    Fetch the appropriate player season stats model class for the given sport. May be used by api views in which case
+    the necessary API exception should be raised.
+
+    :param sport: Sport that will be used to fetch the correct model class.
+    :param exception_cls: Exception class to raise.
+    :return: Player season stats model class for the given sport.
+    """
+    model_cls = SPORT_PLAYER_SEASON_STATS_MODEL_MAPPINGS.get(sport.name)
+    if model_cls is None:
+        raise exception_cls(sport)
+    return model_cls
+
+
+def get_player_season_stats_serializer_cls(sport, exception_cls=SportNotConfiguredException):
+    """
+    Fetch the appropriate player season stats serializer class for the given sport. May be used by api views in which
+    case the necessary API exception should be raised.
+
+    :param sport: Sport that will be used to fetch the correct serializer class.
+    :param exception_cls: Exception class to raise.
+    :return: Player season stats serializer class for the given sport.
+    """
+    serializer_cls = SPORT_PLAYER_SEASON_STATS_SERIALIZER_MAPPINGS.get(sport.name)
+    if serializer_cls is None:
+        raise exception_cls(sport)
+    return serializer_cls
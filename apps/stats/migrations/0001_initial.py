@@ -0,0 +1,57 @@
+# Generated by Django 2.2.28 on 2026-10-18 13:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('players', '0003_auto_20190421_2008'),
+        ('teams', '0007_auto_20181110_0412'),
+        ('seasons', '0003_auto_20190421_2008'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HockeyPlayerSeasonStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Updated')),
+                ('goals', models.PositiveIntegerField(default=0, verbose_name='Goals')),
+                ('assists', models.PositiveIntegerField(default=0, verbose_name='Assists')),
+                ('points', models.PositiveIntegerField(default=0, verbose_name='Points')),
+                ('penalty_minutes', models.PositiveIntegerField(default=0, verbose_name='Penalty Minutes')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='season_stats', to='players.HockeyPlayer', verbose_name='Player')),
+                ('season', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='hockeyplayerseasonstats', to='seasons.Season', verbose_name='Season')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='hockeyplayerseasonstats', to='teams.Team', verbose_name='Team')),
+            ],
+            options={
+                'verbose_name_plural': 'Hockey Player Season Stats',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='hockeyplayerseasonstats',
+            index=models.Index(fields=['season', '-points', '-goals'], name='hockeystats_season_points'),
+        ),
+        migrations.AddIndex(
+            model_name='hockeyplayerseasonstats',
+            index=models.Index(fields=['season', '-penalty_minutes'], name='hockeystats_season_pim'),
+        ),
+        migrations.AddIndex(
+            model_name='hockeyplayerseasonstats',
+            index=models.Index(fields=['team', 'season', '-points', '-goals'], name='hockeystats_team_points'),
+        ),
+        migrations.AddIndex(
+            model_name='hockeyplayerseasonstats',
+            index=models.Index(fields=['team', 'season', '-penalty_minutes'], name='hockeystats_team_pim'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='hockeyplayerseasonstats',
+            unique_together={('player', 'season')},
+        ),
+    ]
@@ -0,0 +1,90 @@
+from django.db import models
+from django.db.models.signals import post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from common.models import TimestampedModel
+from games.models import HockeyAssist, HockeyGoal
+from penalties.models import HockeyPenalty
+from stats.managers import PlayerSeasonStatsManager
+
+
+class AbstractPlayerSeasonStats(TimestampedModel):
+    """
+    Denormalized stat totals for a player in a season. Rows are incrementally updated as goals, assists, penalties, etc.
+    are recorded, updated and deleted (see `stats.utils`), so leaderboards never require aggregating the raw events.
+    The `rebuild_player_stats` management command recomputes (or verifies) everything from scratch.
+    """
+    LEADERBOARD_ORDERINGS = {}
+
+    team = models.ForeignKey('teams.Team', verbose_name='Team', on_delete=models.PROTECT, related_name='%(class)s')
+    season = models.ForeignKey('seasons.Season', verbose_name='Season', on_delete=models.PROTECT,
+                               related_name='%(class)s')
+
+    objects = PlayerSeasonStatsManager()
+
+    class Meta:
+        abstract = True
+
+
+class HockeyPlayerSeasonStats(AbstractPlayerSeasonStats):
+    POINTS = 'points'
+    PENALTY_MINUTES = 'penalty_minutes'
+    LEADERBOARD_ORDERINGS = {
+        POINTS: ['-points', '-goals', 'id'],
+        PENALTY_MINUTES: ['-penalty_minutes', 'id'],
+    }
+
+    player = models.ForeignKey('players.HockeyPlayer', verbose_name='Player', on_delete=models.PROTECT,
+                               related_name='season_stats')
+    goals = models.PositiveIntegerField(verbose_name='Goals', default=0)
+    assists = models.PositiveIntegerField(verbose_name='Assists', default=0)
+    points = models.PositiveIntegerField(verbose_name='Points', default=0)
+    penalty_minutes = models.PositiveIntegerField(verbose_name='Penalty Minutes', default=0)
+
+    class Meta:
+        verbose_name_plural = 'Hockey Player Season Stats'
+        unique_together = (
+            ('player', 'season'),
+        )
+        indexes = [
+            models.Index(fields=['season', '-points', '-goals'], name='hockeystats_season_points'),
+            models.Index(fields=['season', '-penalty_minutes'], name='hockeystats_season_pim'),
+            models.Index(fields=['team', 'season', '-points', '-goals'], name='hockeystats_team_points'),
+            models.Index(fields=['team', 'season', '-penalty_minutes'], name='hockeystats_team_pim'),
+        ]
+
+    def __str__(self):
+        return f'{self.player_id} {self.season_id}: {self.goals}G {self.assists}A {self.penalty_minutes}PIM'
+
+
+@receiver(pre_save, sender=HockeyGoal)
+@receiver(pre_save, sender=HockeyAssist)
+@receiver(pre_save, sender=HockeyPenalty)
+def remember_hockey_stat_entry(sender, instance, raw=False, **kwargs):
+    from stats.utils import get_hockey_stat_entry
+
+    # Updates can move an event to another player or change how much it's worth, remember what it contributed before
+    # the update so the difference can be applied in post_save.
+    if not raw and instance.pk is not None:
+        instance._stat_entry = get_hockey_stat_entry(instance)
+
+
+@receiver(post_save, sender=HockeyGoal)
+@receiver(post_save, sender=HockeyAssist)
+@receiver(post_save, sender=HockeyPenalty)
+def sync_hockey_stats_on_save(sender, instance, raw=False, **kwargs):
+    from stats.utils import get_hockey_stat_entry, sync_hockey_stat_entry
+
+    if not raw:
+        old = getattr(instance, '_stat_entry', None)
+        instance._stat_entry = None
+        sync_hockey_stat_entry(old, get_hockey_stat_entry(instance))
+
+
+@receiver(pre_delete, sender=HockeyGoal)
+@receiver(pre_delete, sender=HockeyAssist)
+@receiver(pre_delete, sender=HockeyPenalty)
+def revert_hockey_stats_on_delete(sender, instance, **kwargs):
+    from stats.utils import get_hockey_stat_entry, sync_hockey_stat_entry
+
+    sync_hockey_stat_entry(get_hockey_stat_entry(instance), None)
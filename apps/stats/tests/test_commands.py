@@ -0,0 +1,33 @@
+from django.core.management import call_command
+from django.utils.six import StringIO
+
+from ayrabo.utils.testing import BaseTestCase
+from players.tests import HockeyPlayerFactory
+from seasons.tests import SeasonFactory
+from sports.tests import SportFactory
+from stats.models import HockeyPlayerSeasonStats
+from teams.tests import TeamFactory
+
+
+class RebuildPlayerStatsTests(BaseTestCase):
+    def setUp(self):
+        self.sport = SportFactory(name='Ice Hockey')
+        self.team = TeamFactory(division__league__sport=self.sport)
+        self.season = SeasonFactory(league=self.team.division.league, teams=[self.team])
+        self.player = HockeyPlayerFactory(team=self.team, sport=self.sport)
+        HockeyPlayerSeasonStats.objects.create(player=self.player, team=self.team, season=self.season, goals=3)
+
+    def test_verify(self):
+        out = StringIO()
+        call_command('rebuild_player_stats', '--verify', stdout=out)
+        self.assertEqual(
+            out.getvalue(),
+            f'Ice Hockey: 1 player stats out of sync\nPlayer {self.player.pk}, season {self.season.pk}\n'
+        )
+        self.assertTrue(HockeyPlayerSeasonStats.objects.exists())
+
+    def test_rebuild(self):
+        out = StringIO()
+        call_command('rebuild_player_stats', '--seasons', str(self.season.pk), stdout=out)
+        self.assertEqual(out.getvalue(), 'Ice Hockey: Rebuilt 0 player stats\n')
+        self.assertFalse(HockeyPlayerSeasonStats.objects.exists())
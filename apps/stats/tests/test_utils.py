@@ -0,0 +1,162 @@
+import datetime
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ayrabo.utils.testing import BaseTestCase
+from common.models import GenericChoice
+from common.tests import GenericChoiceFactory
+from games.models import HockeyGame
+from games.tests import HockeyAssistFactory, HockeyGameFactory, HockeyGoalFactory
+from penalties.tests import GenericPenaltyChoiceFactory, HockeyPenaltyFactory
+from periods.tests import HockeyPeriodFactory
+from players.tests import HockeyPlayerFactory
+from seasons.models import Season
+from seasons.tests import SeasonFactory
+from sports.tests import SportFactory
+from stats.models import HockeyPlayerSeasonStats
+from stats.utils import rebuild_hockey_player_stats, verify_hockey_player_stats
+from teams.tests import TeamFactory
+
+
+class HockeyPlayerSeasonStatsTests(BaseTestCase):
+    def setUp(self):
+        self.sport = SportFactory(name='Ice Hockey')
+        self.home_team = TeamFactory(name='Green Machine IceCats', division__league__sport=self.sport)
+        self.away_team = TeamFactory(name='Long Island Edge', division=self.home_team.division)
+        self.season = SeasonFactory(league=self.home_team.division.league, teams=[self.home_team, self.away_team])
+        self.game = HockeyGameFactory(
+            home_team=self.home_team,
+            away_team=self.away_team,
+            season=self.season,
+            status=HockeyGame.IN_PROGRESS,
+            type=GenericChoiceFactory(content_object=self.sport, short_value='exhibition', long_value='Exhibition',
+                                      type=GenericChoice.GAME_TYPE),
+            point_value=GenericChoiceFactory(content_object=self.sport, short_value='2', long_value='2',
+                                             type=GenericChoice.GAME_POINT_VALUE),
+        )
+        self.period = HockeyPeriodFactory(game=self.game)
+        self.penalty_type = GenericPenaltyChoiceFactory(content_object=self.sport)
+        self.p1 = HockeyPlayerFactory(team=self.home_team, sport=self.sport)
+        self.p2 = HockeyPlayerFactory(team=self.home_team, sport=self.sport)
+        self.p3 = HockeyPlayerFactory(team=self.away_team, sport=self.sport)
+
+    def _create_goal(self, player, **kwargs):
+        return HockeyGoalFactory(game=self.game, period=self.period, player=player, **kwargs)
+
+    def _create_penalty(self, player, minutes=2):
+        return HockeyPenaltyFactory(game=self.game, period=self.period, player=player, type=self.penalty_type,
+                                    duration=datetime.timedelta(minutes=minutes))
+
+    def _get_stats(self, player):
+        return HockeyPlayerSeasonStats.objects.get(player=player, season=self.season)
+
+    def assertStats(self, player, goals=0, assists=0, points=0, penalty_minutes=0):
+        player_stats = self._get_stats(player)
+        self.assertEqual(player_stats.team_id, player.team_id)
+        self.assertDictEqual(
+            {
+                'goals': player_stats.goals,
+                'assists': player_stats.assists,
+                'points': player_stats.points,
+                'penalty_minutes': player_stats.penalty_minutes,
+            },
+            {'goals': goals, 'assists': assists, 'points': points, 'penalty_minutes': penalty_minutes}
+        )
+
+    def test_goals_and_assists(self):
+        goal1 = self._create_goal(self.p1)
+        HockeyAssistFactory(goal=goal1, player=self.p2)
+        goal2 = self._create_goal(self.p2)
+        HockeyAssistFactory(goal=goal2, player=self.p1)
+        self._create_goal(self.p1)
+        self.assertStats(self.p1, goals=2, assists=1, points=3)
+        self.assertStats(self.p2, goals=1, assists=1, points=2)
+        self.assertFalse(HockeyPlayerSeasonStats.objects.filter(player=self.p3).exists())
+
+    def test_penalties(self):
+        self._create_penalty(self.p3)
+        penalty = self._create_penalty(self.p3, minutes=5)
+        self.assertStats(self.p3, penalty_minutes=7)
+
+        penalty.duration = datetime.timedelta(minutes=10)
+        penalty.save()
+        self.assertStats(self.p3, penalty_minutes=12)
+
+    def test_update_moves_stats(self):
+        goal = self._create_goal(self.p1)
+        assist = HockeyAssistFactory(goal=goal, player=self.p2)
+        goal.player = self.p3
+        goal.save()
+        self.assertStats(self.p1)
+        self.assertStats(self.p3, goals=1, points=1)
+
+        assist.player = self.p1
+        assist.save()
+        self.assertStats(self.p1, assists=1, points=1)
+        self.assertStats(self.p2)
+
+    def test_save_without_changes(self):
+        goal = self._create_goal(self.p1)
+        with CaptureQueriesContext(connection) as context:
+            goal.save(update_fields=['time'])
+        # Fetching the previous entry and the new entry, nothing is written
+        stats_queries = [query for query in context.captured_queries if 'stats_' in query['sql']]
+        self.assertEqual(len(stats_queries), 0)
+        self.assertStats(self.p1, goals=1, points=1)
+
+    def test_delete(self):
+        goal = self._create_goal(self.p1)
+        assist = HockeyAssistFactory(goal=goal, player=self.p2)
+        penalty = self._create_penalty(self.p1)
+        assist.delete()
+        goal.delete()
+        self.assertStats(self.p1, penalty_minutes=2)
+        self.assertStats(self.p2)
+        penalty.delete()
+        self.assertStats(self.p1)
+
+    def test_rebuild_hockey_player_stats(self):
+        goal = self._create_goal(self.p1)
+        HockeyAssistFactory(goal=goal, player=self.p2)
+        self._create_penalty(self.p1, minutes=4)
+        self._create_penalty(self.p3)
+        other_season = SeasonFactory(start_date=self.season.start_date - datetime.timedelta(days=365),
+                                     league=self.season.league)
+        HockeyPlayerSeasonStats.objects.create(player=self.p1, season=other_season, team=self.home_team, goals=5)
+        HockeyPlayerSeasonStats.objects.update(goals=10, penalty_minutes=0)
+
+        seasons = Season.objects.filter(pk=self.season.pk)
+        self.assertListEqual(
+            verify_hockey_player_stats(seasons),
+            [(self.p1.pk, self.season.pk), (self.p2.pk, self.season.pk), (self.p3.pk, self.season.pk)]
+        )
+        self.assertEqual(rebuild_hockey_player_stats(seasons), 3)
+        self.assertListEqual(verify_hockey_player_stats(seasons), [])
+
+        self.assertStats(self.p1, goals=1, points=1, penalty_minutes=4)
+        self.assertStats(self.p2, assists=1, points=1)
+        self.assertStats(self.p3, penalty_minutes=2)
+        # Other seasons aren't touched
+        self.assertEqual(HockeyPlayerSeasonStats.objects.get(season=other_season).goals, 10)
+
+    def test_get_leaders(self):
+        p4 = HockeyPlayerFactory(team=self.away_team, sport=self.sport)
+        for player in [self.p1, self.p3, self.p3, p4]:
+            self._create_goal(player)
+        HockeyAssistFactory(goal=self._create_goal(self.p1), player=self.p2)
+        self._create_penalty(self.p2, minutes=10)
+        self._create_penalty(p4)
+
+        leaders = HockeyPlayerSeasonStats.objects.get_leaders(self.season, HockeyPlayerSeasonStats.POINTS)
+        self.assertListEqual([s.player for s in leaders], [self.p1, self.p3, p4, self.p2])
+        leaders = HockeyPlayerSeasonStats.objects.get_leaders(self.season, HockeyPlayerSeasonStats.POINTS, limit=2)
+        self.assertListEqual([s.player for s in leaders], [self.p1, self.p3])
+        leaders = HockeyPlayerSeasonStats.objects.get_leaders(
+            self.season,
+            HockeyPlayerSeasonStats.POINTS,
+            team=self.home_team
+        )
+        self.assertListEqual([s.player for s in leaders], [self.p1, self.p2])
+        leaders = HockeyPlayerSeasonStats.objects.get_leaders(self.season, HockeyPlayerSeasonStats.PENALTY_MINUTES)
+        self.assertListEqual([s.player for s in leaders], [self.p2, p4])
@@ -0,0 +1,147 @@
+from django.db import transaction
+from django.db.models import F
+
+from games.models import HockeyAssist, HockeyGoal
+from penalties.models import HockeyPenalty
+from players.models import HockeyPlayer
+from .models import HockeyPlayerSeasonStats
+
+
+HOCKEY_STAT_FIELDS = ['goals', 'assists', 'points', 'penalty_minutes']
+
+
+def get_penalty_minutes(duration):
+    return int(duration.total_seconds() // 60)
+
+
+def _get_hockey_goal_deltas(row):
+    return {'goals': 1, 'points': 1}
+
+
+def _get_hockey_assist_deltas(row):
+    return {'assists': 1, 'points': 1}
+
+
+def _get_hockey_penalty_deltas(row):
+    return {'penalty_minutes': get_penalty_minutes(row['duration'])}
+
+
+# Model -> (lookup for the event's season, extra fields needed to compute the deltas, function computing the deltas)
+HOCKEY_STAT_EVENTS = {
+    HockeyGoal: ('game__season_id', [], _get_hockey_goal_deltas),
+    HockeyAssist: ('goal__game__season_id', [], _get_hockey_assist_deltas),
+    HockeyPenalty: ('game__season_id', ['duration'], _get_hockey_penalty_deltas),
+}
+
+
+def _get_hockey_stat_rows(model_cls, qs):
+    season_lookup, fields, _ = HOCKEY_STAT_EVENTS[model_cls]
+    return qs.values('player_id', *fields, team_id=F('player__team_id'), season_id=F(season_lookup)).order_by()
+
+
+def get_hockey_stat_entry(instance):
+    """
+    Compute what the goal, assist or penalty contributes to its player's season stats, as it's currently stored in the
+    db. This is one query.
+
+    :param instance: `HockeyGoal`, `HockeyAssist` or `HockeyPenalty` instance
+    :return: Tuple of (player id, season id, deltas) or None if the instance isn't in the db
+    """
+    model_cls = type(instance)
+    _, _, get_deltas = HOCKEY_STAT_EVENTS[model_cls]
+    row = _get_hockey_stat_rows(model_cls, model_cls.objects.filter(pk=instance.pk)).first()
+    if row is None:
+        return None
+    return row['player_id'], row['season_id'], get_deltas(row)
+
+
+def _apply_hockey_stat_entry(entry, sign):
+    player_id, season_id, deltas = entry
+    updated = HockeyPlayerSeasonStats.objects.filter(player_id=player_id, season_id=season_id).update(
+        **{field: F(field) + sign * value for field, value in deltas.items()}
+    )
+    if not updated and sign > 0:
+        team_id = HockeyPlayer.objects.values_list('team_id', flat=True).get(pk=player_id)
+        HockeyPlayerSeasonStats.objects.create(player_id=player_id, season_id=season_id, team_id=team_id, **deltas)
+
+
+def sync_hockey_stat_entry(old, new):
+    """
+    Replace the old contribution of an event with its new contribution. Nothing is written when they're the same.
+
+    :param old: Entry as returned by `get_hockey_stat_entry` before the change, None for new events
+    :param new: Entry as returned by `get_hockey_stat_entry` after the change, None for deleted events
+    """
+    if old == new:
+        return
+    with transaction.atomic():
+        if old is not None:
+            _apply_hockey_stat_entry(old, -1)
+        if new is not None:
+            _apply_hockey_stat_entry(new, 1)
+
+
+def compute_hockey_player_stats(season_ids):
+    """
+    Compute player season stats from the raw goals, assists and penalties. Rows are streamed from one query per event
+    table.
+
+    :param season_ids: Ids of the seasons to compute stats for
+    :return: Dict of (player id, season id) -> unsaved `HockeyPlayerSeasonStats`
+    """
+    stats = {}
+    for model_cls, (season_lookup, _, get_deltas) in HOCKEY_STAT_EVENTS.items():
+        qs = model_cls.objects.filter(**{f'{season_lookup}__in': season_ids})
+        for row in _get_hockey_stat_rows(model_cls, qs).iterator():
+            key = (row['player_id'], row['season_id'])
+            player_stats = stats.get(key)
+            if player_stats is None:
+                player_stats = HockeyPlayerSeasonStats(
+                    player_id=row['player_id'],
+                    season_id=row['season_id'],
+                    team_id=row['team_id']
+                )
+                stats[key] = player_stats
+            for field, value in get_deltas(row).items():
+                setattr(player_stats, field, getattr(player_stats, field) + value)
+    return stats
+
+
+@transaction.atomic
+def rebuild_hockey_player_stats(seasons, batch_size=1000):
+    """
+    Recompute hockey player season stats for the given seasons from scratch.
+
+    :param seasons: Season QuerySet
+    :param batch_size: Batch size used for the bulk inserts
+    :return: # of player season stats created
+    """
+    season_ids = list(seasons.values_list('id', flat=True))
+    stats = compute_hockey_player_stats(season_ids)
+    HockeyPlayerSeasonStats.objects.filter(season_id__in=season_ids).delete()
+    HockeyPlayerSeasonStats.objects.bulk_create(stats.values(), batch_size=batch_size)
+    return len(stats)
+
+
+def verify_hockey_player_stats(seasons):
+    """
+    Compare the incrementally maintained stats with stats recomputed from scratch, without writing anything. Players
+    that have a stats row with all zeros are treated the same as players without a row.
+
+    :param seasons: Season QuerySet
+    :return: Sorted list of (player id, season id) that are out of sync
+    """
+    season_ids = list(seasons.values_list('id', flat=True))
+    expected = {}
+    for key, player_stats in compute_hockey_player_stats(season_ids).items():
+        values = [getattr(player_stats, field) for field in HOCKEY_STAT_FIELDS]
+        if any(values):
+            expected[key] = values
+    actual = {}
+    rows = HockeyPlayerSeasonStats.objects.filter(season_id__in=season_ids).values_list(
+        'player_id', 'season_id', *HOCKEY_STAT_FIELDS
+    )
+    for player_id, season_id, *values in rows.iterator():
+        if any(values):
+            actual[(player_id, season_id)] = values
+    return sorted(key for key in expected.keys() | actual.keys() if expected.get(key) != actual.get(key))
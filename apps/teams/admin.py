@@ -4,6 +4,7 @@ from easy_thumbnails.widgets import ImageClearableFileInput
 
 from ayrabo.utils.admin import format_website_link
 from ayrabo.utils.admin.mixins import AdminBulkUploadMixin
+from common.reference_data import DIVISIONS, LOCATIONS, get_reference_objects, lazy_model_choices
 from locations.models import TeamLocation
 from .models import Team
 
@@ -11,6 +12,13 @@ from .models import Team
 class TeamLocationInline(admin.TabularInline):
     model = TeamLocation
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        field = super().formfield_for_foreignkey(db_field, request, **kwargs)
+        if db_field.name == 'location':
+            # Each inline form renders the dropdown
+            field.choices = lazy_model_choices(field, lambda: get_reference_objects(LOCATIONS))
+        return field
+
 
 @admin.register(Team)
 class TeamAdmin(AdminBulkUploadMixin, admin.ModelAdmin):
@@ -30,6 +38,12 @@ class TeamAdmin(AdminBulkUploadMixin, admin.ModelAdmin):
     # for hockey. The saving in the inline isn't caught by the m2m_changed signal and creating a custom form just for
     # the admin is overkill.
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        field = super().formfield_for_foreignkey(db_field, request, **kwargs)
+        if db_field.name == 'division':
+            field.choices = lazy_model_choices(field, lambda: get_reference_objects(DIVISIONS))
+        return field
+
     def website_link(self, obj):
         return format_website_link(obj)
 
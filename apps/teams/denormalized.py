@@ -0,0 +1,73 @@
+from django.db.models import F, OuterRef, Subquery
+
+from divisions.models import Division
+from teams.models import Team
+
+
+def _get_team_role_model_classes():
+    # Prevents circular import error
+    from coaches.models import Coach
+    from managers.models import Manager
+
+    return [Coach, Manager]
+
+
+def get_stale_teams(teams=None):
+    """
+    :param teams: Teams queryset to check, defaults to all teams
+    :return: Teams queryset of teams whose `league` or `sport` don't match their division's
+    """
+    teams = Team.objects.all() if teams is None else teams
+    return teams.annotate(
+        division_league_id=F('division__league_id'),
+        division_sport_id=F('division__league__sport_id'),
+    ).exclude(league_id=F('division_league_id'), sport_id=F('division_sport_id'))
+
+
+def get_stale_team_roles(model_cls, teams=None):
+    """
+    :param model_cls: Model class of the team role, i.e. `Coach`
+    :param teams: Teams queryset whose coaches, managers, etc. should be checked, defaults to all teams
+    :return: Queryset of objects whose `sport` doesn't match their team's
+    """
+    qs = model_cls.objects.all() if teams is None else model_cls.objects.filter(team__in=teams)
+    return qs.annotate(team_sport_id=F('team__sport_id')).exclude(sport_id=F('team_sport_id'))
+
+
+def get_stale_objects(teams=None):
+    """
+    Consistency check for the denormalized `league` and `sport` of teams and the `sport` of coaches and managers.
+
+    :param teams: Teams queryset to check, defaults to all teams
+    :return: Dict of model class -> queryset of objects whose denormalized keys are stale
+    """
+    result = {Team: get_stale_teams(teams)}
+    for model_cls in _get_team_role_model_classes():
+        result[model_cls] = get_stale_team_roles(model_cls, teams)
+    return result
+
+
+def sync_denormalized_keys(teams=None):
+    """
+    Update the denormalized keys that have gone stale, i.e. a division was moved to another league. Teams are updated
+    first, so their coaches and managers pick up the teams' new sport. Up to date rows aren't written to.
+
+    NOTE: `QuerySet.update` doesn't send signals, code bulk changing teams, divisions or leagues needs to call this
+    function manually. Bulk created teams, coaches and managers need their denormalized keys set, `clean` sets them.
+
+    :param teams: Teams queryset to sync, defaults to all teams
+    :return: Dict of model class -> # of objects updated
+    """
+    division_qs = Division.objects.filter(pk=OuterRef('division_id'))
+    result = {
+        Team: get_stale_teams(teams).update(
+            league_id=Subquery(division_qs.values('league_id')[:1]),
+            sport_id=Subquery(division_qs.values('league__sport_id')[:1]),
+        )
+    }
+    team_qs = Team.objects.filter(pk=OuterRef('team_id'))
+    for model_cls in _get_team_role_model_classes():
+        result[model_cls] = get_stale_team_roles(model_cls, teams).update(
+            sport_id=Subquery(team_qs.values('sport_id')[:1])
+        )
+    return result
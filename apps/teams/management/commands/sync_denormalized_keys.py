@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from teams.denormalized import get_stale_objects, sync_denormalized_keys
+
+
+class Command(BaseCommand):
+    help = (
+        'Backfills the denormalized league and sport of teams, coaches and managers. Useful after bulk changes, which '
+        'skip the signals keeping them up to date.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Report the objects whose league or sport is stale without updating them, fails if there are any.'
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            num_stale = 0
+            for model_cls, qs in get_stale_objects().items():
+                pks = list(qs.values_list('pk', flat=True))
+                num_stale += len(pks)
+                self.stdout.write(f'{model_cls._meta.verbose_name_plural.title()}: {len(pks)} stale')
+                if pks and options['verbosity'] > 1:
+                    self.stdout.write('  ids: {}'.format(', '.join(str(pk) for pk in pks)))
+            if num_stale:
+                raise CommandError(f'{num_stale} objects have a stale league or sport, run without --check to fix them')
+            return
+
+        for model_cls, num_updated in sync_denormalized_keys().items():
+            self.stdout.write(f'{model_cls._meta.verbose_name_plural.title()}: Updated {num_updated}')
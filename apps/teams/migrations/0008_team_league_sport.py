@@ -0,0 +1,39 @@
+# Generated by Django 2.2.28 on 2026-10-18 15:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import OuterRef, Subquery
+
+
+def forwards_func(apps, schema_editor):
+    Division = apps.get_model('divisions', 'Division')
+    Team = apps.get_model('teams', 'Team')
+    divisions = Division.objects.filter(pk=OuterRef('division_id'))
+    Team.objects.update(
+        league_id=Subquery(divisions.values('league_id')[:1]),
+        sport_id=Subquery(divisions.values('league__sport_id')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sports', '0007_auto_20180924_0034'),
+        ('leagues', '0007_auto_20190421_2008'),
+        ('teams', '0007_auto_20181110_0412'),
+        ('divisions', '0004_auto_20181110_0401'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='league',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='leagues.League', verbose_name='League'),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='sport',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='sports.Sport', verbose_name='Sport'),
+        ),
+        migrations.RunPython(forwards_func, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 2.2.28 on 2026-10-18 16:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import OuterRef, Subquery
+
+
+def forwards_func(apps, schema_editor):
+    # Teams bulk created since the columns were added
+    Division = apps.get_model('divisions', 'Division')
+    Team = apps.get_model('teams', 'Team')
+    divisions = Division.objects.filter(pk=OuterRef('division_id'))
+    Team.objects.filter(models.Q(league__isnull=True) | models.Q(sport__isnull=True)).update(
+        league_id=Subquery(divisions.values('league_id')[:1]),
+        sport_id=Subquery(divisions.values('league__sport_id')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+    # Postgres can't alter a table with pending trigger events, i.e. the backfill's updates in the same transaction
+    atomic = False
+
+    dependencies = [
+        ('teams', '0008_team_league_sport'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards_func, reverse_code=migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='team',
+            name='league',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='leagues.League', verbose_name='League'),
+        ),
+        migrations.AlterField(
+            model_name='team',
+            name='sport',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='sports.Sport', verbose_name='Sport'),
+        ),
+    ]
@@ -1,11 +1,15 @@
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.text import slugify
 from easy_thumbnails.fields import ThumbnailerImageField
 
 from ayrabo.utils import UploadTo
 from ayrabo.utils.model_fields import WebsiteField
+from common.fragments import LEAGUE, TEAM, bump_fragment_versions, is_fragment_cache_enabled
 from common.models import TimestampedModel
+from divisions.models import Division
 
 
 class Team(TimestampedModel):
@@ -22,18 +26,47 @@ class Team(TimestampedModel):
                                        related_name='teams')
     organization = models.ForeignKey('organizations.Organization', verbose_name='Organization',
                                      on_delete=models.PROTECT, related_name='teams')
+    # Denormalized from the division (see `clean` and `save`), so filtering by league or sport doesn't join through the
+    # division and league tables. `teams.denormalized` keeps them up to date when a division or league changes.
+    league = models.ForeignKey('leagues.League', editable=False, verbose_name='League', on_delete=models.PROTECT,
+                               related_name='+')
+    sport = models.ForeignKey('sports.Sport', editable=False, verbose_name='Sport', on_delete=models.PROTECT,
+                              related_name='+')
 
     def clean(self):
         self.slug = slugify(self.name)
 
         division = getattr(self, 'division', None)
         organization = getattr(self, 'organization', None)
+        if division is not None:
+            # Bulk created teams are cleaned but not saved
+            self.league_id = division.league_id
+            self.sport_id = division.league.sport_id
         if division is not None and organization is not None:
             if division.league.sport_id != organization.sport_id:
                 msg = 'Sports do not match {} and {}'.format(
                     division.league.sport.name, organization.sport.name)
                 raise ValidationError({'organization': msg})
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The division the team had when it was loaded, see `save`. Deferred divisions count as changed.
+        instance._loaded_division_id = instance.__dict__.get('division_id', models.DEFERRED)
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Only look up the division's league and sport (and sync the coaches and managers, see
+        # `sync_denormalized_keys_on_team_change`) when the team is new or moved to another division
+        self._denormalized_keys_changed = (
+            self.division_id is not None and self.division_id != getattr(self, '_loaded_division_id', None)
+        )
+        if self._denormalized_keys_changed:
+            self.league_id, self.sport_id = Division.objects.values_list('league_id', 'league__sport_id').get(
+                pk=self.division_id)
+        super().save(*args, **kwargs)
+        self._loaded_division_id = self.division_id
+
     class Meta:
         ordering = ['name', 'division']
         unique_together = (
@@ -43,3 +76,25 @@ class Team(TimestampedModel):
 
     def __str__(self):
         return self.name
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def bump_fragment_versions_on_team_change(sender, instance, **kwargs):
+    """
+    Team names, logos, etc. are displayed by the team's pages and the league's schedule and divisions fragments.
+    """
+    if is_fragment_cache_enabled():
+        bump_fragment_versions((TEAM, instance.pk), (LEAGUE, instance.league_id))
+
+
+@receiver(post_save, sender=Team)
+def sync_denormalized_keys_on_team_change(sender, instance, created, **kwargs):
+    """
+    The team's coaches and managers have the team's sport, which changes if the team is moved to another division.
+    """
+    if created or not getattr(instance, '_denormalized_keys_changed', True):
+        return
+    from teams.denormalized import sync_denormalized_keys
+
+    sync_denormalized_keys(Team.objects.filter(pk=instance.pk))
@@ -0,0 +1,38 @@
+from django.core.management import CommandError, call_command
+from django.utils.six import StringIO
+
+from ayrabo.utils.testing import BaseTestCase
+from coaches.models import Coach
+from coaches.tests import CoachFactory
+from leagues.tests import LeagueFactory
+from sports.tests import SportFactory
+from teams.models import Team
+from teams.tests import TeamFactory
+
+
+class SyncDenormalizedKeysTests(BaseTestCase):
+    def setUp(self):
+        self.team = TeamFactory()
+        self.coach = CoachFactory(team=self.team)
+
+    def test_sync(self):
+        Team.objects.update(league=LeagueFactory())
+        out = StringIO()
+        call_command('sync_denormalized_keys', stdout=out)
+        self.assertEqual(out.getvalue(), 'Teams: Updated 1\nCoaches: Updated 0\nManagers: Updated 0\n')
+        self.team.refresh_from_db()
+        self.assertEqual(self.team.league_id, self.team.division.league_id)
+
+    def test_check(self):
+        out = StringIO()
+        call_command('sync_denormalized_keys', '--check', stdout=out)
+        self.assertEqual(out.getvalue(), 'Teams: 0 stale\nCoaches: 0 stale\nManagers: 0 stale\n')
+
+    def test_check_stale(self):
+        Coach.objects.update(sport=SportFactory())
+        out = StringIO()
+        with self.assertRaisesMessage(CommandError, '1 objects have a stale league or sport'):
+            call_command('sync_denormalized_keys', '--check', verbosity=2, stdout=out)
+        self.assertIn(f'Coaches: 1 stale\n  ids: {self.coach.pk}\n', out.getvalue())
+        self.coach.refresh_from_db()
+        self.assertNotEqual(self.coach.sport_id, self.team.sport_id)
@@ -0,0 +1,81 @@
+from ayrabo.utils.testing import BaseTestCase
+from coaches.models import Coach
+from coaches.tests import CoachFactory
+from divisions.tests import DivisionFactory
+from leagues.tests import LeagueFactory
+from managers.models import Manager
+from managers.tests import ManagerFactory
+from sports.tests import SportFactory
+from teams.denormalized import get_stale_objects, sync_denormalized_keys
+from teams.models import Team
+from teams.tests import TeamFactory
+
+
+class DenormalizedKeysTests(BaseTestCase):
+    def setUp(self):
+        self.ice_hockey = SportFactory(name='Ice Hockey')
+        self.baseball = SportFactory(name='Baseball')
+        self.liahl = LeagueFactory(name='Long Island Amateur Hockey League', sport=self.ice_hockey)
+        self.division = DivisionFactory(name='Pee Wee AA', league=self.liahl)
+        self.team = TeamFactory(division=self.division)
+        self.coach = CoachFactory(team=self.team)
+        self.manager = ManagerFactory(team=self.team)
+
+    def assertKeys(self, league, sport):
+        self.team.refresh_from_db()
+        self.coach.refresh_from_db()
+        self.manager.refresh_from_db()
+        self.assertEqual(self.team.league_id, league.id)
+        self.assertEqual(self.team.sport_id, sport.id)
+        self.assertEqual(self.coach.sport_id, sport.id)
+        self.assertEqual(self.manager.sport_id, sport.id)
+
+    def test_set_on_create(self):
+        self.assertKeys(self.liahl, self.ice_hockey)
+
+    def test_division_moved_to_other_league(self):
+        league = LeagueFactory(sport=self.baseball)
+        self.division.league = league
+        self.division.save()
+        self.assertKeys(league, self.baseball)
+
+    def test_league_moved_to_other_sport(self):
+        self.liahl.sport = self.baseball
+        self.liahl.save()
+        self.assertKeys(self.liahl, self.baseball)
+
+    def test_team_moved_to_other_division(self):
+        division = DivisionFactory(league__sport=self.baseball)
+        self.team.division = division
+        self.team.save()
+        self.assertKeys(division.league, self.baseball)
+
+    def test_get_stale_objects(self):
+        self.assertDictEqual({model_cls: qs.count() for model_cls, qs in get_stale_objects().items()}, {
+            Team: 0, Coach: 0, Manager: 0
+        })
+        # i.e. a bulk update, signals aren't sent
+        Team.objects.filter(pk=self.team.pk).update(league=LeagueFactory(sport=self.ice_hockey))
+        Coach.objects.filter(pk=self.coach.pk).update(sport=self.baseball)
+        stale = get_stale_objects()
+        self.assertListEqual(list(stale[Team]), [self.team])
+        self.assertListEqual(list(stale[Coach]), [self.coach])
+        self.assertListEqual(list(stale[Manager]), [])
+
+    def test_sync_denormalized_keys(self):
+        other_team = TeamFactory(division=self.division)
+        Team.objects.update(league=LeagueFactory(sport=self.baseball), sport=self.baseball)
+        Manager.objects.update(sport=self.baseball)
+        self.assertDictEqual(sync_denormalized_keys(), {Team: 2, Coach: 0, Manager: 1})
+        self.assertKeys(self.liahl, self.ice_hockey)
+        other_team.refresh_from_db()
+        self.assertEqual(other_team.league_id, self.liahl.id)
+        self.assertDictEqual(sync_denormalized_keys(), {Team: 0, Coach: 0, Manager: 0})
+
+    def test_sync_denormalized_keys_for_teams(self):
+        other_team = TeamFactory(division=self.division)
+        Team.objects.update(sport=self.baseball)
+        sync_denormalized_keys(Team.objects.filter(pk=self.team.pk))
+        other_team.refresh_from_db()
+        self.assertKeys(self.liahl, self.ice_hockey)
+        self.assertEqual(other_team.sport_id, self.baseball.id)
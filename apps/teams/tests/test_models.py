@@ -65,3 +65,32 @@ class TeamModelTests(BaseTestCase):
         msg = "{'organization': ['Sports do not match Ice Hockey and Baseball']}"
         with self.assertRaisesMessage(ValidationError, msg):
             TeamFactory(division=self.pee_wee_division, organization=organization)
+
+    def test_league_and_sport_set_from_division(self):
+        team = TeamFactory(division=self.pee_wee_division)
+        self.assertEqual(team.league_id, self.liahl.id)
+        self.assertEqual(team.sport_id, self.ice_hockey.id)
+
+        other_division = DivisionFactory(league__sport=self.ice_hockey)
+        team.division = other_division
+        team.save()
+        team.refresh_from_db()
+        self.assertEqual(team.league_id, other_division.league_id)
+
+    def test_save_division_unchanged(self):
+        TeamFactory(division=self.pee_wee_division)
+        team = Team.objects.get()
+        team.name = 'Long Island Edge'
+        # Only the team's update, the league and sport aren't looked up and the coaches and managers aren't synced
+        with self.assertNumQueries(1):
+            team.save()
+
+    def test_clean_sets_league_and_sport(self):
+        # i.e. admin bulk uploads, the cleaned teams are bulk created
+        organization = OrganizationFactory(sport=self.ice_hockey)
+        team = TeamFactory.build(division=self.pee_wee_division, organization=organization)
+        team.full_clean()
+        Team.objects.bulk_create([team])
+        team = Team.objects.get()
+        self.assertEqual(team.league_id, self.liahl.id)
+        self.assertEqual(team.sport_id, self.ice_hockey.id)
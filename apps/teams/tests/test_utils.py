@@ -6,7 +6,12 @@ from leagues.tests import LeagueFactory
 from sports.tests import SportFactory
 from teams import utils
 from teams.tests import TeamFactory
-from teams.utils import get_team_detail_players_url, get_team_detail_schedule_url, get_team_detail_season_rosters_url
+from teams.utils import (
+    get_team_detail_leaders_url,
+    get_team_detail_players_url,
+    get_team_detail_schedule_url,
+    get_team_detail_season_rosters_url,
+)
 
 
 class UtilsTests(BaseTestCase):
@@ -24,6 +29,7 @@ class UtilsTests(BaseTestCase):
             'schedule_link': '',
             'players_link': reverse('teams:players', kwargs={'team_pk': self.icecats.pk}),
             'season_rosters_link': '',
+            'leaders_link': '',
             'seasons': [self.future_season, self.current_season, self.past_season]
         }
 
@@ -73,13 +79,24 @@ class UtilsTests(BaseTestCase):
             })
         )
 
+    def test_get_team_detail_leaders_url(self):
+        self.assertEqual(
+            get_team_detail_leaders_url(self.icecats, self.past_season),
+            reverse('teams:seasons:leaders', kwargs={'team_pk': self.icecats.pk, 'season_pk': self.past_season.pk})
+        )
+        self.assertEqual(
+            get_team_detail_leaders_url(self.icecats, self.current_season),
+            reverse('teams:leaders', kwargs={'team_pk': self.icecats.pk})
+        )
+
     def test_get_team_detail_view_context_current_season(self):
         result = utils.get_team_detail_view_context(self.icecats, season=self.current_season)
         kwargs = {'team_pk': self.icecats.pk}
         self.expected_team_detail_view_context.update({
             'season': self.current_season,
             'schedule_link': reverse('teams:schedule', kwargs=kwargs),
-            'season_rosters_link': reverse('teams:season_rosters:list', kwargs=kwargs)
+            'season_rosters_link': reverse('teams:season_rosters:list', kwargs=kwargs),
+            'leaders_link': reverse('teams:leaders', kwargs=kwargs)
         })
         self.assertDictWithQuerySetEqual(result, self.expected_team_detail_view_context)
 
@@ -89,7 +106,8 @@ class UtilsTests(BaseTestCase):
         self.expected_team_detail_view_context.update({
             'season': self.past_season,
             'schedule_link': reverse('teams:seasons:schedule', kwargs=kwargs),
-            'season_rosters_link': reverse('teams:seasons:season_rosters-list', kwargs=kwargs)
+            'season_rosters_link': reverse('teams:seasons:season_rosters-list', kwargs=kwargs),
+            'leaders_link': reverse('teams:seasons:leaders', kwargs=kwargs)
         })
         self.assertDictWithQuerySetEqual(result, self.expected_team_detail_view_context)
 
@@ -99,6 +117,7 @@ class UtilsTests(BaseTestCase):
         self.expected_team_detail_view_context.update({
             'season': self.future_season,
             'schedule_link': reverse('teams:seasons:schedule', kwargs=kwargs),
-            'season_rosters_link': reverse('teams:seasons:season_rosters-list', kwargs=kwargs)
+            'season_rosters_link': reverse('teams:seasons:season_rosters-list', kwargs=kwargs),
+            'leaders_link': reverse('teams:seasons:leaders', kwargs=kwargs)
         })
         self.assertDictWithQuerySetEqual(result, self.expected_team_detail_view_context)
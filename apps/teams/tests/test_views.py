@@ -4,11 +4,12 @@ from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 
-from ayrabo.utils.testing import BaseTestCase
+from ayrabo.utils.testing import BaseTestCase, QueryBudgetMixin
 from common.models import GenericChoice
 from common.tests import GenericChoiceFactory
 from divisions.tests import DivisionFactory
 from games.tests import HockeyGameFactory
+from games.utils import GAMES_PAGE_SIZE
 from leagues.tests import LeagueFactory
 from managers.tests import ManagerFactory
 from organizations.tests import OrganizationFactory
@@ -16,6 +17,7 @@ from players.tests import HockeyPlayerFactory
 from seasons.tests import HockeySeasonRosterFactory, SeasonFactory
 from sports.models import SportRegistration
 from sports.tests import SportFactory, SportRegistrationFactory
+from stats.models import HockeyPlayerSeasonStats
 from teams.models import Team
 from teams.tests import TeamFactory
 from users.tests import UserFactory
@@ -53,7 +55,7 @@ class TeamAdminBulkUploadViewTests(BaseTestCase):
                                 ['Select a valid choice. That choice is not one of the available choices.'])
 
 
-class TeamDetailScheduleViewTests(BaseTestCase):
+class TeamDetailScheduleViewTests(QueryBudgetMixin, BaseTestCase):
     url = 'teams:schedule'
 
     def _create_game(self, home_team, away_team, season):
@@ -145,8 +147,7 @@ class TeamDetailScheduleViewTests(BaseTestCase):
         self.assertTrue(context.get('can_create_game'))
 
         self.assertEqual(context.get('active_tab'), 'schedule')
-        self.assertListEqual(list(context.get('games')), [self.game2, self.game1])
-        self.assertTrue(context.get('has_games'))
+        self.assertListEqual(list(context.get('page_obj')), [self.game2, self.game1])
 
         self.assertEqual(context.get('sport'), self.ice_hockey)
 
@@ -176,7 +177,7 @@ class TeamDetailScheduleViewTests(BaseTestCase):
         )
         self.assertIsNotNone(context.get('seasons'))
         self.assertTrue(context.get('can_create_game'))
-        self.assertFalse(context.get('has_games'))
+        self.assertListEqual(list(context.get('page_obj')), [])
 
     def test_get_future_season(self):
         url = reverse('teams:seasons:schedule', kwargs={
@@ -190,6 +191,16 @@ class TeamDetailScheduleViewTests(BaseTestCase):
         self.assertEqual(context.get('season'), self.future_season)
         self.assertTrue(context.get('can_create_game'))
 
+    def test_query_budget(self):
+        def seed(count):
+            for i in range(count):
+                self._create_game(self.icecats_mm_aa, [self.edge_mm_aa, self.rebels_mm_aa][i % 2], self.current_season)
+
+        # More games than fit on a page
+        sizes = (1, GAMES_PAGE_SIZE + 5)
+        self.assertQueriesDoNotScale(lambda: self.client.get(self.formatted_url), seed, sizes=sizes, max_queries=15)
+        self.assertQueryBudget(lambda: self.client.get(self.formatted_url, {'page': 2}), max_queries=15)
+
 
 class TeamDetailSeasonRostersViewTests(BaseTestCase):
     url = 'teams:season_rosters:list'
@@ -358,3 +369,64 @@ class TeamDetailPlayersViewTests(BaseTestCase):
         self.assertListEqual(context.get('columns'), ['Jersey Number', 'Name'])
         self.assertListEqual(list(context.get('players')), [])
         self.assertFalse(context.get('has_players'))
+
+
+class TeamDetailLeadersViewTests(BaseTestCase):
+    url = 'teams:leaders'
+
+    def _create_stats(self, team, season, **kwargs):
+        player = HockeyPlayerFactory(team=team, sport=self.ice_hockey)
+        return HockeyPlayerSeasonStats.objects.create(player=player, team=team, season=season, **kwargs)
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.ice_hockey = SportFactory(name='Ice Hockey')
+        self.liahl = LeagueFactory(sport=self.ice_hockey, name='Long Island Amateur Hockey League')
+        self.mm_aa = DivisionFactory(league=self.liahl, name='Midget Minor AA')
+        self.icecats_mm_aa = TeamFactory(division=self.mm_aa, name='Green Machine IceCats')
+        self.edge_mm_aa = TeamFactory(division=self.mm_aa, name='Long Island Edge')
+        self.past_season, self.current_season, _ = self.create_past_current_future_seasons(self.liahl)
+        self.s1 = self._create_stats(self.icecats_mm_aa, self.current_season, goals=1, points=1)
+        self.s2 = self._create_stats(self.icecats_mm_aa, self.current_season, assists=2, points=2, penalty_minutes=2)
+        self.s3 = self._create_stats(self.edge_mm_aa, self.current_season, goals=5, points=5, penalty_minutes=10)
+        self.s4 = self._create_stats(self.icecats_mm_aa, self.past_season, goals=1, points=1)
+
+        self.formatted_url = self.format_url(team_pk=self.icecats_mm_aa.pk)
+        self.login(user=self.user)
+
+    def test_login_required(self):
+        self.client.logout()
+        self.assertLoginRequired(self.formatted_url)
+
+    def test_sport_not_configured(self):
+        team = TeamFactory()
+        SeasonFactory(league=team.division.league)
+        self.assertSportNotConfigured(self.format_url(team_pk=team.pk))
+
+    # GET
+    def test_get(self):
+        response = self.client.get(self.formatted_url)
+        context = response.context
+
+        self.assert_200(response)
+        self.assertTemplateUsed(response, 'teams/team_detail_leaders.html')
+        self.assertEqual(context.get('season'), self.current_season)
+        self.assertEqual(context.get('leaders_link'), self.formatted_url)
+        self.assertEqual(context.get('current_season_page_url'), self.formatted_url)
+        self.assertEqual(context.get('active_tab'), 'leaders')
+        self.assertListEqual(list(context.get('top_scorers')), [self.s2, self.s1])
+        self.assertListEqual(list(context.get('penalty_leaders')), [self.s2])
+
+    def test_get_past_season(self):
+        url = reverse(
+            'teams:seasons:leaders',
+            kwargs={'team_pk': self.icecats_mm_aa.pk, 'season_pk': self.past_season.pk}
+        )
+        response = self.client.get(url)
+        context = response.context
+
+        self.assert_200(response)
+        self.assertEqual(context.get('season'), self.past_season)
+        self.assertEqual(context.get('leaders_link'), url)
+        self.assertListEqual(list(context.get('top_scorers')), [self.s4])
+        self.assertListEqual(list(context.get('penalty_leaders')), [])
@@ -8,6 +8,7 @@ from . import views
 season_urls = [
     url(r'^$', views.TeamDetailScheduleView.as_view(), name='schedule'),
     url(r'^season-rosters/$', views.TeamDetailSeasonRostersView.as_view(), name='season_rosters-list'),
+    url(r'^leaders/$', views.TeamDetailLeadersView.as_view(), name='leaders'),
 ]
 
 app_name = 'teams'
@@ -17,4 +18,5 @@ urlpatterns = [
     url(r'^(?P<team_pk>\d+)/games/', include('games.urls')),
     url(r'^(?P<team_pk>\d+)/$', views.TeamDetailScheduleView.as_view(), name='schedule'),
     url(r'^(?P<team_pk>\d+)/players/$', views.TeamDetailPlayersView.as_view(), name='players'),
+    url(r'^(?P<team_pk>\d+)/leaders/$', views.TeamDetailLeadersView.as_view(), name='leaders'),
 ]
@@ -23,14 +23,23 @@ def get_team_detail_season_rosters_url(team, season):
     return reverse('teams:seasons:season_rosters-list', kwargs=kwargs)
 
 
+def get_team_detail_leaders_url(team, season):
+    kwargs = {'team_pk': team.pk}
+    if season.is_current:
+        return reverse('teams:leaders', kwargs=kwargs)
+    kwargs.update({'season_pk': season.pk})
+    return reverse('teams:seasons:leaders', kwargs=kwargs)
+
+
 def get_team_detail_view_context(team, season):
     division = team.division
-    league = division.league
+    league = team.league
     return {
         'team_display_name': f'{team.name} - {division.name}',
         'season': season,  # Note `get_game_list_view_context` is also setting the same context key.
         'schedule_link': get_team_detail_schedule_url(team, season),
         'players_link': get_team_detail_players_url(team),
         'season_rosters_link': get_team_detail_season_rosters_url(team, season),
+        'leaders_link': get_team_detail_leaders_url(team, season),
         'seasons': Season.objects.get_for_league(league=league)
     }
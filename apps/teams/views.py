@@ -1,14 +1,17 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import render
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.views.generic import DetailView
 
 from ayrabo.utils import send_season_not_configured_email
 from ayrabo.utils.mixins import HandleSportNotConfiguredMixin
-from games.utils import get_game_list_view_context
+from common.fragments import TEAM, get_or_render_fragment
+from games.utils import get_game_list_fragment
 from players.mappings import get_player_model_cls
 from seasons.mappings import get_season_roster_model_cls
 from seasons.utils import get_current_season_or_from_pk
+from stats.mappings import get_player_season_stats_model_cls
 from teams.utils import get_team_detail_view_context
 from users.authorizers import GameAuthorizer, SeasonRosterAuthorizer
 from .models import Team
@@ -17,15 +20,15 @@ from .models import Team
 class AbstractTeamDetailView(LoginRequiredMixin, HandleSportNotConfiguredMixin, DetailView):
     context_object_name = 'team'
     pk_url_kwarg = 'team_pk'
-    queryset = Team.objects.select_related('division__league__sport', 'organization')
+    queryset = Team.objects.select_related('division', 'league', 'sport', 'organization')
 
     def get_object(self, queryset=None):
         if hasattr(self, 'object'):
             return self.object
         self.object = super().get_object(queryset)
         self.division = self.object.division
-        self.league = self.division.league
-        self.sport = self.league.sport
+        self.league = self.object.league
+        self.sport = self.object.sport
         self.season = get_current_season_or_from_pk(self.league, self.kwargs.get('season_pk'))
         return self.object
 
@@ -52,14 +55,14 @@ class TeamDetailScheduleView(AbstractTeamDetailView):
         user = self.request.user
         team = self.get_object()
         season = context.get('season')
-        game_list_context = get_game_list_view_context(user, self.sport, season, team=team)
+        game_list_fragment = get_game_list_fragment(self.request, self.sport, season, team=team)
         game_authorizer = GameAuthorizer(user=user)
         context.update({
             # Game create form displays all seasons, might as well display the button as long as the user is a manager
             'can_create_game': game_authorizer.can_user_create(team=team),
             'current_season_page_url': reverse('teams:schedule', kwargs={'team_pk': team.pk})
         })
-        context.update(game_list_context)
+        context.update(game_list_fragment)
         return context
 
 
@@ -80,7 +83,7 @@ class TeamDetailSeasonRostersView(AbstractTeamDetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         team = self.get_object()
-        sport = team.division.league.sport
+        sport = team.sport
         season = context.get('season')
         season_roster_authorizer = SeasonRosterAuthorizer(user=self.request.user)
         can_user_list = season_roster_authorizer.can_user_list(team=team, sport=sport)
@@ -103,23 +106,54 @@ class TeamDetailPlayersView(AbstractTeamDetailView):
         player_model_cls = get_player_model_cls(self.sport)
         return player_model_cls.objects.active().filter(team=team).select_related('user')
 
+    def get_players_fragment(self, team):
+        """
+        The players table is the same for all users, it's cached as a fragment so the players are only fetched on a
+        miss.
+
+        :return: Dict containing the rendered `players_table` and `has_players`
+        """
+        def render():
+            players = self._get_players(team)
+            has_players = players.exists()
+            # The default columns to show if there are no players.
+            columns = ['Jersey Number', 'Name']
+            if has_players:
+                # Player subclasses can define different fields, so we need to dynamically generate the columns.
+                player = players.first()
+                columns = list(player.table_fields.keys())
+            context = {'columns': columns, 'players': players, 'has_players': has_players}
+            return {
+                'players_table': render_to_string('teams/_players_table.html', context),
+                'has_players': has_players,
+            }
+
+        return get_or_render_fragment('team_players', [(TEAM, team.pk)], render)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         team = self.get_object()
-        players = self._get_players(team)
-        has_players = players.exists()
-        # The default columns to show if there are no players.
-        columns = ['Jersey Number', 'Name']
-        if has_players:
-            # Player subclasses can define different fields, so we need to dynamically generate the columns.
-            player = players.first()
-            columns = list(player.table_fields.keys())
+        context.update(self.get_players_fragment(team))
         context.update({
-            'columns': columns,
-            'players': players,
-            'has_players': has_players,
             'header_text': 'All Players',
             'sport': self.sport,
             'active_tab': 'players'
         })
         return context
+
+
+class TeamDetailLeadersView(AbstractTeamDetailView):
+    template_name = 'teams/team_detail_leaders.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        team = self.get_object()
+        season = context.get('season')
+        stats_model_cls = get_player_season_stats_model_cls(self.sport)
+        context.update({
+            'active_tab': 'leaders',
+            'top_scorers': stats_model_cls.objects.get_leaders(season, stats_model_cls.POINTS, team=team),
+            'penalty_leaders': stats_model_cls.objects.get_leaders(season, stats_model_cls.PENALTY_MINUTES, team=team),
+            'current_season_page_url': reverse('teams:leaders', kwargs={'team_pk': team.pk}),
+        })
+        return context
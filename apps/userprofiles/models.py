@@ -2,8 +2,11 @@ import re
 
 from django.conf import settings
 from django.conf.global_settings import LANGUAGES
+from django.contrib.auth.signals import user_logged_in
 from django.core.validators import MaxValueValidator, MinValueValidator, RegexValidator
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 
 from common.models import TimestampedModel
@@ -58,3 +61,33 @@ class UserProfile(TimestampedModel):
 
     def __str__(self):
         return self.user.email
+
+
+@receiver(post_save, sender=UserProfile)
+def cache_user_preferences_on_save(sender, instance, **kwargs):
+    """
+    Store the updated preferences right away, so the next request doesn't need to load them. The preferences loaded for
+    the current request (if any) are replaced as well.
+    """
+    from userprofiles.preferences import UserPreferences, cache_user_preferences
+    preferences = UserPreferences.from_userprofile(instance)
+    cache_user_preferences(instance.user_id, preferences)
+    if 'user' in instance._state.fields_cache:
+        instance.user.user_preferences = preferences
+
+
+@receiver(post_delete, sender=UserProfile)
+def invalidate_user_preferences_on_delete(sender, instance, **kwargs):
+    from userprofiles.preferences import invalidate_user_preferences
+    invalidate_user_preferences(instance.user_id)
+
+
+@receiver(user_logged_in)
+def cache_user_preferences_on_login(sender, request, user, **kwargs):
+    """
+    Cache the user's preferences at login (if the cross request cache is enabled), they're served from the cache for the
+    rest of the user's session.
+    """
+    from userprofiles.preferences import is_user_preferences_cache_enabled, load_user_preferences
+    if is_user_preferences_cache_enabled():
+        load_user_preferences(user)
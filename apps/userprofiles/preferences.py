@@ -0,0 +1,114 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from userprofiles.models import UserProfile
+
+
+USER_PREFERENCES_CACHE_KEY = 'userprofiles:preferences:{user_id}'
+
+
+class UserPreferences(object):
+    """
+    Snapshot of the profile values middleware needs on every request: whether the user has completed their registration
+    (has a profile), their timezone and their language.
+    """
+
+    def __init__(self, is_registration_complete=False, timezone=None, language=None):
+        self.is_registration_complete = is_registration_complete
+        self.timezone = timezone
+        self.language = language
+
+    @classmethod
+    def load(cls, user):
+        """
+        Build the preferences from the db in a single query.
+
+        :param user: User to load the preferences for
+        :return: UserPreferences for the user
+        """
+        values = UserProfile.objects.filter(user=user).values_list('timezone', 'language').first()
+        if values is None:
+            return cls()
+        timezone, language = values
+        return cls(is_registration_complete=True, timezone=timezone, language=language)
+
+    @classmethod
+    def from_userprofile(cls, userprofile):
+        return cls(is_registration_complete=True, timezone=userprofile.timezone, language=userprofile.language)
+
+    def to_cache_value(self):
+        return self.is_registration_complete, self.timezone, self.language
+
+    @classmethod
+    def from_cache_value(cls, value):
+        is_registration_complete, timezone, language = value
+        return cls(is_registration_complete=is_registration_complete, timezone=timezone, language=language)
+
+    def __eq__(self, other):
+        return isinstance(other, UserPreferences) and self.to_cache_value() == other.to_cache_value()
+
+    def __repr__(self):
+        return '<UserPreferences is_registration_complete={} timezone={} language={}>'.format(*self.to_cache_value())
+
+
+def get_user_preferences_cache_key(user_id):
+    return USER_PREFERENCES_CACHE_KEY.format(user_id=user_id)
+
+
+def is_user_preferences_cache_enabled():
+    return bool(getattr(settings, 'USER_PREFERENCES_CACHE_TIMEOUT', 0))
+
+
+def cache_user_preferences(user_id, preferences):
+    """
+    Store the user's preferences in the shared cache. A no-op if the cross request cache has been disabled.
+    """
+    if is_user_preferences_cache_enabled():
+        cache.set(
+            get_user_preferences_cache_key(user_id),
+            preferences.to_cache_value(),
+            settings.USER_PREFERENCES_CACHE_TIMEOUT
+        )
+
+
+def load_user_preferences(user):
+    """
+    Load the preferences for the user from the shared cache (if enabled), falling back to the db.
+
+    :param user: User to load the preferences for
+    :return: UserPreferences for the user
+    """
+    if not is_user_preferences_cache_enabled():
+        return UserPreferences.load(user)
+    value = cache.get(get_user_preferences_cache_key(user.pk))
+    if value is not None:
+        return UserPreferences.from_cache_value(value)
+    preferences = UserPreferences.load(user)
+    cache_user_preferences(user.pk, preferences)
+    return preferences
+
+
+def get_user_preferences(user):
+    """
+    Fetch the preferences for the user. They're stored on the user instance, so all middleware handling a request (the
+    request's user instance is shared) reuses them.
+
+    :param user: User to get the preferences for
+    :return: UserPreferences for the user
+    """
+    preferences = getattr(user, 'user_preferences', None)
+    if preferences is None:
+        preferences = load_user_preferences(user)
+        user.user_preferences = preferences
+    return preferences
+
+
+def invalidate_user_preferences(user_id):
+    """
+    Remove the cached preferences for the user so the next request reloads them. A no-op if the cross request cache has
+    been disabled.
+
+    :param user_id: Id of the user whose profile has changed
+    """
+    if is_user_preferences_cache_enabled():
+        cache.delete(get_user_preferences_cache_key(user_id))
@@ -0,0 +1,76 @@
+from django.contrib.auth.signals import user_logged_in
+from django.core.cache import cache
+from django.test import RequestFactory, override_settings
+
+from ayrabo.utils.testing import BaseTestCase
+from userprofiles.preferences import (
+    UserPreferences,
+    get_user_preferences,
+    get_user_preferences_cache_key,
+    invalidate_user_preferences,
+)
+from users.models import User
+from users.tests import UserFactory
+
+
+class UserPreferencesTests(BaseTestCase):
+    def setUp(self):
+        # Fetched again, creating the profile stores the preferences on the factory's user instance
+        self.user = User.objects.get(pk=UserFactory(userprofile__timezone='US/Pacific', userprofile__language='fr').pk)
+        self.user_without_profile = UserFactory(userprofile=None)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_load(self):
+        with self.assertNumQueries(1):
+            preferences = UserPreferences.load(self.user)
+        expected = UserPreferences(is_registration_complete=True, timezone='US/Pacific', language='fr')
+        self.assertEqual(preferences, expected)
+
+    def test_load_without_profile(self):
+        self.assertEqual(UserPreferences.load(self.user_without_profile), UserPreferences())
+
+    def test_get_user_preferences_memoized(self):
+        with self.assertNumQueries(1):
+            preferences = get_user_preferences(self.user)
+            self.assertIs(get_user_preferences(self.user), preferences)
+
+    def test_cache_disabled(self):
+        get_user_preferences(self.user)
+        self.assertIsNone(cache.get(get_user_preferences_cache_key(self.user.id)))
+
+    @override_settings(USER_PREFERENCES_CACHE_TIMEOUT=60)
+    def test_cache_enabled(self):
+        preferences = get_user_preferences(self.user)
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_preferences(user), preferences)
+
+    @override_settings(USER_PREFERENCES_CACHE_TIMEOUT=60)
+    def test_cached_at_login(self):
+        user_logged_in.send(sender=User, request=RequestFactory().get('/'), user=self.user)
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_preferences(user).language, 'fr')
+
+    @override_settings(USER_PREFERENCES_CACHE_TIMEOUT=60)
+    def test_cache_updated_on_profile_changes(self):
+        get_user_preferences(self.user)
+        userprofile = self.user.userprofile
+        userprofile.timezone = 'US/Eastern'
+        userprofile.save()
+        self.assertEqual(get_user_preferences(self.user).timezone, 'US/Eastern')
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_preferences(user).timezone, 'US/Eastern')
+
+        userprofile.delete()
+        self.assertIsNone(cache.get(get_user_preferences_cache_key(self.user.id)))
+        self.assertFalse(get_user_preferences(User.objects.get(pk=self.user.pk)).is_registration_complete)
+
+    @override_settings(USER_PREFERENCES_CACHE_TIMEOUT=60)
+    def test_invalidate_user_preferences(self):
+        get_user_preferences(self.user)
+        invalidate_user_preferences(self.user.id)
+        self.assertIsNone(cache.get(get_user_preferences_cache_key(self.user.id)))
@@ -1,55 +1,44 @@
-from django.contrib.contenttypes.models import ContentType
-from django.utils.functional import cached_property
-
-from managers.models import Manager
-from organizations.models import Organization
-from scorekeepers.models import Scorekeeper
-from users.models import Permission
+from users.roles import get_role_snapshot
 
 
 class BaseAuthorizer(object):
     def __init__(self, user):
         self.user = user
 
-    @cached_property
+    @property
+    def role_snapshot(self):
+        """
+        The user's role snapshot is computed once per request and shared by all authorizers, so constructing multiple
+        authorizers for the same user doesn't result in extra db queries.
+        """
+        return get_role_snapshot(self.user)
+
+    @property
     def manager_team_ids(self):
         """
         Compute team ids the user is an active manager for.
 
-        As of now It is way less queries to check if an id is in a list of ids over calling queryset methods and
-        triggering db queries.
-
-        :return: QuerySet of team ids
+        :return: frozenset of team ids
         """
-        return Manager.objects.active().filter(user=self.user).values_list('team_id', flat=True)
+        return self.role_snapshot.manager_team_ids
 
-    @cached_property
+    @property
     def org_admin_org_ids(self):
         """
         Compute org ids the user is an org admin for.
 
-        As of now It is way less queries to check if an id is in a list of ids over calling queryset methods and
-        triggering db queries.
-
-        :return: QuerySet of organization ids
+        :return: frozenset of organization ids
         """
-        return Permission.objects.filter(
-            user=self.user,
-            name=Permission.ADMIN,
-            content_type=ContentType.objects.get_for_model(model=Organization)
-        ).values_list('object_id', flat=True)
+        return self.role_snapshot.org_admin_org_ids
 
-    @cached_property
+    @property
     def scorekeeper_sport_ids(self):
         """
         Compute sport ids the user is an active scorekeeper for.
 
-        As of now It is way less queries to check if an id is in a list of ids over calling queryset methods and
-        triggering db queries.
-
-        :return: QuerySet of sport ids
+        :return: frozenset of sport ids
         """
-        return Scorekeeper.objects.active().filter(user=self.user).values_list('sport_id', flat=True)
+        return self.role_snapshot.scorekeeper_sport_ids
 
     def _is_manager_for_team(self, team):
         return team.id in self.manager_team_ids
@@ -109,6 +98,47 @@ class GameAuthorizer(BaseAuthorizer):
             self.can_user_update_game_rosters(game.home_team, game.away_team, sport, *args, **kwargs)
         )
 
+    def can_user_update_any_game(self, sport):
+        """
+        Determine if the user may be able to update any of the sport's games or game rosters. Game lists look the same
+        for all users that can't, so they can be shared (see `games.utils.get_game_list_fragment`).
+        """
+        return bool(self.manager_team_ids or self.org_admin_org_ids) or self._is_scorekeeper_for_sport(sport=sport)
+
+    def get_game_authorizations(self, games, sport):
+        """
+        Batch version of `can_user_update` and `can_user_update_game_rosters` for a list of games. The checks only use
+        team and organization ids, so the games' organizations don't need to be fetched.
+
+        :param games: List of games, the home and away teams should be select related
+        :param sport: Sport the games belong to
+        :return: Dict of game pk -> dict containing `can_user_update` and `can_user_update_game_rosters`
+        """
+        manager_team_ids = self.manager_team_ids
+        org_admin_org_ids = self.org_admin_org_ids
+        is_scorekeeper = sport.id in self.scorekeeper_sport_ids
+
+        team_org_ids = {}
+        for game in games:
+            team_org_ids[game.home_team_id] = game.home_team.organization_id
+            team_org_ids[game.away_team_id] = game.away_team.organization_id
+
+        def can_update_team(team_id):
+            return team_id in manager_team_ids or team_org_ids.get(team_id) in org_admin_org_ids
+
+        game_authorizations = {}
+        for game in games:
+            # The team a game was created for is nearly always the home or away team
+            if game.team_id is not None and game.team_id not in team_org_ids:
+                team_org_ids[game.team_id] = game.team.organization_id
+            game_authorizations[game.pk] = {
+                'can_user_update': game.team_id is not None and can_update_team(game.team_id),
+                'can_user_update_game_rosters': (
+                    is_scorekeeper or can_update_team(game.home_team_id) or can_update_team(game.away_team_id)
+                ),
+            }
+        return game_authorizations
+
 
 class SeasonRosterAuthorizer(BaseAuthorizer):
     def can_user_create(self, team, *args, **kwargs):
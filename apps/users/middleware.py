@@ -0,0 +1,17 @@
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+
+from users.roles import load_role_snapshot
+
+
+class RoleSnapshotMiddleware(MiddlewareMixin):
+    """
+    Attaches a lazily evaluated role snapshot to `request.user`. The snapshot is only computed the first time an
+    authorizer (or anything else) needs it, and is then reused for the rest of the request.
+    """
+
+    def process_request(self, request):
+        user = request.user
+        if user.is_authenticated:
+            user.role_snapshot = SimpleLazyObject(lambda: load_role_snapshot(user))
+        return None
@@ -1,9 +1,9 @@
-from itertools import groupby
-
 from django.contrib.auth.models import AbstractUser
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from coaches.models import Coach
 from common.models import TimestampedModel
@@ -13,12 +13,16 @@ from referees.models import Referee
 from scorekeepers.models import Scorekeeper
 from sports.models import SportRegistration
 from users.managers import PermissionManager
+from users.permission_index import bump_permission_index_version, get_permission_index
+from users.roles import invalidate_role_snapshot
 
 
 class User(AbstractUser):
     def has_object_permission(self, name, obj):
-        content_type = ContentType.objects.get_for_model(obj)
-        return self.permissions.filter(name=name, content_type=content_type, object_id=obj.id).exists()
+        """
+        Answered by the user's permission index, see `users.permission_index`.
+        """
+        return get_permission_index(self).has_object_permission(name, obj)
 
     def get_sport_registrations(self, sports=None):
         """
@@ -55,18 +59,17 @@ class User(AbstractUser):
             }
         }
 
+        The role objects are lists, they're batch loaded for all sports in a fixed # of queries, see
+        `users.registrations.load_sport_registration_data`.
+
         :param sports: list of sports that should only be included
         :return: Dict where keys are sports the user is registered for and values are additional meta data regarding
             the user's registration for that sport.
         """
-        result = {}
-        for sport, registrations in groupby(self.get_sport_registrations(sports), key=lambda obj: obj.sport):
-            registrations_as_list = list(registrations)
-            result[sport] = {
-                'registrations': registrations_as_list,
-                'roles': self.get_roles(sport, registrations_as_list)
-            }
-        return result
+        # Prevents circular import error
+        from users.registrations import load_sport_registration_data
+
+        return load_sport_registration_data(self, sports)
 
     def get_roles(self, sport, sport_registrations):
         """
@@ -125,15 +128,13 @@ class User(AbstractUser):
                                                                                                'sport')
 
     def get_coaches(self, sport):
-        return Coach.objects.active().filter(user=self, team__division__league__sport=sport).select_related(
-            'team__division__league__sport')
+        return Coach.objects.active().filter(user=self, sport=sport).select_related('team__division__league__sport')
 
     def get_referees(self, sport):
         return Referee.objects.active().filter(user=self, league__sport=sport).select_related('league__sport')
 
     def get_managers(self, sport):
-        return Manager.objects.active().filter(user=self, team__division__league__sport=sport).select_related(
-            'team__division__league__sport')
+        return Manager.objects.active().filter(user=self, sport=sport).select_related('team__division__league__sport')
 
     def get_scorekeepers(self, sport):
         return Scorekeeper.objects.active().filter(user=self, sport=sport).select_related('sport')
@@ -163,3 +164,27 @@ class Permission(TimestampedModel):
 
     def __str__(self):
         return '<{}> {} {}'.format(self.user.email, self.content_type.name, self.name)
+
+
+@receiver(post_save, sender=Manager)
+@receiver(post_delete, sender=Manager)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+@receiver(post_save, sender=Scorekeeper)
+@receiver(post_delete, sender=Scorekeeper)
+def invalidate_role_snapshot_on_change(sender, instance, **kwargs):
+    """
+    Roles (managers, org admin permissions, scorekeepers) feed into the user's role snapshot, so any change means the
+    cached snapshot is stale.
+    """
+    invalidate_role_snapshot(instance.user_id)
+
+
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def bump_permission_index_version_on_change(sender, instance, **kwargs):
+    bump_permission_index_version(instance.user_id)
+    # The index is memoized on user instances, drop it from the permission's user so it is reloaded
+    user = instance._state.fields_cache.get('user')
+    if user is not None:
+        user.__dict__.pop('permission_index', None)
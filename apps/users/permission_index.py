@@ -0,0 +1,135 @@
+import uuid
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+
+
+PERMISSION_INDEX_VERSION_CACHE_KEY = 'users:permission_index:version:{user_id}'
+PERMISSION_INDEX_CACHE_KEY = 'users:permission_index:{user_id}:{version}'
+
+
+class PermissionIndex(object):
+    """
+    Immutable index of a user's object permissions (`users.Permission`), loaded in a single query. Checking a permission
+    or fetching the ids of the objects of a type the user has a permission for doesn't hit the db.
+    """
+
+    def __init__(self, permissions=None):
+        """
+        :param permissions: Iterable of (name, content type id, object id) tuples
+        """
+        object_ids = {}
+        for name, content_type_id, object_id in permissions or []:
+            object_ids.setdefault((name, content_type_id), set()).add(object_id)
+        # (name, content type id) -> object ids
+        self._object_ids = {key: frozenset(ids) for key, ids in object_ids.items()}
+
+    @classmethod
+    def load(cls, user):
+        """
+        :param user: User to load the permissions for
+        :return: PermissionIndex for the user
+        """
+        # Prevents circular import error
+        from users.models import Permission
+
+        if not user.is_authenticated:
+            return cls()
+        return cls(Permission.objects.filter(user=user).values_list('name', 'content_type_id', 'object_id'))
+
+    def has_object_permission(self, name, obj):
+        return obj.pk in self.get_object_ids(name, obj)
+
+    def get_object_ids(self, name, model):
+        """
+        :param name: Name of the permission, i.e. `Permission.ADMIN`
+        :param model: Model class (or instance) of the objects
+        :return: frozenset of ids of the objects the user has the permission for
+        """
+        content_type = ContentType.objects.get_for_model(model)
+        return self._object_ids.get((name, content_type.id), frozenset())
+
+    def to_cache_value(self):
+        return sorted(
+            (name, content_type_id, object_id)
+            for (name, content_type_id), object_ids in self._object_ids.items()
+            for object_id in object_ids
+        )
+
+    @classmethod
+    def from_cache_value(cls, value):
+        return cls(value)
+
+    def __eq__(self, other):
+        return isinstance(other, PermissionIndex) and self._object_ids == other._object_ids
+
+    def __repr__(self):
+        return '<PermissionIndex {}>'.format(self.to_cache_value())
+
+
+def is_permission_index_cache_enabled():
+    return bool(getattr(settings, 'PERMISSION_INDEX_CACHE_TIMEOUT', 0))
+
+
+def get_permission_index_version_cache_key(user_id):
+    return PERMISSION_INDEX_VERSION_CACHE_KEY.format(user_id=user_id)
+
+
+def get_permission_index_cache_key(user_id):
+    """
+    :return: Cache key for the current version of the user's permission index
+    """
+    version_cache_key = get_permission_index_version_cache_key(user_id)
+    version = cache.get(version_cache_key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(version_cache_key, version, None)
+    return PERMISSION_INDEX_CACHE_KEY.format(user_id=user_id, version=version)
+
+
+def load_permission_index(user):
+    """
+    Load the permission index for the user from the shared cache (if enabled), falling back to the db.
+
+    :param user: User to load the permission index for
+    :return: PermissionIndex for the user
+    """
+    if not user.is_authenticated or not is_permission_index_cache_enabled():
+        return PermissionIndex.load(user)
+    cache_key = get_permission_index_cache_key(user.pk)
+    value = cache.get(cache_key)
+    if value is not None:
+        return PermissionIndex.from_cache_value(value)
+    index = PermissionIndex.load(user)
+    cache.set(cache_key, index.to_cache_value(), settings.PERMISSION_INDEX_CACHE_TIMEOUT)
+    return index
+
+
+def get_permission_index(user):
+    """
+    Fetch the permission index for the user. The index is stored on the user instance, so permission checks made
+    while handling a request (the request's user instance is shared) reuse it.
+
+    :param user: User to get the permission index for
+    :return: PermissionIndex for the user
+    """
+    index = getattr(user, 'permission_index', None)
+    if index is None:
+        index = load_permission_index(user)
+        user.permission_index = index
+    return index
+
+
+def bump_permission_index_version(user_id):
+    """
+    Give the user's permission index a new version, the cached index is stale afterwards. A no-op if the cross request
+    cache has been disabled.
+
+    NOTE: `QuerySet.update` and `bulk_create` don't send signals, code bulk changing permissions needs to call this
+    function manually.
+
+    :param user_id: Id of the user whose permissions have changed
+    """
+    if is_permission_index_cache_enabled():
+        cache.set(get_permission_index_version_cache_key(user_id), uuid.uuid4().hex, None)
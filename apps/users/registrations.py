@@ -0,0 +1,138 @@
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+
+from coaches.models import Coach
+from managers.models import Manager
+from organizations.models import Organization
+from referees.models import Referee
+from scorekeepers.models import Scorekeeper
+from sports.models import SportRegistration
+
+
+ORGANIZATION_ROLE = 'organization'
+
+
+def _group_by_sport(objects, get_sport_id):
+    result = defaultdict(list)
+    for obj in objects:
+        result[get_sport_id(obj)].append(obj)
+    return result
+
+
+def _load_players(user, sports):
+    """
+    :return: Dict of sport id -> active players for the user, one query per player model
+    """
+    # Prevents circular import error
+    from players.mappings import SPORT_PLAYER_MODEL_MAPPINGS
+
+    sport_ids_by_model_cls = defaultdict(list)
+    for sport in sports:
+        player_model_cls = SPORT_PLAYER_MODEL_MAPPINGS.get(sport.name)
+        if player_model_cls is not None:
+            sport_ids_by_model_cls[player_model_cls].append(sport.id)
+
+    result = {}
+    for player_model_cls, sport_ids in sport_ids_by_model_cls.items():
+        players = player_model_cls.objects.active().filter(user=user, sport_id__in=sport_ids).select_related(
+            'team__division', 'sport')
+        result.update(_group_by_sport(players, lambda obj: obj.sport_id))
+    return result
+
+
+def _load_coaches(user, sports):
+    coaches = Coach.objects.active().filter(user=user, sport__in=sports).select_related('team__division__league__sport')
+    return _group_by_sport(coaches, lambda obj: obj.sport_id)
+
+
+def _load_referees(user, sports):
+    referees = Referee.objects.active().filter(user=user, league__sport__in=sports).select_related('league__sport')
+    return _group_by_sport(referees, lambda obj: obj.league.sport_id)
+
+
+def _load_managers(user, sports):
+    managers = Manager.objects.active().filter(user=user, sport__in=sports).select_related(
+        'team__division__league__sport')
+    return _group_by_sport(managers, lambda obj: obj.sport_id)
+
+
+def _load_scorekeepers(user, sports):
+    scorekeepers = Scorekeeper.objects.active().filter(user=user, sport__in=sports).select_related('sport')
+    return _group_by_sport(scorekeepers, lambda obj: obj.sport_id)
+
+
+ROLE_OBJECT_LOADERS = {
+    SportRegistration.PLAYER: _load_players,
+    SportRegistration.COACH: _load_coaches,
+    SportRegistration.REFEREE: _load_referees,
+    SportRegistration.MANAGER: _load_managers,
+    SportRegistration.SCOREKEEPER: _load_scorekeepers,
+}
+
+
+def _load_organizations(user, sports):
+    """
+    :return: Dict of sport id -> organizations the user is an admin of. The permissions' organizations (and their teams,
+        displayed by the sport dashboard) are prefetched instead of fetched one generic foreign key at a time.
+    """
+    # Prevents circular import error
+    from users.models import Permission
+
+    sport_ids = {sport.id for sport in sports}
+    permissions = Permission.objects.filter(
+        user=user,
+        name=Permission.ADMIN,
+        content_type=ContentType.objects.get_for_model(Organization)
+    ).prefetch_related('content_object__teams')
+    organizations = [
+        perm.content_object for perm in permissions
+        if perm.content_object is not None and perm.content_object.sport_id in sport_ids
+    ]
+    return _group_by_sport(organizations, lambda obj: obj.sport_id)
+
+
+def load_sport_registration_data(user, sports=None):
+    """
+    Batch loads the data `User.sport_registration_data_by_sport` computes. Role objects are fetched once for all sports
+    (one query per role), so the # of queries doesn't depend on the # of sports or roles the user is registered for.
+
+    :param user: User to load the sport registrations and role objects for
+    :param sports: list of sports that should only be included
+    :return: Dict where keys are sports the user is registered for and values are dicts with the user's `registrations`
+        and `roles` (role -> list of objects for that role) for the sport
+    """
+    registrations_by_sport = {}
+    for registration in user.get_sport_registrations(sports):
+        registrations_by_sport.setdefault(registration.sport, []).append(registration)
+    if not registrations_by_sport:
+        return {}
+
+    registered_sports = list(registrations_by_sport)
+    registered_roles = {
+        registration.role for registrations in registrations_by_sport.values() for registration in registrations
+    }
+    objects_by_role = {
+        role: loader(user, registered_sports)
+        for role, loader in ROLE_OBJECT_LOADERS.items() if role in registered_roles
+    }
+    organizations_by_sport = _load_organizations(user, registered_sports)
+
+    result = {}
+    for sport, registrations in registrations_by_sport.items():
+        roles = [registration.role for registration in registrations]
+        if organizations_by_sport.get(sport.id):
+            roles.append(ORGANIZATION_ROLE)
+        role_objects = {}
+        for role in sorted(roles):
+            if role == ORGANIZATION_ROLE:
+                role_objects[role] = organizations_by_sport[sport.id]
+            elif role in objects_by_role:
+                role_objects[role] = objects_by_role[role].get(sport.id, [])
+            else:
+                role_objects[role] = None
+        result[sport] = {
+            'registrations': registrations,
+            'roles': role_objects,
+        }
+    return result
@@ -0,0 +1,124 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from managers.models import Manager
+from organizations.models import Organization
+from scorekeepers.models import Scorekeeper
+from users.permission_index import get_permission_index
+
+
+ROLE_SNAPSHOT_CACHE_KEY = 'users:role_snapshot:{user_id}'
+
+
+class RoleSnapshot(object):
+    """
+    Immutable snapshot of the ids a user's roles grant access to. Authorizers, api permission classes, etc. should
+    check membership against these sets instead of querying the manager, permission and scorekeeper tables on demand.
+    """
+
+    def __init__(self, manager_team_ids=None, org_admin_org_ids=None, scorekeeper_sport_ids=None):
+        self.manager_team_ids = frozenset(manager_team_ids or [])
+        self.org_admin_org_ids = frozenset(org_admin_org_ids or [])
+        self.scorekeeper_sport_ids = frozenset(scorekeeper_sport_ids or [])
+
+    @classmethod
+    def load(cls, user):
+        """
+        Build the snapshot from the db, one query per role table. Org admins come from the user's permission index.
+
+        :param user: User to compute the snapshot for
+        :return: RoleSnapshot for the user
+        """
+        # Prevents circular import error
+        from users.models import Permission
+
+        if not user.is_authenticated:
+            return cls()
+
+        manager_team_ids = Manager.objects.active().filter(user=user).values_list('team_id', flat=True)
+        org_admin_org_ids = get_permission_index(user).get_object_ids(Permission.ADMIN, Organization)
+        scorekeeper_sport_ids = Scorekeeper.objects.active().filter(user=user).values_list('sport_id', flat=True)
+        return cls(
+            manager_team_ids=list(manager_team_ids),
+            org_admin_org_ids=list(org_admin_org_ids),
+            scorekeeper_sport_ids=list(scorekeeper_sport_ids),
+        )
+
+    def to_cache_value(self):
+        return (
+            sorted(self.manager_team_ids),
+            sorted(self.org_admin_org_ids),
+            sorted(self.scorekeeper_sport_ids),
+        )
+
+    @classmethod
+    def from_cache_value(cls, value):
+        manager_team_ids, org_admin_org_ids, scorekeeper_sport_ids = value
+        return cls(
+            manager_team_ids=manager_team_ids,
+            org_admin_org_ids=org_admin_org_ids,
+            scorekeeper_sport_ids=scorekeeper_sport_ids,
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, RoleSnapshot) and self.to_cache_value() == other.to_cache_value()
+
+    def __repr__(self):
+        return '<RoleSnapshot managers={} org_admins={} scorekeepers={}>'.format(*self.to_cache_value())
+
+
+def get_role_snapshot_cache_key(user_id):
+    return ROLE_SNAPSHOT_CACHE_KEY.format(user_id=user_id)
+
+
+def is_role_snapshot_cache_enabled():
+    return bool(getattr(settings, 'ROLE_SNAPSHOT_CACHE_TIMEOUT', 0))
+
+
+def load_role_snapshot(user):
+    """
+    Load the role snapshot for the user from the shared cache (if enabled), falling back to the db.
+
+    :param user: User to load the role snapshot for
+    :return: RoleSnapshot for the user
+    """
+    if not user.is_authenticated or not is_role_snapshot_cache_enabled():
+        return RoleSnapshot.load(user)
+    cache_key = get_role_snapshot_cache_key(user.pk)
+    value = cache.get(cache_key)
+    if value is not None:
+        return RoleSnapshot.from_cache_value(value)
+    snapshot = RoleSnapshot.load(user)
+    cache.set(cache_key, snapshot.to_cache_value(), settings.ROLE_SNAPSHOT_CACHE_TIMEOUT)
+    return snapshot
+
+
+def get_role_snapshot(user):
+    """
+    Fetch the role snapshot for the user. The snapshot is stored on the user instance, so every authorizer created
+    during a request (the request's user instance is shared) reuses it. `RoleSnapshotMiddleware` attaches a lazy
+    snapshot to `request.user`, this function handles users that didn't go through the middleware (i.e. drf token
+    authentication, management commands, tests).
+
+    :param user: User to get the role snapshot for
+    :return: RoleSnapshot for the user
+    """
+    snapshot = getattr(user, 'role_snapshot', None)
+    if snapshot is None:
+        snapshot = load_role_snapshot(user)
+        user.role_snapshot = snapshot
+    return snapshot
+
+
+def invalidate_role_snapshot(user_id):
+    """
+    Remove the cached role snapshot for the user so the next request rebuilds it. A no-op if the cross request cache
+    has been disabled.
+
+    NOTE: `QuerySet.update` doesn't send signals, so code bulk updating managers, permissions or scorekeepers needs to
+    call this function manually.
+
+    :param user_id: Id of the user whose roles have changed
+    """
+    if is_role_snapshot_cache_enabled():
+        cache.delete(get_role_snapshot_cache_key(user_id))
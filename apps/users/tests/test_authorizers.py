@@ -1,5 +1,9 @@
 from ayrabo.utils.testing import BaseTestCase
+from common.models import GenericChoice
+from common.tests import GenericChoiceFactory
 from divisions.tests import DivisionFactory
+from games.models import HockeyGame
+from games.tests import HockeyGameFactory
 from leagues.tests import LeagueFactory
 from managers.tests import ManagerFactory
 from organizations.tests import OrganizationFactory
@@ -72,6 +76,52 @@ class GameAuthorizerTests(BaseTestCase):
             self.home_team, self.away_team, self.sport)
         )
 
+    def test_get_game_authorizations(self):
+        other_team = TeamFactory(division=self.division)
+        choices = {
+            'type': GenericChoiceFactory(content_object=self.sport, short_value='exhibition', long_value='Exhibition',
+                                         type=GenericChoice.GAME_TYPE),
+            'point_value': GenericChoiceFactory(content_object=self.sport, short_value='2', long_value='2',
+                                                type=GenericChoice.GAME_POINT_VALUE),
+        }
+        game1 = HockeyGameFactory(home_team=self.home_team, away_team=self.away_team, team=self.home_team, **choices)
+        game2 = HockeyGameFactory(home_team=other_team, away_team=self.away_team, team=other_team, **choices)
+        # Created for a team that isn't playing in the game
+        game3 = HockeyGameFactory(home_team=other_team, away_team=self.away_team, team=self.home_team, **choices)
+        games = list(HockeyGame.objects.select_related('home_team', 'away_team').order_by('pk'))
+
+        def get_game_authorizations(user):
+            return GameAuthorizer(user=user).get_game_authorizations(games, self.sport)
+
+        self.assertDictEqual(get_game_authorizations(self.user2), {
+            game1.pk: {'can_user_update': True, 'can_user_update_game_rosters': True},
+            game2.pk: {'can_user_update': False, 'can_user_update_game_rosters': False},
+            game3.pk: {'can_user_update': True, 'can_user_update_game_rosters': False},
+        })
+        self.assertDictEqual(get_game_authorizations(self.user3), {
+            game1.pk: {'can_user_update': False, 'can_user_update_game_rosters': True},
+            game2.pk: {'can_user_update': False, 'can_user_update_game_rosters': True},
+            game3.pk: {'can_user_update': False, 'can_user_update_game_rosters': True},
+        })
+        self.assertDictEqual(get_game_authorizations(self.user4), {
+            game1.pk: {'can_user_update': False, 'can_user_update_game_rosters': True},
+            game2.pk: {'can_user_update': False, 'can_user_update_game_rosters': True},
+            game3.pk: {'can_user_update': False, 'can_user_update_game_rosters': True},
+        })
+        # Matches the per game checks
+        authorizer = GameAuthorizer(user=self.user1)
+        for game in games:
+            self.assertDictEqual(authorizer.get_game_authorizations(games, self.sport)[game.pk], {
+                'can_user_update': authorizer.can_user_update(team=game.team),
+                'can_user_update_game_rosters': authorizer.can_user_update_game_rosters(
+                    game.home_team, game.away_team, self.sport
+                ),
+            })
+        # Only fetching the role snapshot
+        authorizer = GameAuthorizer(user=UserFactory())
+        with self.assertNumQueries(3):
+            authorizer.get_game_authorizations(games[:2], self.sport)
+
 
 class SeasonRosterAuthorizerTests(BaseTestCase):
     def setUp(self):
@@ -0,0 +1,28 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+
+from ayrabo.utils.testing import BaseTestCase
+from managers.tests import ManagerFactory
+from users.middleware import RoleSnapshotMiddleware
+from users.tests import UserFactory
+
+
+class RoleSnapshotMiddlewareTests(BaseTestCase):
+    def setUp(self):
+        self.middleware = RoleSnapshotMiddleware()
+        self.request = RequestFactory().get('/')
+        self.user = UserFactory()
+        self.manager = ManagerFactory(user=self.user)
+
+    def test_anonymous_user(self):
+        self.request.user = AnonymousUser()
+        self.assertIsNone(self.middleware.process_request(self.request))
+        self.assertFalse(hasattr(self.request.user, 'role_snapshot'))
+
+    def test_lazy_role_snapshot(self):
+        self.request.user = self.user
+        with self.assertNumQueries(0):
+            self.middleware.process_request(self.request)
+        with self.assertNumQueries(3):
+            self.assertEqual(self.request.user.role_snapshot.manager_team_ids, frozenset([self.manager.team_id]))
+            self.assertEqual(self.request.user.role_snapshot.scorekeeper_sport_ids, frozenset())
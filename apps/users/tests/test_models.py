@@ -107,6 +107,46 @@ class UserModelTests(BaseTestCase):
         self.assertListEqual(ice_hockey_data.get('registrations'), [sr1])
         self.assertListEqual(list(ice_hockey_data.get('roles').get('coach')), [])
 
+    def test_sport_registration_data_by_sport_role_objects(self):
+        baseball_team = TeamFactory(division__league__sport=self.baseball)
+        baseball_coach = CoachFactory(user=self.user, team=baseball_team)
+        baseball_organization = OrganizationFactory(sport=self.baseball)
+        for role, _ in SportRegistration.ROLE_CHOICES:
+            SportRegistrationFactory(user=self.user, sport=self.ice_hockey, role=role)
+        SportRegistrationFactory(user=self.user, sport=self.baseball, role=SportRegistration.COACH)
+        PermissionFactory(user=self.user, name=Permission.ADMIN, content_object=self.organization)
+        PermissionFactory(user=self.user, name=Permission.ADMIN, content_object=baseball_organization)
+        # Permission for another type of object (should be excluded)
+        PermissionFactory(user=self.user, name=Permission.ADMIN, content_object=self.team)
+
+        result = self.user.sport_registration_data_by_sport()
+        ice_hockey_roles = result.get(self.ice_hockey).get('roles')
+        baseball_roles = result.get(self.baseball).get('roles')
+
+        roles = [role for role, _ in SportRegistration.ROLE_CHOICES] + ['organization']
+        self.assertListEqual(list(ice_hockey_roles.keys()), sorted(roles))
+        self.assertListEqual(ice_hockey_roles.get('coach'), [self.coach])
+        self.assertListEqual(ice_hockey_roles.get('manager'), [self.manager])
+        self.assertListEqual(ice_hockey_roles.get('player'), [self.player])
+        self.assertListEqual(ice_hockey_roles.get('referee'), [self.referee])
+        self.assertListEqual(ice_hockey_roles.get('scorekeeper'), [self.scorekeeper])
+        self.assertListEqual(ice_hockey_roles.get('organization'), [self.organization])
+        self.assertDictEqual(baseball_roles, {'coach': [baseball_coach], 'organization': [baseball_organization]})
+
+    def test_sport_registration_data_by_sport_num_queries(self):
+        for role, _ in SportRegistration.ROLE_CHOICES:
+            SportRegistrationFactory(user=self.user, sport=self.ice_hockey, role=role)
+            SportRegistrationFactory(user=self.user, sport=self.baseball, role=role)
+        PermissionFactory(user=self.user, name=Permission.ADMIN, content_object=self.organization)
+        baseball_organization = OrganizationFactory(sport=self.baseball)
+        PermissionFactory(user=self.user, name=Permission.ADMIN, content_object=baseball_organization)
+        # Registrations, one query per role, hockey and baseball players, permissions, organizations and their teams
+        with self.assertNumQueries(10):
+            result = self.user.sport_registration_data_by_sport()
+            for data in result.values():
+                for organization in data['roles']['organization']:
+                    organization.teams.all().count()
+
     def test_get_roles(self):
         sr1 = SportRegistrationFactory(user=self.user, sport=self.ice_hockey, role=SportRegistration.COACH)
         sr2 = SportRegistrationFactory(user=self.user, sport=self.ice_hockey, role=SportRegistration.PLAYER)
@@ -0,0 +1,91 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import override_settings
+
+from ayrabo.utils.testing import BaseTestCase
+from organizations.models import Organization
+from organizations.tests import OrganizationFactory
+from teams.models import Team
+from teams.tests import TeamFactory
+from users.models import Permission, User
+from users.permission_index import (
+    PermissionIndex,
+    get_permission_index,
+    get_permission_index_cache_key,
+    get_permission_index_version_cache_key,
+)
+from users.tests import PermissionFactory, UserFactory
+
+
+class PermissionIndexTests(BaseTestCase):
+    def setUp(self):
+        self.organization = OrganizationFactory()
+        self.other_organization = OrganizationFactory()
+        self.team = TeamFactory()
+        self.user = User.objects.get(pk=UserFactory().pk)
+        PermissionFactory(user=self.user, name=Permission.ADMIN, content_object=self.organization)
+        PermissionFactory(user=self.user, name=Permission.ADMIN, content_object=self.team)
+        # Permission for another user (should be excluded)
+        PermissionFactory(name=Permission.ADMIN, content_object=self.other_organization)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_load(self):
+        with self.assertNumQueries(1):
+            index = PermissionIndex.load(self.user)
+        with self.assertNumQueries(0):
+            self.assertTrue(index.has_object_permission(Permission.ADMIN, self.organization))
+            self.assertTrue(index.has_object_permission(Permission.ADMIN, self.team))
+            self.assertFalse(index.has_object_permission(Permission.ADMIN, self.other_organization))
+            self.assertEqual(index.get_object_ids(Permission.ADMIN, Organization), frozenset([self.organization.id]))
+            self.assertEqual(index.get_object_ids(Permission.ADMIN, Team), frozenset([self.team.id]))
+
+    def test_load_anonymous_user(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(PermissionIndex.load(AnonymousUser()), PermissionIndex())
+
+    def test_cache_value(self):
+        index = PermissionIndex.load(self.user)
+        self.assertEqual(PermissionIndex.from_cache_value(index.to_cache_value()), index)
+
+    def test_user_has_object_permission_reuses_index(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(self.user.has_object_permission(Permission.ADMIN, self.organization))
+            self.assertTrue(self.user.has_object_permission(Permission.ADMIN, self.team))
+            self.assertFalse(self.user.has_object_permission(Permission.ADMIN, self.other_organization))
+
+    def test_memoized_index_dropped_on_change(self):
+        self.assertFalse(self.user.has_object_permission(Permission.ADMIN, self.other_organization))
+        permission = PermissionFactory(user=self.user, name=Permission.ADMIN, content_object=self.other_organization)
+        self.assertTrue(self.user.has_object_permission(Permission.ADMIN, self.other_organization))
+        permission.delete()
+        self.assertFalse(self.user.has_object_permission(Permission.ADMIN, self.other_organization))
+
+    def test_cache_disabled(self):
+        get_permission_index(self.user)
+        self.assertIsNone(cache.get(get_permission_index_version_cache_key(self.user.id)))
+
+    @override_settings(PERMISSION_INDEX_CACHE_TIMEOUT=60)
+    def test_cache_enabled(self):
+        index = get_permission_index(self.user)
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_permission_index(user), index)
+
+    @override_settings(PERMISSION_INDEX_CACHE_TIMEOUT=60)
+    def test_cache_version_bumped_on_change(self):
+        get_permission_index(self.user)
+        cache_key = get_permission_index_cache_key(self.user.id)
+        self.assertIsNotNone(cache.get(cache_key))
+
+        PermissionFactory(user=self.user, name=Permission.ADMIN, content_object=self.other_organization)
+        self.assertNotEqual(get_permission_index_cache_key(self.user.id), cache_key)
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(user.has_object_permission(Permission.ADMIN, self.other_organization))
+
+        cache_key = get_permission_index_cache_key(self.user.id)
+        Permission.objects.filter(user=self.user).delete()
+        self.assertNotEqual(get_permission_index_cache_key(self.user.id), cache_key)
+        user = User.objects.get(pk=self.user.pk)
+        self.assertFalse(user.has_object_permission(Permission.ADMIN, self.organization))
@@ -0,0 +1,79 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import override_settings
+
+from ayrabo.utils.testing import BaseTestCase
+from managers.tests import ManagerFactory
+from organizations.tests import OrganizationFactory
+from scorekeepers.tests import ScorekeeperFactory
+from sports.tests import SportFactory
+from teams.tests import TeamFactory
+from users.authorizers import GameAuthorizer, SeasonRosterAuthorizer
+from users.models import Permission, User
+from users.roles import RoleSnapshot, get_role_snapshot, get_role_snapshot_cache_key
+from users.tests import PermissionFactory, UserFactory
+
+
+class RoleSnapshotTests(BaseTestCase):
+    def setUp(self):
+        self.sport = SportFactory()
+        self.organization = OrganizationFactory(sport=self.sport)
+        self.team = TeamFactory(division__league__sport=self.sport, organization=self.organization)
+        self.user = UserFactory()
+        ManagerFactory(user=self.user, team=self.team)
+        ManagerFactory(user=self.user, is_active=False)
+        PermissionFactory(user=self.user, name=Permission.ADMIN, content_object=self.organization)
+        ScorekeeperFactory(user=self.user, sport=self.sport)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_load(self):
+        snapshot = RoleSnapshot.load(self.user)
+        self.assertEqual(snapshot.manager_team_ids, frozenset([self.team.id]))
+        self.assertEqual(snapshot.org_admin_org_ids, frozenset([self.organization.id]))
+        self.assertEqual(snapshot.scorekeeper_sport_ids, frozenset([self.sport.id]))
+
+    def test_load_anonymous_user(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(RoleSnapshot.load(AnonymousUser()), RoleSnapshot())
+
+    def test_get_role_snapshot_reused_by_authorizers(self):
+        with self.assertNumQueries(3):
+            game_authorizer = GameAuthorizer(user=self.user)
+            season_roster_authorizer = SeasonRosterAuthorizer(user=self.user)
+            self.assertTrue(game_authorizer.can_user_update_game_roster(team=self.team, sport=self.sport))
+            self.assertTrue(season_roster_authorizer.can_user_list(team=self.team, sport=self.sport, api=True))
+            self.assertTrue(GameAuthorizer(user=self.user).can_user_create(team=self.team))
+
+    def test_cache_disabled(self):
+        get_role_snapshot(self.user)
+        self.assertIsNone(cache.get(get_role_snapshot_cache_key(self.user.id)))
+
+    @override_settings(ROLE_SNAPSHOT_CACHE_TIMEOUT=60)
+    def test_cache_enabled(self):
+        snapshot = get_role_snapshot(self.user)
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_role_snapshot(user), snapshot)
+
+    @override_settings(ROLE_SNAPSHOT_CACHE_TIMEOUT=60)
+    def test_cache_invalidated_on_role_changes(self):
+        cache_key = get_role_snapshot_cache_key(self.user.id)
+        get_role_snapshot(self.user)
+        manager = ManagerFactory(user=self.user)
+        self.assertIsNone(cache.get(cache_key))
+
+        get_role_snapshot(User.objects.get(pk=self.user.pk))
+        self.assertIn(manager.team_id, cache.get(cache_key)[0])
+        manager.is_active = False
+        manager.save()
+        self.assertIsNone(cache.get(cache_key))
+
+        get_role_snapshot(User.objects.get(pk=self.user.pk))
+        Permission.objects.filter(user=self.user).delete()
+        self.assertIsNone(cache.get(cache_key))
+
+        get_role_snapshot(User.objects.get(pk=self.user.pk))
+        ScorekeeperFactory(user=self.user)
+        self.assertIsNone(cache.get(cache_key))
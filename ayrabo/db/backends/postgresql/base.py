@@ -0,0 +1,105 @@
+import functools
+
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.base import Database
+
+from ayrabo.db.pool import PoolTimeout, get_connection_metrics, get_connection_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    Postgres backend that adds pre-use health checks for reused connections and an optional connection pool per worker
+    process. It's configured with these (non standard) keys of the database's settings:
+
+    - CONN_HEALTH_CHECKS: Check a reused connection is still usable before its first query of each request, a broken
+      connection is replaced instead of failing the request.
+    - POOL_SIZE: Max # of connections shared by a worker process' threads, 0 disables the pool. When the pool is
+      enabled, CONN_MAX_AGE should be 0 so connections are returned to the pool at the end of each request.
+    - POOL_TIMEOUT: Seconds a thread waits for a pooled connection before an OperationalError is raised.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_checks_enabled = self.settings_dict.get('CONN_HEALTH_CHECKS', False)
+        self.health_check_done = False
+        self.metrics = get_connection_metrics(self.alias)
+
+    @property
+    def pool(self):
+        pool_size = self.settings_dict.get('POOL_SIZE', 0)
+        if not pool_size:
+            return None
+        return get_connection_pool(self.alias, pool_size, timeout=self.settings_dict.get('POOL_TIMEOUT'))
+
+    def _is_connection_usable(self, connection):
+        try:
+            connection.cursor().execute('SELECT 1')
+        except Database.Error:
+            return False
+        return True
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        connect = functools.partial(super().get_new_connection, conn_params)
+        if pool is None:
+            self.metrics.increment('checkouts')
+            self.metrics.increment('connects')
+            return connect()
+
+        while True:
+            try:
+                connection, is_new = pool.checkout(connect)
+            except PoolTimeout as e:
+                raise Database.OperationalError(str(e)) from e
+            if is_new or not self.health_checks_enabled or self._is_connection_usable(connection):
+                break
+            self.metrics.increment('reconnects')
+            pool.discard(connection)
+
+        if not is_new:
+            # Mirrors what the parent class sets for new connections
+            self.isolation_level = self.settings_dict['OPTIONS'].get('isolation_level', connection.isolation_level)
+        return connection
+
+    def connect(self):
+        super().connect()
+        # Connections are checked when they're checked out of the pool, or are brand new
+        self.health_check_done = True
+
+    def ensure_connection(self):
+        if (
+            self.connection is not None and
+            self.health_checks_enabled and
+            not self.health_check_done and
+            not self.in_atomic_block
+        ):
+            self.health_check_done = True
+            if not self.is_usable():
+                self.metrics.increment('reconnects')
+                # Makes sure a pooled connection is discarded instead of being returned to the pool
+                self.errors_occurred = True
+                self.close()
+        super().ensure_connection()
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        # Called at the start and end of each request, a reused connection is checked before its next query
+        self.health_check_done = False
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+
+        connection = self.connection
+        if self.errors_occurred or connection.closed:
+            pool.discard(connection)
+            return
+        try:
+            # Another thread may check the connection out next, it can't have an open transaction. This is a no-op
+            # when there isn't one.
+            connection.rollback()
+        except Database.Error:
+            pool.discard(connection)
+        else:
+            pool.checkin(connection)
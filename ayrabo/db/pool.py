@@ -0,0 +1,158 @@
+import collections
+import os
+import threading
+
+
+# Pools and metrics are per worker process, keyed by db alias
+_pools = {}
+_metrics = {}
+_registry_lock = threading.Lock()
+# Pools inherited from the parent when a process forks. Their connections' sockets are shared with the parent, so they
+# can't be used or closed (closing would terminate the parent's connections). Keeping a reference prevents them from
+# being closed when they're garbage collected.
+_inherited_pools = []
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionMetrics(object):
+    """
+    Thread safe counters for a worker process' db connections, surfaced through the health check view.
+    """
+    FIELDS = ('checkouts', 'waits', 'timeouts', 'connects', 'reconnects')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(self.FIELDS, 0)
+
+    def increment(self, name):
+        with self._lock:
+            self._counts[name] += 1
+
+    def as_dict(self):
+        with self._lock:
+            return dict(self._counts)
+
+
+class ConnectionPool(object):
+    """
+    Bounded pool of db connections shared by the threads of a worker process. Connections are checked out when django
+    opens a connection and checked back in when django closes it, so a request only holds a connection while it's
+    using one. Threads wait for a connection to be checked in once `max_size` connections are open.
+    """
+
+    def __init__(self, max_size, timeout=None, metrics=None):
+        """
+        :param max_size: Max # of open connections (checked out and idle), usually the # of threads per worker
+        :param timeout: Seconds to wait for a connection before raising `PoolTimeout`, None waits forever
+        :param metrics: Optional `ConnectionMetrics` to record checkouts, waits, etc. in
+        """
+        self.max_size = max_size
+        self.timeout = timeout
+        self.metrics = metrics or ConnectionMetrics()
+        self.pid = os.getpid()
+        self._idle = collections.deque()
+        self._size = 0
+        self._condition = threading.Condition()
+
+    def checkout(self, connect):
+        """
+        :param connect: Function that opens a new connection when there isn't an idle one, it is called with no args
+        :raises PoolTimeout: If a connection didn't become available in time
+        :return: Tuple of (connection, whether the connection is new). Reused connections may have gone stale while
+            idle, callers can check them before use.
+        """
+        with self._condition:
+            self.metrics.increment('checkouts')
+            if not self._idle and self._size >= self.max_size:
+                self.metrics.increment('waits')
+                if not self._condition.wait_for(lambda: self._idle or self._size < self.max_size, self.timeout):
+                    self.metrics.increment('timeouts')
+                    raise PoolTimeout(f'No connection became available within {self.timeout} seconds.')
+            if self._idle:
+                # Most recently used first, it's the least likely to have been closed by the server
+                return self._idle.pop(), False
+            self._size += 1
+
+        try:
+            connection = connect()
+        except Exception:
+            self._release_slot()
+            raise
+        self.metrics.increment('connects')
+        return connection, True
+
+    def checkin(self, connection):
+        with self._condition:
+            self._idle.append(connection)
+            self._condition.notify()
+
+    def discard(self, connection):
+        """
+        Close a connection that shouldn't be reused, i.e. it's broken, freeing up its slot.
+        """
+        try:
+            connection.close()
+        except Exception:
+            pass
+        finally:
+            self._release_slot()
+
+    def _release_slot(self):
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def close(self):
+        """
+        Close all idle connections, checked out connections are closed when they're checked in and discarded.
+        """
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+        for connection in idle:
+            self.discard(connection)
+
+    def get_stats(self):
+        with self._condition:
+            stats = {'size': self._size, 'idle': len(self._idle), 'max_size': self.max_size}
+        stats.update(self.metrics.as_dict())
+        return stats
+
+
+def get_connection_metrics(alias):
+    with _registry_lock:
+        if alias not in _metrics:
+            _metrics[alias] = ConnectionMetrics()
+        return _metrics[alias]
+
+
+def get_connection_pool(alias, max_size, timeout=None):
+    """
+    :return: The worker process' pool for the db alias, created on first use
+    """
+    metrics = get_connection_metrics(alias)
+    with _registry_lock:
+        pool = _pools.get(alias)
+        if pool is not None and pool.pid != os.getpid():
+            _inherited_pools.append(pool)
+            pool = None
+        if pool is None:
+            pool = _pools[alias] = ConnectionPool(max_size, timeout=timeout, metrics=metrics)
+        return pool
+
+
+def get_connection_stats():
+    """
+    :return: Dict of db alias -> the worker process' connection metrics, including pool stats for pooled dbs
+    """
+    with _registry_lock:
+        aliases = sorted(set(_metrics) | set(_pools))
+        pools = dict(_pools)
+    stats = {}
+    for alias in aliases:
+        pool = pools.get(alias)
+        stats[alias] = pool.get_stats() if pool is not None else get_connection_metrics(alias).as_dict()
+    return stats
@@ -0,0 +1,187 @@
+import atexit
+import fcntl
+import json
+import threading
+import time
+
+from django.db import connections
+
+
+class QueryStats(object):
+    """
+    Queries executed while a `QueryRecorder` was active.
+    """
+
+    def __init__(self):
+        # List of (sql, params, duration in seconds) tuples
+        self.queries = []
+
+    def add(self, sql, params, duration):
+        self.queries.append((sql, params, duration))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duplicates(self):
+        """
+        # of queries that are identical (sql and params) to an earlier query, i.e. the same object is fetched twice
+        """
+        return self.count - len({(sql, repr(params)) for sql, params, _ in self.queries})
+
+    @property
+    def similar(self):
+        """
+        # of queries with the same sql as an earlier query, but possibly different params. These are usually caused by
+        fetching related objects in a loop (N+1 queries).
+        """
+        return self.count - len({sql for sql, _, _ in self.queries})
+
+    @property
+    def time(self):
+        return sum(duration for _, _, duration in self.queries)
+
+    def as_dict(self):
+        return {
+            'queries': self.count,
+            'duplicates': self.duplicates,
+            'similar': self.similar,
+            'time': round(self.time, 6),
+        }
+
+
+class QueryRecorder(object):
+    """
+    Context manager that records the queries executed on the current thread's db connections. Unlike
+    `connection.queries`, this doesn't require DEBUG to be enabled.
+
+    with QueryRecorder() as recorder:
+        ...
+    recorder.stats.count
+    """
+
+    def __init__(self, using=None):
+        """
+        :param using: Db alias to record the queries of, defaults to all dbs
+        """
+        self.aliases = [using] if using is not None else list(connections)
+        self.stats = QueryStats()
+        self._wrappers = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.stats.add(sql, params, time.monotonic() - start)
+
+    def __enter__(self):
+        for alias in self.aliases:
+            wrapper = connections[alias].execute_wrapper(self)
+            wrapper.__enter__()
+            self._wrappers.append(wrapper)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        while self._wrappers:
+            self._wrappers.pop().__exit__(exc_type, exc_value, traceback)
+
+
+class QueryReport(object):
+    """
+    Thread safe aggregate of the queries executed per view name, i.e. `leagues:schedule`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view_name, stats):
+        """
+        :param view_name: Name of the view the queries were executed by
+        :param stats: `QueryStats` for a single request
+        """
+        with self._lock:
+            view = self._views.setdefault(view_name, {
+                'requests': 0,
+                'queries': 0,
+                'max_queries': 0,
+                'duplicates': 0,
+                'similar': 0,
+                'time': 0.0,
+            })
+            view['requests'] += 1
+            view['queries'] += stats.count
+            view['max_queries'] = max(view['max_queries'], stats.count)
+            view['duplicates'] += stats.duplicates
+            view['similar'] += stats.similar
+            view['time'] += stats.time
+
+    def as_dict(self):
+        with self._lock:
+            views = {name: dict(view) for name, view in self._views.items()}
+        for view in views.values():
+            view['avg_queries'] = round(view['queries'] / view['requests'], 2)
+            view['time'] = round(view['time'], 6)
+        return views
+
+    def to_json(self):
+        return json.dumps(self.as_dict(), indent=2, sort_keys=True)
+
+    def write_json(self, path, merge=False):
+        """
+        Write the report to a file, views already in the file (i.e. from an earlier test class) are kept unless this
+        report also has them. The file is locked while it's updated, so processes can write to the same file.
+
+        :param path: Path to the JSON file
+        :param merge: Add this report's counts to the counts of the views already in the file instead of replacing
+            them, i.e. the reports of a server's worker processes
+        """
+        with open(path, 'a+') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            f.seek(0)
+            try:
+                views = json.load(f)
+            except ValueError:
+                views = {}
+            for name, view in self.as_dict().items():
+                views[name] = _merge_views(views[name], view) if merge and name in views else view
+            f.seek(0)
+            f.truncate()
+            json.dump(views, f, indent=2, sort_keys=True)
+
+    def clear(self):
+        with self._lock:
+            self._views.clear()
+
+
+def _merge_views(view, other):
+    merged = {
+        name: view.get(name, 0) + other[name] for name in ['requests', 'queries', 'duplicates', 'similar', 'time']
+    }
+    merged['max_queries'] = max(view.get('max_queries', 0), other['max_queries'])
+    merged['avg_queries'] = round(merged['queries'] / merged['requests'], 2)
+    merged['time'] = round(merged['time'], 6)
+    return merged
+
+
+# Report of the queries executed by the views this process has handled, see `QueryInstrumentationMiddleware`
+query_report = QueryReport()
+_report_files = set()
+_report_files_lock = threading.Lock()
+
+
+def write_query_report_at_exit(path):
+    """
+    Merge the process' `query_report` into a file when the process exits, so requests don't write to the file. Every
+    process (i.e. each of gunicorn's workers) adds its counts to the file, delete the file to start over. Calling this
+    again with the same path is a no-op.
+
+    :param path: Path to the JSON file
+    """
+    with _report_files_lock:
+        if path in _report_files:
+            return
+        _report_files.add(path)
+    atexit.register(query_report.write_json, path, merge=True)
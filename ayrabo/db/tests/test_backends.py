@@ -0,0 +1,127 @@
+from unittest import mock
+
+from django.db import OperationalError
+
+from ayrabo.db import pool as pool_module
+from ayrabo.db.backends.postgresql.base import Database, DatabaseWrapper
+from ayrabo.utils.testing import BaseTestCase
+
+
+class DatabaseWrapperTests(BaseTestCase):
+    alias = 'backend_test'
+
+    def setUp(self):
+        self.addCleanup(pool_module._pools.pop, self.alias, None)
+        self.addCleanup(pool_module._metrics.pop, self.alias, None)
+        patcher = mock.patch.object(
+            Database,
+            'connect',
+            side_effect=lambda **kwargs: mock.MagicMock(closed=False, autocommit=True)
+        )
+        self.connect = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get_wrapper(self, **kwargs):
+        settings_dict = {
+            'ENGINE': 'ayrabo.db.backends.postgresql',
+            'NAME': 'ayrabo',
+            'USER': '',
+            'PASSWORD': '',
+            'HOST': '',
+            'PORT': '',
+            'OPTIONS': {},
+            'AUTOCOMMIT': True,
+            'ATOMIC_REQUESTS': False,
+            'CONN_MAX_AGE': 0,
+            'TIME_ZONE': None,
+            'TEST': {},
+        }
+        settings_dict.update(kwargs)
+        return DatabaseWrapper(settings_dict, alias=self.alias)
+
+    def _make_unusable(self, connection):
+        connection.cursor.return_value.execute.side_effect = Database.OperationalError('server closed the connection')
+
+    def test_health_check_replaces_persistent_connection(self):
+        wrapper = self._get_wrapper(CONN_HEALTH_CHECKS=True, CONN_MAX_AGE=None)
+        wrapper.ensure_connection()
+        connection = wrapper.connection
+        # End of the request, the connection is kept open
+        wrapper.close_if_unusable_or_obsolete()
+        self.assertIs(wrapper.connection, connection)
+
+        self._make_unusable(connection)
+        wrapper.cursor()
+
+        self.assertIsNot(wrapper.connection, connection)
+        connection.close.assert_called_once_with()
+        self.assertEqual(self.connect.call_count, 2)
+        self.assertEqual(wrapper.metrics.as_dict().get('reconnects'), 1)
+
+    def test_health_check_replaces_pooled_connection(self):
+        wrapper = self._get_wrapper(CONN_HEALTH_CHECKS=True, POOL_SIZE=2)
+        wrapper.ensure_connection()
+        connection = wrapper.connection
+        wrapper.close()
+        wrapper.close_if_unusable_or_obsolete()
+
+        self._make_unusable(connection)
+        wrapper.cursor()
+
+        self.assertIsNot(wrapper.connection, connection)
+        connection.close.assert_called_once_with()
+        self.assertEqual(self.connect.call_count, 2)
+        stats = wrapper.pool.get_stats()
+        self.assertEqual(stats.get('size'), 1)
+        self.assertEqual(stats.get('reconnects'), 1)
+
+    def test_close_rolls_back_pooled_connection(self):
+        wrapper = self._get_wrapper(POOL_SIZE=1)
+        wrapper.ensure_connection()
+        connection = wrapper.connection
+        wrapper.close()
+
+        connection.rollback.assert_called_once_with()
+        connection.close.assert_not_called()
+        self.assertEqual(wrapper.pool.get_stats().get('idle'), 1)
+        other_wrapper = self._get_wrapper(POOL_SIZE=1)
+        other_wrapper.ensure_connection()
+        self.assertIs(other_wrapper.connection, connection)
+
+        # A connection that can't be rolled back is discarded instead of being returned to the pool
+        connection.rollback.side_effect = Database.OperationalError('server closed the connection')
+        other_wrapper.close()
+        connection.close.assert_called_once_with()
+        stats = wrapper.pool.get_stats()
+        self.assertEqual(stats.get('size'), 0)
+        self.assertEqual(stats.get('idle'), 0)
+
+    def test_checkout_after_fork(self):
+        wrapper = self._get_wrapper(POOL_SIZE=1)
+        wrapper.ensure_connection()
+        connection = wrapper.connection
+        wrapper.close()
+        pool = wrapper.pool
+        self.addCleanup(pool_module._inherited_pools.remove, pool)
+
+        with mock.patch('os.getpid', return_value=pool.pid + 1):
+            wrapper.ensure_connection()
+            self.assertIsNot(wrapper.pool, pool)
+
+        self.assertIsNot(wrapper.connection, connection)
+        self.assertEqual(self.connect.call_count, 2)
+        # Closing the inherited connection would terminate the parent's connection
+        connection.close.assert_not_called()
+        self.assertEqual(pool.get_stats().get('idle'), 1)
+        self.assertIn(pool, pool_module._inherited_pools)
+
+    def test_pool_timeout(self):
+        wrapper = self._get_wrapper(POOL_SIZE=1, POOL_TIMEOUT=0.01)
+        wrapper.ensure_connection()
+
+        other_wrapper = self._get_wrapper(POOL_SIZE=1, POOL_TIMEOUT=0.01)
+        with self.assertRaises(OperationalError):
+            other_wrapper.ensure_connection()
+        self.assertIsNone(other_wrapper.connection)
+        self.assertEqual(self.connect.call_count, 1)
+        self.assertEqual(wrapper.pool.get_stats().get('timeouts'), 1)
@@ -0,0 +1,82 @@
+import threading
+from unittest import mock
+
+from ayrabo.db import pool as pool_module
+from ayrabo.db.pool import ConnectionPool, PoolTimeout, get_connection_pool
+from ayrabo.utils.testing import BaseTestCase
+
+
+class ConnectionPoolTests(BaseTestCase):
+    def setUp(self):
+        self.pool = ConnectionPool(max_size=2, timeout=0.1)
+        self.connect = mock.Mock(side_effect=lambda: mock.Mock(closed=False))
+
+    def test_checkout_reuses_connections(self):
+        connection, is_new = self.pool.checkout(self.connect)
+        self.assertTrue(is_new)
+        self.pool.checkin(connection)
+        self.assertEqual(self.pool.checkout(self.connect), (connection, False))
+        self.assertEqual(self.connect.call_count, 1)
+        self.assertDictEqual(self.pool.get_stats(), {
+            'size': 1,
+            'idle': 0,
+            'max_size': 2,
+            'checkouts': 2,
+            'waits': 0,
+            'timeouts': 0,
+            'connects': 1,
+            'reconnects': 0,
+        })
+
+    def test_checkout_timeout(self):
+        self.pool.checkout(self.connect)
+        self.pool.checkout(self.connect)
+        with self.assertRaises(PoolTimeout):
+            self.pool.checkout(self.connect)
+        stats = self.pool.get_stats()
+        self.assertEqual(stats.get('waits'), 1)
+        self.assertEqual(stats.get('timeouts'), 1)
+
+    def test_checkout_waits_for_checkin(self):
+        self.pool.timeout = 5
+        connection, _ = self.pool.checkout(self.connect)
+        self.pool.checkout(self.connect)
+        checked_out = []
+        thread = threading.Thread(target=lambda: checked_out.append(self.pool.checkout(self.connect)))
+        thread.start()
+        self.pool.checkin(connection)
+        thread.join()
+        self.assertEqual(checked_out, [(connection, False)])
+        self.assertEqual(self.connect.call_count, 2)
+
+    def test_discard(self):
+        connection, _ = self.pool.checkout(self.connect)
+        self.pool.checkout(self.connect)
+        self.pool.discard(connection)
+        connection.close.assert_called_once_with()
+        _, is_new = self.pool.checkout(self.connect)
+        self.assertTrue(is_new)
+        self.assertEqual(self.pool.get_stats().get('size'), 2)
+
+    def test_connect_error(self):
+        connect = mock.Mock(side_effect=Exception('Connection refused'))
+        for _ in range(3):
+            with self.assertRaises(Exception):
+                self.pool.checkout(connect)
+        self.assertEqual(self.pool.get_stats().get('size'), 0)
+
+    def test_close(self):
+        connection, _ = self.pool.checkout(self.connect)
+        self.pool.checkin(connection)
+        self.pool.close()
+        connection.close.assert_called_once_with()
+        self.assertEqual(self.pool.get_stats().get('size'), 0)
+
+    def test_get_connection_pool_after_fork(self):
+        self.addCleanup(pool_module._pools.pop, 'test', None)
+        pool = get_connection_pool('test', 2)
+        self.assertIs(get_connection_pool('test', 2), pool)
+        with mock.patch('os.getpid', return_value=pool.pid + 1):
+            child_pool = get_connection_pool('test', 2)
+        self.assertIsNot(child_pool, pool)
+        self.assertIn(pool, pool_module._inherited_pools)
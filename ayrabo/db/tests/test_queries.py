@@ -0,0 +1,149 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+
+from ayrabo.db import queries
+from ayrabo.db.queries import QueryRecorder, QueryReport, QueryStats, query_report
+from ayrabo.middleware import QueryInstrumentationMiddleware
+from ayrabo.utils.testing import BaseTestCase
+from sports.models import Sport
+from sports.tests import SportFactory
+
+
+class QueryRecorderTests(BaseTestCase):
+    def setUp(self):
+        self.sports = SportFactory.create_batch(2)
+
+    def test_stats(self):
+        with QueryRecorder() as recorder:
+            for sport in self.sports:
+                Sport.objects.get(pk=sport.pk)
+            Sport.objects.get(pk=self.sports[0].pk)
+            list(Sport.objects.all())
+        # Queries executed after the recorder exits aren't recorded
+        Sport.objects.count()
+
+        stats = recorder.stats
+        self.assertEqual(stats.count, 4)
+        self.assertEqual(stats.duplicates, 1)
+        self.assertEqual(stats.similar, 2)
+        self.assertGreaterEqual(stats.time, 0)
+
+
+class QueryReportTests(BaseTestCase):
+    def _get_stats(self, *queries):
+        stats = QueryStats()
+        for sql in queries:
+            stats.add(sql, (), 0.5)
+        return stats
+
+    def test_record(self):
+        report = QueryReport()
+        report.record('leagues:schedule', self._get_stats('a', 'a', 'b'))
+        report.record('leagues:schedule', self._get_stats('a'))
+        self.assertDictEqual(report.as_dict(), {
+            'leagues:schedule': {
+                'requests': 2,
+                'queries': 4,
+                'max_queries': 3,
+                'avg_queries': 2.0,
+                'duplicates': 1,
+                'similar': 1,
+                'time': 2.0,
+            }
+        })
+
+    def test_write_json(self):
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        with open(path, 'w') as f:
+            json.dump({'teams:schedule': {'queries': 1}}, f)
+
+        report = QueryReport()
+        report.record('leagues:schedule', self._get_stats('a'))
+        report.write_json(path)
+        with open(path) as f:
+            self.assertListEqual(sorted(json.load(f)), ['leagues:schedule', 'teams:schedule'])
+
+    def test_write_json_merge(self):
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+
+        # i.e. two worker processes
+        for queries_executed in [('a', 'a', 'b'), ('a',)]:
+            report = QueryReport()
+            report.record('leagues:schedule', self._get_stats(*queries_executed))
+            report.write_json(path, merge=True)
+        with open(path) as f:
+            self.assertDictEqual(json.load(f), {
+                'leagues:schedule': {
+                    'requests': 2,
+                    'queries': 4,
+                    'max_queries': 3,
+                    'avg_queries': 2.0,
+                    'duplicates': 1,
+                    'similar': 1,
+                    'time': 2.0,
+                }
+            })
+
+
+class QueryInstrumentationMiddlewareTests(BaseTestCase):
+    def setUp(self):
+        self.addCleanup(query_report.clear)
+        self.request = RequestFactory().get('/')
+        self.request.resolver_match = type('ResolverMatch', (), {'view_name': 'home'})
+
+    def _get_response(self, request):
+        list(Sport.objects.all())
+        return HttpResponse()
+
+    def test_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            QueryInstrumentationMiddleware(self._get_response)
+
+    @override_settings(QUERY_INSTRUMENTATION_ENABLED=True)
+    def test_records_queries(self):
+        response = QueryInstrumentationMiddleware(self._get_response)(self.request)
+        self.assertEqual(response['X-Query-Count'], '1')
+        self.assertEqual(response['X-Query-Duplicates'], '0')
+        report = query_report.as_dict()
+        self.assertEqual(report['home']['requests'], 1)
+        self.assertEqual(report['home']['queries'], 1)
+
+    @override_settings(QUERY_INSTRUMENTATION_ENABLED=True)
+    def test_records_streamed_queries(self):
+        def stream():
+            yield b'['
+            yield str(Sport.objects.count()).encode()
+            yield b']'
+
+        def get_response(request):
+            list(Sport.objects.all())
+            return StreamingHttpResponse(stream())
+
+        response = QueryInstrumentationMiddleware(get_response)(self.request)
+        self.assertEqual(response['X-Query-Count'], '1')
+        self.assertDictEqual(query_report.as_dict(), {})
+        self.assertEqual(b''.join(response.streaming_content), b'[0]')
+        report = query_report.as_dict()
+        self.assertEqual(report['home']['requests'], 1)
+        self.assertEqual(report['home']['queries'], 2)
+
+    @override_settings(QUERY_INSTRUMENTATION_ENABLED=True, QUERY_REPORT_FILE='/tmp/query_report.json')
+    def test_report_file_written_at_exit(self):
+        self.addCleanup(queries._report_files.discard, '/tmp/query_report.json')
+        with mock.patch('atexit.register') as mock_register, mock.patch.object(query_report, 'write_json') as write:
+            middleware = QueryInstrumentationMiddleware(self._get_response)
+            QueryInstrumentationMiddleware(self._get_response)
+            middleware(self.request)
+        mock_register.assert_called_once_with(write, '/tmp/query_report.json', merge=True)
+        # Nothing is written on the request path
+        write.assert_not_called()
@@ -1,20 +1,76 @@
 import pytz
 from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
 from django.utils import timezone, translation
 from django.utils.deprecation import MiddlewareMixin
 
+from ayrabo.db.queries import QueryRecorder, query_report, write_query_report_at_exit
+from userprofiles.preferences import get_user_preferences
+
 
 class TimezoneAndTranslationMiddleware(MiddlewareMixin):
     def process_request(self, request):
-        if request.user.is_authenticated and hasattr(request.user, 'userprofile'):
-            userprofile = request.user.userprofile
-            language_code = userprofile.language
-            tz = userprofile.timezone
+        preferences = get_user_preferences(request.user) if request.user.is_authenticated else None
+        if preferences is not None and preferences.is_registration_complete:
+            language_code = preferences.language
+            tz = preferences.timezone
         else:
             language_code = translation.get_language_from_request(request)
             tz = settings.TIME_ZONE
-        request.session[translation.LANGUAGE_SESSION_KEY] = language_code
+        # Only write to the session when the value changes, otherwise the session is saved on every request
+        if request.session.get(translation.LANGUAGE_SESSION_KEY) != language_code:
+            request.session[translation.LANGUAGE_SESSION_KEY] = language_code
         translation.activate(language_code)
 
         timezone.activate(pytz.timezone(tz))
         return None
+
+
+class QueryInstrumentationMiddleware(object):
+    """
+    Records the # of queries, duplicate queries and db time of each request per view name (see `ayrabo.db.queries`).
+    The stats are added to the response's headers and, when QUERY_REPORT_FILE is set, the process' report is merged into
+    that file when the process exits. Meant for development and load testing, it's disabled unless
+    QUERY_INSTRUMENTATION_ENABLED is set.
+
+    Streaming responses can execute queries while their content is streamed (i.e. `ValuesProjection`). Those are
+    recorded once the content has been streamed, the headers only count the queries executed before that.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if settings.QUERY_REPORT_FILE:
+            write_query_report_at_exit(settings.QUERY_REPORT_FILE)
+
+    def _record_streamed_queries(self, recorder, streaming_content, view_name):
+        try:
+            content = iter(streaming_content)
+            while True:
+                with recorder:
+                    chunk = next(content, None)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            if view_name is not None:
+                query_report.record(view_name, recorder.stats)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with recorder:
+            response = self.get_response(request)
+
+        stats = recorder.stats
+        response['X-Query-Count'] = stats.count
+        response['X-Query-Duplicates'] = stats.duplicates
+        response['X-Query-Time'] = '{:.6f}'.format(stats.time)
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        view_name = resolver_match.view_name if resolver_match is not None else None
+        if response.streaming:
+            response.streaming_content = self._record_streamed_queries(recorder, response.streaming_content, view_name)
+        elif view_name is not None:
+            query_report.record(view_name, stats)
+        return response
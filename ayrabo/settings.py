@@ -66,6 +66,48 @@ CACHES = {
     'default': env.cache('CACHE_URL')
 }
 
+# Seconds a user's role snapshot (see `users.roles`) is cached for across requests. 0 disables the cross request cache,
+# the snapshot is still computed at most once per request.
+ROLE_SNAPSHOT_CACHE_TIMEOUT = env.int('ROLE_SNAPSHOT_CACHE_TIMEOUT', default=0)
+
+# Seconds a user's permission index (see `users.permission_index`) is cached for across requests. The index is
+# versioned per user, permission changes invalidate it right away. 0 disables the cross request cache.
+PERMISSION_INDEX_CACHE_TIMEOUT = env.int('PERMISSION_INDEX_CACHE_TIMEOUT', default=0)
+
+# Seconds rendered fragments of the team and league detail pages (see `common.fragments`) are cached for. Fragments are
+# versioned per league, season and team, changes invalidate them right away. 0 disables fragment caching.
+FRAGMENT_CACHE_TIMEOUT = env.int('FRAGMENT_CACHE_TIMEOUT', default=0)
+
+# Cache each league's current season (see `seasons.utils.get_current_season`) until the next season boundary instead of
+# querying for it on every request.
+CURRENT_SEASON_CACHE_ENABLED = env.bool('CURRENT_SEASON_CACHE_ENABLED', default=False)
+
+# Seconds a user's preferences (see `userprofiles.preferences`) are cached for across requests. 0 disables the cross
+# request cache, the preferences are still loaded at most once per request.
+USER_PREFERENCES_CACHE_TIMEOUT = env.int('USER_PREFERENCES_CACHE_TIMEOUT', default=0)
+
+# Seconds reference data (sports, leagues, divisions, locations and generic choices, see `common.reference_data`) is
+# cached for in the shared cache. Each process also keeps the reference data it has loaded, changes invalidate it in
+# all processes right away. 0 disables the reference data registry.
+REFERENCE_DATA_CACHE_TIMEOUT = env.int('REFERENCE_DATA_CACHE_TIMEOUT', default=0)
+
+# Record the queries executed per view (see `ayrabo.middleware.QueryInstrumentationMiddleware`). When a report file is
+# set, the per view query report is written to it as JSON, the query budget tests (see `QueryBudgetMixin`) write their
+# measurements to it as well.
+QUERY_INSTRUMENTATION_ENABLED = env.bool('QUERY_INSTRUMENTATION_ENABLED', default=False)
+QUERY_REPORT_FILE = env.str('QUERY_REPORT_FILE', default='')
+
+# Admin bulk uploads are queued and processed by the `process_bulk_uploads` worker instead of in the request. The worker
+# needs to be running when this is enabled.
+BULK_UPLOAD_IN_BACKGROUND = env.bool('BULK_UPLOAD_IN_BACKGROUND', default=False)
+# Seconds a running bulk upload can go without progress before it's considered abandoned and marked as failed. Uploads
+# that aren't saved in chunks only report progress once they're done, this needs to be longer than they take.
+BULK_UPLOAD_STALE_TIMEOUT = env.int('BULK_UPLOAD_STALE_TIMEOUT', default=60 * 60)
+
+# Unpaginated JSON responses of the v1 list apis are read with `values()` queries and streamed instead of going through
+# the serializers (see `api.projections.ValuesProjection`).
+API_VALUES_SERIALIZATION_ENABLED = env.bool('API_VALUES_SERIALIZATION_ENABLED', default=False)
+
 # CSRF
 CSRF_COOKIE_SECURE = env.bool('CSRF_COOKIE_SECURE')
 
@@ -110,6 +152,7 @@ INSTALLED_APPS = [
     # Custom apps
     'accounts.apps.AccountsConfig',
     'api.apps.ApiConfig',
+    'bulkuploads.apps.BulkuploadsConfig',
     'coaches.apps.CoachesConfig',
     'common.apps.CommonConfig',
     'divisions.apps.DivisionsConfig',
@@ -126,6 +169,8 @@ INSTALLED_APPS = [
     'scorekeepers.apps.ScorekeepersConfig',
     'seasons.apps.SeasonsConfig',
     'sports.apps.SportsConfig',
+    'standings.apps.StandingsConfig',
+    'stats.apps.StatsConfig',
     'teams.apps.TeamsConfig',
     'userprofiles.apps.UserprofilesConfig',
     'users.apps.UsersConfig',
@@ -136,6 +181,7 @@ CRISPY_TEMPLATE_PACK = 'bootstrap3'
 # NOTE: The ordering of the middleware is important, do not rearrange things unless you know what you are doing.
 MIDDLEWARE = [
     'debug_toolbar.middleware.DebugToolbarMiddleware',
+    'ayrabo.middleware.QueryInstrumentationMiddleware',
     'django.middleware.common.BrokenLinkEmailsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -148,6 +194,7 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'ayrabo.middleware.TimezoneAndTranslationMiddleware',
     'accounts.middleware.UserProfileCompleteMiddleware',
+    'users.middleware.RoleSnapshotMiddleware',
     'waffle.middleware.WaffleMiddleware',
 ]
 
@@ -181,14 +228,21 @@ WSGI_APPLICATION = 'ayrabo.wsgi.application'
 # https://docs.djangoproject.com/en/1.9/ref/settings/#databases
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        # Adds connection health checks and pooling, see `ayrabo.db.backends.postgresql.base.DatabaseWrapper`
+        'ENGINE': 'ayrabo.db.backends.postgresql',
         'NAME': env.str('POSTGRES_DB'),
         'USER': env.str('POSTGRES_USER'),
         'PASSWORD': env.str('POSTGRES_PASSWORD'),
         'HOST': env.str('POSTGRES_HOST'),
         'PORT': env.int('POSTGRES_PORT', default=5432),
-        # For now leave as the default
-        'CONN_MAX_AGE': 0,
+        # Seconds a thread keeps its connection open between requests, 0 closes it at the end of each request. Should
+        # be 0 when the pool is enabled.
+        'CONN_MAX_AGE': env.int('POSTGRES_CONN_MAX_AGE', default=0),
+        'CONN_HEALTH_CHECKS': env.bool('POSTGRES_CONN_HEALTH_CHECKS', default=True),
+        # Max # of connections per worker process shared by its threads (usually gunicorn's `threads`), 0 disables the
+        # pool
+        'POOL_SIZE': env.int('POSTGRES_POOL_SIZE', default=0),
+        'POOL_TIMEOUT': env.float('POSTGRES_POOL_TIMEOUT', default=10),
         'OPTIONS': {
             'client_encoding': 'UTF8',
         },
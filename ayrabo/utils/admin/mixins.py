@@ -1,7 +1,8 @@
 from django.contrib import messages
+from django.contrib.contenttypes.models import ContentType
 from django.shortcuts import redirect
 from django.templatetags.static import static
-from django.urls import path, reverse_lazy
+from django.urls import path, reverse, reverse_lazy
 from django_object_actions import DjangoObjectActions
 
 from ayrabo.utils.admin.views import AdminBulkUploadView
@@ -13,27 +14,33 @@ class AdminBulkUploadMixin(DjangoObjectActions):
     bulk_upload_model_form_class = None
     bulk_upload_model_formset_class = None
     bulk_upload_view_class = AdminBulkUploadView
-    changelist_actions = ('bulk_upload', 'download_sample_bulk_upload_csv')
+    # Stream the csv and save it in chunks of this many rows, see `AdminBulkUploadView.save_chunks`
+    bulk_upload_chunk_size = None
+    changelist_actions = ('bulk_upload', 'bulk_upload_jobs', 'download_sample_bulk_upload_csv')
 
     def get_url_name(self):
         _meta = self.model._meta
         return f'{_meta.app_label}_{_meta.model_name}_bulk_upload'
 
-    def bulk_upload_view(self):
+    def get_bulk_upload_view_kwargs(self):
         _meta = self.model._meta
-        return self.bulk_upload_view_class.as_view(
+        return dict(
             success_url=reverse_lazy(f'admin:{_meta.app_label}_{_meta.model_name}_changelist'),
             model=self.model,
             model_form_class=self.bulk_upload_model_form_class,
             model_formset_class=self.bulk_upload_model_formset_class,
             fields=self.bulk_upload_form_fields,
             admin_site=self.admin_site,
+            chunk_size=self.bulk_upload_chunk_size,
             extra_context={
                 'title': f'Bulk upload {_meta.verbose_name_plural}',
                 'opts': _meta,  # Django's base admin template expects this variable in the context
             }
         )
 
+    def bulk_upload_view(self):
+        return self.bulk_upload_view_class.as_view(**self.get_bulk_upload_view_kwargs())
+
     def get_urls(self):
         urls = super().get_urls()
         new_urls = [
@@ -44,6 +51,11 @@ class AdminBulkUploadMixin(DjangoObjectActions):
     def bulk_upload(self, *args, **kwargs):
         return redirect(f'admin:{self.get_url_name()}')
 
+    def bulk_upload_jobs(self, *args, **kwargs):
+        content_type = ContentType.objects.get_for_model(self.model)
+        url = reverse('admin:bulkuploads_bulkuploadjob_changelist')
+        return redirect(f'{url}?content_type__id__exact={content_type.pk}')
+
     def download_sample_bulk_upload_csv(self, request, *args, **kwargs):
         if self.bulk_upload_sample_csv:
             return redirect(static(f'csv_examples/{self.bulk_upload_sample_csv}'))
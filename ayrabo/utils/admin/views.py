@@ -1,11 +1,47 @@
+import codecs
 import csv
 
 from django import forms
+from django.conf import settings
 from django.contrib import messages
-from django.shortcuts import render
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db import connections, router, transaction
+from django.shortcuts import redirect, render
+from django.urls import reverse
 from django.views import generic
 
 from ayrabo.utils.admin.forms import AdminBulkUploadForm
+from ayrabo.utils.form_fields import PrefetchedModelChoiceField
+from bulkuploads.models import BulkUploadJob
+
+
+class BulkCreateModelFormSetMixin(object):
+    """
+    Saves the valid new forms of a model formset with one bulk insert instead of one insert per form. Forms with errors
+    are skipped. Any post-processing done by the formset's `save` still runs on the created instances.
+    """
+
+    def save_new_objects(self, commit=True):
+        saved_forms = [
+            form for form in self.extra_forms
+            if form.has_changed() and form.is_valid() and not (self.can_delete and self._should_delete_form(form))
+        ]
+        self.new_objects = [form.save(commit=False) for form in saved_forms]
+        if not commit:
+            self.saved_forms = saved_forms
+            return self.new_objects
+
+        connection = connections[router.db_for_write(self.model)]
+        if connection.features.can_return_ids_from_bulk_insert:
+            self.model.objects.bulk_create(self.new_objects)
+        else:
+            # Instances need their pks for m2m data and any post-processing done by the formset (i.e. sqlite).
+            for instance in self.new_objects:
+                instance.save()
+        for form in saved_forms:
+            form.save_m2m()
+        return self.new_objects
 
 
 class AdminBulkUploadView(generic.FormView):
@@ -18,6 +54,11 @@ class AdminBulkUploadView(generic.FormView):
     model_form_class = None
     model_formset_class = None
     admin_site = None
+    # When set, the csv is streamed and validated/saved in chunks of this many rows (see `save_chunks`)
+    chunk_size = None
+    # Queue the csv for the `process_bulk_uploads` worker instead of processing it in the request, defaults to the
+    # `BULK_UPLOAD_IN_BACKGROUND` setting
+    in_background = None
 
     def get_form_value(self, key, value, row):
         func_name = key.replace(' ', '_').lower()
@@ -35,21 +76,37 @@ class AdminBulkUploadView(generic.FormView):
             data[new_key] = self.get_form_value(key, value, row)
         return data
 
+    def get_formset_data(self, rows):
+        data = {}
+        for count, row in enumerate(rows):
+            data.update(self.as_form_data(row, count))
+        data['form-TOTAL_FORMS'] = len(rows)
+        data['form-INITIAL_FORMS'] = 0
+        return data
+
     def clean_data(self, uploaded_file):
         rows = [row.decode() for row in uploaded_file]
         uploaded_file.seek(0)
-        reader = csv.DictReader(rows)
-        cleaned_data = {}
-        raw_data = []
-        count = 0
+        raw_data = list(csv.DictReader(rows))
+        return self.get_formset_data(raw_data), raw_data
+
+    def iter_chunks(self, uploaded_file):
+        """
+        Lazily decode and parse the uploaded csv, only one chunk of rows is kept in memory at a time.
+
+        :param uploaded_file: Uploaded csv file
+        :return: Generator of lists of (line number, row) tuples, each list contains at most `chunk_size` rows
+        """
+        reader = csv.DictReader(codecs.iterdecode(uploaded_file, 'utf-8'))
+        chunk = []
         for row in reader:
-            raw_data.append(row)
-            form_data = self.as_form_data(row, count)
-            cleaned_data.update(form_data)
-            count += 1
-        cleaned_data['form-TOTAL_FORMS'] = count
-        cleaned_data['form-INITIAL_FORMS'] = 0
-        return cleaned_data, raw_data
+            # `line_num` is the line the row ends on, quoted values can span multiple lines
+            chunk.append((reader.line_num, row))
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
 
     def get_formset_class(self):
         kwargs = {}
@@ -61,25 +118,107 @@ class AdminBulkUploadView(generic.FormView):
             kwargs['formset'] = self.model_formset_class
         return forms.modelformset_factory(self.model, **kwargs)
 
+    def get_bulk_create_formset_class(self):
+        base_formset_class = self.model_formset_class or forms.BaseModelFormSet
+        formset_class = type(
+            f'BulkCreate{base_formset_class.__name__}',
+            (BulkCreateModelFormSetMixin, base_formset_class),
+            {}
+        )
+        # The default max of 1000 forms would silently drop the rest of the forms for bigger chunk sizes
+        kwargs = {'formset': formset_class, 'max_num': self.chunk_size}
+        if self.fields:
+            kwargs['fields'] = self.fields
+        if self.model_form_class:
+            kwargs['form'] = self.model_form_class
+        return forms.modelformset_factory(self.model, **kwargs)
+
     def get_model_form_kwargs(self, data, raw_data):
         return {}
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context.update(self.admin_site.each_context(self.request))
-        return context
+    def prefetch_choices(self, formset):
+        """
+        Resolve the values of every model choice field in the formset with one query per field, instead of one query
+        per field per form. The fields are swapped out for fields that look up the prefetched instances.
 
-    def form_valid(self, form):
-        uploaded_file = form.cleaned_data.get('file')
+        :param formset: Bound formset
+        """
+        if not formset.forms:
+            return
+        for name, field in formset.forms[0].fields.items():
+            if not isinstance(field, forms.ModelChoiceField) or isinstance(field, forms.ModelMultipleChoiceField):
+                continue
+            opts = field.queryset.model._meta
+            model_field = opts.get_field(field.to_field_name) if field.to_field_name else opts.pk
+            values = set()
+            for form in formset.forms:
+                value = form.data.get(form.add_prefix(name))
+                if value in field.empty_values:
+                    continue
+                try:
+                    values.add(model_field.to_python(value))
+                except ValidationError:
+                    # Resolved to an invalid choice error when the form is validated
+                    continue
+            instances = field.queryset.in_bulk(values, field_name=model_field.name)
+            instances = {str(value): instance for value, instance in instances.items()}
+            for form in formset.forms:
+                form.fields[name] = PrefetchedModelChoiceField.from_field(form.fields[name], instances)
+
+    def save_chunks(self, uploaded_file, on_chunk_saved=None):
+        """
+        Stream the uploaded csv and validate/save it in chunks of `chunk_size` rows. Foreign keys are resolved with one
+        query per field per chunk and the valid rows of each chunk are bulk created in their own transaction. Rows with
+        errors are skipped and reported with the line they're on, so they can be corrected and uploaded again.
+
+        NOTE: `bulk_create` doesn't send the `pre_save`/`post_save` signals.
+
+        :param uploaded_file: Uploaded csv file
+        :param on_chunk_saved: Optional callback, called with (# of rows, # of instances created, row errors) after
+            each chunk is saved
+        :return: Tuple of (# of instances created, list of (line number, errors) tuples)
+        """
+        FormSetClass = self.get_bulk_create_formset_class()
+        num_instances = 0
+        row_errors = []
+        for chunk in self.iter_chunks(uploaded_file):
+            line_numbers = [line_number for line_number, _ in chunk]
+            raw_data = [row for _, row in chunk]
+            data = self.get_formset_data(raw_data)
+            formset = FormSetClass(data, form_kwargs=self.get_model_form_kwargs(data, raw_data))
+            self.prefetch_choices(formset)
+            chunk_errors = [
+                (line_number, form_errors)
+                for line_number, form_errors in zip(line_numbers, formset.errors) if form_errors
+            ]
+            with transaction.atomic():
+                num_chunk_instances = len(formset.save())
+            num_instances += num_chunk_instances
+            row_errors.extend(chunk_errors)
+            if on_chunk_saved is not None:
+                on_chunk_saved(len(chunk), num_chunk_instances, chunk_errors)
+        return num_instances, row_errors
+
+    def save_formset(self, uploaded_file):
+        """
+        Validate and save the whole csv with one formset. Nothing is saved if any of the rows have errors.
+
+        :param uploaded_file: Uploaded csv file
+        :return: Tuple of (saved instances, formset), instances is None if the formset isn't valid
+        """
         cleaned_data, raw_data = self.clean_data(uploaded_file)
         FormSetClass = self.get_formset_class()
         formset = FormSetClass(cleaned_data, form_kwargs=self.get_model_form_kwargs(cleaned_data, raw_data))
         if not formset.is_valid():
-            context = self.get_context_data()
-            context.update({'formset': formset})
-            return render(self.request, self.template_name, context)
-        instances = formset.save()
-        num_instances = len(instances)
+            return None, formset
+        return formset.save(), formset
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(self.admin_site.each_context(self.request))
+        return context
+
+    def add_success_message(self, num_instances):
         opts = self.model._meta
         verbose_name = opts.verbose_name
         verbose_name_plural = opts.verbose_name_plural
@@ -90,4 +229,38 @@ class AdminBulkUploadView(generic.FormView):
             messages.success(self.request, f'{base_msg} {verbose_name}')
         else:
             messages.success(self.request, f'{base_msg} {verbose_name_plural}')
+
+    def is_in_background(self):
+        return settings.BULK_UPLOAD_IN_BACKGROUND if self.in_background is None else self.in_background
+
+    def queue_job(self, uploaded_file):
+        job = BulkUploadJob.objects.create(
+            content_type=ContentType.objects.get_for_model(self.model),
+            file=uploaded_file,
+            created_by=self.request.user,
+        )
+        messages.info(
+            self.request,
+            'Your csv will be processed in the background, refresh this page to follow its progress.'
+        )
+        return redirect(reverse('admin:bulkuploads_bulkuploadjob_change', args=[job.pk]))
+
+    def form_valid(self, form):
+        uploaded_file = form.cleaned_data.get('file')
+        if self.is_in_background():
+            return self.queue_job(uploaded_file)
+        if self.chunk_size:
+            num_instances, row_errors = self.save_chunks(uploaded_file)
+            if row_errors:
+                context = self.get_context_data()
+                context.update({'row_errors': row_errors, 'num_instances': num_instances})
+                return render(self.request, self.template_name, context)
+        else:
+            instances, formset = self.save_formset(uploaded_file)
+            if instances is None:
+                context = self.get_context_data()
+                context.update({'formset': formset})
+                return render(self.request, self.template_name, context)
+            num_instances = len(instances)
+        self.add_success_message(num_instances)
         return super().form_valid(form)
@@ -1,4 +1,5 @@
 from django import forms
+from django.core.exceptions import ValidationError
 from django.utils import timezone
 
 
@@ -17,6 +18,43 @@ class SeasonModelChoiceField(forms.ModelChoiceField):
         return '{}: {}-{} Season'.format(obj.league.abbreviated_name, obj.start_date.year, obj.end_date.year)
 
 
+class PrefetchedModelChoiceField(forms.ModelChoiceField):
+    """
+    Model choice field that resolves values from instances fetched up front (i.e. for every row in a chunk of a bulk
+    upload) instead of querying the db for every form.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.instances = kwargs.pop('instances')
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def from_field(cls, field, instances):
+        """
+        :param field: The model choice field to replace
+        :param instances: Dict of str(value) -> instance, for the values the field is going to be cleaning
+        :return: `PrefetchedModelChoiceField` that validates the same way as `field`
+        """
+        return cls(
+            queryset=field.queryset,
+            instances=instances,
+            required=field.required,
+            label=field.label,
+            to_field_name=field.to_field_name,
+            error_messages=field.error_messages,
+            validators=field.validators,
+            disabled=field.disabled,
+        )
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        instance = self.instances.get(str(value))
+        if instance is None:
+            raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice')
+        return instance
+
+
 class PlayerModelMultipleChoiceField(forms.ModelMultipleChoiceField):
     def __init__(self, *args, **kwargs):
         self.position_field = kwargs.pop('position_field')
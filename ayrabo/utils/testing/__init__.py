@@ -1,6 +1,7 @@
 from .testing import (
     BaseAPITestCase,
     BaseTestCase,
+    QueryBudgetMixin,
     clean_kwargs,
     comma_separated_string_to_list,
     get_user,
@@ -1,6 +1,7 @@
 import re
 from datetime import datetime, timedelta
 
+from django.conf import settings
 from django.core import mail
 from django.db.models import Q, QuerySet
 from django.test import TestCase
@@ -10,6 +11,8 @@ from rest_framework import status
 from rest_framework.reverse import reverse as drf_reverse
 from rest_framework.test import APITestCase
 
+from ayrabo.db.queries import QueryRecorder, QueryReport
+
 
 def get_user(username_or_email):
     """
@@ -108,6 +111,85 @@ def handle_time(value):
     return now
 
 
+# Queries measured by `QueryBudgetMixin` for the test run, per view name
+test_query_report = QueryReport()
+
+
+class QueryBudgetMixin(object):
+    """
+    Assertions that pin the # of queries a view executes. Use `assertQueryBudget` for a fixed upper bound and
+    `assertQueriesDoNotScale` to make sure the # of queries doesn't grow with the amount of data (N+1 queries). When
+    QUERY_REPORT_FILE is set, the measurements are written to that file as JSON after each test class.
+    """
+
+    @classmethod
+    def tearDownClass(cls):
+        if settings.QUERY_REPORT_FILE:
+            test_query_report.write_json(settings.QUERY_REPORT_FILE)
+        super().tearDownClass()
+
+    def record_queries(self, make_request):
+        """
+        :param make_request: Function that makes the request, it is called with no args
+        :return: Tuple of (response, `QueryStats` for the request)
+        """
+        with QueryRecorder() as recorder:
+            response = make_request()
+        resolver_match = getattr(response, 'resolver_match', None)
+        if resolver_match is not None:
+            test_query_report.record(resolver_match.view_name, recorder.stats)
+        return response, recorder.stats
+
+    def _format_queries(self, stats):
+        return '\n'.join(f'{i}. {sql}' for i, (sql, _, _) in enumerate(stats.queries, start=1))
+
+    def assertQueryBudget(self, make_request, max_queries, max_similar=None):
+        """
+        :param make_request: Function that makes the request, it is called with no args
+        :param max_queries: Max # of queries the request may execute
+        :param max_similar: Max # of queries that may repeat the sql of an earlier query, see `QueryStats.similar`
+        :return: The response
+        """
+        response, stats = self.record_queries(make_request)
+        self._assert_within_budget(stats, max_queries)
+        if max_similar is not None and stats.similar > max_similar:
+            queries = self._format_queries(stats)
+            self.fail(f'{stats.similar} similar queries executed, budget is {max_similar}:\n{queries}')
+        return response
+
+    def assertQueriesDoNotScale(self, make_request, seed, sizes=(1, 10), max_queries=None):
+        """
+        Make the request after seeding increasing amounts of data, the # of queries must be the same for every size. The
+        request is made once before measuring, so per process caches (sites, content types, etc.) are warm.
+
+        :param make_request: Function that makes the request, it is called with no args
+        :param seed: Function that creates data the request lists, it is called with the # of objects to add. The total
+            # of objects is the current size.
+        :param sizes: Increasing # of objects to make the request with
+        :param max_queries: Optional max # of queries the request may execute
+        :return: The last response
+        """
+        counts = []
+        seeded = 0
+        for size in sizes:
+            seed(size - seeded)
+            if not seeded:
+                make_request()
+            seeded = size
+            response, stats = self.record_queries(make_request)
+            counts.append((size, stats))
+        if len({stats.count for _, stats in counts}) > 1:
+            summary = ', '.join(f'{stats.count} queries for {size} objects' for size, stats in counts)
+            self.fail(f'The # of queries grows with the data ({summary}):\n{self._format_queries(counts[-1][1])}')
+        if max_queries is not None:
+            self._assert_within_budget(counts[-1][1], max_queries)
+        return response
+
+    def _assert_within_budget(self, stats, max_queries):
+        if stats.count > max_queries:
+            self.fail(f'{stats.count} queries executed, budget is {max_queries}:\n{self._format_queries(stats)}')
+
+
 class BaseTestCase(TestCase):
     fixtures = ['sites.json']
 
@@ -208,6 +290,9 @@ class BaseAPITestCase(APITestCase):
         'permission_denied': {'detail': 'You do not have permission to perform this action.'},
         'sport_not_configured': {'detail': '{} is not currently configured.'},
         'validation_error': {'detail': ''},
+        'game_roster_conflict': {
+            'detail': 'The game roster has been changed by someone else, reload it and try again.'
+        },
     }
 
     STATUS_CODE_DEFAULTS = {
@@ -216,6 +301,7 @@ class BaseAPITestCase(APITestCase):
         'permission_denied': status.HTTP_403_FORBIDDEN,
         'sport_not_configured': status.HTTP_400_BAD_REQUEST,
         'validation_error': status.HTTP_400_BAD_REQUEST,
+        'game_roster_conflict': status.HTTP_409_CONFLICT,
     }
 
     def format_url(self, **kwargs):
@@ -1,5 +1,7 @@
 from unittest import mock
 
+from django.contrib.contenttypes.models import ContentType
+
 from ayrabo.utils.testing import BaseTestCase
 from locations.admin import LocationAdmin
 from locations.models import Location
@@ -33,6 +35,7 @@ class AdminBulkUploadMixinTests(BaseTestCase):
                 'website'
             ),
             admin_site=self.mock_admin_site,
+            chunk_size=None,
             extra_context={
                 'title': 'Bulk upload locations',
                 'opts': Location._meta,
@@ -45,4 +48,12 @@ class AdminBulkUploadMixinTests(BaseTestCase):
         self.assertIn('locations_location_bulk_upload', url_names)
 
     def test_changelist_actions(self):
-        self.assertTupleEqual(self.admin.changelist_actions, ('bulk_upload', 'download_sample_bulk_upload_csv'))
+        self.assertTupleEqual(
+            self.admin.changelist_actions,
+            ('bulk_upload', 'bulk_upload_jobs', 'download_sample_bulk_upload_csv')
+        )
+
+    def test_bulk_upload_jobs(self):
+        content_type = ContentType.objects.get_for_model(Location)
+        response = self.admin.bulk_upload_jobs(mock.Mock())
+        self.assertEqual(response.url, f'/admin/bulkuploads/bulkuploadjob/?content_type__id__exact={content_type.pk}')
@@ -1,7 +1,24 @@
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from ayrabo.utils.admin.views import AdminBulkUploadView
 from ayrabo.utils.testing import BaseTestCase
+from bulkuploads.models import BulkUploadJob, BulkUploadJobError
+from bulkuploads.tests import BulkUploadJobTestCase
+from common.fragments import TEAM, get_fragment_versions
+from locations.models import Location
+from players.admin import HockeyPlayerAdminForm, PlayerAdminModelFormSet
+from players.models import HockeyPlayer
+from sports.models import SportRegistration
+from sports.tests import SportFactory
+from teams.tests import TeamFactory
 from users.tests import UserFactory
 
 
@@ -41,3 +58,131 @@ class AdminBulkUploadViewTests(BaseTestCase):
         f = SimpleUploadedFile('test.csv', b'hello world')
         response = self.client.post(self.url, {'file': f})
         self.assertRedirects(response, reverse('admin:locations_location_changelist'))
+
+
+class AdminBulkUploadViewBackgroundTests(BulkUploadJobTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('admin:locations_location_bulk_upload')
+        self.user = UserFactory(is_staff=True, is_superuser=True)
+
+    @override_settings(BULK_UPLOAD_IN_BACKGROUND=True)
+    def test_post(self):
+        self.login(user=self.user)
+        f = SimpleUploadedFile('test.csv', b'name,city\nBarclays Center,Brooklyn')
+        response = self.client.post(self.url, {'file': f}, follow=True)
+        job = BulkUploadJob.objects.get()
+        self.assertRedirects(response, reverse('admin:bulkuploads_bulkuploadjob_change', args=[job.pk]))
+        self.assertHasMessage(
+            response,
+            'Your csv will be processed in the background, refresh this page to follow its progress.'
+        )
+        self.assertEqual(job.status, BulkUploadJob.PENDING)
+        self.assertEqual(job.content_type, ContentType.objects.get_for_model(Location))
+        self.assertEqual(job.created_by, self.user)
+        self.assertEqual(job.file.read(), b'name,city\nBarclays Center,Brooklyn')
+        self.assertFalse(Location.objects.exists())
+
+    def test_job_status_pages(self):
+        self.login(user=self.user)
+        job = self.create_job(Location, ['name,city', 'Barclays Center,Brooklyn'])
+        BulkUploadJobError.objects.create(job=job, line_number=2, errors='city: Invalid.')
+        response = self.client.get(reverse('admin:bulkuploads_bulkuploadjob_changelist'))
+        self.assertContains(response, 'Pending')
+        response = self.client.get(reverse('admin:bulkuploads_bulkuploadjob_change', args=[job.pk]))
+        self.assertContains(response, 'city: Invalid.')
+
+
+class AdminBulkUploadViewStreamingTests(BaseTestCase):
+
+    def setUp(self):
+        self.url = reverse('admin:players_hockeyplayer_bulk_upload')
+        self.user = UserFactory(is_staff=True, is_superuser=True)
+        self.sport = SportFactory(name='Ice Hockey')
+        self.team = TeamFactory(division__league__sport=self.sport)
+        self.users = UserFactory.create_batch(4)
+        self.view = AdminBulkUploadView(
+            model=HockeyPlayer,
+            fields=HockeyPlayerAdminForm.Meta.fields,
+            model_form_class=HockeyPlayerAdminForm,
+            model_formset_class=PlayerAdminModelFormSet,
+            chunk_size=2,
+        )
+
+    def _get_csv(self, rows):
+        lines = ['user,team,jersey_number,position,handedness']
+        lines.extend(','.join(str(value) for value in row) for row in rows)
+        return SimpleUploadedFile('players.csv', '\n'.join(lines).encode())
+
+    def test_save_chunks(self):
+        csv_file = self._get_csv([
+            (self.users[0].pk, self.team.pk, 1, 'C', 'Left'),
+            (self.users[1].pk, 'abc', 2, 'C', 'Left'),
+            (self.users[2].pk, self.team.pk, 3, 'LW', 'Right'),
+            ('', self.team.pk, 4, 'C', 'Left'),
+            (self.users[3].pk, self.team.pk, 5, 'G', 'Left'),
+        ])
+        with CaptureQueriesContext(connection) as context:
+            num_instances, row_errors = self.view.save_chunks(csv_file)
+
+        self.assertEqual(num_instances, 3)
+        self.assertListEqual(
+            [(line_number, list(errors.keys())) for line_number, errors in row_errors],
+            [(3, ['team']), (5, ['user'])]
+        )
+        players = HockeyPlayer.objects.order_by('jersey_number')
+        self.assertListEqual([player.user for player in players], [self.users[0], self.users[2], self.users[3]])
+        self.assertTrue(all(player.sport == self.sport for player in players))
+        self.assertEqual(
+            SportRegistration.objects.filter(role=SportRegistration.PLAYER, sport=self.sport, is_complete=True).count(),
+            3
+        )
+        # Teams are fetched once per chunk
+        team_queries = [query for query in context.captured_queries if query['sql'].startswith('SELECT "teams_team"')]
+        self.assertEqual(len(team_queries), 3)
+
+    def test_post_with_errors(self):
+        self.login(user=self.user)
+        csv_file = self._get_csv([
+            (self.users[0].pk, self.team.pk, 1, 'C', 'Left'),
+            (self.users[1].pk, self.team.pk, 100, 'C', 'Left'),
+        ])
+        response = self.client.post(self.url, {'file': csv_file})
+        self.assert_200(response)
+        self.assertTemplateUsed(response, 'admin/bulk_upload.html')
+        self.assertEqual(response.context['num_instances'], 1)
+        line_number, errors = response.context['row_errors'][0]
+        self.assertEqual(line_number, 3)
+        self.assertIn('jersey_number', errors)
+        self.assertContains(response, 'Line 3:')
+        self.assertEqual(HockeyPlayer.objects.count(), 1)
+
+    def test_post(self):
+        self.login(user=self.user)
+        csv_file = self._get_csv([
+            (self.users[0].pk, self.team.pk, 1, 'C', 'Left'),
+            (self.users[1].pk, self.team.pk, 2, 'C', 'Left'),
+        ])
+        response = self.client.post(self.url, {'file': csv_file}, follow=True)
+        self.assertRedirects(response, reverse('admin:players_hockeyplayer_changelist'))
+        self.assertContains(response, 'Successfully created 2 hockey players')
+        self.assertEqual(HockeyPlayer.objects.count(), 2)
+
+    @override_settings(FRAGMENT_CACHE_TIMEOUT=60)
+    def test_post_bumps_team_fragment_versions(self):
+        self.addCleanup(cache.clear)
+        self.login(user=self.user)
+        other_team = TeamFactory(division=self.team.division)
+        versions = get_fragment_versions([(TEAM, self.team.pk), (TEAM, other_team.pk)])
+        csv_file = self._get_csv([
+            (self.users[0].pk, self.team.pk, 1, 'C', 'Left'),
+            (self.users[1].pk, self.team.pk, 2, 'C', 'Left'),
+        ])
+        # Players are bulk created when the db supports it, the signal receivers don't run then
+        with mock.patch('players.models.bump_fragment_versions'):
+            self.client.post(self.url, {'file': csv_file})
+        self.assertEqual(HockeyPlayer.objects.filter(team=self.team).count(), 2)
+        new_versions = get_fragment_versions([(TEAM, self.team.pk), (TEAM, other_team.pk)])
+        self.assertNotEqual(new_versions[0], versions[0])
+        self.assertEqual(new_versions[1], versions[1])